@@ -206,6 +206,11 @@ FPS_COUNTER_POSITION = (
 )
 FPS_COUNTER_COLOUR = (0, 255, 0)  # RGB colour (default: green)
 
+# Telemetry page: redraw only changed widgets and update only changed screen
+# areas (pygame.display.update(rects)) while no full-screen overlay is shown.
+# Disable for display backends that need a full flip every frame.
+DISPLAY_PARTIAL_UPDATES = True
+
 # Status bar configuration
 STATUS_BAR_HEIGHT = 20  # Height of status bars in pixels (scaled)
 STATUS_BAR_ENABLED = True  # Show status bars at top and bottom
@@ -294,8 +299,9 @@ SCALE_BAR_HEIGHT = 30  # Scale bar height in pixels (before scaling)
 CAR_ICON_WIDTH = 100  # Car icon width in pixels (before scaling)
 CAR_ICON_HEIGHT = 200  # Car icon height in pixels (before scaling)
 
-# Text cache settings (for radar overlay and other cached text)
-TEXT_CACHE_MAX_SIZE = 64  # Maximum entries in text render cache (LRU)
+# Shared text cache (gui/text_cache.py); numeric readouts use a glyph atlas instead
+TEXT_CACHE_MAX_SIZE = 256  # Maximum rendered strings kept (LRU)
+TEXT_CACHE_MAX_KB = 4096  # Maximum pixel memory of rendered strings
 
 # Input event queue settings
 INPUT_EVENT_QUEUE_SIZE = 10  # Maximum queued input events
@@ -429,6 +435,11 @@ MLX_DISPLAY_WIDTH = int(
 )  # Width of displayed heatmap - to cover the complete tyre width
 MLX_DISPLAY_HEIGHT = int(172 * SCALE_Y)  # Height of displayed heatmap
 
+# Thermal tiles are cached and rebuilt only when a zone temperature moves by
+# at least this much (zone temperatures are shown to 0.1)
+THERMAL_TILE_TEMP_STEP = 0.1
+THERMAL_TILE_CACHE_SIZE = 32  # Finished tiles kept (about 165 KB each)
+
 # Tyre temperature history display settings
 # "current" shows only current temps, "history" shows vertical gradient with history
 TYRE_HISTORY_DISPLAY_DEFAULT = "current"
@@ -558,6 +569,12 @@ CAMERA_FOV_DEGREES = 106.0  # Horizontal field of view in degrees
 # Camera FPS update interval (for display)
 CAMERA_FPS_UPDATE_INTERVAL_S = 1.0  # Seconds between FPS counter updates
 
+# MJPEG decode scale: decode the camera's JPEG frames at 1/N resolution
+# (libjpeg DCT scaling), far cheaper than decoding full size then scaling down.
+# 0 = auto (largest reduction that still covers the display), 1 = full size,
+# 2, 4 or 8 = fixed reduction
+CAMERA_MJPEG_DECODE_SCALE = 0
+
 # ==============================================================================
 # CAMERA DEVICES
 # ==============================================================================
@@ -603,6 +620,11 @@ BUTTON_VIEW_MODE = 0  # Switch between categories (camera pages ↔ UI pages)
 # Recording configuration
 RECORDING_HOLD_DURATION = 1.0  # Seconds to hold button 0 to start/stop recording
 RECORDING_RATE_HZ = 10  # Telemetry recording rate (10 Hz matches sensor/GPS max rate)
+TELEMETRY_BLOCK_ROWS = 100  # Rows per on-disk block (10s at 10 Hz, max data lost on crash)
+TELEMETRY_MAX_PENDING_BLOCKS = 8  # Blocks queued for the writer thread before dropping
+RAW_LOG_ENABLED = True  # Log IMU/OBD2/GPS/radar at native rate alongside the 10 Hz recording
+RAW_LOG_RING_CAPACITY = 2048  # Samples buffered per handler between drains (~20s at 100 Hz)
+RAW_LOG_FLUSH_INTERVAL_S = 0.5  # Seconds between raw log drains to disk
 
 # ==============================================================================
 # ROTARY ENCODER (Adafruit I2C QT)
@@ -829,10 +851,22 @@ LAP_TIMING_ENABLED = True  # Set to False to disable lap timing
 # Track auto-detection
 TRACK_AUTO_DETECT = True  # Automatically detect track from GPS position
 TRACK_SEARCH_RADIUS_KM = 10.0  # Search radius for nearby tracks (kilometres)
+TRACK_AUTO_DETECT_REQUERY_M = 250.0  # Movement before searching again after a miss (metres)
 
 # Delta bar display range
 DELTA_BAR_RANGE = 10.0  # Maximum delta to display (seconds, +/-)
 
+# Reference lap lookup table resolution (metres between entries)
+LAP_TIMING_DELTA_RESOLUTION_M = 0.5
+
+# Delta prediction
+LAP_TIMING_SPEED_WINDOW = 5  # Recent positions used for speed/delta trend (0.5s at 10Hz)
+LAP_TIMING_DELTA_TREND_HORIZON_S = 3.0  # How far ahead the delta trend is projected (seconds)
+
+# Position tracking
+LAP_TIMING_TRACKER_WINDOW_M = 60.0  # Centreline searched ahead of the last position each fix (metres)
+LAP_TIMING_TRACKER_LOCK_DISTANCE_M = 30.0  # Lock is lost beyond this distance from the centreline (metres)
+
 # Lap timing data directory (uses USB if available)
 LAP_TIMING_DATA_DIR = os.path.join(DATA_DIR, "lap_timing")
 
@@ -843,6 +877,9 @@ LAP_TIMING_RACELOGIC_DB = os.path.join(LAP_TIMING_TRACKS_DIR, "racelogic.db")
 LAP_TIMING_CUSTOM_TRACKS_DIR = os.path.join(LAP_TIMING_TRACKS_DIR, "maps")
 LAP_TIMING_RACELOGIC_TRACKS_DIR = os.path.join(LAP_TIMING_TRACKS_DIR, "racelogic")
 
+# Compiled track cache (preprocessed centreline, S/F line and corners)
+LAP_TIMING_TRACK_CACHE_DIR = os.path.join(LAP_TIMING_DATA_DIR, "track_cache")
+
 # Routes directory for GPX/KMZ files (uses USB if available)
 LAP_TIMING_ROUTES_DIR = os.path.join(DATA_DIR, "routes")
 
@@ -936,10 +973,14 @@ COPILOT_LOOKAHEAD_M = 1000
 # Road data fetching
 COPILOT_ROAD_FETCH_RADIUS_M = 2000  # Radius to cache roads around current position
 COPILOT_REFETCH_DISTANCE_M = 500  # Refetch roads when moved this far from last fetch
+COPILOT_PREFETCH_AHEAD_M = 500  # Centre background loads this far ahead along heading/route
+COPILOT_PREFETCH_MARGIN_M = 500  # Start the next load while this much coverage remains past the lookahead
+COPILOT_ROAD_KEEP_RADIUS_M = 3000  # Keep merged roads within this distance of the latest load centre
+COPILOT_PREFETCH_RETRY_S = 10.0  # Wait this long before retrying a failed background load
 
 # Update interval in seconds
 # Lower values give more responsive callouts but use more CPU
-COPILOT_UPDATE_INTERVAL_S = 0.5
+COPILOT_UPDATE_INTERVAL_S = 0.25
 
 # ==============================================================================
 # COPILOT - CORNER DETECTION
@@ -964,6 +1005,7 @@ COPILOT_HEADING_TOLERANCE_DEG = (
     45.0  # Roads within this angle of heading are "straight on" (increased for real-world use)
 )
 COPILOT_ROAD_SEARCH_RADIUS_M = 150  # Maximum distance from GPS to search for current road
+COPILOT_WAY_CONTINUITY_BONUS_M = 15.0  # Score bonus for staying on last cycle's road (metres)
 
 # ==============================================================================
 # COPILOT - AUDIO
@@ -973,6 +1015,8 @@ COPILOT_AUDIO_ENABLED = True  # Enable audio callouts
 COPILOT_AUDIO_VOLUME = 0.8  # Audio volume (0.0-1.0)
 COPILOT_TTS_VOICE = "Daniel"  # British male voice (macOS), falls back to en-gb on Linux
 COPILOT_TTS_SPEED = 210  # Words per minute (faster for rally style)
+COPILOT_TTS_CACHE_DIR = os.path.join(COPILOT_CACHE_DIR, "tts")  # Rendered TTS phrases
+COPILOT_TTS_CACHE_MB = 32  # Disk budget for rendered TTS phrases (least recently used evicted)
 
 # ==============================================================================
 # COPILOT - OVERLAY
@@ -1023,6 +1067,7 @@ COPILOT_REFETCH_THRESHOLD_M = 2500  # Distance before triggering refetch
 # Used by all hardware handlers for lock-free producer-consumer pattern
 HANDLER_QUEUE_DEPTH = 2  # Depth of snapshot queue
 HANDLER_STOP_TIMEOUT_S = 5.0  # Timeout waiting for handler thread to stop
+HANDLER_UPDATE_WAIT_TIMEOUT_S = 0.1  # Max wait for an upstream snapshot before refreshing state anyway
 
 # ==============================================================================
 # THREAD SHUTDOWN TIMEOUTS
@@ -1,4 +1,9 @@
-"""Audio output for pacenotes using Janne Laahanen samples or TTS fallback."""
+"""Audio output for pacenotes using Janne Laahanen samples or TTS fallback.
+
+Where aplay is available, callouts are built in memory and streamed by an
+in-process AudioEngine (see audio_engine.py). Elsewhere they are played by
+spawning sox and afplay/aplay per callout.
+"""
 
 import logging
 import os
@@ -9,11 +14,30 @@ import subprocess
 import tempfile
 import threading
 import time
+import wave
 from pathlib import Path
 from queue import Queue, Empty
 from typing import Dict, List, Optional
 
-from config import COPILOT_TTS_VOICE, COPILOT_TTS_SPEED
+import numpy as np
+
+from config import (
+    COPILOT_TTS_CACHE_DIR,
+    COPILOT_TTS_CACHE_MB,
+    COPILOT_TTS_SPEED,
+    COPILOT_TTS_VOICE,
+)
+
+from .audio_engine import (
+    ENGINE_SAMPLE_RATE,
+    AplaySink,
+    AudioEngine,
+    AudioSink,
+    decode_wav,
+    intercom_effect,
+)
+from .pacenotes import PacenoteGenerator
+from .phrase_cache import PhraseCache, join_phrases
 
 logger = logging.getLogger('openTPT.copilot.audio')
 
@@ -109,6 +133,7 @@ class JanneSampleLibrary:
     def __init__(self, sample_dir: Path):
         self.sample_dir = sample_dir
         self._cache: Dict[str, List[Path]] = {}  # folder -> list of wav files
+        self._pcm: Dict[str, List[np.ndarray]] = {}  # folder -> decoded samples
         self._scan_samples()
 
     def _scan_samples(self) -> None:
@@ -129,6 +154,33 @@ class JanneSampleLibrary:
         wavs = self._cache[folder_name]
         return random.choice(wavs) if wavs else None
 
+    def load_pcm(self, sample_rate: int = ENGINE_SAMPLE_RATE) -> int:
+        """
+        Decode the samples of every mapped folder to PCM for AudioEngine.
+
+        Returns the number of samples decoded. Files that fail to decode
+        are skipped.
+        """
+        folders = {
+            *self.CORNER_MAP.values(), *self.DETAIL_MAP.values(), *self.NUMBER_MAP.values()
+        }
+        self._pcm = {}
+        for folder in folders & self._cache.keys():
+            clips = []
+            for wav_file in self._cache[folder]:
+                try:
+                    clips.append(decode_wav(wav_file, sample_rate))
+                except (wave.Error, ValueError, EOFError, OSError) as e:
+                    logger.warning("Skipping sample %s: %s", wav_file, e)
+            if clips:
+                self._pcm[folder] = clips
+        return sum(len(clips) for clips in self._pcm.values())
+
+    def get_sample_pcm(self, folder_name: str) -> Optional[np.ndarray]:
+        """Get a random decoded sample from the named folder (after load_pcm)."""
+        clips = self._pcm.get(folder_name)
+        return random.choice(clips) if clips else None
+
     def has_sample(self, folder_name: str) -> bool:
         """Check if a sample folder exists."""
         return folder_name in self._cache
@@ -154,6 +206,12 @@ class AudioPlayer:
 
     Chaining: When multiple callouts arrive in quick succession, they are
     combined with "into" between them (e.g., "left four into right three").
+
+    With an AudioEngine (aplay available, or a sink given), samples are
+    decoded once at start() and callouts are concatenated and filtered in
+    memory. A callout more urgent than the one playing cuts it off. Speech
+    for callouts the samples cannot say is rendered once per phrase and
+    kept in a PhraseCache, warmed at start() with the pacenote vocabulary.
     """
 
     # Time window to collect items for chaining (seconds)
@@ -166,10 +224,19 @@ class AudioPlayer:
         speed: int = COPILOT_TTS_SPEED,
         enable_effects: bool = True,
         enable_mpris: bool = True,
+        volume: float = 1.0,
+        sink: Optional[AudioSink] = None,
+        phrase_cache_dir: Optional[Path] = Path(COPILOT_TTS_CACHE_DIR),
     ):
         self.voice = voice
         self.speed = speed
         self.enable_effects = enable_effects
+        self.volume = volume
+        self._sink = sink
+        self._engine: Optional[AudioEngine] = None
+        self._phrase_cache_dir = phrase_cache_dir
+        self._phrase_cache: Optional[PhraseCache] = None
+        self._warm_thread: Optional[threading.Thread] = None
         self._queue: Queue = Queue()
         self._thread: Optional[threading.Thread] = None
         self._running = False
@@ -196,10 +263,40 @@ class AudioPlayer:
 
     def start(self) -> None:
         """Start the audio playback thread."""
+        # In-process engine when there is a streaming output
+        sink = self._sink
+        if sink is None and self._has_aplay:
+            sink = AplaySink()
+        if sink is not None:
+            if self.samples:
+                start = time.perf_counter()
+                count = self.samples.load_pcm(sink.sample_rate)
+                logger.info(
+                    "Decoded %d pacenote samples in %.0fms",
+                    count, (time.perf_counter() - start) * 1000,
+                )
+            self._engine = AudioEngine(sink, self.volume)
+            self._engine.start()
+
         self._running = True
         self._thread = threading.Thread(target=self._playback_loop, daemon=True)
         self._thread.start()
 
+        # Rendered speech for callouts the samples cannot say
+        if self._engine is not None and self._has_espeak:
+            sample_rate = self._engine.sample_rate
+            self._phrase_cache = PhraseCache(
+                self._phrase_cache_dir,
+                (self._espeak_cmd(), "en-gb", self.speed, self.enable_effects, sample_rate),
+                max_disk_bytes=COPILOT_TTS_CACHE_MB * 1024 * 1024,
+            )
+            self._warm_thread = threading.Thread(
+                target=self._warm_phrase_cache,
+                args=(self._phrase_cache, sample_rate),
+                daemon=True,
+            )
+            self._warm_thread.start()
+
         # Start MPRIS for Bluetooth metadata
         if self._mpris:
             if self._mpris.start():
@@ -208,7 +305,7 @@ class AudioPlayer:
                 logger.debug("MPRIS not available")
 
         # Warm up sox to avoid delay on first audio (loads libraries)
-        if self._has_sox:
+        if self._engine is None and self._has_sox:
             try:
                 warmup_file = os.path.join(self._temp_dir, "warmup.wav")
                 subprocess.run(
@@ -222,8 +319,14 @@ class AudioPlayer:
     def stop(self) -> None:
         """Stop the audio playback thread."""
         self._running = False
+        if self._engine:
+            self._engine.stop()
         if self._thread:
             self._thread.join(timeout=1)
+        if self._warm_thread:
+            self._warm_thread.join(timeout=1)
+        self._engine = None
+        self._phrase_cache = None
 
         # Stop MPRIS
         if self._mpris:
@@ -238,8 +341,11 @@ class AudioPlayer:
             pass
 
     def say(self, text: str, priority: int = 5) -> None:
-        """Queue text to be spoken."""
+        """Queue text to be spoken, cutting off a less urgent callout."""
         self._queue.put((priority, text, time.time()))
+        engine = self._engine
+        if engine:
+            engine.preempt(priority)
 
     def _playback_loop(self) -> None:
         """
@@ -259,15 +365,16 @@ class AudioPlayer:
             chain = [text]
             while True:
                 try:
-                    _, next_text, _ = self._queue.get_nowait()
+                    next_priority, next_text, _ = self._queue.get_nowait()
                     chain.append(next_text)
+                    priority = min(priority, next_priority)
                 except Empty:
                     break
 
             # Speak the chain
-            self._speak_chain(chain)
+            self._speak_chain(chain, priority)
 
-    def _speak_chain(self, chain: List[str]) -> None:
+    def _speak_chain(self, chain: List[str], priority: int = 5) -> None:
         """Speak one or more pacenotes, chained with 'into' if multiple."""
         # Expand any pre-merged "into" chains from pacenote generator
         expanded = []
@@ -287,6 +394,16 @@ class AudioPlayer:
         if mpris:
             mpris.update_now_playing(display_text)
 
+        # Build in memory and stream, waiting until played or cut off
+        engine = self._engine
+        if engine:
+            pcm = self._render_chain(expanded, display_text, engine.sample_rate)
+            if pcm is not None:
+                engine.play(pcm, priority).wait()
+            if mpris:
+                mpris.set_stopped()
+            return
+
         # Try Janne samples first (supports chaining natively)
         if self.samples:
             if self._speak_with_samples(expanded):
@@ -305,39 +422,109 @@ class AudioPlayer:
         if mpris:
             mpris.set_stopped()
 
-    def _speak_with_samples(self, chain: List[str]) -> bool:
+    def _sample_folders(self, chain: List[str]) -> Optional[List[str]]:
         """
-        Build and play pacenotes using Janne Laahanen samples.
+        Sample folders to play for pacenotes, in order.
 
-        Chains multiple notes with 'into' between them.
-        Returns True if successful, False to fall back.
+        Chains multiple notes with 'into' between them. Returns None if
+        any note cannot be said with samples.
         """
-        wav_files: List[Path] = []
+        folders: List[str] = []
 
         for idx, text in enumerate(chain):
             # Add "into" sample between notes
-            if idx > 0:
-                into_file = self.samples.get_sample_file("detail_into")
-                if into_file:
-                    wav_files.append(into_file)
+            if idx > 0 and self.samples.has_sample("detail_into"):
+                folders.append("detail_into")
 
             # Parse this pacenote into sample keys
             keys = self._parse_to_sample_keys(text)
             if not keys:
-                return False
+                return None
 
-            # Get WAV file for each key
             for key in keys:
                 folder = self.samples.get_folder_for_key(key)
                 if not folder or not self.samples.has_sample(folder):
-                    return False
-                wav_file = self.samples.get_sample_file(folder)
-                if not wav_file:
-                    return False
-                wav_files.append(wav_file)
+                    return None
+                folders.append(folder)
+
+        return folders or None
 
-        if not wav_files:
+    def _render_chain(
+        self, chain: List[str], display_text: str, sample_rate: int
+    ) -> Optional[np.ndarray]:
+        """PCM for pacenotes: concatenated samples, else synthesised speech."""
+        if self.samples:
+            folders = self._sample_folders(chain)
+            if folders:
+                clips = [self.samples.get_sample_pcm(folder) for folder in folders]
+                if all(clip is not None for clip in clips):
+                    return np.concatenate(clips)
+        return self._synthesise(display_text, sample_rate)
+
+    def _synthesise(self, text: str, sample_rate: int) -> Optional[np.ndarray]:
+        """
+        PCM for text, from cached phrases where possible.
+
+        Callouts made entirely of cached vocabulary phrases are joined from
+        them; anything else is rendered once and cached whole.
+        """
+        cache = self._phrase_cache
+        if cache is None:
+            return self._render_speech(text, sample_rate)
+
+        phrases = PacenoteGenerator.split_phrases(text)
+        if phrases:
+            clips = [cache.get(phrase) for phrase in phrases]
+            if all(clip is not None for clip in clips):
+                return join_phrases(clips, sample_rate)
+        return cache.get_or_render(text, lambda t: self._render_speech(t, sample_rate))
+
+    def _warm_phrase_cache(self, cache: PhraseCache, sample_rate: int) -> None:
+        """Render (or load from disk) every pacenote vocabulary phrase."""
+        start = time.perf_counter()
+        rendered = 0
+        for phrase in PacenoteGenerator.vocabulary():
+            if not self._running:
+                return
+            if cache.get(phrase) is None:
+                pcm = self._render_speech(phrase, sample_rate)
+                if pcm is not None:
+                    cache.put(phrase, pcm)
+                    rendered += 1
+        logger.info(
+            "TTS phrase cache warm in %.0fms (%d phrases rendered)",
+            (time.perf_counter() - start) * 1000, rendered,
+        )
+
+    def _espeak_cmd(self) -> str:
+        return "espeak-ng" if shutil.which("espeak-ng") else "espeak"
+
+    def _render_speech(self, text: str, sample_rate: int) -> Optional[np.ndarray]:
+        """Speak text to PCM with espeak (no temp files), adding the intercom effect."""
+        if not self._has_espeak:
+            return None
+        try:
+            result = subprocess.run(
+                [self._espeak_cmd(), "-v", "en-gb", "-s", str(self.speed), "--stdout", text],
+                check=True,
+                capture_output=True,
+            )
+            pcm = decode_wav(result.stdout, sample_rate)
+        except (subprocess.CalledProcessError, wave.Error, ValueError, EOFError):
+            return None
+        return intercom_effect(pcm, sample_rate) if self.enable_effects else pcm
+
+    def _speak_with_samples(self, chain: List[str]) -> bool:
+        """
+        Build and play pacenotes using Janne Laahanen samples.
+
+        Chains multiple notes with 'into' between them.
+        Returns True if successful, False to fall back.
+        """
+        folders = self._sample_folders(chain)
+        if not folders:
             return False
+        wav_files = [self.samples.get_sample_file(folder) for folder in folders]
 
         # Concatenate and play
         try:
@@ -0,0 +1,360 @@
+"""In-process audio output for pacenotes.
+
+Pacenote audio is built as PCM in memory (float32 mono, -1.0 to 1.0) and
+streamed to one long-lived output by a mixer thread, rather than spawning
+sox and aplay for every callout:
+
+    decode_wav()        WAV file or bytes -> mono PCM at the engine rate
+    intercom_effect()   numpy version of the sox helmet/intercom chain
+    AudioEngine         plays clips most urgent first; a more urgent clip
+                        cuts off the one playing after a short fade
+    AplaySink           raw PCM into a single aplay process
+    NullSink            discards audio, noting when it arrived (benchmarks)
+"""
+
+import heapq
+import io
+import itertools
+import logging
+import subprocess
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger('openTPT.copilot.audio_engine')
+
+ENGINE_SAMPLE_RATE = 22050  # Voice band; the intercom effect cuts above 3.2kHz
+
+
+def resample(pcm: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linearly resample mono PCM."""
+    if from_rate == to_rate or not len(pcm):
+        return pcm.astype(np.float32, copy=False)
+    count = int(round(len(pcm) * to_rate / from_rate))
+    positions = np.arange(count) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(pcm)), pcm).astype(np.float32)
+
+
+def decode_wav(
+    source: Union[bytes, str, Path], sample_rate: int = ENGINE_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Decode a PCM WAV file (or its bytes) to float32 mono at sample_rate.
+
+    Channels are averaged. Raises wave.Error or ValueError for files that
+    are not 8, 16, 24 or 32-bit PCM.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    else:
+        source = str(source)
+
+    with wave.open(source, "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    # Streamed WAVs (espeak --stdout) can end mid-frame
+    frames = frames[:len(frames) // (width * channels) * width * channels]
+    if width == 1:
+        pcm = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        pcm = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        pcm = ((values << 8) >> 8).astype(np.float32) / 2 ** 23
+    elif width == 4:
+        pcm = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2 ** 31
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1)
+    return resample(pcm, rate, sample_rate)
+
+
+def _db_to_gain(db):
+    return 10 ** (np.asarray(db) / 20)
+
+
+def intercom_effect(pcm: np.ndarray, sample_rate: int = ENGINE_SAMPLE_RATE) -> np.ndarray:
+    """
+    Helmet/intercom radio effect for synthesised speech.
+
+    Follows the sox chain the TTS path used ("highpass 400 lowpass 3200
+    compand 0.1,0.3 -70,-60,-20 -8 -90 0.1 overdrive 3 gain -5"):
+    - band-pass: second-order Butterworth magnitudes at 400Hz and 3.2kHz,
+      applied to the whole clip in the frequency domain
+    - compand: the same transfer points and -8dB gain, on an envelope
+      averaged over the 0.1s attack time
+    - overdrive: +3dB into a cubic soft clipper
+    - -5dB output gain
+    """
+    if not len(pcm):
+        return pcm.astype(np.float32, copy=False)
+
+    # Band-pass, zero-padded so the filtered clip does not wrap around
+    size = 1 << int(len(pcm) + sample_rate // 10 - 1).bit_length()
+    freqs = np.fft.rfftfreq(size, 1 / sample_rate)
+    with np.errstate(divide="ignore"):
+        highpass = 1 / np.sqrt(1 + (400 / freqs) ** 4)
+    lowpass = 1 / np.sqrt(1 + (freqs / 3200) ** 4)
+    out = np.fft.irfft(np.fft.rfft(pcm, size) * highpass * lowpass, size)[:len(pcm)]
+
+    # Compand: lift quiet passages along -70,-60 -> -20,-20 -> 0,0
+    window = max(1, int(0.1 * sample_rate))
+    level = np.cumsum(np.abs(out))
+    level[window:] = level[window:] - level[:-window]
+    envelope_db = 20 * np.log10(np.maximum(level / window, 1e-9))
+    out_db = np.interp(envelope_db, [-200, -70, -20, 0], [-190, -60, -20, 0])
+    out = out * _db_to_gain(out_db - envelope_db - 8)
+
+    # Overdrive, then output gain
+    driven = out * _db_to_gain(3)
+    out = np.where(
+        np.abs(driven) < 1, driven - driven ** 3 / 3, np.sign(driven) * 2 / 3
+    ) * _db_to_gain(-5)
+    return out.astype(np.float32)
+
+
+class AudioSink:
+    """
+    Destination for the engine's audio: int16 mono blocks at sample_rate.
+
+    realtime sinks play audio as it is written, so the engine paces its
+    writes to keep only AudioEngine.LEAD_S queued ahead of playback.
+    """
+
+    realtime = True
+
+    def __init__(self, sample_rate: int = ENGINE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def open(self) -> None:
+        """Prepare the output before the first callout."""
+
+    def write(self, pcm: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the output."""
+
+
+class AplaySink(AudioSink):
+    """
+    Streams raw PCM into one long-lived aplay process.
+
+    The process is started by open() and restarted if it exits, so a
+    callout never waits for a player to start.
+    """
+
+    def __init__(self, sample_rate: int = ENGINE_SAMPLE_RATE, buffer_ms: int = 100):
+        super().__init__(sample_rate)
+        self.buffer_ms = buffer_ms
+        self._process: Optional[subprocess.Popen] = None
+
+    def open(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            return
+        self._process = subprocess.Popen(
+            [
+                "aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1",
+                "-r", str(self.sample_rate), f"--buffer-time={self.buffer_ms * 1000}",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+
+    def write(self, pcm: np.ndarray) -> None:
+        try:
+            self.open()
+            self._process.stdin.write(pcm.tobytes())
+        except OSError as e:
+            logger.debug("aplay output failed, restarting: %s", e)
+            self._process = None
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+
+class NullSink(AudioSink):
+    """
+    Discards audio, recording when the first sample arrived.
+
+    Not realtime by default, so clips are "played" as fast as they are
+    written. Set keep=True to keep the written blocks for inspection.
+    """
+
+    def __init__(
+        self, sample_rate: int = ENGINE_SAMPLE_RATE, realtime: bool = False, keep: bool = False
+    ):
+        super().__init__(sample_rate)
+        self.realtime = realtime
+        self.first_sample_at: Optional[float] = None  # time.perf_counter()
+        self.samples_written = 0
+        self.blocks: Optional[List[np.ndarray]] = [] if keep else None
+
+    def write(self, pcm: np.ndarray) -> None:
+        if self.first_sample_at is None:
+            self.first_sample_at = time.perf_counter()
+        self.samples_written += len(pcm)
+        if self.blocks is not None:
+            self.blocks.append(pcm)
+
+
+class Playback:
+    """A clip passed to AudioEngine.play(), to wait on or check."""
+
+    def __init__(self, pcm: np.ndarray, priority: int):
+        self.pcm = pcm
+        self.priority = priority
+        self.position = 0  # Samples written so far
+        self.preempted = False  # Cut off (or dropped) before the end
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the clip has been written out or cut off."""
+        return self._done.wait(timeout)
+
+
+class AudioEngine:
+    """
+    Streams PCM clips to one sink from a mixer thread.
+
+    Priorities follow Pacenote.priority: 1 is most urgent. A clip more
+    urgent than the one playing cuts it off after a FADE_S fade; other
+    clips wait their turn, in priority then arrival order.
+    """
+
+    BLOCK_S = 0.01  # Audio written per mixer step
+    LEAD_S = 0.05  # Audio kept queued ahead of playback (realtime sinks)
+    FADE_S = 0.005  # Fade-out when a clip is cut off
+
+    def __init__(self, sink: AudioSink, volume: float = 1.0):
+        self.sink = sink
+        self.volume = volume
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[int, int, Playback]] = []  # Heap
+        self._current: Optional[Playback] = None
+        self._order = itertools.count()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._play_until = 0.0  # When the audio queued in the sink runs out
+
+    @property
+    def sample_rate(self) -> int:
+        return self.sink.sample_rate
+
+    @property
+    def idle(self) -> bool:
+        """True when nothing is playing or waiting to play."""
+        with self._cond:
+            return self._current is None and not self._pending
+
+    def start(self) -> None:
+        """Open the sink and start the mixer thread."""
+        self.sink.open()
+        self._running = True
+        self._thread = threading.Thread(target=self._mix_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the mixer, dropping anything not yet played."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=1)
+        with self._cond:
+            dropped = [playback for _, _, playback in self._pending]
+            if self._current:
+                dropped.append(self._current)
+            self._pending = []
+            self._current = None
+        for playback in dropped:
+            playback.preempted = True
+            playback._done.set()
+        self.sink.close()
+
+    def play(self, pcm: np.ndarray, priority: int = 5) -> Playback:
+        """Queue a clip of float PCM at the engine sample rate."""
+        playback = Playback(np.asarray(pcm, dtype=np.float32), priority)
+        with self._cond:
+            heapq.heappush(self._pending, (priority, next(self._order), playback))
+            self._cond.notify()
+        return playback
+
+    def preempt(self, priority: int) -> bool:
+        """Cut off the playing clip if it is less urgent than priority."""
+        with self._cond:
+            current = self._current
+            if current is not None and priority < current.priority:
+                current.preempted = True
+                return True
+        return False
+
+    def _mix_loop(self) -> None:
+        """Mixer thread: write the current clip a block at a time."""
+        block = max(1, int(self.BLOCK_S * self.sample_rate))
+        fade = max(1, int(self.FADE_S * self.sample_rate))
+
+        while True:
+            with self._cond:
+                while self._running and self._current is None and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                if self._current is None:
+                    self._current = heapq.heappop(self._pending)[2]
+                elif self._pending and self._pending[0][0] < self._current.priority:
+                    self._current.preempted = True
+                playback = self._current
+
+            start = playback.position
+            if playback.preempted:
+                chunk = playback.pcm[start:start + fade]
+                chunk = chunk * np.linspace(1.0, 0.0, len(chunk), dtype=np.float32)
+                playback.position = len(playback.pcm)
+            else:
+                chunk = playback.pcm[start:start + block]
+                playback.position = start + len(chunk)
+
+            if len(chunk):
+                self._write(chunk)
+
+            if playback.position >= len(playback.pcm):
+                with self._cond:
+                    self._current = None
+                playback._done.set()
+
+    def _write(self, chunk: np.ndarray) -> None:
+        """Write a block to the sink, pacing realtime sinks."""
+        pcm = (np.clip(chunk * self.volume, -1.0, 1.0) * 32767).astype(np.int16)
+        self.sink.write(pcm)
+        if not self.sink.realtime:
+            return
+
+        now = time.perf_counter()
+        self._play_until = max(now, self._play_until) + len(pcm) / self.sample_rate
+        ahead = self._play_until - now - self.LEAD_S
+        if ahead > 0:
+            time.sleep(ahead)
@@ -0,0 +1,365 @@
+"""Array-backed road network for a loaded region.
+
+RoadNetwork keeps one Node object per node, a Python list of node IDs per
+way and a dict of lists for the node-to-way index. For a loaded region
+that is several hundred bytes per node, and get_way_geometry() builds a
+new list of tuples on every call.
+
+CompactRoadNetwork stores the same roads as flat numpy arrays in
+compressed sparse row (CSR) form:
+
+- Way nodes are laid out way after way. way_offsets[w]:way_offsets[w + 1]
+  are the positions of way w, and position_node, lats and lons hold the
+  node ID and coordinates at each position, so the geometry of a way is a
+  slice (a view, no copy).
+- node_ids holds each node once, sorted. node_offsets[n]:node_offsets[n + 1]
+  index node_positions, the positions at which node n appears, in way
+  order. This is the node-to-way adjacency.
+- Way tags are a structured array (way_info) with strings stored as codes
+  into a shared string table, "" always being code 0.
+
+Junctions, railway crossings and barriers are few per region and stay as
+dicts keyed by node ID.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .road_network import Node, RoadNetwork, Way
+
+# Way tags, one row per way. String tags are codes into strings.
+WAY_INFO_DTYPE = np.dtype([
+    ("name", np.int32),
+    ("highway_type", np.int32),
+    ("surface", np.int32),
+    ("traffic_calming", np.int32),
+    ("speed_limit", np.int32),
+    ("width", np.float64),
+    ("oneway", np.bool_),
+    ("bridge", np.bool_),
+    ("tunnel", np.bool_),
+    ("ford", np.bool_),
+    ("narrow", np.bool_),
+])
+
+_STRING_TAGS = ("name", "highway_type", "surface", "traffic_calming")
+_VALUE_TAGS = ("speed_limit", "width", "oneway", "bridge", "tunnel", "ford", "narrow")
+
+
+class CompactRoadNetwork:
+    """Road network for a geographic area, stored as CSR numpy arrays."""
+
+    def __init__(
+        self,
+        way_ids: np.ndarray,
+        way_offsets: np.ndarray,
+        position_node: np.ndarray,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        way_info: np.ndarray,
+        strings: List[str],
+        junctions: Optional[Dict] = None,
+        railway_crossings: Optional[Dict] = None,
+        barriers: Optional[Dict] = None,
+    ):
+        # Ways
+        self.way_ids = np.asarray(way_ids, dtype=np.int64)
+        self.way_offsets = np.asarray(way_offsets, dtype=np.int64)
+        self.way_info = way_info
+        self.strings = strings
+        self.way_index: Dict[int, int] = {
+            way_id: w for w, way_id in enumerate(self.way_ids.tolist())
+        }
+
+        # Way node positions
+        self.position_node = np.asarray(position_node, dtype=np.int64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.position_way = np.repeat(
+            np.arange(len(self.way_ids), dtype=np.int32), np.diff(self.way_offsets)
+        )
+
+        # Node-to-way adjacency: positions grouped by node, in way order
+        order = np.argsort(self.position_node, kind="stable")
+        self.node_ids, starts = np.unique(self.position_node[order], return_index=True)
+        self.node_offsets = np.append(starts, len(order)).astype(np.int64)
+        self.node_positions = order.astype(np.int32)
+
+        # Node features
+        self.junctions = junctions if junctions is not None else {}
+        self.railway_crossings = railway_crossings if railway_crossings is not None else {}
+        self.barriers = barriers if barriers is not None else {}
+
+    @classmethod
+    def empty(cls) -> "CompactRoadNetwork":
+        """A network with no roads."""
+        return cls(
+            np.zeros(0), np.zeros(1), np.zeros(0), np.zeros(0), np.zeros(0),
+            np.zeros(0, dtype=WAY_INFO_DTYPE), [""],
+        )
+
+    @classmethod
+    def from_network(cls, network) -> "CompactRoadNetwork":
+        """
+        Build from a RoadNetwork (map_loader or sqlite_cache).
+
+        Way nodes with no coordinates in network.nodes are left out, as
+        RoadNetwork.get_way_geometry() does. The junction, crossing and
+        barrier dicts are shared, not copied.
+        """
+        codes = {"": 0}
+        way_ids = []
+        offsets = [0]
+        position_node = []
+        lats = []
+        lons = []
+        info = np.zeros(len(network.ways), dtype=WAY_INFO_DTYPE)
+        nodes = network.nodes
+
+        for w, (way_id, way) in enumerate(network.ways.items()):
+            way_ids.append(way_id)
+            for nid in way.nodes:
+                node = nodes.get(nid)
+                if node is not None:
+                    position_node.append(nid)
+                    lats.append(node.lat)
+                    lons.append(node.lon)
+            offsets.append(len(position_node))
+
+            row = info[w]
+            for tag in _STRING_TAGS:
+                row[tag] = codes.setdefault(getattr(way, tag), len(codes))
+            for tag in _VALUE_TAGS:
+                row[tag] = getattr(way, tag)
+
+        return cls(
+            np.array(way_ids, dtype=np.int64),
+            np.array(offsets, dtype=np.int64),
+            np.array(position_node, dtype=np.int64),
+            np.array(lats, dtype=np.float64),
+            np.array(lons, dtype=np.float64),
+            info,
+            list(codes),
+            network.junctions,
+            network.railway_crossings,
+            network.barriers,
+        )
+
+    @property
+    def way_count(self) -> int:
+        return len(self.way_ids)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    def way_span(self, w: int) -> Tuple[int, int]:
+        """(start, end) positions of way w."""
+        return int(self.way_offsets[w]), int(self.way_offsets[w + 1])
+
+    def way_length(self, w: int) -> int:
+        """Number of nodes in way w."""
+        return int(self.way_offsets[w + 1] - self.way_offsets[w])
+
+    def way_geometry(self, w: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(lats, lons) of way w, as views into the network arrays."""
+        start, end = self.way_span(w)
+        return self.lats[start:end], self.lons[start:end]
+
+    def way_nodes(self, w: int) -> np.ndarray:
+        """Node IDs of way w in order, as a view."""
+        start, end = self.way_span(w)
+        return self.position_node[start:end]
+
+    def way_tag(self, w: int, tag: str):
+        """Tag value of way w, with string tags decoded."""
+        value = self.way_info[tag][w]
+        if tag in _STRING_TAGS:
+            return self.strings[value]
+        return value.item()
+
+    def get_way_geometry(self, way_id: int) -> List[Tuple[float, float]]:
+        """List of (lat, lon) points for a way, as RoadNetwork.get_way_geometry()."""
+        w = self.way_index.get(way_id)
+        if w is None:
+            return []
+        lats, lons = self.way_geometry(w)
+        return list(zip(lats.tolist(), lons.tolist()))
+
+    def _node_slot(self, node_id: int) -> int:
+        """Index of a node in node_ids, or -1 if it is not in the network."""
+        n = int(self.node_ids.searchsorted(node_id))
+        if n < len(self.node_ids) and self.node_ids[n] == node_id:
+            return n
+        return -1
+
+    def node_positions_of(self, node_id: int) -> np.ndarray:
+        """Positions at which a node appears, in way order."""
+        n = self._node_slot(node_id)
+        if n < 0:
+            return self.node_positions[:0]
+        return self.node_positions[self.node_offsets[n]:self.node_offsets[n + 1]]
+
+    def ways_at_node(self, node_id: int) -> List[int]:
+        """IDs of the ways through a node, as RoadNetwork.node_to_ways."""
+        positions = self.node_positions_of(node_id)
+        return self.way_ids[self.position_way[positions]].tolist()
+
+    def node_index(self, w: int, node_id: int) -> int:
+        """Index of the first occurrence of a node in way w, or -1."""
+        start, end = self.way_span(w)
+        found = np.flatnonzero(self.position_node[start:end] == node_id)
+        return int(found[0]) if len(found) else -1
+
+    def node_location(self, node_id: int) -> Optional[Tuple[float, float]]:
+        """(lat, lon) of a node, or None if it is not in the network."""
+        positions = self.node_positions_of(node_id)
+        if len(positions) == 0:
+            return None
+        p = positions[0]
+        return float(self.lats[p]), float(self.lons[p])
+
+    def to_network(self) -> RoadNetwork:
+        """Expand into a dict-based RoadNetwork (sharing the feature dicts)."""
+        network = RoadNetwork(
+            junctions=self.junctions,
+            railway_crossings=self.railway_crossings,
+            barriers=self.barriers,
+        )
+        lats = self.lats.tolist()
+        lons = self.lons.tolist()
+        position_node = self.position_node.tolist()
+        offsets = self.way_offsets.tolist()
+        info = self.way_info
+        tags = {tag: info[tag].tolist() for tag in _STRING_TAGS + _VALUE_TAGS}
+        for tag in _STRING_TAGS:
+            tags[tag] = [self.strings[code] for code in tags[tag]]
+
+        for w, way_id in enumerate(self.way_ids.tolist()):
+            start, end = offsets[w], offsets[w + 1]
+            node_ids = position_node[start:end]
+            for p, nid in enumerate(node_ids, start):
+                if nid not in network.nodes:
+                    network.nodes[nid] = Node(nid, lats[p], lons[p])
+                network.node_to_ways.setdefault(nid, []).append(way_id)
+            network.ways[way_id] = Way(
+                way_id, node_ids, **{tag: values[w] for tag, values in tags.items()}
+            )
+        return network
+
+    def nbytes(self) -> int:
+        """Bytes held by the arrays (excludes the dicts)."""
+        return sum(
+            a.nbytes for a in (
+                self.way_ids, self.way_offsets, self.way_info, self.position_node,
+                self.lats, self.lons, self.position_way, self.node_ids,
+                self.node_offsets, self.node_positions,
+            )
+        )
+
+
+def as_compact_network(network) -> CompactRoadNetwork:
+    """Return network as a CompactRoadNetwork, converting a RoadNetwork."""
+    if isinstance(network, CompactRoadNetwork):
+        return network
+    return CompactRoadNetwork.from_network(network)
+
+
+def merge_compact_networks(
+    base: CompactRoadNetwork,
+    update: CompactRoadNetwork,
+    keep_lat: float,
+    keep_lon: float,
+    keep_radius_m: float,
+) -> CompactRoadNetwork:
+    """
+    Merge a newly loaded area into an existing network.
+
+    Array version of map_loader.merge_road_networks(): ways in base with no
+    node within keep_radius_m of (keep_lat, keep_lon) are dropped, ways in
+    update replace base ways with the same ID, and node features on the
+    kept roads are carried over (update wins where both have one). Neither
+    input is modified.
+    """
+    lat_delta = keep_radius_m / 111000
+    lon_delta = keep_radius_m / (111000 * math.cos(math.radians(keep_lat)))
+    in_box = (
+        (np.abs(base.lats - keep_lat) <= lat_delta)
+        & (np.abs(base.lons - keep_lon) <= lon_delta)
+    )
+    keep = np.zeros(base.way_count, dtype=bool)
+    keep[base.position_way[in_box]] = True
+    return _concatenate([(base, keep), (update, None)])
+
+
+def combine_compact_networks(networks: List[CompactRoadNetwork]) -> CompactRoadNetwork:
+    """
+    Join networks (e.g. neighbouring map regions) into one.
+
+    A way in a later network replaces one with the same ID in an earlier
+    network, and node features are kept for nodes on the joined roads.
+    """
+    return _concatenate([(network, None) for network in networks])
+
+
+def _concatenate(
+    parts: List[Tuple[CompactRoadNetwork, Optional[np.ndarray]]],
+) -> CompactRoadNetwork:
+    """Join (network, way mask) parts, later parts winning on duplicate IDs."""
+    if not parts:
+        return CompactRoadNetwork.empty()
+
+    codes = {"": 0}
+    way_ids, lengths, position_node, lats, lons, infos = [], [], [], [], [], []
+
+    for k, (network, keep) in enumerate(parts):
+        if keep is None:
+            keep = np.ones(network.way_count, dtype=bool)
+        later = [other.way_ids for other, _ in parts[k + 1:]]
+        if later:
+            keep = keep & ~np.isin(network.way_ids, np.concatenate(later))
+        kept_positions = keep[network.position_way]
+
+        # String codes remapped into the joined table
+        remap = np.array(
+            [codes.setdefault(s, len(codes)) for s in network.strings], dtype=np.int32
+        )
+        info = network.way_info[keep]
+        for tag in _STRING_TAGS:
+            info[tag] = remap[info[tag]]
+
+        way_ids.append(network.way_ids[keep])
+        lengths.append(np.diff(network.way_offsets)[keep])
+        position_node.append(network.position_node[kept_positions])
+        lats.append(network.lats[kept_positions])
+        lons.append(network.lons[kept_positions])
+        infos.append(info)
+
+    lengths = np.concatenate(lengths)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    merged = CompactRoadNetwork(
+        np.concatenate(way_ids),
+        offsets,
+        np.concatenate(position_node),
+        np.concatenate(lats),
+        np.concatenate(lons),
+        np.concatenate(infos),
+        list(codes),
+    )
+
+    node_ids = set(merged.node_ids.tolist())
+    for network, _ in parts:
+        for features, merged_features in (
+            (network.junctions, merged.junctions),
+            (network.railway_crossings, merged.railway_crossings),
+            (network.barriers, merged.barriers),
+        ):
+            for nid, feature in features.items():
+                if nid in node_ids:
+                    merged_features[nid] = feature
+
+    return merged
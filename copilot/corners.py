@@ -10,12 +10,14 @@ Ported from lap-timing-system - uses 5-phase algorithm:
 """
 
 import math
+from bisect import bisect_left
 from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Tuple
 
-from .geometry import haversine_distance, calculate_curvature, cumulative_distances
+from .geometry import haversine_distance, _get_lat_lon
 from config import COPILOT_CORNER_MIN_ANGLE_DEG, COPILOT_CORNER_MIN_RADIUS_M
+from utils import geometry_kernels as gk
 
 
 class Direction(Enum):
@@ -115,6 +117,12 @@ class Segment:
     direction: Optional[str]
 
 
+def _lat_lon_arrays(points: List) -> Tuple[List[float], List[float]]:
+    """Split (lat, lon) tuples or PathPoint-like objects into lat and lon lists."""
+    coords = [_get_lat_lon(p) for p in points]
+    return [c[0] for c in coords], [c[1] for c in coords]
+
+
 class CornerDetector:
     """
     Detect corners using ASC (Automated Segmentation based on Curvature).
@@ -199,6 +207,8 @@ class CornerDetector:
         self,
         points: List[Tuple[float, float]],
         start_distance: float = 0.0,
+        curvatures: Optional[List[float]] = None,
+        distances: Optional[List[float]] = None,
     ) -> List[Corner]:
         """
         Detect all corners in a path using ASC algorithm.
@@ -206,6 +216,10 @@ class CornerDetector:
         Args:
             points: List of (lat, lon) points along the projected path
             start_distance: Distance offset for the first point
+            curvatures: Precomputed curvature at each point, e.g. cached
+                        across cycles by PathProjector.project_path_incremental
+            distances: Precomputed cumulative distance of each point from
+                       the first (start_distance is still added)
 
         Returns:
             List of detected corners with distances from path start
@@ -214,11 +228,15 @@ class CornerDetector:
             return []
 
         # Calculate curvature at each point
-        curvatures = self._calculate_curvatures(points)
+        if curvatures is None:
+            curvatures = self._calculate_curvatures(points)
 
         # Calculate cumulative distances
-        distances = cumulative_distances(points)
-        distances = [d + start_distance for d in distances]
+        if distances is None:
+            lats, lons = _lat_lon_arrays(points)
+            distances = (gk.cumulative_distances(lats, lons) + start_distance).tolist()
+        else:
+            distances = [d + start_distance for d in distances]
 
         # ASC 5-phase algorithm
         cuts = self._phase1_peak_detection(curvatures)
@@ -246,15 +264,12 @@ class CornerDetector:
     def _calculate_curvatures(
         self, points: List[Tuple[float, float]]
     ) -> List[float]:
-        """Calculate curvature at each point using three-point method."""
-        curvatures = [0.0]  # First point has no curvature
-
-        for i in range(1, len(points) - 1):
-            curv = calculate_curvature(points[i - 1], points[i], points[i + 1])
-            curvatures.append(curv)
+        """Calculate curvature at each point using three-point method.
 
-        curvatures.append(0.0)  # Last point has no curvature
-        return curvatures
+        End points have no curvature (0.0).
+        """
+        lats, lons = _lat_lon_arrays(points)
+        return gk.curvature(lats, lons).tolist()
 
     def _phase1_peak_detection(self, curvatures: List[float]) -> List[int]:
         """
@@ -432,17 +447,17 @@ class CornerDetector:
     def _find_index_at_distance(
         self, distances: List[float], target_distance: float
     ) -> Optional[int]:
-        """Find index closest to target distance."""
-        best_idx = None
-        best_diff = float('inf')
-
-        for i, dist in enumerate(distances):
-            diff = abs(dist - target_distance)
-            if diff < best_diff:
-                best_diff = diff
-                best_idx = i
-
-        return best_idx
+        """Find index closest to target distance (first one on a tie)."""
+        if not distances:
+            return None
+
+        # Distances are cumulative, so binary search
+        idx = bisect_left(distances, target_distance)
+        if idx == len(distances):
+            idx -= 1
+        elif idx > 0 and target_distance - distances[idx - 1] <= distances[idx] - target_distance:
+            idx -= 1
+        return bisect_left(distances, distances[idx])
 
     def _create_segments(
         self,
@@ -1,9 +1,10 @@
-"""Load road network from OSM PBF file or SQLite cache.
+"""Load road network from OSM PBF file, SQLite cache or mapped road tiles.
 
-Supports three storage backends:
+Supports four storage backends:
 1. SQLite cache (.roads.db) - Preferred, scalable, fast spatial queries
-2. Pickle cache (.roads.pkl) - Legacy, loads entire region into memory
-3. OSM PBF file (.osm.pbf) - Source format, auto-converted to cache
+2. Road tile (.roads.tile) - Memory-mapped arrays, read in place (see map_tiles)
+3. Pickle cache (.roads.pkl) - Legacy, loads entire region into memory
+4. OSM PBF file (.osm.pbf) - Source format, auto-converted to cache
 
 For large regions (country/county level), use SQLite which:
 - Streams PBF import without loading everything in RAM
@@ -14,7 +15,6 @@ For large regions (country/county level), use SQLite which:
 import math
 import os
 import pickle
-from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
@@ -24,86 +24,72 @@ try:
 except ImportError:
     OSMIUM_AVAILABLE = False
 
+from .compact_network import CompactRoadNetwork, combine_compact_networks
 from .geometry import haversine_distance, bearing
+from .map_tiles import TILE_SUFFIX, MappedTile, read_tile_bounds, tile_region_name, write_tile
+from .road_network import Barrier, Junction, Node, RailwayCrossing, RoadNetwork, Way
 from .sqlite_cache import SQLiteMapCache, RoadNetwork as SQLiteRoadNetwork
 
 
-@dataclass
-class Node:
-    """OSM node with coordinates."""
-    id: int
-    lat: float
-    lon: float
-
-
-@dataclass
-class Way:
-    """OSM way representing a road segment."""
-    id: int
-    nodes: List[int]  # Node IDs in order
-    name: str = ""
-    highway_type: str = ""
-    oneway: bool = False
-    speed_limit: int = 0  # km/h, 0 if unknown
-    bridge: bool = False
-    tunnel: bool = False
-    surface: str = ""  # asphalt, gravel, concrete, etc.
-    ford: bool = False
-    traffic_calming: str = ""  # bump, hump, table, etc.
-    width: float = 0.0  # Road width in meters, 0 if unknown
-    narrow: bool = False  # Explicit narrow tag
-
-
-@dataclass
-class Junction:
-    """A junction where roads meet."""
-    node_id: int
-    lat: float
-    lon: float
-    connected_ways: List[int]  # Way IDs that meet here
-    is_t_junction: bool = False
-
-
-@dataclass
-class RailwayCrossing:
-    """A railway level crossing."""
-    node_id: int
-    lat: float
-    lon: float
-
-
-@dataclass
-class Barrier:
-    """A barrier on the road (cattle grid, gate, etc.)."""
-    node_id: int
-    lat: float
-    lon: float
-    barrier_type: str  # cattle_grid, gate, etc.
-
-
-@dataclass
-class RoadNetwork:
-    """Cached road network for a geographic area."""
-    nodes: Dict[int, Node] = field(default_factory=dict)
-    ways: Dict[int, Way] = field(default_factory=dict)
-    junctions: Dict[int, Junction] = field(default_factory=dict)
-    # Node ID -> list of Way IDs that contain this node
-    node_to_ways: Dict[int, List[int]] = field(default_factory=dict)
-    # Railway level crossings
-    railway_crossings: Dict[int, RailwayCrossing] = field(default_factory=dict)
-    # Barriers (cattle grids, gates, etc.)
-    barriers: Dict[int, Barrier] = field(default_factory=dict)
-
-    def get_way_geometry(self, way_id: int) -> List[Tuple[float, float]]:
-        """Get list of (lat, lon) points for a way."""
-        way = self.ways.get(way_id)
-        if not way:
-            return []
-        return [
-            (self.nodes[nid].lat, self.nodes[nid].lon)
-            for nid in way.nodes
-            if nid in self.nodes
-        ]
+def merge_road_networks(
+    base: RoadNetwork,
+    update: RoadNetwork,
+    keep_lat: float,
+    keep_lon: float,
+    keep_radius_m: float,
+) -> RoadNetwork:
+    """
+    Merge a newly loaded area into an existing network.
+
+    Roads from the update are added alongside the roads already loaded, so
+    the path ahead stays connected across load boundaries. Roads in base
+    with no node within keep_radius_m of (keep_lat, keep_lon) are dropped
+    to bound memory. Neither input is modified (loaded networks may be
+    shared with the MapLoader caches).
+
+    Returns:
+        New merged RoadNetwork
+    """
+    lat_delta = keep_radius_m / 111000
+    lon_delta = keep_radius_m / (111000 * math.cos(math.radians(keep_lat)))
+    min_lat, max_lat = keep_lat - lat_delta, keep_lat + lat_delta
+    min_lon, max_lon = keep_lon - lon_delta, keep_lon + lon_delta
+
+    def in_keep_area(nid: int) -> bool:
+        node = base.nodes.get(nid)
+        return (
+            node is not None
+            and min_lat <= node.lat <= max_lat
+            and min_lon <= node.lon <= max_lon
+        )
+
+    merged = RoadNetwork()
+    for wid, way in base.ways.items():
+        if wid not in update.ways and any(in_keep_area(nid) for nid in way.nodes):
+            merged.ways[wid] = way
+    merged.ways.update(update.ways)
+
+    # Nodes and node-to-way index for the kept ways
+    for wid, way in merged.ways.items():
+        for nid in way.nodes:
+            node = update.nodes.get(nid) or base.nodes.get(nid)
+            if node is not None:
+                merged.nodes[nid] = node
+            merged.node_to_ways.setdefault(nid, []).append(wid)
+
+    # Node features on kept roads (update wins where both have one)
+    for source in (base, update):
+        for nid, junction in source.junctions.items():
+            if nid in merged.node_to_ways:
+                merged.junctions[nid] = junction
+        for nid, crossing in source.railway_crossings.items():
+            if nid in merged.node_to_ways:
+                merged.railway_crossings[nid] = crossing
+        for nid, barrier in source.barriers.items():
+            if nid in merged.node_to_ways:
+                merged.barriers[nid] = barrier
+
+    return merged
 
 
 class PBFRoadHandler(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
@@ -233,15 +219,18 @@ class PBFRoadHandler(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
 
 
 class MapLoader:
-    """Load and query road network from SQLite cache, pickle cache, or OSM PBF file.
+    """Load and query road network from SQLite cache, road tiles, pickle cache, or OSM PBF file.
 
     Supports multiple modes:
     1. SQLite (.roads.db) - Preferred for large regions, efficient spatial queries
-    2. Pickle (.roads.pkl) - Legacy format, loads entire region into memory
-    3. PBF source (.osm.pbf) - Auto-converted to SQLite cache on first use
-    4. Multi-region: Directory with multiple .roads.db files (boundary preloading)
+    2. Road tile (.roads.tile) - Memory-mapped, only the area queried is read
+    3. Pickle (.roads.pkl) - Legacy format, loads entire region into memory
+    4. PBF source (.osm.pbf) - Auto-converted to SQLite cache on first use
+    5. Multi-region: Directory with multiple .roads.db or .roads.tile files
+       (boundary preloading)
 
     For new deployments, use generate_cache.py to create SQLite caches.
+    Convert legacy pickles with tools/convert_map_tiles.py.
     """
 
     # Tile settings (for legacy pickle mode)
@@ -259,6 +248,7 @@ class MapLoader:
         self.map_path = Path(map_path)
         self._prefer_sqlite = prefer_sqlite
         self._pkl_file: Optional[Path] = None
+        self._tile_file: Optional[Path] = None
         self._pbf_file: Optional[Path] = None
         self._db_file: Optional[Path] = None
         self._sqlite_cache: Optional[SQLiteMapCache] = None
@@ -273,34 +263,44 @@ class MapLoader:
         self._tile_cache: Dict[str, RoadNetwork] = {}  # tile_name -> network
         self._tile_access_order: List[str] = []  # LRU tracking
         self._sqlite_caches: Dict[str, SQLiteMapCache] = {}  # region -> cache
+        self._use_mapped_tiles = False
+        self._tile_paths: Dict[str, Path] = {}  # region -> .roads.tile
+        self._mapped_tiles: Dict[str, MappedTile] = {}  # region -> opened tile
+        self._mapped_tile: Optional[MappedTile] = None  # Single tile file
 
         # Find map files
         self._find_map_files()
 
     def _find_map_files(self) -> None:
-        """Find SQLite cache, pickle cache, and/or PBF file, or detect multi-file mode."""
+        """Find SQLite cache, road tiles, pickle cache, and/or PBF file, or detect multi-file mode."""
         if self.map_path.is_dir():
             # Look for cache files
             dbs = list(self.map_path.glob("*.roads.db"))
+            tiles = list(self.map_path.glob(f"*{TILE_SUFFIX}"))
             pkls = list(self.map_path.glob("*.roads.pkl"))
             pbfs = list(self.map_path.glob("*.osm.pbf"))
 
-            if len(dbs) > 1 or len(pkls) > 1:
+            if len(dbs) > 1 or len(tiles) > 1 or len(pkls) > 1:
                 # Multi-file mode: multiple county/region caches
                 self._tile_mode = True
                 self._tile_dir = self.map_path
-                cache_count = max(len(dbs), len(pkls))
+                cache_count = max(len(dbs), len(tiles), len(pkls))
                 print(f"  Multi-region mode: found {cache_count} map files")
-                # Build bounds index (prefer SQLite)
+                # Build bounds index (prefer SQLite, then road tiles)
                 if dbs:
                     self._build_sqlite_region_index(dbs)
+                elif tiles:
+                    self._build_tile_region_index(tiles)
                 else:
+                    print("  Legacy pickle maps: convert with tools/convert_map_tiles.py")
                     self._build_region_index(pkls)
                 return
 
             # Single file mode
             if dbs and self._prefer_sqlite:
                 self._db_file = dbs[0]
+            elif tiles:
+                self._tile_file = tiles[0]
             elif pkls:
                 self._pkl_file = pkls[0]
             elif dbs:
@@ -311,15 +311,20 @@ class MapLoader:
             # Specific file provided
             if str(self.map_path).endswith(".roads.db"):
                 self._db_file = self.map_path
+            elif str(self.map_path).endswith(TILE_SUFFIX):
+                self._tile_file = self.map_path
             elif self.map_path.suffix == ".pkl" or str(self.map_path).endswith(".roads.pkl"):
                 self._pkl_file = self.map_path
             elif self.map_path.suffix == ".pbf":
                 self._pbf_file = self.map_path
                 # Check for matching caches (prefer SQLite)
                 db_path = Path(str(self.map_path).replace(".osm.pbf", ".roads.db"))
+                tile_path = Path(str(self.map_path).replace(".osm.pbf", TILE_SUFFIX))
                 pkl_path = Path(str(self.map_path).replace(".osm.pbf", ".roads.pkl"))
                 if db_path.exists() and self._prefer_sqlite:
                     self._db_file = db_path
+                elif tile_path.exists():
+                    self._tile_file = tile_path
                 elif pkl_path.exists():
                     self._pkl_file = pkl_path
                 elif db_path.exists():
@@ -348,6 +353,21 @@ class MapLoader:
 
         print(f"  Indexed {len(self._region_bounds)} regions")
 
+    def _build_tile_region_index(self, tile_files: List[Path]) -> None:
+        """Build index of region bounds from road tile headers (no map data is read)."""
+        self._region_bounds: Dict[str, Tuple[float, float, float, float]] = {}
+        self._use_mapped_tiles = True
+
+        for tile_path in tile_files:
+            try:
+                region_name = tile_region_name(tile_path)
+                self._region_bounds[region_name] = read_tile_bounds(tile_path)
+                self._tile_paths[region_name] = tile_path
+            except (OSError, ValueError) as e:
+                print(f"    Warning: {tile_path.name}: {e}")
+
+        print(f"  Indexed {len(self._region_bounds)} regions")
+
     def _build_region_index(self, pkl_files: List[Path]) -> None:
         """Build or load index of region bounds."""
         self._region_bounds: Dict[str, Tuple[float, float, float, float]] = {}
@@ -617,6 +637,44 @@ class MapLoader:
         print(f"  Loaded {len(merged.ways)} roads from {len(needed_regions)} region(s)")
         return merged
 
+    def _get_mapped_tile(self, region_name: str) -> Optional[MappedTile]:
+        """Open a road tile on first use; mapped tiles stay open (the OS pages them)."""
+        tile = self._mapped_tiles.get(region_name)
+        if tile is None:
+            path = self._tile_paths.get(region_name)
+            if path is None:
+                return None
+            tile = self._mapped_tiles[region_name] = MappedTile(path)
+        return tile
+
+    def _load_around_mapped(
+        self, lat: float, lon: float, radius_m: float
+    ) -> CompactRoadNetwork:
+        """Load road network from memory-mapped road tiles around a point."""
+        if self._tile_mode:
+            needed_regions = self._find_regions_for_position(lat, lon)
+            if not needed_regions:
+                print(f"  Warning: No region contains {lat:.2f}, {lon:.2f}")
+                return CompactRoadNetwork.empty()
+            tiles = [self._get_mapped_tile(name) for name in needed_regions]
+        else:
+            if self._mapped_tile is None:
+                self._mapped_tile = MappedTile(self._tile_file)
+            tiles = [self._mapped_tile]
+
+        networks = [tile.load_region(lat, lon, radius_m) for tile in tiles if tile]
+        network = combine_compact_networks(networks)
+        print(f"  Loaded {network.way_count} roads from {len(networks)} region(s)")
+        return network
+
+    def _uses_mapped_tiles(self) -> bool:
+        """Whether queries are answered from memory-mapped road tiles."""
+        if self._tile_mode:
+            return self._use_mapped_tiles
+        return not (self._db_file and self._db_file.exists()) and bool(
+            self._tile_file and self._tile_file.exists()
+        )
+
     def _get_full_network(self) -> RoadNetwork:
         """Get the full road network, loading from cache or PBF.
 
@@ -687,15 +745,14 @@ class MapLoader:
 
         self._full_network = self._extract_all_roads()
 
-        # Save to pickle cache (alongside PBF)
-        cache_file = Path(str(self._pbf_file).replace(".osm.pbf", ".roads.pkl"))
+        # Save as a road tile (alongside PBF)
+        cache_file = Path(str(self._pbf_file).replace(".osm.pbf", TILE_SUFFIX))
         try:
             print(f"  Saving cache to {cache_file.name}...")
-            with open(cache_file, "wb") as f:
-                pickle.dump(self._full_network, f)
+            write_tile(cache_file, self._full_network)
             size_mb = os.path.getsize(cache_file) / 1024 / 1024
             print(f"  Cache saved ({size_mb:.1f} MB)")
-            self._pkl_file = cache_file
+            self._tile_file = cache_file
         except Exception as e:
             print(f"  Warning: Could not save cache: {e}")
 
@@ -833,6 +890,14 @@ class MapLoader:
         if self._tile_mode and hasattr(self, '_use_sqlite_regions') and self._use_sqlite_regions:
             return self._load_around_sqlite_regions(lat, lon, radius_m)
 
+        # Memory-mapped road tiles (single or multi-region)
+        if self._uses_mapped_tiles():
+            network = self._load_around_mapped(lat, lon, radius_m).to_network()
+            self._query_cache = network
+            self._query_cache_center = (lat, lon)
+            self._query_cache_radius = radius_m
+            return network
+
         # Tile mode with pickle (legacy)
         if self._tile_mode:
             return self._load_around_tiles(lat, lon, radius_m)
@@ -903,6 +968,22 @@ class MapLoader:
 
         return network
 
+    def load_around_compact(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float = 2000
+    ) -> CompactRoadNetwork:
+        """
+        Load road network around a point as a CompactRoadNetwork.
+
+        Road tiles are read straight into arrays; other backends load a
+        RoadNetwork (using the load_around() cache) and convert it.
+        """
+        if self._uses_mapped_tiles():
+            return self._load_around_mapped(lat, lon, radius_m)
+        return CompactRoadNetwork.from_network(self.load_around(lat, lon, radius_m))
+
     def _is_t_junction(
         self,
         node_id: int,
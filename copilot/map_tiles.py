@@ -0,0 +1,370 @@
+"""Memory-mapped road tiles (.roads.tile).
+
+A tile holds the roads of one map region as raw little-endian arrays after
+a fixed-size header, so it can be mapped read-only and queried in place:
+
+    header      magic, version, region bounds, way index grid, and the
+                (offset, count) of each section
+    ways        way_ids, way_offsets, way_info
+    positions   position_node, lats, lons (CSR layout as CompactRoadNetwork)
+    way index   cell_offsets, cell_ways: for each grid cell, row by row,
+                the ways whose bounding box touches it
+    strings     string_offsets, string_data (UTF-8, "" is string 0)
+    features    junctions (with junction_way_offsets, junction_ways),
+                railway_crossings and barriers, sorted by node ID
+
+read_tile_bounds() reads only the header, so indexing a directory of tiles
+costs the same whatever their size. MappedTile.load_region() touches only
+the grid cells, ways and features around the query point.
+
+Usage:
+    write_tile(Path("region.roads.tile"), network)
+    tile = MappedTile(Path("region.roads.tile"))
+    network = tile.load_region(lat, lon, radius_m=2000)
+"""
+
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .compact_network import WAY_INFO_DTYPE, CompactRoadNetwork, as_compact_network
+from .road_network import Barrier, Junction, RailwayCrossing
+
+TILE_SUFFIX = ".roads.tile"
+TILE_MAGIC = b"OTPTROAD"
+TILE_VERSION = 1
+TILE_CELL_DEG = 0.01  # Way index grid cell (about 1km)
+
+_JUNCTION_DTYPE = np.dtype([
+    ("node_id", "<i8"), ("lat", "<f8"), ("lon", "<f8"), ("is_t_junction", "u1"),
+])
+_CROSSING_DTYPE = np.dtype([("node_id", "<i8"), ("lat", "<f8"), ("lon", "<f8")])
+_BARRIER_DTYPE = np.dtype([
+    ("node_id", "<i8"), ("lat", "<f8"), ("lon", "<f8"), ("barrier_type", "<i4"),
+])
+
+# Sections in file order
+_SECTIONS = (
+    ("way_ids", np.dtype("<i8")),
+    ("way_offsets", np.dtype("<i8")),
+    ("way_info", WAY_INFO_DTYPE.newbyteorder("<")),
+    ("position_node", np.dtype("<i8")),
+    ("lats", np.dtype("<f8")),
+    ("lons", np.dtype("<f8")),
+    ("cell_offsets", np.dtype("<i8")),
+    ("cell_ways", np.dtype("<i4")),
+    ("string_offsets", np.dtype("<i8")),
+    ("string_data", np.dtype("u1")),
+    ("junctions", _JUNCTION_DTYPE),
+    ("junction_way_offsets", np.dtype("<i8")),
+    ("junction_ways", np.dtype("<i8")),
+    ("railway_crossings", _CROSSING_DTYPE),
+    ("barriers", _BARRIER_DTYPE),
+)
+
+# magic, version, section count, bounds (min_lat, min_lon, max_lat, max_lon),
+# grid (origin lat, origin lon, cell size, rows, cols), (offset, count) per section
+_HEADER = struct.Struct("<8sII4d3d2I" + "QQ" * len(_SECTIONS))
+
+
+def tile_region_name(path: Path) -> str:
+    """Region name of a tile file (file name without .roads.tile)."""
+    return path.name[:-len(TILE_SUFFIX)] if path.name.endswith(TILE_SUFFIX) else path.stem
+
+
+def _parse_header(data: bytes) -> tuple:
+    """Unpack and check a tile header."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a road tile: file too short")
+    fields = _HEADER.unpack_from(data)
+    magic, version, section_count = fields[:3]
+    if magic != TILE_MAGIC:
+        raise ValueError("Not a road tile: bad magic")
+    if version != TILE_VERSION or section_count != len(_SECTIONS):
+        raise ValueError(f"Unsupported road tile version {version}")
+    return fields
+
+
+def read_tile_bounds(path: Path) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) of a tile, read from its header only."""
+    with open(path, "rb") as f:
+        fields = _parse_header(f.read(_HEADER.size))
+    return tuple(fields[3:7])
+
+
+def _expand(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions in the ranges [starts[i], ends[i]), concatenated.
+
+    Returns:
+        (positions, owner) where owner is the range index of each position
+    """
+    lengths = ends - starts
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    first = np.cumsum(lengths) - lengths
+    positions = np.arange(int(lengths.sum())) - np.repeat(first - starts, lengths)
+    return positions, owner
+
+
+def write_tile(path: Path, network) -> None:
+    """
+    Write a road network (RoadNetwork or CompactRoadNetwork) as a tile.
+
+    The file is written alongside and renamed into place, so a reader
+    never sees a partial tile.
+    """
+    compact = as_compact_network(network)
+    lats, lons = compact.lats, compact.lons
+    if len(lats):
+        bounds = (float(lats.min()), float(lons.min()), float(lats.max()), float(lons.max()))
+    else:
+        bounds = (0.0, 0.0, 0.0, 0.0)
+    rows = int((bounds[2] - bounds[0]) // TILE_CELL_DEG) + 1
+    cols = int((bounds[3] - bounds[1]) // TILE_CELL_DEG) + 1
+
+    # Way index: each way is listed in every cell its bounding box touches
+    offsets = compact.way_offsets
+    ways = np.flatnonzero(np.diff(offsets) > 0)
+    cells = owner = np.zeros(0, dtype=np.int64)
+    if len(ways):
+        starts = offsets[ways]  # Empty ways are skipped, so reduceat spans one way each
+
+        def cell(values, origin):
+            return ((values - origin) // TILE_CELL_DEG).astype(np.int64)
+
+        r0 = cell(np.minimum.reduceat(lats, starts), bounds[0])
+        r1 = cell(np.maximum.reduceat(lats, starts), bounds[0])
+        c0 = cell(np.minimum.reduceat(lons, starts), bounds[1])
+        c1 = cell(np.maximum.reduceat(lons, starts), bounds[1])
+        span = c1 - c0 + 1
+        k, owner = _expand(np.zeros(len(ways), dtype=np.int64), (r1 - r0 + 1) * span)
+        cells = (r0[owner] + k // span[owner]) * cols + c0[owner] + k % span[owner]
+    order = np.argsort(cells, kind="stable")
+    cell_ways = ways[owner[order]]
+    cell_offsets = np.searchsorted(cells[order], np.arange(rows * cols + 1))
+
+    # Strings, with barrier types added to the way tag strings
+    strings = list(compact.strings)
+    codes = {s: i for i, s in enumerate(strings)}
+    barrier_items = sorted(compact.barriers.items())
+    barrier_codes = [codes.setdefault(b.barrier_type, len(codes)) for _, b in barrier_items]
+    strings = list(codes)
+    encoded = [s.encode("utf-8") for s in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=string_offsets[1:])
+
+    junction_items = sorted(compact.junctions.items())
+    junctions = np.array(
+        [(nid, j.lat, j.lon, j.is_t_junction) for nid, j in junction_items],
+        dtype=_JUNCTION_DTYPE,
+    )
+    junction_way_offsets = np.zeros(len(junction_items) + 1, dtype=np.int64)
+    np.cumsum([len(j.connected_ways) for _, j in junction_items], out=junction_way_offsets[1:])
+    junction_ways = np.array(
+        [w for _, j in junction_items for w in j.connected_ways], dtype=np.int64
+    )
+    crossings = np.array(
+        [(nid, c.lat, c.lon) for nid, c in sorted(compact.railway_crossings.items())],
+        dtype=_CROSSING_DTYPE,
+    )
+    barriers = np.array(
+        [(nid, b.lat, b.lon, code) for (nid, b), code in zip(barrier_items, barrier_codes)],
+        dtype=_BARRIER_DTYPE,
+    )
+
+    arrays = {
+        "way_ids": compact.way_ids,
+        "way_offsets": offsets,
+        "way_info": compact.way_info,
+        "position_node": compact.position_node,
+        "lats": lats,
+        "lons": lons,
+        "cell_offsets": cell_offsets,
+        "cell_ways": cell_ways,
+        "string_offsets": string_offsets,
+        "string_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "junctions": junctions,
+        "junction_way_offsets": junction_way_offsets,
+        "junction_ways": junction_ways,
+        "railway_crossings": crossings,
+        "barriers": barriers,
+    }
+
+    # Lay out sections after the header, 8-byte aligned
+    blobs = []
+    table = []
+    offset = _HEADER.size
+    for name, dtype in _SECTIONS:
+        data = np.ascontiguousarray(arrays[name], dtype=dtype).tobytes()
+        offset += -offset % 8
+        table.extend((offset, len(arrays[name])))
+        blobs.append((offset, data))
+        offset += len(data)
+
+    header = _HEADER.pack(
+        TILE_MAGIC, TILE_VERSION, len(_SECTIONS), *bounds,
+        bounds[0], bounds[1], TILE_CELL_DEG, rows, cols, *table,
+    )
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for start, data in blobs:
+            f.write(b"\0" * (start - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class MappedTile:
+    """
+    A road tile mapped read-only.
+
+    Opening a tile reads only its header; the arrays are views into the
+    mapping, paged in by the OS as load_region() touches them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _parse_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+
+        self.bounds: Tuple[float, float, float, float] = tuple(fields[3:7])
+        self._grid_lat, self._grid_lon, self._cell_deg = fields[7:10]
+        self._rows, self._cols = fields[10:12]
+        table = fields[12:]
+        self._arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(self._mmap, dtype=dtype, count=table[2 * i + 1], offset=table[2 * i])
+            for i, (name, dtype) in enumerate(_SECTIONS)
+        }
+
+    def close(self) -> None:
+        """Unmap the file. Networks already loaded stay valid (they are copies)."""
+        self._arrays = {}
+        self._mmap.close()
+
+    @property
+    def way_count(self) -> int:
+        return len(self._arrays["way_ids"])
+
+    def _strings(self, codes: np.ndarray) -> List[str]:
+        """Decode the given string codes."""
+        offsets = self._arrays["string_offsets"]
+        data = self._arrays["string_data"]
+        return [
+            data[offsets[code]:offsets[code + 1]].tobytes().decode("utf-8")
+            for code in codes.tolist()
+        ]
+
+    def _candidate_ways(self, min_lat, min_lon, max_lat, max_lon) -> np.ndarray:
+        """Ways listed in the grid cells covering a box."""
+        r0 = max(0, math.floor((min_lat - self._grid_lat) / self._cell_deg))
+        r1 = min(self._rows - 1, math.floor((max_lat - self._grid_lat) / self._cell_deg))
+        c0 = max(0, math.floor((min_lon - self._grid_lon) / self._cell_deg))
+        c1 = min(self._cols - 1, math.floor((max_lon - self._grid_lon) / self._cell_deg))
+        if r0 > r1 or c0 > c1:
+            return np.zeros(0, dtype=np.int64)
+
+        cell_offsets = self._arrays["cell_offsets"]
+        cell_ways = self._arrays["cell_ways"]
+        # Cells of one grid row are contiguous in cell_ways
+        chunks = [
+            cell_ways[cell_offsets[r * self._cols + c0]:cell_offsets[r * self._cols + c1 + 1]]
+            for r in range(r0, r1 + 1)
+        ]
+        return np.unique(np.concatenate(chunks)).astype(np.int64)
+
+    def load_region(self, lat: float, lon: float, radius_m: float) -> CompactRoadNetwork:
+        """
+        Load roads with a node within radius_m of a point (bounding box).
+
+        As the other MapLoader backends, ways are loaded with all their
+        nodes, junctions where at least two loaded ways meet, and the
+        railway crossings and barriers on the loaded roads.
+        """
+        lat_delta = radius_m / 111000
+        lon_delta = radius_m / (111000 * math.cos(math.radians(lat)))
+        min_lat, max_lat = lat - lat_delta, lat + lat_delta
+        min_lon, max_lon = lon - lon_delta, lon + lon_delta
+        a = self._arrays
+
+        candidates = self._candidate_ways(min_lat, min_lon, max_lat, max_lon)
+        way_offsets = a["way_offsets"]
+        positions, owner = _expand(way_offsets[candidates], way_offsets[candidates + 1])
+        plat = a["lats"][positions]
+        plon = a["lons"][positions]
+        in_box = (plat >= min_lat) & (plat <= max_lat) & (plon >= min_lon) & (plon <= max_lon)
+        hit = np.zeros(len(candidates), dtype=bool)
+        hit[owner[in_box]] = True
+        if not hit.any():
+            return CompactRoadNetwork.empty()
+
+        ways = candidates[hit]
+        kept = hit[owner]
+        positions = positions[kept]
+        offsets = np.zeros(len(ways) + 1, dtype=np.int64)
+        np.cumsum(way_offsets[ways + 1] - way_offsets[ways], out=offsets[1:])
+
+        # Re-code the strings used by these ways
+        info = a["way_info"][ways].astype(WAY_INFO_DTYPE)
+        tags = ("name", "highway_type", "surface", "traffic_calming")
+        used = np.union1d([0], np.concatenate([info[tag] for tag in tags]))
+        for tag in tags:
+            info[tag] = np.searchsorted(used, info[tag])
+
+        network = CompactRoadNetwork(
+            a["way_ids"][ways], offsets, a["position_node"][positions],
+            plat[kept], plon[kept], info, self._strings(used),
+        )
+        self._add_features(network)
+        return network
+
+    def _add_features(self, network: CompactRoadNetwork) -> None:
+        """Fill in the junctions, crossings and barriers of a loaded network."""
+        a = self._arrays
+        node_ids = network.node_ids
+
+        def matches(table, ids):
+            """Rows of a node-sorted table for the given node IDs."""
+            column = table["node_id"]
+            rows = np.searchsorted(column, ids)
+            found = rows < len(column)
+            rows, ids = rows[found], ids[found]
+            return rows[column[rows] == ids]
+
+        junctions = a["junctions"]
+        way_offsets = a["junction_way_offsets"]
+        way_ids = a["junction_ways"]
+        shared = node_ids[np.diff(network.node_offsets) >= 2]
+        for row in matches(junctions, shared).tolist():
+            j = junctions[row]
+            nid = int(j["node_id"])
+            network.junctions[nid] = Junction(
+                node_id=nid,
+                lat=float(j["lat"]),
+                lon=float(j["lon"]),
+                connected_ways=way_ids[way_offsets[row]:way_offsets[row + 1]].tolist(),
+                is_t_junction=bool(j["is_t_junction"]),
+            )
+
+        crossings = a["railway_crossings"]
+        for row in matches(crossings, node_ids).tolist():
+            c = crossings[row]
+            nid = int(c["node_id"])
+            network.railway_crossings[nid] = RailwayCrossing(nid, float(c["lat"]), float(c["lon"]))
+
+        barriers = a["barriers"]
+        rows = matches(barriers, node_ids)
+        types = self._strings(barriers["barrier_type"][rows])
+        for row, barrier_type in zip(rows.tolist(), types):
+            b = barriers[row]
+            nid = int(b["node_id"])
+            network.barriers[nid] = Barrier(nid, float(b["lat"]), float(b["lon"]), barrier_type)
@@ -857,3 +857,47 @@ class PacenoteGenerator:
             priority=4,  # Informational but important
             unique_key=unique_key,
         )
+
+    @classmethod
+    def vocabulary(cls) -> List[str]:
+        """
+        Every phrase a pacenote is built from, in speaking order.
+
+        Pacenote texts are these phrases joined with spaces, so speech
+        rendered per phrase (see split_phrases) covers every callout.
+        """
+        phrases = [call for _, call in cls.DISTANCE_CALLS]
+        for direction in (Direction.LEFT.value, Direction.RIGHT.value):
+            phrases.extend(f"{direction} {severity}" for severity in cls.SEVERITY_NAMES[2:7])
+            phrases.extend(f"{kind} {direction}" for kind in ("hairpin", "flat", "square", "junction"))
+        phrases.extend(["chicane left right", "chicane right left"])
+        phrases.extend(["tightens", "opens", "long", "into"])
+        phrases.extend([
+            "junction", "over bridge", "tunnel", "over rails", "water",
+            "bump", "bumps", "cattle grid", "gate", "narrows",
+        ])
+        phrases.extend(f"onto {surface}" for surface in dict.fromkeys(cls.SURFACE_CALLOUTS.values()))
+        return phrases
+
+    @classmethod
+    def split_phrases(cls, text: str) -> Optional[List[str]]:
+        """
+        Split pacenote text into vocabulary phrases, longest match first.
+
+        Returns None if any part of the text is not in the vocabulary.
+        """
+        vocabulary = set(cls.vocabulary())
+        longest = max(len(phrase.split()) for phrase in vocabulary)
+        words = text.split()
+        phrases = []
+        i = 0
+        while i < len(words):
+            for length in range(min(longest, len(words) - i), 0, -1):
+                phrase = " ".join(words[i:i + length])
+                if phrase in vocabulary:
+                    phrases.append(phrase)
+                    i += length
+                    break
+            else:
+                return None
+        return phrases
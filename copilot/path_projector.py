@@ -1,21 +1,26 @@
 """Project path ahead based on current position and heading."""
 
 import math
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from .geometry import (
     haversine_distance,
     bearing,
     angle_difference,
-    closest_point_on_segment,
+    calculate_curvature,
     cumulative_distances,
 )
-from .map_loader import RoadNetwork, Junction, Way
+from .compact_network import CompactRoadNetwork, as_compact_network
+from .map_loader import Junction
+from utils import geometry_kernels as gk
 from config import (
     COPILOT_HEADING_TOLERANCE_DEG,
     COPILOT_LOOKAHEAD_M,
     COPILOT_ROAD_SEARCH_RADIUS_M,
+    COPILOT_WAY_CONTINUITY_BONUS_M,
 )
 
 
@@ -43,6 +48,8 @@ class ProjectedPath:
     barriers: List["BarrierInfo"] = field(default_factory=list)
     narrows: List["NarrowInfo"] = field(default_factory=list)
     total_distance: float = 0.0
+    # Curvature at each point (set by project_path_incremental)
+    curvatures: Optional[List[float]] = None
 
 
 @dataclass
@@ -135,16 +142,133 @@ class NarrowInfo:
     width: float  # Road width in meters, 0 if just tagged narrow
 
 
+class SegmentIndex:
+    """
+    Uniform grid over every way segment of a road network.
+
+    Segments are projected once into a local metric frame (same scale
+    factors as closest_point_on_segment) and bucketed into square cells.
+    A query only tests the segments in the cells around the point, so the
+    cost depends on local road density rather than network size.
+    """
+
+    def __init__(self, network, cell_size: float = COPILOT_ROAD_SEARCH_RADIUS_M):
+        network = as_compact_network(network)
+        self.cell_size = cell_size
+
+        # A segment starts at every way position except the last of its way
+        positions = np.arange(len(network.position_node) - 1)
+        positions = positions[network.position_way[:-1] == network.position_way[1:]]
+        way_indices = network.position_way[positions].astype(np.int64)
+
+        self.size = len(positions)
+        self.way_indices = way_indices
+        self.way_ids = network.way_ids[way_indices]
+        self.seg_indices = positions - network.way_offsets[way_indices]
+
+        lat1, lon1 = network.lats[positions], network.lons[positions]
+        lat2, lon2 = network.lats[positions + 1], network.lons[positions + 1]
+
+        # Local frame centred on the network
+        self.origin = (float(lat1.mean()), float(lon1.mean())) if self.size else (0.0, 0.0)
+        self.scale_x = 111320 * math.cos(math.radians(self.origin[0]))
+        self.scale_y = 110540
+        self.x1, self.y1 = self._to_local(lat1, lon1)
+        x2, y2 = self._to_local(lat2, lon2)
+        self.dx = x2 - self.x1
+        self.dy = y2 - self.y1
+        length_sq = self.dx * self.dx + self.dy * self.dy
+        self.inv_len_sq = np.divide(
+            1.0, length_sq, out=np.zeros_like(length_sq), where=length_sq > 0
+        )
+
+        # Segment bearings (constant per segment)
+        self.bearings = gk.bearing(lat1, lon1, lat2, lon2)
+
+        self.cells: Dict[Tuple[int, int], np.ndarray] = self._build_cells(x2, y2)
+
+    def _to_local(self, lat, lon):
+        """Project lat/lon (scalars or arrays) to metres from the origin."""
+        return (lon - self.origin[1]) * self.scale_x, (lat - self.origin[0]) * self.scale_y
+
+    def _build_cells(self, x2: np.ndarray, y2: np.ndarray) -> Dict[Tuple[int, int], np.ndarray]:
+        """Bucket segment indices into every cell their bounding box touches."""
+        cx0 = np.floor(np.minimum(self.x1, x2) / self.cell_size).astype(np.int64)
+        cx1 = np.floor(np.maximum(self.x1, x2) / self.cell_size).astype(np.int64)
+        cy0 = np.floor(np.minimum(self.y1, y2) / self.cell_size).astype(np.int64)
+        cy1 = np.floor(np.maximum(self.y1, y2) / self.cell_size).astype(np.int64)
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for seg in range(self.size):
+            for cx in range(cx0[seg], cx1[seg] + 1):
+                for cy in range(cy0[seg], cy1[seg] + 1):
+                    buckets.setdefault((cx, cy), []).append(seg)
+        return {cell: np.array(segs, dtype=np.int64) for cell, segs in buckets.items()}
+
+    def query(self, lat: float, lon: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find segments within radius of a point.
+
+        Returns:
+            (segment indices, distances in metres) for segments within radius
+        """
+        x, y = self._to_local(lat, lon)
+        cx0 = math.floor((x - radius) / self.cell_size)
+        cx1 = math.floor((x + radius) / self.cell_size)
+        cy0 = math.floor((y - radius) / self.cell_size)
+        cy1 = math.floor((y + radius) / self.cell_size)
+
+        found = [
+            self.cells[(cx, cy)]
+            for cx in range(cx0, cx1 + 1)
+            for cy in range(cy0, cy1 + 1)
+            if (cx, cy) in self.cells
+        ]
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        segs = np.unique(np.concatenate(found)) if len(found) > 1 else found[0]
+
+        px = x - self.x1[segs]
+        py = y - self.y1[segs]
+        dx = self.dx[segs]
+        dy = self.dy[segs]
+        t = np.clip((px * dx + py * dy) * self.inv_len_sq[segs], 0.0, 1.0)
+        ex = px - t * dx
+        ey = py - t * dy
+        dist = np.sqrt(ex * ex + ey * ey)
+
+        within = dist <= radius
+        return segs[within], dist[within]
+
+
 class PathProjector:
     """Projects the likely path ahead based on current heading."""
 
     def __init__(
         self,
-        network: RoadNetwork,
+        network,
         heading_tolerance: float = COPILOT_HEADING_TOLERANCE_DEG,
     ):
-        self.network = network
+        # A RoadNetwork is converted once; the walk reads the arrays directly
+        self.network: CompactRoadNetwork = as_compact_network(network)
         self.heading_tolerance = heading_tolerance
+        self.segment_index = SegmentIndex(self.network)
+        priorities = np.array(
+            [self.ROAD_PRIORITY.get(s, 10) for s in self.network.strings],
+            dtype=np.float64,
+        )
+        self.segment_priority = priorities[
+            self.network.way_info["highway_type"][self.segment_index.way_indices]
+        ]
+        # Length from each way position to the next (meaningless at way ends)
+        lats, lons = self.network.lats, self.network.lons
+        self.position_lengths = gk.haversine(lats[:-1], lons[:-1], lats[1:], lons[1:])
+        # Exit bearings by (way index, node ID), fixed for the network
+        self._exits: Dict[Tuple[int, int], Tuple[Optional[float], Optional[float]]] = {}
+        # Way matched on the previous call, favoured on the next
+        self.last_way_id: Optional[int] = None
+        # Path kept across calls by project_path_incremental
+        self._walker: Optional["_PathWalker"] = None
 
     # Road type priority (lower = prefer)
     ROAD_PRIORITY = {
@@ -168,64 +292,42 @@ class PathProjector:
         """
         Find which way the vehicle is currently on.
 
-        Prefers main roads over service roads when both are nearby.
+        Prefers main roads over service roads when both are nearby, and
+        the way matched on the previous call over an equally good one.
         Returns: (way_id, node_index, forward) where forward indicates
                  direction of travel along the way.
         """
-        candidates = []
-        fallback_candidates = []  # For when heading doesn't match
-
-        search_radius = COPILOT_ROAD_SEARCH_RADIUS_M
-
-        for way_id, way in self.network.ways.items():
-            geometry = self.network.get_way_geometry(way_id)
-            if len(geometry) < 2:
-                continue
-
-            for i in range(len(geometry) - 1):
-                p1, p2 = geometry[i], geometry[i + 1]
-
-                # Find closest point on this segment
-                closest, t = closest_point_on_segment((lat, lon), p1, p2)
-                dist = haversine_distance(lat, lon, closest[0], closest[1])
-
-                if dist > search_radius:
-                    continue
-
-                # Check heading alignment
-                seg_bearing = bearing(p1[0], p1[1], p2[0], p2[1])
-                heading_diff = abs(angle_difference(heading, seg_bearing))
-
-                # Could be going either direction on the road
-                forward = heading_diff < 90
-                if not forward:
-                    heading_diff = 180 - heading_diff
-
-                # Get road priority (prefer main roads)
-                priority = self.ROAD_PRIORITY.get(way.highway_type, 10)
-
-                # Score: heavily prioritise road type over distance
-                # A primary road 100m away should beat a service road 30m away
-                score = priority * 50 + dist
-
-                if heading_diff > self.heading_tolerance:
-                    # Doesn't match heading - add to fallback (only if very close)
-                    if dist < 30:  # Only fallback for very close roads
-                        fallback_candidates.append((score + 500, way_id, i, forward))
-                    continue
-
-                candidates.append((score, way_id, i, forward))
+        index = self.segment_index
+        segs, dist = index.query(lat, lon, COPILOT_ROAD_SEARCH_RADIUS_M)
+        if len(segs) == 0:
+            self.last_way_id = None
+            return None
 
-        # Use heading-aligned candidates if available, otherwise fallback
-        if not candidates:
-            if not fallback_candidates:
+        # Check heading alignment - could be going either direction on the road
+        heading_diff = np.abs((index.bearings[segs] - heading + 180) % 360 - 180)
+        forward = heading_diff < 90
+        heading_diff = np.where(forward, heading_diff, 180 - heading_diff)
+
+        # Score: heavily prioritise road type over distance
+        # A primary road 100m away should beat a service road 30m away
+        way_ids = index.way_ids[segs]
+        score = self.segment_priority[segs] * 50 + dist
+        if self.last_way_id is not None:
+            score[way_ids == self.last_way_id] -= COPILOT_WAY_CONTINUITY_BONUS_M
+
+        # Use heading-aligned candidates if available, otherwise fall back
+        # to very close roads that don't match heading
+        aligned = heading_diff <= self.heading_tolerance
+        if not aligned.any():
+            aligned = dist < 30
+            if not aligned.any():
+                self.last_way_id = None
                 return None
-            candidates = fallback_candidates
 
-        # Return best candidate (lowest score)
-        candidates.sort(key=lambda x: x[0])
-        _, way_id, node_idx, forward = candidates[0]
-        return (way_id, node_idx, forward)
+        best = int(np.argmin(np.where(aligned, score, np.inf)))
+        way_id = int(way_ids[best])
+        self.last_way_id = way_id
+        return (way_id, int(index.seg_indices[segs[best]]), bool(forward[best]))
 
     def project_path(
         self,
@@ -252,264 +354,79 @@ class PathProjector:
         if not current:
             return None
 
-        way_id, node_idx, forward = current
-        points: List[PathPoint] = []
-        junctions: List[JunctionInfo] = []
-        bridges: List[BridgeInfo] = []
-        tunnels: List[TunnelInfo] = []
-        railway_crossings: List[RailwayCrossingInfo] = []
-        fords: List[FordInfo] = []
-        speed_bumps: List[SpeedBumpInfo] = []
-        surface_changes: List[SurfaceChangeInfo] = []
-        barriers: List[BarrierInfo] = []
-        narrows: List[NarrowInfo] = []
-        total_distance = 0.0
-
-        # Start from current position
-        visited_ways = {way_id}
-        visited_bridges = set()  # Track bridge ways already recorded
-        visited_tunnels = set()
-        visited_fords = set()
-        visited_speed_bumps = set()
-        visited_railway_crossings = set()
-        visited_barriers = set()
-        visited_narrows = set()
-        current_surface = ""  # Track for surface change detection
-        current_width = 0.0  # Track for narrow detection
-
-        while total_distance < max_distance:
-            way = self.network.ways.get(way_id)
-            if not way:
-                break
-
-            geometry = self.network.get_way_geometry(way_id)
-            if len(geometry) < 2:
-                break
-
-            # Check for way-level features at start of this way
-            feature_pt = geometry[node_idx] if node_idx < len(geometry) else geometry[0]
+        walker = _PathWalker(self, *current, route_waypoints)
+        return walker.window(lat, lon, 0, max_distance)
 
-            # Bridge
-            if way.bridge and way_id not in visited_bridges:
-                visited_bridges.add(way_id)
-                bridges.append(BridgeInfo(
-                    lat=feature_pt[0],
-                    lon=feature_pt[1],
-                    distance_m=total_distance,
-                    way_id=way_id,
-                ))
-
-            # Tunnel
-            if way.tunnel and way_id not in visited_tunnels:
-                visited_tunnels.add(way_id)
-                tunnels.append(TunnelInfo(
-                    lat=feature_pt[0],
-                    lon=feature_pt[1],
-                    distance_m=total_distance,
-                    way_id=way_id,
-                ))
-
-            # Ford
-            if way.ford and way_id not in visited_fords:
-                visited_fords.add(way_id)
-                fords.append(FordInfo(
-                    lat=feature_pt[0],
-                    lon=feature_pt[1],
-                    distance_m=total_distance,
-                    way_id=way_id,
-                ))
-
-            # Speed bump / traffic calming
-            if way.traffic_calming and way_id not in visited_speed_bumps:
-                visited_speed_bumps.add(way_id)
-                speed_bumps.append(SpeedBumpInfo(
-                    lat=feature_pt[0],
-                    lon=feature_pt[1],
-                    distance_m=total_distance,
-                    way_id=way_id,
-                    bump_type=way.traffic_calming,
-                ))
-
-            # Surface change detection
-            if way.surface and way.surface != current_surface:
-                if current_surface:  # Only record if we had a previous surface
-                    surface_changes.append(SurfaceChangeInfo(
-                        lat=feature_pt[0],
-                        lon=feature_pt[1],
-                        distance_m=total_distance,
-                        from_surface=current_surface,
-                        to_surface=way.surface,
-                        way_id=way_id,
-                    ))
-                current_surface = way.surface
-
-            # Narrow section detection (width < 3m or explicit narrow tag)
-            is_narrow = way.narrow or (way.width > 0 and way.width < 3.0)
-            if is_narrow and way_id not in visited_narrows:
-                visited_narrows.add(way_id)
-                narrows.append(NarrowInfo(
-                    lat=feature_pt[0],
-                    lon=feature_pt[1],
-                    distance_m=total_distance,
-                    way_id=way_id,
-                    width=way.width,
-                ))
-
-            # Add points along this way
-            if forward:
-                indices = range(node_idx, len(way.nodes))
-            else:
-                indices = range(node_idx, -1, -1)
-
-            prev_point = (lat, lon) if not points else (points[-1].lat, points[-1].lon)
-
-            for i in indices:
-                if i < 0 or i >= len(geometry):
-                    continue
-
-                pt = geometry[i]
-                dist = haversine_distance(prev_point[0], prev_point[1], pt[0], pt[1])
-                total_distance += dist
-
-                if total_distance > max_distance:
-                    break
-
-                points.append(PathPoint(
-                    lat=pt[0],
-                    lon=pt[1],
-                    distance_from_start=total_distance,
-                    way_id=way_id,
-                    node_index=i,
-                ))
-
-                # Check for railway crossing at this node
-                node_id = way.nodes[i]
-                if node_id in self.network.railway_crossings and node_id not in visited_railway_crossings:
-                    visited_railway_crossings.add(node_id)
-                    crossing = self.network.railway_crossings[node_id]
-                    railway_crossings.append(RailwayCrossingInfo(
-                        lat=crossing.lat,
-                        lon=crossing.lon,
-                        distance_m=total_distance,
-                        node_id=node_id,
-                    ))
-
-                # Check for barrier (cattle grid, gate) at this node
-                if node_id in self.network.barriers and node_id not in visited_barriers:
-                    visited_barriers.add(node_id)
-                    barrier = self.network.barriers[node_id]
-                    barriers.append(BarrierInfo(
-                        lat=barrier.lat,
-                        lon=barrier.lon,
-                        distance_m=total_distance,
-                        node_id=node_id,
-                        barrier_type=barrier.barrier_type,
-                    ))
-
-                prev_point = pt
-
-            if total_distance > max_distance:
-                break
-
-            # At end of way - find continuation
-            end_node_id = way.nodes[-1] if forward else way.nodes[0]
-            end_node = self.network.nodes.get(end_node_id)
-            if not end_node:
-                break
-
-            # Check if this is a junction
-            junction = self.network.junctions.get(end_node_id)
-            if junction:
-                # Record junction info
-                exit_bearings = self._get_exit_bearings(
-                    junction, way_id, forward
-                )
-                current_bearing = bearing(
-                    prev_point[0], prev_point[1],
-                    end_node.lat, end_node.lon
-                )
-
-                # Determine which way to go at junction
-                chosen_bearing = None
-                turn_direction = None
-
-                if route_waypoints:
-                    # Route-guided mode: find exit that leads toward next waypoint
-                    chosen_bearing, turn_direction = self._find_route_guided_exit(
-                        junction, current_bearing, exit_bearings, route_waypoints
-                    )
+    def project_path_incremental(
+        self,
+        lat: float,
+        lon: float,
+        heading: float,
+        max_distance: float = COPILOT_LOOKAHEAD_M,
+        route_waypoints: Optional[List[Tuple[float, float]]] = None,
+    ) -> Optional[ProjectedPath]:
+        """
+        Project the path ahead, reusing the path projected on the last call.
+
+        The projected path is kept as a sliding window: points the vehicle
+        has passed are trimmed and only the tail is walked further. Junction
+        choices already made are kept, so the path is only re-projected from
+        scratch when the vehicle is no longer on it (different way, direction
+        or a node outside the window), when route guidance is switched on or
+        off, when the walk stopped at a way the vehicle has since passed (a
+        circuit shorter than the lookahead), or after reset_path().
+
+        Args and return value are as for project_path(). The returned path
+        also carries per-point curvatures, cached across calls.
+        """
+        current = self.find_current_way(lat, lon, heading)
+        if not current:
+            self._walker = None
+            return None
 
-                if chosen_bearing is None:
-                    # Fall back to straight-on
-                    chosen_bearing = self._find_straight_on(
-                        current_bearing, exit_bearings,
-                        current_way=way, junction=junction
-                    )
-                    if chosen_bearing is not None:
-                        turn_direction = "straight"
+        way_id, node_idx, forward = current
+        walker = self._walker
+        guided = route_waypoints is not None
+        start = walker.index_of(way_id, node_idx, forward) if walker else None
+        if start is None or walker.guided != guided or walker.blocked_behind(start):
+            walker = self._walker = _PathWalker(self, way_id, node_idx, forward, route_waypoints)
+            start = 0
+        else:
+            walker.route_waypoints = route_waypoints
 
-                junctions.append(JunctionInfo(
-                    lat=junction.lat,
-                    lon=junction.lon,
-                    distance_m=total_distance,
-                    is_t_junction=junction.is_t_junction,
-                    exit_bearings=exit_bearings,
-                    straight_on_bearing=chosen_bearing,
-                    node_id=junction.node_id,
-                    turn_direction=turn_direction,
-                ))
+        return walker.window(lat, lon, start, max_distance, with_curvature=True)
 
-                # Follow chosen road
-                if chosen_bearing is not None:
-                    next_way, next_forward = self._find_way_with_bearing(
-                        junction, chosen_bearing, way_id
-                    )
-                    if next_way and next_way not in visited_ways:
-                        way_id = next_way
-                        forward = next_forward
-                        visited_ways.add(way_id)
-                        node_idx = 0 if next_forward else len(self.network.ways[way_id].nodes) - 1
-                        continue
-
-                break  # No continuation found
-
-            # Not a junction - try to find connecting way
-            connected_ways = self.network.node_to_ways.get(end_node_id, [])
-            next_way = None
-            for wid in connected_ways:
-                if wid != way_id and wid not in visited_ways:
-                    next_way = wid
-                    break
+    def reset_path(self):
+        """Discard the path kept by project_path_incremental()."""
+        self._walker = None
 
-            if next_way:
-                way_id = next_way
-                visited_ways.add(way_id)
-                new_way = self.network.ways[way_id]
-                # Determine direction on new way
-                if new_way.nodes[0] == end_node_id:
-                    forward = True
-                    node_idx = 0
-                elif new_way.nodes[-1] == end_node_id:
-                    forward = False
-                    node_idx = len(new_way.nodes) - 1
-                else:
-                    break
-            else:
-                break
+    def _way_exits(self, w: int, node_id: int) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Bearings leaving a node along way w.
 
-        return ProjectedPath(
-            points=points,
-            junctions=junctions,
-            bridges=bridges,
-            tunnels=tunnels,
-            railway_crossings=railway_crossings,
-            fords=fords,
-            speed_bumps=speed_bumps,
-            surface_changes=surface_changes,
-            barriers=barriers,
-            narrows=narrows,
-            total_distance=total_distance,
-        )
+        Returns:
+            (backward, forward) bearings, None where the way ends at the
+            node or does not pass through it
+        """
+        exits = self._exits.get((w, node_id))
+        if exits is not None:
+            return exits
+
+        network = self.network
+        idx = network.node_index(w, node_id)
+        backward = forward = None
+        if idx >= 0:
+            start, end = network.way_span(w)
+            p = start + idx
+            lats, lons = network.lats, network.lons
+            lat, lon = float(lats[p]), float(lons[p])
+            if p > start:
+                backward = bearing(lat, lon, float(lats[p - 1]), float(lons[p - 1]))
+            if p < end - 1:
+                forward = bearing(lat, lon, float(lats[p + 1]), float(lons[p + 1]))
+
+        exits = self._exits[(w, node_id)] = (backward, forward)
+        return exits
 
     def _get_exit_bearings(
         self,
@@ -519,32 +436,18 @@ class PathProjector:
     ) -> List[float]:
         """Get bearings of all roads leaving this junction (excluding arrival)."""
         bearings = []
-        node = self.network.nodes[junction.node_id]
 
         for way_id in junction.connected_ways:
             if way_id == arrival_way_id:
                 continue
 
-            way = self.network.ways.get(way_id)
-            if not way:
-                continue
-
-            try:
-                idx = way.nodes.index(junction.node_id)
-            except ValueError:
+            w = self.network.way_index.get(way_id)
+            if w is None:
                 continue
 
             # Get bearing leaving the junction along this way
-            if idx > 0:
-                prev = self.network.nodes.get(way.nodes[idx - 1])
-                if prev:
-                    b = bearing(node.lat, node.lon, prev.lat, prev.lon)
-                    bearings.append(b)
-
-            if idx < len(way.nodes) - 1:
-                next_n = self.network.nodes.get(way.nodes[idx + 1])
-                if next_n:
-                    b = bearing(node.lat, node.lon, next_n.lat, next_n.lon)
+            for b in self._way_exits(w, junction.node_id):
+                if b is not None:
                     bearings.append(b)
 
         return bearings
@@ -553,24 +456,25 @@ class PathProjector:
         self,
         arrival_bearing: float,
         exit_bearings: List[float],
-        current_way: Optional[Way] = None,
+        current_way: Optional[int] = None,
         junction: Optional[Junction] = None,
     ) -> Optional[float]:
         """
         Find which exit is 'straight on' (closest to current bearing).
 
-        If current_way is provided, checks if the road actually continues
-        through the junction (same road) vs hitting a different road (T-junction).
+        If current_way (index into the network) is provided, checks if the
+        road actually continues through the junction (same road) vs hitting
+        a different road (T-junction).
         """
         if not exit_bearings:
             return None
 
         # If we have road info, check if current road continues through junction
-        if current_way and junction:
+        if current_way is not None and junction:
             # Check if current road continues (node is in middle of way, not at end)
-            if junction.node_id in current_way.nodes:
-                idx = current_way.nodes.index(junction.node_id)
-                road_continues = 0 < idx < len(current_way.nodes) - 1
+            idx = self.network.node_index(current_way, junction.node_id)
+            if idx >= 0:
+                road_continues = 0 < idx < self.network.way_length(current_way) - 1
 
                 if not road_continues:
                     # Current road ends here - check if any exit is the same road name
@@ -596,7 +500,7 @@ class PathProjector:
 
     def _find_same_road_exit(
         self,
-        current_way: Way,
+        current_way: int,
         junction: Junction,
         arrival_bearing: float,
     ) -> Optional[float]:
@@ -605,48 +509,38 @@ class PathProjector:
 
         Returns the bearing if found, None if no same-road continuation exists.
         """
-        node = self.network.nodes[junction.node_id]
+        network = self.network
+        info = network.way_info
+        # String tags are codes into one table, code 0 being ""
+        name = info["name"][current_way]
+        highway_type = info["highway_type"][current_way]
+        current_id = int(network.way_ids[current_way])
 
         for way_id in junction.connected_ways:
-            if way_id == current_way.id:
+            if way_id == current_id:
                 continue
 
-            other_way = self.network.ways.get(way_id)
-            if not other_way:
+            w = network.way_index.get(way_id)
+            if w is None:
                 continue
 
             # Check if this is the same road (same name, or both unnamed with same type)
+            other_name = info["name"][w]
             same_road = False
-            if current_way.name and other_way.name:
-                same_road = current_way.name == other_way.name
-            elif not current_way.name and not other_way.name:
+            if name and other_name:
+                same_road = name == other_name
+            elif not name and not other_name:
                 # Both unnamed - only continue if same road type
-                same_road = current_way.highway_type == other_way.highway_type
+                same_road = highway_type == info["highway_type"][w]
 
             if not same_road:
                 continue
 
-            # Get bearing of this exit
-            try:
-                idx = other_way.nodes.index(junction.node_id)
-            except ValueError:
-                continue
-
-            # Check forward direction
-            if idx < len(other_way.nodes) - 1:
-                next_n = self.network.nodes.get(other_way.nodes[idx + 1])
-                if next_n:
-                    b = bearing(node.lat, node.lon, next_n.lat, next_n.lon)
-                    if abs(angle_difference(arrival_bearing, b)) < self.heading_tolerance:
-                        return b
-
-            # Check backward direction
-            if idx > 0:
-                prev = self.network.nodes.get(other_way.nodes[idx - 1])
-                if prev:
-                    b = bearing(node.lat, node.lon, prev.lat, prev.lon)
-                    if abs(angle_difference(arrival_bearing, b)) < self.heading_tolerance:
-                        return b
+            # Check forward direction, then backward
+            backward, forward = self._way_exits(w, junction.node_id)
+            for b in (forward, backward):
+                if b is not None and abs(angle_difference(arrival_bearing, b)) < self.heading_tolerance:
+                    return b
 
         return None
 
@@ -657,36 +551,19 @@ class PathProjector:
         exclude_way_id: int,
     ) -> Tuple[Optional[int], bool]:
         """Find way leaving junction with given bearing."""
-        node = self.network.nodes[junction.node_id]
-
         for way_id in junction.connected_ways:
             if way_id == exclude_way_id:
                 continue
 
-            way = self.network.ways.get(way_id)
-            if not way:
-                continue
-
-            try:
-                idx = way.nodes.index(junction.node_id)
-            except ValueError:
+            w = self.network.way_index.get(way_id)
+            if w is None:
                 continue
 
-            # Check forward direction
-            if idx < len(way.nodes) - 1:
-                next_n = self.network.nodes.get(way.nodes[idx + 1])
-                if next_n:
-                    b = bearing(node.lat, node.lon, next_n.lat, next_n.lon)
-                    if abs(angle_difference(target_bearing, b)) < self.heading_tolerance:
-                        return way_id, True
-
-            # Check backward direction
-            if idx > 0:
-                prev = self.network.nodes.get(way.nodes[idx - 1])
-                if prev:
-                    b = bearing(node.lat, node.lon, prev.lat, prev.lon)
-                    if abs(angle_difference(target_bearing, b)) < self.heading_tolerance:
-                        return way_id, False
+            # Check forward direction, then backward
+            backward, forward = self._way_exits(w, junction.node_id)
+            for b, is_forward in ((forward, True), (backward, False)):
+                if b is not None and abs(angle_difference(target_bearing, b)) < self.heading_tolerance:
+                    return way_id, is_forward
 
         return None, False
 
@@ -772,3 +649,468 @@ class PathProjector:
             turn_direction = "right"
 
         return best_exit, turn_direction
+
+
+class _PathWalker:
+    """
+    Resumable walk along the road network from a starting way.
+
+    Holds the state of the path projection loop so the walk can be extended
+    later. Point and feature distances are measured along the walk from its
+    first point; window() converts them to distances from the vehicle.
+    """
+
+    # Way-level feature lists, kept while the vehicle is on their way
+    WAY_FEATURES = ("bridges", "tunnels", "fords", "speed_bumps", "narrows")
+
+    def __init__(
+        self,
+        projector: PathProjector,
+        way_id: int,
+        node_idx: int,
+        forward: bool,
+        route_waypoints: Optional[List[Tuple[float, float]]],
+    ):
+        self.projector = projector
+        self.network = projector.network
+        self.route_waypoints = route_waypoints
+        self.guided = route_waypoints is not None
+
+        # Loop state
+        self.way_id = way_id
+        self.forward = forward
+        self.node_idx = node_idx
+        self.next_i = node_idx
+        self.entering_way = True
+        self.finished = False
+        self.total_distance = 0.0
+        self.prev_point: Optional[Tuple[float, float]] = None
+        self.current_surface = ""  # Track for surface change detection
+
+        # Current way, unpacked from the network arrays on entering it
+        self.way = -1  # Index into the network
+        self.way_lats: List[float] = []
+        self.way_lons: List[float] = []
+        self.way_nodes: List[int] = []
+        self.way_lengths: List[float] = []  # Segment lengths along the way
+
+        # Walked path: points[k] has absolute index first_index + k
+        self.first_index = 0
+        self.points: List[PathPoint] = []
+        self.curvatures: List[Optional[float]] = []
+        self.way_directions = {way_id: forward}
+        self.way_order = {way_id: 0}  # Position of each way along the walk
+        self.ways_entered = 1
+        self.point_index = {}  # (way_id, node_index) -> absolute point index
+
+        self.junctions: List[JunctionInfo] = []
+        self.junction_ways: List[int] = []  # Way ending at each junction
+        self.bridges: List[BridgeInfo] = []
+        self.tunnels: List[TunnelInfo] = []
+        self.railway_crossings: List[RailwayCrossingInfo] = []
+        self.fords: List[FordInfo] = []
+        self.speed_bumps: List[SpeedBumpInfo] = []
+        self.surface_changes: List[SurfaceChangeInfo] = []
+        self.barriers: List[BarrierInfo] = []
+        self.narrows: List[NarrowInfo] = []
+
+        # Ways, crossings and barriers in the window (trimmed ones can be walked again)
+        self.visited_ways = {way_id}
+        self.visited_railway_crossings = set()
+        self.visited_barriers = set()
+        self.stopped_at_way: Optional[int] = None  # Walked way the walk could not re-enter
+
+    def index_of(self, way_id: int, node_idx: int, forward: bool) -> Optional[int]:
+        """Position in points of a way node walked in the given direction."""
+        if self.way_directions.get(way_id) != forward:
+            return None
+        index = self.point_index.get((way_id, node_idx))
+        if index is None or index < self.first_index:
+            return None
+        return index - self.first_index
+
+    def blocked_behind(self, start: int) -> bool:
+        """
+        True if the walk ended at a way that trimming to points[start] drops.
+
+        On a circuit shorter than the lookahead the walk stops where it meets
+        the ways it has already walked; once the vehicle has passed them, the
+        path continues past that point and has to be walked again.
+        """
+        if not self.finished or self.stopped_at_way is None or not self.points:
+            return False
+        order = self.way_order.get(self.stopped_at_way)
+        return order is None or order < self.way_order[self.points[start].way_id]
+
+    def window(
+        self,
+        lat: float,
+        lon: float,
+        start: int,
+        max_distance: float,
+        with_curvature: bool = False,
+    ) -> ProjectedPath:
+        """
+        Path from points[start] up to max_distance from the vehicle.
+
+        Trims points before start, walks further if needed and returns the
+        path with distances measured from the vehicle position.
+        """
+        self._trim(start)
+        if not self.points:
+            self._walk(0.0)  # First point, to measure from
+            if not self.points:
+                return ProjectedPath(points=[], junctions=[], bridges=[])
+
+        # Offset from walk distance to distance from the vehicle
+        origin = self.points[0]
+        start_way = origin.way_id
+        offset = haversine_distance(lat, lon, origin.lat, origin.lon) - origin.distance_from_start
+        limit = max_distance - offset
+        self._walk(limit)
+
+        points = [
+            PathPoint(p.lat, p.lon, p.distance_from_start + offset, p.way_id, p.node_index)
+            for p in self.points
+            if p.distance_from_start <= limit
+        ]
+
+        def shift(features, way_level=False):
+            kept = []
+            for f in features:
+                if f.distance_m > limit:
+                    break
+                if way_level and f.way_id == start_way:
+                    # Features of the way being driven are here and now
+                    kept.append(replace(f, lat=origin.lat, lon=origin.lon, distance_m=0.0))
+                else:
+                    kept.append(replace(f, distance_m=f.distance_m + offset))
+            return kept
+
+        path = ProjectedPath(
+            points=points,
+            junctions=shift(self.junctions),
+            bridges=shift(self.bridges, way_level=True),
+            tunnels=shift(self.tunnels, way_level=True),
+            railway_crossings=shift(self.railway_crossings),
+            fords=shift(self.fords, way_level=True),
+            speed_bumps=shift(self.speed_bumps, way_level=True),
+            surface_changes=shift(self.surface_changes),
+            barriers=shift(self.barriers),
+            narrows=shift(self.narrows, way_level=True),
+            total_distance=min(self.total_distance + offset, max_distance),
+        )
+
+        if with_curvature:
+            path.curvatures = self._window_curvatures(len(points))
+        return path
+
+    def _trim(self, start: int):
+        """Drop points, and features, the vehicle has passed."""
+        if start <= 0:
+            return
+        cut = self.points[start].distance_from_start
+        first_way = self.way_order[self.points[start].way_id]
+        del self.points[:start]
+        del self.curvatures[:start]
+        self.first_index += start
+
+        # Way features and junctions go with the ways they belong to;
+        # node features with the point they were found at
+        kept = [
+            (junction, way_id)
+            for junction, way_id in zip(self.junctions, self.junction_ways)
+            if self.way_order[way_id] >= first_way
+        ]
+        self.junctions = [junction for junction, _ in kept]
+        self.junction_ways = [way_id for _, way_id in kept]
+        self.surface_changes = [
+            f for f in self.surface_changes if self.way_order[f.way_id] > first_way
+        ]
+        for name in ("railway_crossings", "barriers"):
+            setattr(self, name, [f for f in getattr(self, name) if f.distance_m >= cut])
+        for name in self.WAY_FEATURES:
+            setattr(self, name, [
+                f for f in getattr(self, name) if self.way_order[f.way_id] >= first_way
+            ])
+
+        # Forget the ways behind, so a circuit can be walked onto them again
+        self.way_order = {w: order for w, order in self.way_order.items() if order >= first_way}
+        self.way_directions = {w: self.way_directions[w] for w in self.way_order}
+        self.visited_ways = set(self.way_order)
+        self.point_index = {
+            key: index for key, index in self.point_index.items() if index >= self.first_index
+        }
+        self.visited_railway_crossings = {f.node_id for f in self.railway_crossings}
+        self.visited_barriers = {f.node_id for f in self.barriers}
+
+    def _window_curvatures(self, count: int) -> List[float]:
+        """Curvature at each of the first count points, cached per point."""
+        points = self.points
+        for k in range(1, count - 1):
+            if self.curvatures[k] is None:
+                self.curvatures[k] = calculate_curvature(
+                    (points[k - 1].lat, points[k - 1].lon),
+                    (points[k].lat, points[k].lon),
+                    (points[k + 1].lat, points[k + 1].lon),
+                )
+        # End points of the window have no curvature
+        return [0.0] + self.curvatures[1:count - 1] + [0.0] if count > 1 else [0.0] * count
+
+    def _walk(self, limit: float):
+        """Walk along the network until the next point would pass limit."""
+        while not self.finished:
+            if self.entering_way:
+                w = self.network.way_index.get(self.way_id)
+                if w is None or self.network.way_length(w) < 2:
+                    self.finished = True
+                    break
+                self.entering_way = False
+                self._unpack_way(w)
+                self._record_way_features()
+
+            # Add points along this way
+            lats, lons, lengths = self.way_lats, self.way_lons, self.way_lengths
+            step = 1 if self.forward else -1
+            while 0 <= self.next_i < len(lats):
+                i = self.next_i
+                if i != self.node_idx:
+                    dist = lengths[i - 1] if self.forward else lengths[i]
+                elif self.prev_point is not None:
+                    dist = haversine_distance(
+                        self.prev_point[0], self.prev_point[1], lats[i], lons[i]
+                    )
+                else:
+                    dist = 0.0
+                if self.total_distance + dist > limit:
+                    return  # Resume from this point on the next walk
+                self.total_distance += dist
+                self._add_point(i)
+                self.prev_point = (lats[i], lons[i])
+                self.next_i += step
+
+            if not self._continue_from():
+                self.finished = True
+
+    def _unpack_way(self, w: int):
+        """Copy the current way out of the network arrays for the walk."""
+        network = self.network
+        start, end = network.way_span(w)
+        self.way = w
+        self.way_lats = network.lats[start:end].tolist()
+        self.way_lons = network.lons[start:end].tolist()
+        self.way_nodes = network.position_node[start:end].tolist()
+        self.way_lengths = self.projector.position_lengths[start:end - 1].tolist()
+
+    def _add_point(self, i: int):
+        """Append a path point and the node features found at it."""
+        total_distance = self.total_distance
+        way_id = self.way_id
+        self.point_index[(way_id, i)] = self.first_index + len(self.points)
+        self.points.append(PathPoint(
+            lat=self.way_lats[i],
+            lon=self.way_lons[i],
+            distance_from_start=total_distance,
+            way_id=way_id,
+            node_index=i,
+        ))
+        self.curvatures.append(None)
+
+        # Check for railway crossing at this node
+        node_id = self.way_nodes[i]
+        if node_id in self.network.railway_crossings and node_id not in self.visited_railway_crossings:
+            self.visited_railway_crossings.add(node_id)
+            crossing = self.network.railway_crossings[node_id]
+            self.railway_crossings.append(RailwayCrossingInfo(
+                lat=crossing.lat,
+                lon=crossing.lon,
+                distance_m=total_distance,
+                node_id=node_id,
+            ))
+
+        # Check for barrier (cattle grid, gate) at this node
+        if node_id in self.network.barriers and node_id not in self.visited_barriers:
+            self.visited_barriers.add(node_id)
+            barrier = self.network.barriers[node_id]
+            self.barriers.append(BarrierInfo(
+                lat=barrier.lat,
+                lon=barrier.lon,
+                distance_m=total_distance,
+                node_id=node_id,
+                barrier_type=barrier.barrier_type,
+            ))
+
+    def _record_way_features(self):
+        """Record way-level features on entering a way."""
+        network = self.network
+        w = self.way
+        way_id = self.way_id
+        info = network.way_info[w]
+        total_distance = self.total_distance
+        node_idx = self.node_idx if self.node_idx < len(self.way_lats) else 0
+        feature_pt = (self.way_lats[node_idx], self.way_lons[node_idx])
+
+        # Each way is entered once, so way-level features need no dedup
+        if info["bridge"]:
+            self.bridges.append(BridgeInfo(
+                lat=feature_pt[0],
+                lon=feature_pt[1],
+                distance_m=total_distance,
+                way_id=way_id,
+            ))
+
+        if info["tunnel"]:
+            self.tunnels.append(TunnelInfo(
+                lat=feature_pt[0],
+                lon=feature_pt[1],
+                distance_m=total_distance,
+                way_id=way_id,
+            ))
+
+        if info["ford"]:
+            self.fords.append(FordInfo(
+                lat=feature_pt[0],
+                lon=feature_pt[1],
+                distance_m=total_distance,
+                way_id=way_id,
+            ))
+
+        # Speed bump / traffic calming
+        traffic_calming = network.strings[info["traffic_calming"]]
+        if traffic_calming:
+            self.speed_bumps.append(SpeedBumpInfo(
+                lat=feature_pt[0],
+                lon=feature_pt[1],
+                distance_m=total_distance,
+                way_id=way_id,
+                bump_type=traffic_calming,
+            ))
+
+        # Surface change detection
+        surface = network.strings[info["surface"]]
+        if surface and surface != self.current_surface:
+            if self.current_surface:  # Only record if we had a previous surface
+                self.surface_changes.append(SurfaceChangeInfo(
+                    lat=feature_pt[0],
+                    lon=feature_pt[1],
+                    distance_m=total_distance,
+                    from_surface=self.current_surface,
+                    to_surface=surface,
+                    way_id=way_id,
+                ))
+            self.current_surface = surface
+
+        # Narrow section detection (width < 3m or explicit narrow tag)
+        width = float(info["width"])
+        if info["narrow"] or (width > 0 and width < 3.0):
+            self.narrows.append(NarrowInfo(
+                lat=feature_pt[0],
+                lon=feature_pt[1],
+                distance_m=total_distance,
+                way_id=way_id,
+                width=width,
+            ))
+
+    def _continue_from(self) -> bool:
+        """At the end of the current way, move onto the continuing way if there is one."""
+        network = self.network
+        projector = self.projector
+        way_id = self.way_id
+        forward = self.forward
+        prev_point = self.prev_point
+
+        end = -1 if forward else 0
+        end_node_id = self.way_nodes[end]
+        if prev_point is None:
+            return False
+
+        # Check if this is a junction
+        junction = network.junctions.get(end_node_id)
+        if junction:
+            # Record junction info
+            exit_bearings = projector._get_exit_bearings(junction, way_id, forward)
+            current_bearing = bearing(
+                prev_point[0], prev_point[1],
+                self.way_lats[end], self.way_lons[end]
+            )
+
+            # Determine which way to go at junction
+            chosen_bearing = None
+            turn_direction = None
+
+            if self.route_waypoints:
+                # Route-guided mode: find exit that leads toward next waypoint
+                chosen_bearing, turn_direction = projector._find_route_guided_exit(
+                    junction, current_bearing, exit_bearings, self.route_waypoints
+                )
+
+            if chosen_bearing is None:
+                # Fall back to straight-on
+                chosen_bearing = projector._find_straight_on(
+                    current_bearing, exit_bearings,
+                    current_way=self.way, junction=junction
+                )
+                if chosen_bearing is not None:
+                    turn_direction = "straight"
+
+            self.junctions.append(JunctionInfo(
+                lat=junction.lat,
+                lon=junction.lon,
+                distance_m=self.total_distance,
+                is_t_junction=junction.is_t_junction,
+                exit_bearings=exit_bearings,
+                straight_on_bearing=chosen_bearing,
+                node_id=junction.node_id,
+                turn_direction=turn_direction,
+            ))
+            self.junction_ways.append(way_id)
+
+            # Follow chosen road
+            if chosen_bearing is not None:
+                next_way, next_forward = projector._find_way_with_bearing(
+                    junction, chosen_bearing, way_id
+                )
+                if next_way and next_way not in self.visited_ways:
+                    w = network.way_index[next_way]
+                    node_idx = 0 if next_forward else network.way_length(w) - 1
+                    self._enter_way(next_way, node_idx, next_forward)
+                    return True
+                if next_way:
+                    self.stopped_at_way = next_way
+
+            return False  # No continuation found
+
+        # Not a junction - try to find connecting way
+        next_way = None
+        for wid in network.ways_at_node(end_node_id):
+            if wid != way_id:
+                if wid not in self.visited_ways:
+                    next_way = wid
+                    break
+                self.stopped_at_way = wid
+        if not next_way:
+            return False
+        self.stopped_at_way = None
+
+        new_nodes = network.way_nodes(network.way_index[next_way])
+        # Determine direction on new way
+        if new_nodes[0] == end_node_id:
+            self._enter_way(next_way, 0, True)
+        elif new_nodes[-1] == end_node_id:
+            self._enter_way(next_way, len(new_nodes) - 1, False)
+        else:
+            self.visited_ways.add(next_way)
+            return False
+        return True
+
+    def _enter_way(self, way_id: int, node_idx: int, forward: bool):
+        """Continue the walk onto a new way."""
+        self.way_id = way_id
+        self.forward = forward
+        self.node_idx = node_idx
+        self.next_i = node_idx
+        self.entering_way = True
+        self.visited_ways.add(way_id)
+        self.way_directions[way_id] = forward
+        self.way_order[way_id] = self.ways_entered
+        self.ways_entered += 1
@@ -0,0 +1,175 @@
+"""Cache of rendered speech for CoPilot's TTS fallback.
+
+Each phrase is synthesised once for a given set of render settings, then
+kept as PCM in memory and as an .npy file on disk, so repeat callouts (and
+later runs) need no synthesis. Entries are content-addressed: the key is a
+hash of the text and the settings (TTS engine, voice, speed, effects,
+sample rate), so changing a setting never plays a stale clip. Both layers
+evict the least recently used entries beyond their size limits.
+
+Usage:
+    cache = PhraseCache(Path("cache/tts"), ("espeak-ng", "en-gb", 210, True, 22050))
+    pcm = cache.get_or_render("left four", render)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger('openTPT.copilot.phrase_cache')
+
+CACHE_FORMAT = 1  # Part of every key; bump when rendering changes
+SILENCE_LEVEL = 0.01  # Trimmed from the ends of phrases joined by join_phrases()
+
+
+def join_phrases(clips: Sequence[np.ndarray], sample_rate: int, gap_s: float = 0.04) -> np.ndarray:
+    """Join separately rendered phrases, trimming their silences to a short gap."""
+    gap = np.zeros(int(gap_s * sample_rate), dtype=np.float32)
+    parts: List[np.ndarray] = []
+    for clip in clips:
+        loud = np.flatnonzero(np.abs(clip) > SILENCE_LEVEL)
+        if not len(loud):
+            continue
+        if parts:
+            parts.append(gap)
+        parts.append(clip[loud[0]:loud[-1] + 1])
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+class PhraseCache:
+    """Rendered phrases (float32 PCM) by text, in memory and on disk."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path],
+        settings: Sequence,
+        max_memory_bytes: int = 8 * 1024 * 1024,
+        max_disk_bytes: int = 32 * 1024 * 1024,
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached phrases (None for memory only)
+            settings: Render settings that change the audio (JSON types)
+            max_memory_bytes: PCM kept in memory
+            max_disk_bytes: Cache files kept on disk
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.settings = list(settings)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> str:
+        """Content address of a phrase rendered with this cache's settings."""
+        data = json.dumps([CACHE_FORMAT, text, *self.settings])
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Rendered phrase, or None if not cached."""
+        key = self.key(text)
+        with self._lock:
+            pcm = self._memory.get(key)
+            if pcm is not None:
+                self._memory.move_to_end(key)
+                return pcm
+        pcm = self._load(key)
+        if pcm is not None:
+            with self._lock:
+                self._remember(key, pcm)
+        return pcm
+
+    def put(self, text: str, pcm: np.ndarray) -> None:
+        """Cache a rendered phrase."""
+        key = self.key(text)
+        pcm = np.asarray(pcm, dtype=np.float32)
+        with self._lock:
+            self._remember(key, pcm)
+        self._store(key, pcm)
+
+    def get_or_render(
+        self, text: str, render: Callable[[str], Optional[np.ndarray]]
+    ) -> Optional[np.ndarray]:
+        """Cached phrase, rendering and caching it on a miss."""
+        pcm = self.get(text)
+        if pcm is None:
+            pcm = render(text)
+            if pcm is not None:
+                self.put(text, pcm)
+        return pcm
+
+    def __contains__(self, text: str) -> bool:
+        key = self.key(text)
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self.cache_dir is not None and self._path(key).exists()
+
+    def _remember(self, key: str, pcm: np.ndarray) -> None:
+        """Add to the memory layer, evicting least recently used (lock held)."""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.nbytes
+        self._memory[key] = pcm
+        self._memory_bytes += pcm.nbytes
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        """Read a phrase from disk, marking it recently used."""
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            pcm = np.load(path, allow_pickle=False)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return pcm.astype(np.float32) / 32767
+
+    def _store(self, key: str, pcm: np.ndarray) -> None:
+        """Write a phrase to disk as int16, then trim the disk layer."""
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, (np.clip(pcm, -1.0, 1.0) * 32767).astype(np.int16))
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            logger.warning("Could not cache phrase in %s: %s", self.cache_dir, e)
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files beyond max_disk_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
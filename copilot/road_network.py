@@ -0,0 +1,87 @@
+"""Road network records shared by the map storage backends.
+
+Node, Way and feature dataclasses plus the dict-based RoadNetwork that
+MapLoader returns. Kept separate from map_loader so the storage modules
+can build them without importing the loader.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class Node:
+    """OSM node with coordinates."""
+    id: int
+    lat: float
+    lon: float
+
+
+@dataclass
+class Way:
+    """OSM way representing a road segment."""
+    id: int
+    nodes: List[int]  # Node IDs in order
+    name: str = ""
+    highway_type: str = ""
+    oneway: bool = False
+    speed_limit: int = 0  # km/h, 0 if unknown
+    bridge: bool = False
+    tunnel: bool = False
+    surface: str = ""  # asphalt, gravel, concrete, etc.
+    ford: bool = False
+    traffic_calming: str = ""  # bump, hump, table, etc.
+    width: float = 0.0  # Road width in meters, 0 if unknown
+    narrow: bool = False  # Explicit narrow tag
+
+
+@dataclass
+class Junction:
+    """A junction where roads meet."""
+    node_id: int
+    lat: float
+    lon: float
+    connected_ways: List[int]  # Way IDs that meet here
+    is_t_junction: bool = False
+
+
+@dataclass
+class RailwayCrossing:
+    """A railway level crossing."""
+    node_id: int
+    lat: float
+    lon: float
+
+
+@dataclass
+class Barrier:
+    """A barrier on the road (cattle grid, gate, etc.)."""
+    node_id: int
+    lat: float
+    lon: float
+    barrier_type: str  # cattle_grid, gate, etc.
+
+
+@dataclass
+class RoadNetwork:
+    """Cached road network for a geographic area."""
+    nodes: Dict[int, Node] = field(default_factory=dict)
+    ways: Dict[int, Way] = field(default_factory=dict)
+    junctions: Dict[int, Junction] = field(default_factory=dict)
+    # Node ID -> list of Way IDs that contain this node
+    node_to_ways: Dict[int, List[int]] = field(default_factory=dict)
+    # Railway level crossings
+    railway_crossings: Dict[int, RailwayCrossing] = field(default_factory=dict)
+    # Barriers (cattle grids, gates, etc.)
+    barriers: Dict[int, Barrier] = field(default_factory=dict)
+
+    def get_way_geometry(self, way_id: int) -> List[Tuple[float, float]]:
+        """Get list of (lat, lon) points for a way."""
+        way = self.ways.get(way_id)
+        if not way:
+            return []
+        return [
+            (self.nodes[nid].lat, self.nodes[nid].lon)
+            for nid in way.nodes
+            if nid in self.nodes
+        ]
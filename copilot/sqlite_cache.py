@@ -3,16 +3,30 @@
 Provides efficient storage and spatial queries for large map regions without
 loading everything into memory. Uses streaming PBF import and R-tree indices.
 
+The PBF import streams roads into the database in batches, then fetches node
+locations with a process pool working over ranges of PBF blocks. Indices,
+R-trees and junctions are built from the tables once the rows are in.
+
 Usage:
     cache = SQLiteMapCache("region.roads.db")
     cache.import_from_pbf(Path("region.osm.pbf"))  # One-time import
     network = cache.load_region(51.46, -2.46, 5000)  # Query by bbox
 """
 
+import os
 import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
 
 try:
     import osmium
@@ -20,12 +34,16 @@ try:
 except ImportError:
     OSMIUM_AVAILABLE = False
 
-from .geometry import bearing
+from utils import geometry_kernels as gk
 
 
 # Schema version - increment when schema changes
 SCHEMA_VERSION = 1
 
+# PBF import tuning
+IMPORT_BATCH_SIZE = 20000  # Ways (or node rows) per executemany batch
+NODE_TASK_BLOCKS = 32  # PBF blocks per node-pass task (8000 entities each)
+
 
 @dataclass
 class Node:
@@ -110,6 +128,47 @@ class RoadNetwork:
         ]
 
 
+@dataclass
+class ImportStage:
+    """Items processed and time taken by one stage of a PBF import."""
+    name: str
+    items: int
+    unit: str
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Items per second."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+_INSERT_WAY = """
+    INSERT OR IGNORE INTO ways (id, name, highway_type, oneway, speed_limit,
+                                bridge, tunnel, surface, ford, traffic_calming,
+                                width, narrow)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_WAY_NODE = "INSERT OR IGNORE INTO way_nodes (way_id, idx, node_id) VALUES (?, ?, ?)"
+_INSERT_CROSSING = "INSERT OR IGNORE INTO railway_crossings (node_id, lat, lon) VALUES (?, ?, ?)"
+_INSERT_BARRIER = (
+    "INSERT OR IGNORE INTO barriers (node_id, lat, lon, barrier_type) VALUES (?, ?, ?, ?)"
+)
+
+
+# way_nodes lookups; dropped for bulk imports and recreated afterwards
+_CREATE_WAY_NODE_INDICES = """
+    CREATE INDEX IF NOT EXISTS idx_way_nodes_node ON way_nodes(node_id);
+    CREATE INDEX IF NOT EXISTS idx_way_nodes_way ON way_nodes(way_id);
+"""
+
+
+def _way_row(w: Way) -> tuple:
+    """Row for _INSERT_WAY."""
+    return (w.id, w.name, w.highway_type, w.oneway, w.speed_limit,
+            w.bridge, w.tunnel, w.surface, w.ford, w.traffic_calming,
+            w.width, w.narrow)
+
+
 class SQLiteMapCache:
     """SQLite-based map cache with R-tree spatial indexing."""
 
@@ -127,6 +186,8 @@ class SQLiteMapCache:
         """Open or create SQLite cache database."""
         self.db_path = Path(db_path)
         self._conn: Optional[sqlite3.Connection] = None
+        # Region loads share a temp table on the connection
+        self._region_lock = threading.Lock()
         self._ensure_schema()
 
     def _get_conn(self) -> sqlite3.Connection:
@@ -155,7 +216,10 @@ class SQLiteMapCache:
                 "SELECT value FROM metadata WHERE key='schema_version'"
             ).fetchone()
             if row and int(row[0]) == SCHEMA_VERSION:
-                return  # Schema is current
+                # Schema is current, but an aborted import may have left the
+                # way_nodes indices dropped
+                conn.executescript(_CREATE_WAY_NODE_INDICES)
+                return
         except (sqlite3.OperationalError, ValueError, TypeError):
             pass  # Table doesn't exist yet or invalid value
 
@@ -249,10 +313,7 @@ class SQLiteMapCache:
                 min_lon, max_lon
             );
 
-            -- Indices for faster lookups
-            CREATE INDEX IF NOT EXISTS idx_way_nodes_node ON way_nodes(node_id);
-            CREATE INDEX IF NOT EXISTS idx_way_nodes_way ON way_nodes(way_id);
-        """)
+        """ + _CREATE_WAY_NODE_INDICES)
 
         # Set schema version
         conn.execute(
@@ -315,23 +376,155 @@ class SQLiteMapCache:
             except sqlite3.OperationalError:
                 pass  # Can't cache - will use R-tree query next time
 
-    def import_from_pbf(self, pbf_path: Path, progress_callback=None) -> None:
+    def import_from_pbf(
+        self, pbf_path: Path, progress_callback=None, workers: Optional[int] = None
+    ) -> List[ImportStage]:
         """Import road network from OSM PBF file using streaming.
 
-        Uses two-pass streaming to minimize memory usage:
-        1. First pass: Extract ways, collect needed node IDs
-        2. Second pass: Extract only needed nodes
+        Memory use is bounded by batch size rather than extract size, apart
+        from the sorted array of road node IDs:
+        1. Ways pass: stream roads into the ways and way_nodes tables in
+           batches, collecting the IDs of their nodes
+        2. Nodes pass: worker processes scan ranges of PBF blocks for those
+           nodes, crossings and barriers; rows are inserted in file order
+        3. Indices, R-trees and junctions are built from the tables
 
         Args:
             pbf_path: Path to OSM PBF file
             progress_callback: Optional callback(stage, current, total)
+            workers: Nodes pass processes (default: CPU count; 1 scans in
+                this process)
+
+        Returns:
+            Items and time per stage, also printed as a throughput report
         """
         if not OSMIUM_AVAILABLE:
             raise ImportError("osmium not available. Install with: pip install osmium")
 
+        pbf_path = Path(pbf_path)
+        progress = _ImportProgress(progress_callback)
+        self._clear()
+
+        try:
+            # Workers map the needed node IDs from disk rather than each
+            # receiving a pickled copy
+            with tempfile.TemporaryDirectory(dir=self.db_path.parent) as tmp_dir:
+                needed_path = Path(tmp_dir) / "needed_nodes.npy"
+                np.save(needed_path, self._import_ways(pbf_path, progress))
+                self._import_nodes(
+                    pbf_path, needed_path, progress, workers or os.cpu_count() or 1
+                )
+
+            self._finish_import(progress)
+        except BaseException:
+            self._restore_indices()
+            raise
+
+        # Store import metadata
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('source_file', ?)",
+            (str(pbf_path),)
+        )
+        conn.commit()
+
+        progress.report()
+        return progress.stages
+
+    def _import_ways(self, pbf_path: Path, progress: "_ImportProgress") -> np.ndarray:
+        """Ways pass: insert roads in batches, return the sorted IDs of their nodes."""
+        conn = self._get_conn()
+        way_rows: List[tuple] = []
+        way_node_rows: List[Tuple[int, int, int]] = []
+        refs = array("q")
+        ref_chunks: List[np.ndarray] = []
+
+        def flush() -> None:
+            conn.executemany(_INSERT_WAY, way_rows)
+            conn.executemany(_INSERT_WAY_NODE, way_node_rows)
+            conn.commit()
+            way_rows.clear()
+            way_node_rows.clear()
+            # Roads share nodes, so de-duplicate as we go
+            ref_chunks.append(np.unique(np.array(refs, dtype=np.int64)))
+            del refs[:]
+            if len(ref_chunks) >= 16:
+                ref_chunks[:] = [np.unique(np.concatenate(ref_chunks))]
+
+        def on_way(way: Way) -> None:
+            way_rows.append(_way_row(way))
+            way_node_rows.extend((way.id, idx, node_id) for idx, node_id in enumerate(way.nodes))
+            refs.extend(way.nodes)
+            if len(way_rows) >= IMPORT_BATCH_SIZE:
+                flush()
+                progress.update(handler.road_count, handler.road_count, "roads")
+
+        progress.start("Pass 1: Extracting ways")
+        handler = _WayExtractor(self.HIGHWAY_TYPES, on_way)
+        handler.apply_file(str(pbf_path))
+        flush()
+        needed = np.unique(np.concatenate(ref_chunks))
+        progress.finish(handler.road_count, "roads")
+        print(f"    Found {handler.road_count:,} roads in {handler.way_count:,} ways, "
+              f"need {len(needed):,} nodes", flush=True)
+        return needed
+
+    def _import_nodes(
+        self, pbf_path: Path, needed_path: Path, progress: "_ImportProgress", workers: int
+    ) -> None:
+        """Nodes pass: insert needed node locations, crossings and barriers."""
         conn = self._get_conn()
+        header, blocks = _pbf_blocks(pbf_path)
+        ranges = _block_ranges(blocks, NODE_TASK_BLOCKS)
 
-        # Clear existing data
+        progress.start(f"Pass 2: Extracting nodes ({workers} workers)", len(ranges))
+        scanned = found = crossings = barriers = 0
+        results = _node_range_results(str(pbf_path), header, ranges, needed_path, workers)
+        for done, (count, ids, lats, lons, crossing_rows, barrier_rows) in enumerate(results, 1):
+            conn.executemany(
+                "INSERT OR IGNORE INTO nodes (id, lat, lon) VALUES (?, ?, ?)",
+                zip(ids.tolist(), lats.tolist(), lons.tolist())
+            )
+            conn.executemany(_INSERT_CROSSING, crossing_rows)
+            conn.executemany(_INSERT_BARRIER, barrier_rows)
+            conn.commit()
+            scanned += count
+            found += len(ids)
+            crossings += len(crossing_rows)
+            barriers += len(barrier_rows)
+            progress.update(done, scanned, "nodes scanned")
+        progress.finish(scanned, "nodes scanned")
+        print(f"    Found {found:,} nodes, {crossings:,} crossings, {barriers:,} barriers",
+              flush=True)
+
+    def import_network(
+        self,
+        nodes: Dict[int, Node],
+        ways: Dict[int, Way],
+        railway_crossings: Optional[Dict[int, RailwayCrossing]] = None,
+        barriers: Optional[Dict[int, Barrier]] = None,
+    ) -> None:
+        """Replace the cache contents with an in-memory road network.
+
+        Same tables and indices as import_from_pbf, for networks built
+        without osmium (tests, benchmarks, converted caches).
+        """
+        self._clear()
+        try:
+            self._insert_ways(ways)
+            self._insert_nodes(nodes, railway_crossings or {}, barriers or {})
+            self._finish_import(_ImportProgress())
+        except BaseException:
+            self._restore_indices()
+            raise
+
+    def _clear(self) -> None:
+        """Delete all road data.
+
+        Also drops the way_nodes indices, so bulk inserts do not maintain
+        them row by row; _finish_import() recreates them.
+        """
+        conn = self._get_conn()
         conn.executescript("""
             DELETE FROM nodes;
             DELETE FROM ways;
@@ -343,193 +536,139 @@ class SQLiteMapCache:
             DELETE FROM node_rtree;
             DELETE FROM railway_rtree;
             DELETE FROM barrier_rtree;
+            DELETE FROM metadata WHERE key IN ('bounds', 'source_file');
+            DROP INDEX IF EXISTS idx_way_nodes_node;
+            DROP INDEX IF EXISTS idx_way_nodes_way;
         """)
         conn.commit()
 
-        print(f"  Pass 1: Extracting ways...", flush=True)
-
-        # Pass 1: Extract ways
-        way_handler = _WayExtractor(self.HIGHWAY_TYPES)
-        way_handler.apply_file(str(pbf_path))
-
-        ways = way_handler.ways
-        needed_nodes = way_handler.needed_nodes
-        print(f"    Found {len(ways):,} roads, need {len(needed_nodes):,} nodes", flush=True)
-
-        # Insert ways
-        print(f"  Inserting ways...", flush=True)
-        conn.executemany("""
-            INSERT INTO ways (id, name, highway_type, oneway, speed_limit,
-                             bridge, tunnel, surface, ford, traffic_calming,
-                             width, narrow)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            (w.id, w.name, w.highway_type, w.oneway, w.speed_limit,
-             w.bridge, w.tunnel, w.surface, w.ford, w.traffic_calming,
-             w.width, w.narrow)
-            for w in ways.values()
-        ])
-
-        # Insert way-node relationships
-        print(f"  Inserting way-node relationships...", flush=True)
-        way_node_rows = []
-        for way in ways.values():
-            for idx, node_id in enumerate(way.nodes):
-                way_node_rows.append((way.id, idx, node_id))
-        conn.executemany(
-            "INSERT INTO way_nodes (way_id, idx, node_id) VALUES (?, ?, ?)",
-            way_node_rows
-        )
-        conn.commit()
-        del way_node_rows
-
-        print(f"  Pass 2: Extracting nodes...", flush=True)
+    def _restore_indices(self) -> None:
+        """Recreate the way_nodes indices after a failed import.
 
-        # Pass 2: Extract needed nodes
-        node_handler = _NodeExtractor(needed_nodes)
-        node_handler.apply_file(str(pbf_path), locations=True)
+        Keeps lookups on whatever rows made it in from falling back to full
+        table scans.
+        """
+        conn = self._get_conn()
+        try:
+            conn.rollback()
+            conn.executescript(_CREATE_WAY_NODE_INDICES)
+        except sqlite3.Error:
+            pass  # _ensure_schema() recreates them when the cache is next opened
 
-        nodes = node_handler.nodes
-        railway_crossings = node_handler.railway_crossings
-        barriers = node_handler.barriers
-        print(f"    Found {len(nodes):,} nodes, {len(railway_crossings):,} crossings, {len(barriers):,} barriers", flush=True)
+    def _insert_ways(self, ways: Dict[int, Way]) -> None:
+        """Insert ways and their ordered way-node rows."""
+        conn = self._get_conn()
+        conn.executemany(_INSERT_WAY, [_way_row(w) for w in ways.values()])
+        conn.executemany(_INSERT_WAY_NODE, (
+            (way.id, idx, node_id)
+            for way in ways.values()
+            for idx, node_id in enumerate(way.nodes)
+        ))
+        conn.commit()
 
-        # Insert nodes and spatial index
-        print(f"  Inserting nodes with spatial index...", flush=True)
+    def _insert_nodes(
+        self,
+        nodes: Dict[int, Node],
+        railway_crossings: Dict[int, RailwayCrossing],
+        barriers: Dict[int, Barrier],
+    ) -> None:
+        """Insert nodes, crossings and barriers (R-trees are built after)."""
+        conn = self._get_conn()
         conn.executemany(
-            "INSERT INTO nodes (id, lat, lon) VALUES (?, ?, ?)",
+            "INSERT OR IGNORE INTO nodes (id, lat, lon) VALUES (?, ?, ?)",
             [(n.id, n.lat, n.lon) for n in nodes.values()]
         )
         conn.executemany(
-            "INSERT INTO node_rtree (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)",
-            [(n.id, n.lat, n.lat, n.lon, n.lon) for n in nodes.values()]
+            _INSERT_CROSSING,
+            [(r.node_id, r.lat, r.lon) for r in railway_crossings.values()]
+        )
+        conn.executemany(
+            _INSERT_BARRIER,
+            [(b.node_id, b.lat, b.lon, b.barrier_type) for b in barriers.values()]
         )
-
-        # Insert railway crossings
-        if railway_crossings:
-            conn.executemany(
-                "INSERT INTO railway_crossings (node_id, lat, lon) VALUES (?, ?, ?)",
-                [(r.node_id, r.lat, r.lon) for r in railway_crossings.values()]
-            )
-            conn.executemany(
-                "INSERT INTO railway_rtree (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)",
-                [(r.node_id, r.lat, r.lat, r.lon, r.lon) for r in railway_crossings.values()]
-            )
-
-        # Insert barriers
-        if barriers:
-            conn.executemany(
-                "INSERT INTO barriers (node_id, lat, lon, barrier_type) VALUES (?, ?, ?, ?)",
-                [(b.node_id, b.lat, b.lon, b.barrier_type) for b in barriers.values()]
-            )
-            conn.executemany(
-                "INSERT INTO barrier_rtree (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)",
-                [(b.node_id, b.lat, b.lat, b.lon, b.lon) for b in barriers.values()]
-            )
-
         conn.commit()
 
-        # Build junctions
-        print(f"  Computing junctions...", flush=True)
-        self._build_junctions(nodes, ways)
+    def _finish_import(self, progress: "_ImportProgress") -> None:
+        """Build indices, R-trees and junctions once all rows are in."""
+        conn = self._get_conn()
 
-        # Store import metadata
-        bounds = self.get_bounds()
-        conn.execute(
-            "INSERT OR REPLACE INTO metadata (key, version) VALUES ('source_file', ?)",
-            (str(pbf_path),)
-        )
+        progress.start("Building indices")
+        conn.executescript(_CREATE_WAY_NODE_INDICES + """
+            INSERT INTO node_rtree (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT id, lat, lat, lon, lon FROM nodes;
+            INSERT INTO railway_rtree (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT node_id, lat, lat, lon, lon FROM railway_crossings;
+            INSERT INTO barrier_rtree (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT node_id, lat, lat, lon, lon FROM barriers;
+        """)
         conn.commit()
+        progress.finish(conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0], "nodes")
 
-        # Optimize query planner with statistics
-        print(f"  Running ANALYZE for query optimization...", flush=True)
+        progress.start("Computing junctions")
+        progress.finish(self._build_junctions(), "junctions")
+
+        # Cache bounds, and optimize query planner with statistics
+        progress.start("Running ANALYZE")
+        self.get_bounds()
         conn.execute("ANALYZE")
         conn.commit()
+        progress.finish(0, "")
 
-        print(f"  Import complete!", flush=True)
+    def _build_junctions(self) -> int:
+        """Build the junction tables from way_nodes, returning the junction count.
 
-    def _build_junctions(self, nodes: Dict[int, Node], ways: Dict[int, Way]) -> None:
-        """Build junction table from way data."""
+        Junctions are nodes on two or more ways. Their bearings to each
+        way's neighbouring nodes (at the node's first position in the way)
+        are read back in junction order to find T-junctions.
+        """
         conn = self._get_conn()
+        cur = conn.cursor()
+        cur.row_factory = None
 
-        # Count way references per node
-        node_way_count: Dict[int, List[int]] = {}
-        for way in ways.values():
-            for node_id in way.nodes:
-                if node_id not in node_way_count:
-                    node_way_count[node_id] = []
-                node_way_count[node_id].append(way.id)
-
-        # Junctions are nodes with 2+ ways
-        junctions = []
-        junction_ways = []
-        for node_id, way_ids in node_way_count.items():
-            # De-duplicate way_ids (a node can appear multiple times in same way)
-            unique_way_ids = list(set(way_ids))
-            if len(unique_way_ids) >= 2 and node_id in nodes:
-                node = nodes[node_id]
-                is_t = self._is_t_junction(node_id, unique_way_ids, nodes, ways)
-                junctions.append((node_id, node.lat, node.lon, is_t))
-                for way_id in unique_way_ids:
-                    junction_ways.append((node_id, way_id))
+        cur.executescript("""
+            DROP TABLE IF EXISTS temp.junction_arms;
+            CREATE TEMP TABLE junction_arms (
+                node_id INTEGER,
+                way_id INTEGER,
+                idx INTEGER,
+                PRIMARY KEY (node_id, way_id)
+            );
+            INSERT INTO temp.junction_arms (node_id, way_id, idx)
+                SELECT wn.node_id, wn.way_id, MIN(wn.idx)
+                FROM way_nodes wn
+                WHERE wn.node_id IN (
+                    SELECT node_id FROM way_nodes
+                    GROUP BY node_id HAVING COUNT(DISTINCT way_id) >= 2
+                )
+                AND wn.node_id IN (SELECT id FROM nodes)
+                GROUP BY wn.node_id, wn.way_id;
+
+            INSERT INTO junctions (node_id, lat, lon, is_t_junction)
+                SELECT n.id, n.lat, n.lon, 0
+                FROM (SELECT DISTINCT node_id FROM temp.junction_arms) a
+                CROSS JOIN nodes n ON n.id = a.node_id;
+            INSERT INTO junction_ways (junction_id, way_id)
+                SELECT node_id, way_id FROM temp.junction_arms;
+        """)
 
-        conn.executemany(
-            "INSERT INTO junctions (node_id, lat, lon, is_t_junction) VALUES (?, ?, ?, ?)",
-            junctions
-        )
-        conn.executemany(
-            "INSERT INTO junction_ways (junction_id, way_id) VALUES (?, ?)",
-            junction_ways
+        cur.execute("""
+            SELECT a.node_id, j.lat, j.lon, n.lat, n.lon
+            FROM temp.junction_arms a
+            CROSS JOIN nodes j ON j.id = a.node_id
+            CROSS JOIN way_nodes nb ON nb.way_id = a.way_id AND nb.idx IN (a.idx - 1, a.idx + 1)
+            CROSS JOIN nodes n ON n.id = nb.node_id
+            ORDER BY a.node_id, a.way_id
+        """)
+        t_junctions = [
+            (node_id,) for node_id, bearings in _junction_bearings(cur)
+            if _is_t_junction(bearings)
+        ]
+        cur.executemany(
+            "UPDATE junctions SET is_t_junction = 1 WHERE node_id = ?", t_junctions
         )
+        cur.execute("DROP TABLE temp.junction_arms")
         conn.commit()
-        print(f"    Found {len(junctions):,} junctions", flush=True)
-
-    def _is_t_junction(
-        self,
-        node_id: int,
-        way_ids: List[int],
-        nodes: Dict[int, Node],
-        ways: Dict[int, Way]
-    ) -> bool:
-        """Check if junction is a T-junction."""
-        if len(way_ids) < 2:
-            return False
-
-        node = nodes[node_id]
-        bearings = []
-
-        for wid in way_ids:
-            way = ways[wid]
-            try:
-                idx = way.nodes.index(node_id)
-            except ValueError:
-                continue
-
-            if idx > 0 and way.nodes[idx - 1] in nodes:
-                prev = nodes[way.nodes[idx - 1]]
-                b = bearing(node.lat, node.lon, prev.lat, prev.lon)
-                bearings.append(b)
-            if idx < len(way.nodes) - 1 and way.nodes[idx + 1] in nodes:
-                next_n = nodes[way.nodes[idx + 1]]
-                b = bearing(node.lat, node.lon, next_n.lat, next_n.lon)
-                bearings.append(b)
-
-        if len(bearings) < 3:
-            return False
-
-        for i, b1 in enumerate(bearings):
-            for j, b2 in enumerate(bearings):
-                if i >= j:
-                    continue
-                diff = abs((b1 - b2 + 180) % 360 - 180)
-                if 150 < diff < 210 or diff < 30:
-                    for k, b3 in enumerate(bearings):
-                        if k == i or k == j:
-                            continue
-                        diff1 = abs((b3 - b1 + 180) % 360 - 180)
-                        if 60 < diff1 < 120:
-                            return True
-        return False
+        return conn.execute("SELECT COUNT(*) FROM junctions").fetchone()[0]
 
     def load_region(
         self,
@@ -539,7 +678,10 @@ class SQLiteMapCache:
     ) -> RoadNetwork:
         """Load road network within radius of center point.
 
-        Uses R-tree spatial index for efficient bbox queries.
+        Uses R-tree spatial index for efficient bbox queries. The ways
+        touching the bbox are collected into a temp table once, then ways,
+        way nodes (with coordinates, in way order) and junctions are each
+        read with a single JOIN against it.
 
         Args:
             center_lat: Center latitude
@@ -551,8 +693,6 @@ class SQLiteMapCache:
         """
         import math
 
-        conn = self._get_conn()
-
         # Calculate bounding box
         lat_delta = radius_m / 111000
         lon_delta = radius_m / (111000 * math.cos(math.radians(center_lat)))
@@ -561,129 +701,118 @@ class SQLiteMapCache:
         min_lon = center_lon - lon_delta
         max_lon = center_lon + lon_delta
 
+        with self._region_lock:
+            try:
+                return self._load_region_bbox(min_lat, max_lat, min_lon, max_lon)
+            finally:
+                # The temp table writes open a transaction; close it so the
+                # connection does not hold a WAL read snapshot (which blocks
+                # checkpoints and hides later writes)
+                self._get_conn().commit()
+
+    def _load_region_bbox(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> RoadNetwork:
+        """Load the road network within a bbox (see load_region)."""
+        conn = self._get_conn()
         network = RoadNetwork()
 
-        # Query nodes in bbox using R-tree
-        node_rows = conn.execute("""
-            SELECT n.id, n.lat, n.lon
-            FROM nodes n
-            INNER JOIN node_rtree r ON n.id = r.id
+        # Plain tuple rows for the bulk queries (sqlite3.Row costs per row)
+        cur = conn.cursor()
+        cur.row_factory = None
+
+        # Ways with at least one node in the bbox
+        cur.executescript("""
+            CREATE TEMP TABLE IF NOT EXISTS region_ways (way_id INTEGER PRIMARY KEY);
+            CREATE TEMP TABLE IF NOT EXISTS region_junctions (node_id INTEGER PRIMARY KEY);
+            DELETE FROM temp.region_ways;
+            DELETE FROM temp.region_junctions;
+        """)
+        cur.execute("""
+            INSERT OR IGNORE INTO temp.region_ways (way_id)
+            SELECT wn.way_id
+            FROM node_rtree r
+            INNER JOIN way_nodes wn ON wn.node_id = r.id
             WHERE r.min_lat >= ? AND r.max_lat <= ?
               AND r.min_lon >= ? AND r.max_lon <= ?
-        """, (min_lat, max_lat, min_lon, max_lon)).fetchall()
-
-        node_ids = set()
-        for row in node_rows:
-            network.nodes[row['id']] = Node(row['id'], row['lat'], row['lon'])
-            node_ids.add(row['id'])
-
-        if not node_ids:
+        """, (min_lat, max_lat, min_lon, max_lon))
+
+        # Way nodes with coordinates, already in (way_id, idx) order. Includes
+        # nodes outside the bbox so ways keep their full geometry.
+        nodes = network.nodes
+        node_to_ways = network.node_to_ways
+        way_nodes: Dict[int, List[int]] = {}
+        current_way = None
+        current_nodes: List[int] = []
+        for way_id, node_id, lat, lon in cur.execute("""
+            SELECT wn.way_id, wn.node_id, n.lat, n.lon
+            FROM temp.region_ways rw
+            CROSS JOIN way_nodes wn ON wn.way_id = rw.way_id
+            LEFT JOIN nodes n ON n.id = wn.node_id
+            ORDER BY rw.way_id, wn.idx
+        """):
+            if way_id != current_way:
+                current_way = way_id
+                current_nodes = way_nodes[way_id] = []
+            current_nodes.append(node_id)
+            if lat is not None and node_id not in nodes:
+                nodes[node_id] = Node(node_id, lat, lon)
+            if node_id in node_to_ways:
+                node_to_ways[node_id].append(way_id)
+            else:
+                node_to_ways[node_id] = [way_id]
+
+        if not way_nodes:
             return network
 
-        # Find ways that have nodes in our bbox (chunked to avoid SQLite variable limit)
-        way_ids = set()
-        node_list = list(node_ids)
-        chunk_size = 500  # SQLite has ~999 variable limit
-        for i in range(0, len(node_list), chunk_size):
-            chunk = node_list[i:i + chunk_size]
-            placeholders = ",".join("?" * len(chunk))
-            rows = conn.execute(f"""
-                SELECT DISTINCT way_id FROM way_nodes
-                WHERE node_id IN ({placeholders})
-            """, chunk).fetchall()
-            way_ids.update(r['way_id'] for r in rows)
-
-        way_ids = list(way_ids)
-        if not way_ids:
-            return network
-
-        # Load ways (chunked)
-        way_rows = []
-        for i in range(0, len(way_ids), chunk_size):
-            chunk = way_ids[i:i + chunk_size]
-            placeholders = ",".join("?" * len(chunk))
-            rows = conn.execute(f"""
-                SELECT * FROM ways WHERE id IN ({placeholders})
-            """, chunk).fetchall()
-            way_rows.extend(rows)
-
-        # Batch load all way_nodes at once (avoid N+1 queries)
-        way_node_map: Dict[int, List[Tuple[int, int]]] = {}  # way_id -> [(idx, node_id)]
-        for i in range(0, len(way_ids), chunk_size):
-            chunk = way_ids[i:i + chunk_size]
-            placeholders = ",".join("?" * len(chunk))
-            wn_rows = conn.execute(f"""
-                SELECT way_id, idx, node_id FROM way_nodes
-                WHERE way_id IN ({placeholders})
-            """, chunk).fetchall()
-            for r in wn_rows:
-                if r['way_id'] not in way_node_map:
-                    way_node_map[r['way_id']] = []
-                way_node_map[r['way_id']].append((r['idx'], r['node_id']))
-
-        # Sort each way's nodes by idx and extract node_ids
-        for way_id in way_node_map:
-            way_node_map[way_id].sort(key=lambda x: x[0])
-
-        for row in way_rows:
-            node_list = [n[1] for n in way_node_map.get(row['id'], [])]
-
-            network.ways[row['id']] = Way(
-                id=row['id'],
-                nodes=node_list,
-                name=row['name'] or "",
-                highway_type=row['highway_type'] or "",
-                oneway=bool(row['oneway']),
-                speed_limit=row['speed_limit'] or 0,
-                bridge=bool(row['bridge']),
-                tunnel=bool(row['tunnel']),
-                surface=row['surface'] or "",
-                ford=bool(row['ford']),
-                traffic_calming=row['traffic_calming'] or "",
-                width=row['width'] or 0.0,
-                narrow=bool(row['narrow']),
+        for (way_id, name, highway_type, oneway, speed_limit, bridge, tunnel,
+             surface, ford, traffic_calming, width, narrow) in cur.execute("""
+            SELECT w.id, w.name, w.highway_type, w.oneway, w.speed_limit,
+                   w.bridge, w.tunnel, w.surface, w.ford, w.traffic_calming,
+                   w.width, w.narrow
+            FROM temp.region_ways rw
+            CROSS JOIN ways w ON w.id = rw.way_id
+        """):
+            network.ways[way_id] = Way(
+                id=way_id,
+                nodes=way_nodes.get(way_id, []),
+                name=name or "",
+                highway_type=highway_type or "",
+                oneway=bool(oneway),
+                speed_limit=speed_limit or 0,
+                bridge=bool(bridge),
+                tunnel=bool(tunnel),
+                surface=surface or "",
+                ford=bool(ford),
+                traffic_calming=traffic_calming or "",
+                width=width or 0.0,
+                narrow=bool(narrow),
             )
 
-            # Load any nodes we don't have yet (way extends outside bbox)
-            for nid in node_list:
-                if nid not in network.nodes:
-                    n_row = conn.execute(
-                        "SELECT id, lat, lon FROM nodes WHERE id = ?", (nid,)
-                    ).fetchone()
-                    if n_row:
-                        network.nodes[n_row['id']] = Node(n_row['id'], n_row['lat'], n_row['lon'])
-
-        # Build node_to_ways index
-        for way in network.ways.values():
-            for nid in way.nodes:
-                if nid not in network.node_to_ways:
-                    network.node_to_ways[nid] = []
-                network.node_to_ways[nid].append(way.id)
-
-        # Load junctions in our node set (chunked)
-        junction_node_ids = [nid for nid in network.node_to_ways if len(network.node_to_ways[nid]) >= 2]
-        for i in range(0, len(junction_node_ids), chunk_size):
-            chunk = junction_node_ids[i:i + chunk_size]
-            placeholders = ",".join("?" * len(chunk))
-            junc_rows = conn.execute(f"""
-                SELECT node_id, lat, lon, is_t_junction FROM junctions
-                WHERE node_id IN ({placeholders})
-            """, chunk).fetchall()
-
-            for row in junc_rows:
-                # Get connected ways
-                jw_rows = conn.execute("""
-                    SELECT way_id FROM junction_ways WHERE junction_id = ?
-                """, (row['node_id'],)).fetchall()
-                way_list = [r['way_id'] for r in jw_rows]
-
-                network.junctions[row['node_id']] = Junction(
-                    node_id=row['node_id'],
-                    lat=row['lat'],
-                    lon=row['lon'],
-                    connected_ways=way_list,
-                    is_t_junction=bool(row['is_t_junction']),
+        # Junctions at nodes shared by loaded ways, with all their connected
+        # ways (including ways outside the region), grouped by junction
+        cur.executemany(
+            "INSERT INTO temp.region_junctions (node_id) VALUES (?)",
+            [(nid,) for nid, way_ids in node_to_ways.items() if len(way_ids) >= 2]
+        )
+        junction = None
+        for node_id, lat, lon, is_t, way_id in cur.execute("""
+            SELECT j.node_id, j.lat, j.lon, j.is_t_junction, jw.way_id
+            FROM temp.region_junctions rj
+            CROSS JOIN junctions j ON j.node_id = rj.node_id
+            CROSS JOIN junction_ways jw ON jw.junction_id = rj.node_id
+            ORDER BY rj.node_id, jw.way_id
+        """):
+            if junction is None or junction.node_id != node_id:
+                junction = Junction(
+                    node_id=node_id,
+                    lat=lat,
+                    lon=lon,
+                    connected_ways=[],
+                    is_t_junction=bool(is_t),
                 )
+                network.junctions[node_id] = junction
+            junction.connected_ways.append(way_id)
 
         # Load railway crossings using R-tree
         rail_rows = conn.execute("""
@@ -729,59 +858,283 @@ class SQLiteMapCache:
             self._conn = None
 
 
+class _ImportProgress:
+    """Stage timings, rate-limited progress lines and progress callbacks."""
+
+    def __init__(self, callback=None, interval_s: float = 5.0):
+        self.callback = callback
+        self.interval_s = interval_s
+        self.stages: List[ImportStage] = []
+        self._name = ""
+        self._total = 0
+        self._start = 0.0
+        self._last_print = 0.0
+
+    def start(self, name: str, total: int = 0) -> None:
+        """Begin a stage of total steps (0 if unknown)."""
+        print(f"  {name}...", flush=True)
+        self._name = name
+        self._total = total
+        self._start = self._last_print = time.perf_counter()
+
+    def update(self, current: int, items: int, unit: str) -> None:
+        """Report progress through the current stage."""
+        if self.callback:
+            self.callback(self._name, current, self._total)
+        now = time.perf_counter()
+        if now - self._last_print < self.interval_s:
+            return
+        self._last_print = now
+        steps = f"{current:,}/{self._total:,}, " if self._total else ""
+        print(f"    {steps}{items:,} {unit} ({items / (now - self._start):,.0f}/s)", flush=True)
+
+    def finish(self, items: int, unit: str) -> None:
+        """End the current stage, recording items processed."""
+        self.stages.append(ImportStage(self._name, items, unit, time.perf_counter() - self._start))
+
+    def report(self) -> None:
+        """Print time and throughput per stage."""
+        total_s = sum(stage.seconds for stage in self.stages)
+        print(f"  Import complete in {total_s:.1f}s", flush=True)
+        for stage in self.stages:
+            rate = f"{stage.items:,} {stage.unit} ({stage.rate:,.0f}/s)" if stage.items else ""
+            print(f"    {stage.name:<40} {stage.seconds:7.1f}s  {rate}", flush=True)
+
+
+def _junction_bearings(cursor: sqlite3.Cursor) -> Iterator[Tuple[int, List[float]]]:
+    """Group (junction, lat, lon, neighbour lat, neighbour lon) rows by junction.
+
+    Rows must be ordered by junction. Yields each junction with the
+    bearings from it to its neighbours, computed a batch of rows at a time.
+    """
+    current, bearings = None, []
+    while True:
+        rows = cursor.fetchmany(100000)
+        if not rows:
+            break
+        ids, lats, lons, next_lats, next_lons = zip(*rows)
+        for node_id, b in zip(ids, gk.bearing(lats, lons, next_lats, next_lons).tolist()):
+            if node_id != current:
+                if bearings:
+                    yield current, bearings
+                current, bearings = node_id, []
+            bearings.append(b)
+    if bearings:
+        yield current, bearings
+
+
+def _is_t_junction(bearings: List[float]) -> bool:
+    """Check if the bearings from a junction to its neighbours form a T.
+
+    True when two arms run straight on (or double back) and a third
+    leaves them at roughly a right angle.
+    """
+    if len(bearings) < 3:
+        return False
+
+    for i, b1 in enumerate(bearings):
+        for j, b2 in enumerate(bearings):
+            if i >= j:
+                continue
+            diff = abs((b1 - b2 + 180) % 360 - 180)
+            if 150 < diff < 210 or diff < 30:
+                for k, b3 in enumerate(bearings):
+                    if k == i or k == j:
+                        continue
+                    diff1 = abs((b3 - b1 + 180) % 360 - 180)
+                    if 60 < diff1 < 120:
+                        return True
+    return False
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode a protobuf varint, returning (value, next position)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _parse_blob_header(data: bytes) -> Tuple[str, int]:
+    """(type, datasize) from an OSM PBF BlobHeader message."""
+    blob_type, data_size, pos = "", 0, 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+            if field == 3:
+                data_size = value
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            if field == 1:
+                blob_type = data[pos:pos + length].decode("utf-8")
+            pos += length
+        else:
+            raise ValueError(f"Unexpected wire type {wire_type} in PBF blob header")
+    return blob_type, data_size
+
+
+def _pbf_blocks(pbf_path: Path) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """Split an OSM PBF file into blocks without decoding them.
+
+    Returns the raw OSMHeader block and the (offset, size) of each
+    OSMData block. The header followed by any run of data blocks is
+    itself a valid PBF file, so workers can decode ranges independently.
+    """
+    header = b""
+    blocks: List[Tuple[int, int]] = []
+    offset = 0
+    with open(pbf_path, "rb") as f:
+        while True:
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                break
+            header_size = struct.unpack(">I", prefix)[0]
+            blob_header = f.read(header_size)
+            if len(blob_header) < header_size:
+                raise ValueError(f"Truncated PBF blob header at offset {offset}")
+            blob_type, data_size = _parse_blob_header(blob_header)
+            size = 4 + header_size + data_size
+            if blob_type == "OSMHeader":
+                header = prefix + blob_header + f.read(data_size)
+            else:
+                blocks.append((offset, size))
+                f.seek(data_size, os.SEEK_CUR)
+            offset += size
+    if not header:
+        raise ValueError(f"{pbf_path} is not an OSM PBF file (no OSMHeader block)")
+    return header, blocks
+
+
+def _block_ranges(blocks: List[Tuple[int, int]], per_range: int) -> List[Tuple[int, int]]:
+    """(start, end) file offsets of runs of up to per_range consecutive blocks."""
+    ranges = []
+    for i in range(0, len(blocks), per_range):
+        last_offset, last_size = blocks[min(i + per_range, len(blocks)) - 1]
+        ranges.append((blocks[i][0], last_offset + last_size))
+    return ranges
+
+
+# Nodes pass worker state: sorted IDs of the nodes roads need (memory-mapped)
+_needed_nodes: Optional[np.ndarray] = None
+
+
+def _init_node_worker(needed_path: Path) -> None:
+    global _needed_nodes
+    _needed_nodes = np.load(needed_path, mmap_mode="r")
+
+
+def _needed(ids: np.ndarray) -> np.ndarray:
+    """Mask of ids that are in the worker's needed node IDs."""
+    if not len(_needed_nodes) or not len(ids):
+        return np.zeros(len(ids), dtype=bool)
+    slots = np.searchsorted(_needed_nodes, ids).clip(max=len(_needed_nodes) - 1)
+    return _needed_nodes[slots] == ids
+
+
+def _needed_rows(rows: List[tuple]) -> List[tuple]:
+    """Rows whose first column is a needed node ID."""
+    keep = _needed(np.array([row[0] for row in rows], dtype=np.int64))
+    return [row for row, k in zip(rows, keep) if k]
+
+
+def _extract_node_range(pbf_path: str, header: bytes, start: int, end: int) -> tuple:
+    """Nodes pass task: scan one range of PBF blocks.
+
+    Returns (nodes scanned, ids, lats, lons, crossing rows, barrier rows)
+    for the needed nodes in the range.
+    """
+    with open(pbf_path, "rb") as f:
+        f.seek(start)
+        data = header + f.read(end - start)
+    handler = _NodeExtractor()
+    handler.apply_buffer(data, "pbf")
+
+    ids = np.frombuffer(handler.ids, dtype=np.int64)
+    keep = _needed(ids)
+    return (
+        len(ids),
+        ids[keep],
+        np.frombuffer(handler.lats, dtype=np.float64)[keep],
+        np.frombuffer(handler.lons, dtype=np.float64)[keep],
+        _needed_rows(handler.railway_crossings),
+        _needed_rows(handler.barriers),
+    )
+
+
+def _node_range_results(
+    pbf_path: str,
+    header: bytes,
+    ranges: List[Tuple[int, int]],
+    needed_path: Path,
+    workers: int,
+) -> Iterator[tuple]:
+    """Results of _extract_node_range for each range, in file order.
+
+    At most two tasks per worker are in flight, so results wait in memory
+    only as long as the database writes lag behind.
+    """
+    global _needed_nodes
+    if workers <= 1:
+        _init_node_worker(needed_path)
+        try:
+            for start, end in ranges:
+                yield _extract_node_range(pbf_path, header, start, end)
+        finally:
+            _needed_nodes = None
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_node_worker, initargs=(needed_path,)
+    ) as pool:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(_extract_node_range, pbf_path, header, start, end))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 class _WayExtractor(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
-    """First-pass handler: extract ways and collect needed node IDs."""
+    """Ways pass handler: pass each road way to a callback as it is read."""
 
-    def __init__(self, highway_types: Set[str]):
+    def __init__(self, highway_types: Set[str], on_way: Callable[[Way], None]):
         if OSMIUM_AVAILABLE:
             super().__init__()
         self.highway_types = highway_types
-        self.ways: Dict[int, Way] = {}
-        self.needed_nodes: Set[int] = set()
-        self._way_count = 0
-        self._road_count = 0
+        self.on_way = on_way
+        self.way_count = 0
+        self.road_count = 0
 
     def way(self, w):
-        self._way_count += 1
-        if self._way_count % 500000 == 0:
-            print(f"    Scanned {self._way_count:,} ways, found {self._road_count:,} roads...", flush=True)
-
-        tags = {tag.k: tag.v for tag in w.tags}
-        highway = tags.get("highway", "")
-
+        self.way_count += 1
+        highway = w.tags.get("highway", "")
         if highway not in self.highway_types:
             return
 
-        node_refs = [n.ref for n in w.nodes]
-
-        name = tags.get("name", "")
-        oneway = tags.get("oneway", "no") in ("yes", "true", "1")
-        speed_limit = self._parse_speed_limit(tags.get("maxspeed", ""))
-        bridge = tags.get("bridge", "no") not in ("no", "")
-        tunnel = tags.get("tunnel", "no") not in ("no", "")
-        surface = tags.get("surface", "")
-        ford = tags.get("ford", "no") not in ("no", "")
-        traffic_calming = tags.get("traffic_calming", "")
-        width = self._parse_width(tags.get("width", ""))
-        narrow = tags.get("narrow", "no") not in ("no", "")
-
-        self.ways[w.id] = Way(
+        tags = {tag.k: tag.v for tag in w.tags}
+        self.on_way(Way(
             id=w.id,
-            nodes=node_refs,
-            name=name,
+            nodes=[n.ref for n in w.nodes],
+            name=tags.get("name", ""),
             highway_type=highway,
-            oneway=oneway,
-            speed_limit=speed_limit,
-            bridge=bridge,
-            tunnel=tunnel,
-            surface=surface,
-            ford=ford,
-            traffic_calming=traffic_calming,
-            width=width,
-            narrow=narrow,
-        )
-        self.needed_nodes.update(node_refs)
-        self._road_count += 1
+            oneway=tags.get("oneway", "no") in ("yes", "true", "1"),
+            speed_limit=self._parse_speed_limit(tags.get("maxspeed", "")),
+            bridge=tags.get("bridge", "no") not in ("no", ""),
+            tunnel=tags.get("tunnel", "no") not in ("no", ""),
+            surface=tags.get("surface", ""),
+            ford=tags.get("ford", "no") not in ("no", ""),
+            traffic_calming=tags.get("traffic_calming", ""),
+            width=self._parse_width(tags.get("width", "")),
+            narrow=tags.get("narrow", "no") not in ("no", ""),
+        ))
+        self.road_count += 1
 
     def _parse_speed_limit(self, value: str) -> int:
         if not value:
@@ -804,48 +1157,34 @@ class _WayExtractor(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
 
 
 class _NodeExtractor(osmium.SimpleHandler if OSMIUM_AVAILABLE else object):
-    """Second-pass handler: extract only needed nodes."""
+    """Nodes pass handler: collect every node location, and crossing and barrier tags.
 
-    def __init__(self, needed_nodes: Set[int]):
+    Locations go into flat arrays so the worker can filter them against
+    the needed node IDs in one vectorised step.
+    """
+
+    def __init__(self):
         if OSMIUM_AVAILABLE:
             super().__init__()
-        self.needed_nodes = needed_nodes
-        self.nodes: Dict[int, Node] = {}
-        self.railway_crossings: Dict[int, RailwayCrossing] = {}
-        self.barriers: Dict[int, Barrier] = {}
-        self._node_count = 0
-        self._found_count = 0
+        self.ids = array("q")
+        self.lats = array("d")
+        self.lons = array("d")
+        self.railway_crossings: List[Tuple[int, float, float]] = []
+        self.barriers: List[Tuple[int, float, float, str]] = []
 
     def node(self, n):
-        self._node_count += 1
-        if self._node_count % 5000000 == 0:
-            print(f"    Scanned {self._node_count:,} nodes, found {self._found_count:,} needed...", flush=True)
+        location = n.location
+        self.ids.append(n.id)
+        self.lats.append(location.lat)
+        self.lons.append(location.lon)
 
-        if n.id not in self.needed_nodes:
+        tags = n.tags
+        if not len(tags):
             return
 
-        self._found_count += 1
-
-        self.nodes[n.id] = Node(
-            id=n.id,
-            lat=n.location.lat,
-            lon=n.location.lon,
-        )
-
-        tags = {tag.k: tag.v for tag in n.tags}
-
         if tags.get("railway") == "level_crossing":
-            self.railway_crossings[n.id] = RailwayCrossing(
-                node_id=n.id,
-                lat=n.location.lat,
-                lon=n.location.lon,
-            )
+            self.railway_crossings.append((n.id, location.lat, location.lon))
 
         barrier_type = tags.get("barrier", "")
         if barrier_type in ("cattle_grid", "gate"):
-            self.barriers[n.id] = Barrier(
-                node_id=n.id,
-                lat=n.location.lat,
-                lon=n.location.lon,
-                barrier_type=barrier_type,
-            )
+            self.barriers.append((n.id, location.lat, location.lon, barrier_type))
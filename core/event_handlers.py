@@ -208,11 +208,12 @@ class EventHandlerMixin:
     def _recording_save(self):
         """Save recording and stop."""
         self.recorder.stop_recording()
-        filepath = self.recorder.save()
+        # CSV export runs in the background so long sessions don't stall the UI
+        filepath = self.recorder.save_in_background()
         if self.input_handler:
             self.input_handler.recording = False
         if filepath:
-            logger.info("Recording saved to %s", filepath)
+            logger.info("Recording saving to %s", filepath)
 
     def _recording_delete(self):
         """Delete recording without saving."""
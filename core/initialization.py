@@ -80,6 +80,13 @@ from config import (
     PIT_TIMER_ENABLED,
 )
 from utils.settings import get_settings
+from utils.raw_channel_log import (
+    GPS_RAW_KEYS,
+    IMU_RAW_KEYS,
+    OBD2_RAW_KEYS,
+    RADAR_RAW_KEYS,
+    radar_track_rows,
+)
 
 # Import handlers
 from gui.camera import Camera
@@ -720,6 +727,20 @@ class InitializationMixin:
             self.ford_hybrid = None
         logger.debug("ford hybrid init done t=%.1fs", time.time()-_boot_start)
 
+        # Log high-rate channels at native rate alongside telemetry recording
+        if self.imu:
+            self.recorder.register_raw_source("imu", self.imu, IMU_RAW_KEYS)
+        if self.obd2:
+            self.recorder.register_raw_source("obd2", self.obd2, OBD2_RAW_KEYS)
+        if self.gps:
+            self.recorder.register_raw_source("gps", self.gps, GPS_RAW_KEYS)
+        if self.radar_rear:
+            self.recorder.register_raw_source(
+                "radar_rear", self.radar_rear, RADAR_RAW_KEYS, radar_track_rows)
+        if self.radar_front:
+            self.recorder.register_raw_source(
+                "radar_front", self.radar_front, RADAR_RAW_KEYS, radar_track_rows)
+
         # Initialise menu system
         self._show_splash("Initialising menu...", 0.85)
         logger.debug("menu init start t=%.1fs", time.time()-_boot_start)
@@ -1,10 +1,11 @@
 """
 Rendering mixin for openTPT.
 
-Provides the display rendering pipeline including telemetry page,
-fuel warnings, and brightness adjustment.
+Provides the display rendering pipeline including the composited
+telemetry page, fuel warnings, and brightness adjustment.
 """
 
+import functools
 import logging
 import time
 
@@ -24,7 +25,13 @@ from config import (
     SCALE_Y,
     COPILOT_OVERLAY_POSITION,
     TYRE_HISTORY_DISPLAY_DEFAULT,
+    BRAKE_POSITIONS,
+    MLX_POSITIONS,
+    TPMS_POSITIONS,
+    DISPLAY_PARTIAL_UPDATES,
 )
+from gui.compositor import Compositor, merge_rects
+from gui.text_cache import get_font, get_text_cache, render_text
 from utils.conversions import kpa_to_psi
 from utils.settings import get_settings
 
@@ -34,50 +41,56 @@ logger = logging.getLogger('openTPT.render')
 class RenderingMixin:
     """Mixin providing display rendering methods."""
 
-    def _draw_fuel_warning(self):
-        """Draw fuel warning overlay on all pages when fuel is low."""
-        if not self.fuel_tracker:
-            return
+    # Pages drawn directly to the screen each frame (everything else is the telemetry page)
+    _DIRECT_UI_PAGES = ("gmeter", "lap_timing", "fuel", "copilot", "pit_timer")
 
+    def _fuel_warning_level(self):
+        """Current fuel warning ("critical", "low") or None."""
         fuel_state = self.fuel_tracker.get_state()
         if not fuel_state.get('data_available'):
-            return
-
-        critical = fuel_state.get('critical_warning', False)
-        low = fuel_state.get('low_warning', False)
-
-        if not critical and not low:
-            return
-
-        # Lazy-init warning font
-        if not hasattr(self, '_fuel_warning_font'):
-            try:
-                self._fuel_warning_font = pygame.font.Font(FONT_PATH, FONT_SIZE_MEDIUM)
-            except Exception:
-                self._fuel_warning_font = pygame.font.SysFont("monospace", FONT_SIZE_MEDIUM)
-
-        fuel_percent = fuel_state.get('fuel_level_percent', 0) or 0
+            return None
+        if fuel_state.get('critical_warning', False):
+            return "critical"
+        if fuel_state.get('low_warning', False):
+            return "low"
+        return None
+
+    def _draw_fuel_warning(self, level):
+        """Draw fuel warning overlay on all pages when fuel is low."""
+        font = get_font(FONT_PATH, FONT_SIZE_MEDIUM)
+        fuel_percent = self.fuel_tracker.get_state().get('fuel_level_percent', 0) or 0
 
-        if critical:
+        if level == "critical":
             # Flashing critical warning
             if int(time.time() * 2) % 2 == 0:
                 warning_text = f"LOW FUEL {fuel_percent:.0f}%"
-                text = self._fuel_warning_font.render(warning_text, True, RED)
+                text = render_text(font, warning_text, RED)
                 text_rect = text.get_rect(center=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT - int(60 * SCALE_Y)))
                 bg_rect = text_rect.inflate(int(20 * SCALE_X), int(10 * SCALE_Y))
                 pygame.draw.rect(self.screen, (40, 0, 0), bg_rect, border_radius=int(5 * SCALE_Y))
                 pygame.draw.rect(self.screen, RED, bg_rect, width=2, border_radius=int(5 * SCALE_Y))
                 self.screen.blit(text, text_rect)
-        elif low:
+        elif level == "low":
             # Low fuel warning (same style as critical but yellow)
             warning_text = f"LOW FUEL {fuel_percent:.0f}%"
-            text = self._fuel_warning_font.render(warning_text, True, YELLOW)
+            text = render_text(font, warning_text, YELLOW)
             text_rect = text.get_rect(center=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT - int(60 * SCALE_Y)))
             bg_rect = text_rect.inflate(int(20 * SCALE_X), int(10 * SCALE_Y))
             pygame.draw.rect(self.screen, (40, 40, 0), bg_rect, border_radius=int(5 * SCALE_Y))
             pygame.draw.rect(self.screen, YELLOW, bg_rect, width=2, border_radius=int(5 * SCALE_Y))
             self.screen.blit(text, text_rect)
 
+    def _copilot_corner_info(self):
+        """Next corner for the CoPilot indicator, or None if there is none to show."""
+        if not self.copilot:
+            return None
+        snapshot = self.copilot.get_snapshot()
+        if snapshot and snapshot.data and snapshot.data.get('status') == 'active':
+            corner_info = self.copilot.get_next_corner_info()
+            if corner_info.get('distance', 0) > 0:
+                return corner_info
+        return None
+
     def _render(self):
         """
         Render the display.
@@ -85,82 +98,127 @@ class RenderingMixin:
         PERFORMANCE CRITICAL PATH - NO BLOCKING OPERATIONS.
         All data access is lock-free via bounded queue snapshots.
         Target: <= 12 ms/frame (from system plan)
+
+        The telemetry page is composited off-screen (see _render_telemetry_page).
+        While nothing else covers it but the status bars and FPS counter, the
+        screen keeps the previous frame and only changed areas are copied and
+        passed to pygame.display.update().
         """
         # Profiling
         render_times = {}
         t_start = time.time()
 
-        # Clear the screen
-        t0 = time.time()
-        self.screen.fill((0, 0, 0))
-        render_times['clear'] = (time.time() - t0) * 1000
+        telemetry_page = not (
+            self.current_category == "camera" or
+            (self.current_category == "ui" and self.current_ui_page in self._DIRECT_UI_PAGES)
+        )
+        if telemetry_page:
+            self._update_ui_visibility()
+
+        # Overlays drawn over the page this frame
+        fuel_level = None
+        if self.fuel_tracker and self.current_ui_page != "fuel":
+            fuel_level = self._fuel_warning_level()
+        corner_info = self._copilot_corner_info()
+        brightness = self.input_handler.get_brightness()
+        menu_visible = bool(self.menu and self.menu.is_visible())
+        ui_shown = self.input_handler.ui_visible or self.ui_fade_alpha > 0
+
+        quiet = (
+            DISPLAY_PARTIAL_UPDATES and telemetry_page and not menu_visible and
+            not ui_shown and fuel_level is None and corner_info is None
+        )
+        in_place = (
+            quiet and self._screen_retained and brightness == self._retained_brightness
+        )
+        status_bars = []
+        if self.status_bar_enabled and self.top_bar and self.bottom_bar:
+            status_bars = [self.top_bar, self.bottom_bar]
 
         # Render based on current category and page
+        update_rects = None  # None = whole screen
         if self.current_category == "camera":
             # Render camera view
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.camera.render()
             render_times['camera'] = (time.time() - t0) * 1000
         elif self.current_category == "ui" and self.current_ui_page == "gmeter":
             # Render G-meter page
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.gmeter.draw(self.screen)
             render_times['gmeter'] = (time.time() - t0) * 1000
         elif self.current_category == "ui" and self.current_ui_page == "lap_timing":
             # Render lap timing page
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.lap_timing_display.draw(self.screen)
             render_times['lap_timing'] = (time.time() - t0) * 1000
         elif self.current_category == "ui" and self.current_ui_page == "fuel":
             # Render fuel tracking page
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.fuel_display.draw(self.screen)
             render_times['fuel'] = (time.time() - t0) * 1000
         elif self.current_category == "ui" and self.current_ui_page == "copilot":
             # Render CoPilot page
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.copilot_display.draw(self.screen)
             render_times['copilot'] = (time.time() - t0) * 1000
         elif self.current_category == "ui" and self.current_ui_page == "pit_timer":
             # Render Pit Timer page
             t0 = time.time()
+            self.screen.fill((0, 0, 0))
             self.pit_timer_display.draw(self.screen)
             render_times['pit_timer'] = (time.time() - t0) * 1000
         else:
             # Render the telemetry page (default UI view)
-            self._render_telemetry_page(render_times)
+            layer_dirty = self._render_telemetry_page(render_times, ui_shown)
+
+            t0 = time.time()
+            layer = self._telemetry_compositor.layer
+            if in_place:
+                # Restore changed areas and those the overlays redraw every frame
+                # (merged, so no area is dimmed twice)
+                restore = layer_dirty + [bar.rect for bar in status_bars]
+                if self._fps_rect:
+                    restore.append(self._fps_rect)
+                update_rects = merge_rects(restore)
+                for rect in update_rects:
+                    self.screen.blit(layer, rect, rect)
+            else:
+                self.screen.blit(layer, (0, 0))
+                if ui_shown:
+                    self.screen.blit(self.cached_ui_surface, (0, 0))
+            render_times['composite'] = (time.time() - t0) * 1000
 
         # Draw status bars on all pages (before brightness so they get dimmed too)
         t0 = time.time()
-        if self.status_bar_enabled and self.top_bar and self.bottom_bar:
-            self.top_bar.draw(self.screen)
-            self.bottom_bar.draw(self.screen)
+        for bar in status_bars:
+            bar.draw(self.screen)
         render_times['status_bars'] = (time.time() - t0) * 1000
 
         # Draw fuel warnings on all pages (except fuel page which has its own)
         t0 = time.time()
-        if self.fuel_tracker and self.current_ui_page != "fuel":
-            self._draw_fuel_warning()
+        if fuel_level:
+            self._draw_fuel_warning(fuel_level)
         render_times['fuel_warning'] = (time.time() - t0) * 1000
 
         # Draw CoPilot corner indicator on all pages
         t0 = time.time()
-        if self.copilot:
-            snapshot = self.copilot.get_snapshot()
-            if snapshot and snapshot.data and snapshot.data.get('status') == 'active':
-                corner_info = self.copilot.get_next_corner_info()
-                if corner_info.get('distance', 0) > 0:
-                    self.display.draw_corner_indicator(
-                        distance=corner_info.get('distance', 0),
-                        direction=corner_info.get('direction', ''),
-                        severity=corner_info.get('severity', 0),
-                        position=COPILOT_OVERLAY_POSITION,
-                    )
+        if corner_info:
+            self.display.draw_corner_indicator(
+                distance=corner_info.get('distance', 0),
+                direction=corner_info.get('direction', ''),
+                severity=corner_info.get('severity', 0),
+                position=COPILOT_OVERLAY_POSITION,
+            )
         render_times['copilot_overlay'] = (time.time() - t0) * 1000
 
         # Apply brightness adjustment using BLEND_MULT (faster than alpha)
         t0 = time.time()
-        brightness = self.input_handler.get_brightness()
         if brightness < 1.0:
             # Only recreate brightness surface if brightness value changed
             if self.cached_brightness_surface is None or abs(self.last_brightness - brightness) > 0.001:
@@ -172,7 +230,13 @@ class RenderingMixin:
                 self.last_brightness = brightness
 
             # Blit with BLEND_MULT - multiplies RGB values (no alpha processing)
-            self.screen.blit(self.cached_brightness_surface, (0, 0), special_flags=pygame.BLEND_MULT)
+            if update_rects is None:
+                self.screen.blit(self.cached_brightness_surface, (0, 0), special_flags=pygame.BLEND_MULT)
+            else:
+                # Only the restored areas are undimmed
+                for rect in update_rects:
+                    self.screen.blit(self.cached_brightness_surface, rect, rect,
+                                     special_flags=pygame.BLEND_MULT)
         else:
             # Clear cached brightness surface when at full brightness
             self.cached_brightness_surface = None
@@ -181,18 +245,25 @@ class RenderingMixin:
         # Draw FPS counter (always on top)
         t0 = time.time()
         camera_fps = self.camera.fps if self.camera and self.camera.is_active() else None
-        self.display.draw_fps_counter(self.fps, camera_fps)
+        self._fps_rect = self.display.draw_fps_counter(self.fps, camera_fps)
+        if update_rects is not None and self._fps_rect:
+            update_rects.append(self._fps_rect)
         render_times['fps_counter'] = (time.time() - t0) * 1000
 
         # Draw menu overlay (if visible)
         t0 = time.time()
-        if self.menu and self.menu.is_visible():
+        if menu_visible:
             self.menu.render(self.screen)
         render_times['menu'] = (time.time() - t0) * 1000
 
         # Update the display
         t0 = time.time()
-        pygame.display.flip()
+        if update_rects is None:
+            pygame.display.flip()
+        elif update_rects:
+            pygame.display.update(update_rects)
+        self._screen_retained = quiet
+        self._retained_brightness = brightness
         render_times['flip'] = (time.time() - t0) * 1000
 
         # Print profiling every 60 frames
@@ -202,16 +273,92 @@ class RenderingMixin:
             for key, val in sorted(render_times.items(), key=lambda x: -x[1]):
                 pct = (val / total_render * 100) if total_render > 0 else 0
                 logger.debug("  %15s: %6.2fms (%5.1f%%)", key, val, pct)
+            text_stats = get_text_cache().stats()
+            logger.debug(
+                "Text cache: hit rate %.1f%%, %d rendered, %d from atlas, %d strings, %.0f KB",
+                text_stats["hit_rate"] * 100, text_stats["misses"], text_stats["atlas_renders"],
+                text_stats["entries"], text_stats["bytes"] / 1024,
+            )
 
-    def _render_telemetry_page(self, render_times):
-        """Render the telemetry page (default UI view)."""
-        self._update_ui_visibility()
+    def _build_telemetry_compositor(self):
+        """
+        Compositor for the telemetry page, bottom to top: brakes, thermal
+        images, overlay mask, mirroring chevrons, TPMS pressures.
+        """
+        display = self.display
+        compositor = Compositor((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+
+        for position in BRAKE_POSITIONS:
+            compositor.add(
+                f"brake_{position}", display.brake_rect(position),
+                functools.partial(display.draw_brake_temp, position),
+            )
+
+        def draw_thermal(position, mode, data, show_text, flip_enabled):
+            if mode == "history":
+                display.draw_thermal_image_with_history(position, data, show_text, flip_enabled)
+            else:
+                display.draw_thermal_image(position, data, show_text)
+
+        def draw_overlay():
+            display.surface.blit(display.overlay_mask, (0, 0))
+
+        def draw_chevron(position, mirrored):
+            if mirrored:
+                display.draw_mirroring_indicator(position)
+
+        def draw_tpms(position, pressure, status):
+            # Tyre temperature is not shown (see Display.draw_pressure_temp)
+            display.draw_pressure_temp(position, pressure, None, status)
+
+        for position in MLX_POSITIONS:
+            compositor.add(f"thermal_{position}", display.thermal_rect(position),
+                           functools.partial(draw_thermal, position))
+        compositor.add("overlay", display.overlay_mask.get_rect(), draw_overlay)
+        for position in MLX_POSITIONS:
+            compositor.add(f"chevron_{position}", display.mirroring_indicator_rect(position),
+                           functools.partial(draw_chevron, position))
+        for position in TPMS_POSITIONS:
+            compositor.add(f"tpms_{position}", display.pressure_temp_rect(position),
+                           functools.partial(draw_tpms, position))
+        return compositor
+
+    def _render_telemetry_page(self, render_times, ui_shown):
+        """
+        Render the telemetry page (default UI view) to its compositor layer.
+
+        Each widget is redrawn only when its inputs change: a new snapshot
+        object, or a value that changes at display precision.
+
+        Args:
+            render_times: Profiling dict to add timings to
+            ui_shown: True if the fading UI (icons, scale bars) is visible
+
+        Returns:
+            Rects of the layer that changed this frame
+        """
+        if self._telemetry_compositor is None:
+            self._telemetry_compositor = self._build_telemetry_compositor()
+        compositor = self._telemetry_compositor
 
         # Capture timestamp once for all stale data checks this frame
         now = time.time()
 
         # Show temps overlay when UI is visible (matches scale bar visibility)
-        show_zone_temps = self.input_handler.ui_visible or self.ui_fade_alpha > 0
+        show_zone_temps = ui_shown
+
+        # Units and thresholds change how every widget is drawn
+        style = (
+            self.display.get_unit_strings(),
+            self.display.get_tyre_thresholds(),
+            self.display.get_brake_thresholds(),
+            self.display.get_pressure_thresholds(),
+        )
+        if style != self._telemetry_style:
+            compositor.invalidate()
+            self._telemetry_style = style
+
+        inputs = {}
 
         # Get brake temperatures (LOCK-FREE snapshot access)
         # Uses stale data cache to prevent flashing when display fps > data fps
@@ -233,22 +380,16 @@ class RenderingMixin:
                 self._brake_cache[position] = {
                     "temp": temp, "inner": inner, "outer": outer, "timestamp": now
                 }
-                self.display.draw_brake_temp(position, temp, inner, outer,
-                                             show_zone_temps)
             elif position in self._brake_cache:
                 # No fresh data - use cache if within timeout
                 cache = self._brake_cache[position]
                 if now - cache["timestamp"] < THERMAL_STALE_TIMEOUT:
-                    self.display.draw_brake_temp(
-                        position, cache.get("temp"), cache.get("inner"),
-                        cache.get("outer"), show_zone_temps
-                    )
-                else:
-                    self.display.draw_brake_temp(position, None,
-                                                 show_text=show_zone_temps)
-            else:
-                self.display.draw_brake_temp(position, None,
-                                             show_text=show_zone_temps)
+                    temp, inner, outer = cache.get("temp"), cache.get("inner"), cache.get("outer")
+
+            # Whole degrees, as displayed
+            inputs[f"brake_{position}"] = (
+                _quantise(temp, 0), _quantise(inner, 0), _quantise(outer, 0), show_zone_temps
+            )
         render_times['brakes'] = (time.time() - t0) * 1000
 
         # Get thermal camera data (LOCK-FREE snapshot access)
@@ -260,57 +401,41 @@ class RenderingMixin:
         display_mode = settings.get("tyre_temps.display_mode", TYRE_HISTORY_DISPLAY_DEFAULT)
 
         for position in ["FL", "FR", "RL", "RR"]:
+            flip_enabled = False
             if display_mode == "history":
                 # History gradient mode - use temperature history snapshots
-                history_snapshot = self.thermal.get_history_snapshot(position)
-                if history_snapshot is not None:
+                data = self.thermal.get_history_snapshot(position)
+                if data is not None:
                     # Fresh data - update cache and display
-                    self._history_cache[position] = {"data": history_snapshot, "timestamp": now}
-                    # Check if flip is enabled for this corner
-                    flip_enabled = settings.get(f"tyre_temps.flip.{position}", False)
-                    self.display.draw_thermal_image_with_history(
-                        position, history_snapshot, show_zone_temps, flip_enabled
-                    )
+                    self._history_cache[position] = {"data": data, "timestamp": now}
                 elif position in self._history_cache:
                     # No fresh data - use cache if within timeout (longer for history since EMAs are smoothed)
                     cache = self._history_cache[position]
                     if now - cache["timestamp"] < TYRE_HISTORY_STALE_TIMEOUT:
-                        flip_enabled = settings.get(f"tyre_temps.flip.{position}", False)
-                        self.display.draw_thermal_image_with_history(
-                            position, cache["data"], show_zone_temps, flip_enabled
-                        )
-                    else:
-                        self.display.draw_thermal_image_with_history(
-                            position, None, show_zone_temps
-                        )
-                else:
-                    self.display.draw_thermal_image_with_history(position, None, show_zone_temps)
+                        data = cache["data"]
+                if data is not None:
+                    # Check if flip is enabled for this corner
+                    flip_enabled = settings.get(f"tyre_temps.flip.{position}", False)
             else:
                 # Current-only mode - original behaviour
-                thermal_data = self.thermal.get_thermal_data(position)
-                if thermal_data is not None:
+                data = self.thermal.get_thermal_data(position)
+                if data is not None:
                     # Fresh data - update cache and display
-                    self._thermal_cache[position] = {"data": thermal_data, "timestamp": now}
-                    self.display.draw_thermal_image(position, thermal_data, show_zone_temps)
+                    self._thermal_cache[position] = {"data": data, "timestamp": now}
                 elif position in self._thermal_cache:
                     # No fresh data - use cache if within timeout
                     cache = self._thermal_cache[position]
                     if now - cache["timestamp"] < THERMAL_STALE_TIMEOUT:
-                        self.display.draw_thermal_image(position, cache["data"], show_zone_temps)
-                    else:
-                        self.display.draw_thermal_image(position, None, show_zone_temps)
-                else:
-                    self.display.draw_thermal_image(position, None, show_zone_temps)
-        render_times['thermal'] = (time.time() - t0) * 1000
+                        data = cache["data"]
 
-        t0 = time.time()
-        self.display.surface.blit(self.display.overlay_mask, (0, 0))
-        render_times['overlay'] = (time.time() - t0) * 1000
+            inputs[f"thermal_{position}"] = (display_mode, data, show_zone_temps, flip_enabled)
 
-        # Draw mirroring indicators AFTER overlay so they're visible
-        t0 = time.time()
-        self.display.draw_mirroring_indicators(self.thermal)
-        render_times['chevrons'] = (time.time() - t0) * 1000
+            # Chevron when temperature is mirrored from the centre channel
+            zone_data = self.thermal.get_zone_data(position)
+            inputs[f"chevron_{position}"] = (
+                bool(zone_data and zone_data.get("_mirrored_from_centre", False)),
+            )
+        render_times['thermal'] = (time.time() - t0) * 1000
 
         # Get TPMS data (LOCK-FREE snapshot access)
         t0 = time.time()
@@ -330,24 +455,24 @@ class RenderingMixin:
                     # Default to PSI if unknown unit
                     pressure_display = kpa_to_psi(pressure)
 
-            self.display.draw_pressure_temp(
-                position,
-                pressure_display,
-                data.get("temp"),
-                data.get("status", "N/A")
+            # Tenths, as displayed
+            inputs[f"tpms_{position}"] = (
+                _quantise(pressure_display, 1), data.get("status", "N/A")
             )
         render_times['tpms'] = (time.time() - t0) * 1000
 
+        # Redraw the widgets whose inputs changed
+        t0 = time.time()
+        with self.display.drawing_to(compositor.layer):
+            dirty = compositor.update(inputs)
+        render_times['widgets'] = (time.time() - t0) * 1000
+
         # Create separate surface for UI elements that can fade (with caching)
         t0 = time.time()
-        if self.input_handler.ui_visible or self.ui_fade_alpha > 0:
+        if ui_shown:
             # Get current units and thresholds to check if cache needs invalidation
-            current_units = self.display.get_unit_strings()
-            current_thresholds = (
-                self.display.get_tyre_thresholds(),
-                self.display.get_brake_thresholds(),
-                self.display.get_pressure_thresholds(),
-            )
+            current_units, *current_thresholds = style
+            current_thresholds = tuple(current_thresholds)
 
             # Recreate UI surface if it doesn't exist, fade alpha changed, units changed, or thresholds changed
             if (self.cached_ui_surface is None or
@@ -376,10 +501,14 @@ class RenderingMixin:
                 self.last_ui_fade_alpha = self.ui_fade_alpha
                 self.cached_ui_units = current_units
                 self.cached_ui_thresholds = current_thresholds
-
-            # Blit the cached surface
-            self.screen.blit(self.cached_ui_surface, (0, 0))
         else:
             # Clear cached UI surface when not visible
             self.cached_ui_surface = None
         render_times['ui'] = (time.time() - t0) * 1000
+
+        return dirty
+
+
+def _quantise(value, digits):
+    """Round a displayed value to the precision it is shown at (None stays None)."""
+    return None if value is None else round(float(value), digits)
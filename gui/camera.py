@@ -8,7 +8,6 @@ import pygame
 import numpy as np
 import time
 import threading
-import queue
 
 logger = logging.getLogger('openTPT.camera')
 
@@ -29,6 +28,7 @@ from config import (
     CAMERA_FRONT_ROTATE,
     CAMERA_FOV_DEGREES,
     CAMERA_FPS_UPDATE_INTERVAL_S,
+    CAMERA_MJPEG_DECODE_SCALE,
     LASER_RANGER_DISPLAY_ENABLED,
     LASER_RANGER_MAX_DISPLAY_M,
     LASER_RANGER_WARN_DISTANCE_M,
@@ -48,6 +48,8 @@ from config import (
     SCALE_X,
     SCALE_Y,
 )
+from gui.camera_frames import FrameConverter, FramePool, MjpegDecoder, mjpeg_decode_scale
+from gui.text_cache import get_font, render_text
 from utils.settings import get_settings
 
 # Optional import - only needed for actual camera functionality
@@ -112,8 +114,9 @@ class Camera:
         if corner_sensors and corner_sensors.laser_ranger_enabled():
             logger.info("Laser ranger available for front camera overlay")
 
-        # Threading related attributes
-        self.frame_queue = queue.Queue(maxsize=2)  # Small queue for maximum performance
+        # Threading related attributes (frames are handed over in a preallocated pool)
+        self.frame_pool = None
+        self._raw_frame = None  # Reused decode buffer when frames need converting
         self.capture_thread = None
         self.thread_running = False
 
@@ -302,30 +305,29 @@ class Camera:
         logger.info("Actual settings: %.0fx%.0f @ %sfps, codec: %s",
                    actual_width, actual_height, actual_fps, fourcc_str)
 
-        # Pre-calculate scaling factors
+        # Frames are written straight into the pool's buffers at display size
         scale = min(
             DISPLAY_WIDTH / self.camera_width, DISPLAY_HEIGHT / self.camera_height
         )
-        target_w = int(self.camera_width * scale)
-        target_h = int(self.camera_height * scale)
-        x_offset = (DISPLAY_WIDTH - target_w) // 2
-        y_offset = (DISPLAY_HEIGHT - target_h) // 2
-        # Skip resize if dimensions match (scale == 1.0)
-        needs_resize = (target_w != self.camera_width or target_h != self.camera_height)
+        pool = self._frame_pool_for(int(self.camera_width * scale), int(self.camera_height * scale))
+        converter = FrameConverter(pixel_format=pool.pixel_format)
+        stats = self._new_capture_stats()
+
+        # Decode MJPEG ourselves at reduced scale when the frames are much
+        # larger than the display (libjpeg skips most of the decode work)
+        decoder = None
+        decode_scale = mjpeg_decode_scale(
+            (self.camera_width, self.camera_height), pool.size, CAMERA_MJPEG_DECODE_SCALE
+        )
+        if decode_scale > 1:
+            self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)  # retrieve() returns the JPEG bytes
+            decoder = MjpegDecoder(decode_scale)
+            logger.info("Decoding MJPEG at 1/%d scale", decode_scale)
 
         # Variables for FPS tracking within the thread
         thread_frame_count = 0
         thread_start_time = time.time()
 
-        # Profiling variables
-        profile_times = {'grab': 0, 'retrieve': 0, 'transform': 0, 'cvt': 0, 'resize': 0, 'queue': 0}
-        profile_count = 0
-
-        # Debug counters
-        grab_success_count = 0
-        grab_fail_count = 0
-        retrieve_fail_count = 0
-
         # Thread loop - continuously capture frames as fast as possible
         if DEBUG_CAMERA:
             logger.debug("Entering capture loop for %s camera", self.current_camera)
@@ -334,118 +336,117 @@ class Camera:
                 self.error_message = "Camera disconnected"
                 break
 
-            # Capture frame using grab/retrieve for maximum speed
-            t0 = time.time()
-            if self.camera.grab():
-                grab_success_count += 1
-                t1 = time.time()
-                profile_times['grab'] += (t1 - t0) * 1000
-
-                ret, frame = self.camera.retrieve()
-                t2 = time.time()
-                profile_times['retrieve'] += (t2 - t1) * 1000
-
-                if not ret:
-                    retrieve_fail_count += 1
-                    continue
-
-                # Pre-process frame for direct rendering
-                try:
-                    t3 = time.time()
-                    # Apply camera transforms (rotate then mirror)
-                    settings = self.camera_settings.get(self.current_camera, {})
-                    rotate = settings.get('rotate', 0)
-                    mirror = settings.get('mirror', False)
-
-                    # Apply rotation
-                    if rotate == 90:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-                    elif rotate == 180:
-                        frame = cv2.rotate(frame, cv2.ROTATE_180)
-                    elif rotate == 270:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-
-                    # Apply mirror (horizontal flip)
-                    if mirror:
-                        frame = cv2.flip(frame, 1)
-
-                    t3b = time.time()
-                    profile_times['transform'] += (t3b - t3) * 1000
+            if not self._capture_frame(pool, converter, stats, decoder):
+                continue
 
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    t4 = time.time()
-                    profile_times['cvt'] += (t4 - t3b) * 1000
-
-                    # Resize only if needed (skip when scale == 1.0)
-                    if needs_resize:
-                        resized_frame = cv2.resize(
-                            rgb_frame, (target_w, target_h), interpolation=cv2.INTER_NEAREST
-                        )
-                    else:
-                        resized_frame = rgb_frame
-                    t5 = time.time()
-                    profile_times['resize'] += (t5 - t4) * 1000
-
-                    # Create processed frame data for direct rendering
-                    # Note: swapaxes done in render thread to keep capture thread fast
-                    processed_frame = {
-                        "data": resized_frame,
-                        "width": target_w,
-                        "height": target_h,
-                        "x_offset": x_offset,
-                        "y_offset": y_offset,
-                    }
+            # Track capture FPS and profiling
+            thread_frame_count += 1
+            thread_elapsed = time.time() - thread_start_time
+            if thread_elapsed >= 5.0:  # Log every 5 seconds
+                capture_fps = thread_frame_count / thread_elapsed
+                logger.info("%s camera capture FPS: %.1f", self.current_camera.capitalize(), capture_fps)
+                if DEBUG_CAMERA:
+                    logger.debug("Grab stats - Success: %d, Fail: %d, Retrieve fail: %d, "
+                                "Decode fail: %d, Direct: %d",
+                                stats['grab_success'], stats['grab_fail'], stats['retrieve_fail'],
+                                stats['decode_fail'], stats['direct'])
+                    # Log profiling info
+                    count = max(stats['published'], 1)
+                    logger.debug("Capture profile (avg ms): grab=%.1f, retrieve=%.1f, decode=%.1f, "
+                                "convert=%.1f, publish=%.1f",
+                                stats['grab'] / count, stats['retrieve'] / count,
+                                stats['decode'] / count, stats['convert'] / count,
+                                stats['publish'] / count)
+                # Reset counters (always, to prevent overflow)
+                stats = self._new_capture_stats()
+                thread_frame_count = 0
+                thread_start_time = time.time()
+
+        logger.info("Camera capture thread stopped for %s camera", self.current_camera)
+
+    @staticmethod
+    def _new_capture_stats():
+        """Counters and timings (ms) for the capture loop."""
+        return {'grab_success': 0, 'grab_fail': 0, 'retrieve_fail': 0, 'decode_fail': 0, 'direct': 0,
+                'published': 0, 'grab': 0.0, 'retrieve': 0.0, 'decode': 0.0, 'convert': 0.0,
+                'publish': 0.0}
 
-                    # Update queue with latest frame
-                    if self.frame_queue.full():
-                        try:
-                            self.frame_queue.get_nowait()
-                        except queue.Empty:
-                            pass
-                    self.frame_queue.put(processed_frame, block=False)
-                    t6 = time.time()
-                    profile_times['queue'] += (t6 - t5) * 1000
-
-                    # Track capture FPS and profiling
-                    thread_frame_count += 1
-                    profile_count += 1
-                    thread_elapsed = time.time() - thread_start_time
-                    if thread_elapsed >= 5.0:  # Log every 5 seconds
-                        capture_fps = thread_frame_count / thread_elapsed
-                        logger.info("%s camera capture FPS: %.1f", self.current_camera.capitalize(), capture_fps)
-                        if DEBUG_CAMERA:
-                            logger.debug("Grab stats - Success: %d, Fail: %d, Retrieve fail: %d",
-                                        grab_success_count, grab_fail_count, retrieve_fail_count)
-                            # Log profiling info
-                            if profile_count > 0:
-                                logger.debug("Capture profile (avg ms): grab=%.1f, retrieve=%.1f, "
-                                            "transform=%.1f, cvt=%.1f, resize=%.1f, queue=%.1f",
-                                            profile_times['grab']/profile_count,
-                                            profile_times['retrieve']/profile_count,
-                                            profile_times['transform']/profile_count,
-                                            profile_times['cvt']/profile_count,
-                                            profile_times['resize']/profile_count,
-                                            profile_times['queue']/profile_count)
-                        # Reset counters (always, to prevent overflow)
-                        grab_success_count = 0
-                        grab_fail_count = 0
-                        retrieve_fail_count = 0
-                        profile_times = {'grab': 0, 'retrieve': 0, 'transform': 0, 'cvt': 0, 'resize': 0, 'queue': 0}
-                        profile_count = 0
-                        thread_frame_count = 0
-                        thread_start_time = time.time()
-
-                except Exception as e:
-                    logger.warning("Error processing frame: %s", e)
-                    continue
+    def _frame_pool_for(self, width, height):
+        """Frame pool at the given size, reusing the current one if it matches."""
+        if self.frame_pool is None or self.frame_pool.size != (width, height):
+            self.frame_pool = FramePool(width, height)
+        return self.frame_pool
+
+    def _capture_frame(self, pool, converter, stats, decoder=None):
+        """
+        Capture one frame into the frame pool and publish it.
+
+        The frame is decoded straight into the pool buffer when no
+        transform or scaling is needed, otherwise into a reused buffer
+        and converted into the pool buffer. With a decoder, the camera
+        returns raw MJPEG bytes, decoded at reduced scale then converted.
+
+        Args:
+            pool: FramePool to write into
+            converter: FrameConverter for the camera's transforms
+            stats: Counters and timings from _new_capture_stats()
+            decoder: MjpegDecoder for raw MJPEG frames, or None
+
+        Returns:
+            True if a frame was published
+        """
+        t0 = time.time()
+        if not self.camera.grab():
+            stats['grab_fail'] += 1
+            return False
+        stats['grab_success'] += 1
+        t1 = time.time()
+        stats['grab'] += (t1 - t0) * 1000
+
+        # Apply camera transforms (rotate then mirror)
+        settings = self.camera_settings.get(self.current_camera, {})
+        converter.set_transform(settings.get('rotate', 0), settings.get('mirror', False))
+
+        buffer = pool.write_buffer()
+        if decoder is not None:
+            ret, frame = self.camera.retrieve()
+        else:
+            raw = self._raw_frame
+            frame_size = (raw.shape[1], raw.shape[0]) if raw is not None else (self.camera_width, self.camera_height)
+            direct = converter.is_direct(frame_size, pool.size)
+            ret, frame = self.camera.retrieve(buffer if direct else raw)
+        t2 = time.time()
+        stats['retrieve'] += (t2 - t1) * 1000
+        if not ret:
+            stats['retrieve_fail'] += 1
+            return False
+
+        try:
+            if frame is buffer:
+                stats['direct'] += 1
             else:
-                grab_fail_count += 1
-                continue
+                if frame.ndim == 1:
+                    # Raw MJPEG (backends that ignore CONVERT_RGB return decoded frames)
+                    frame = decoder.decode(frame)
+                    t_decoded = time.time()
+                    stats['decode'] += (t_decoded - t2) * 1000
+                    t2 = t_decoded
+                    if frame is None:
+                        stats['decode_fail'] += 1
+                        return False
+                else:
+                    self._raw_frame = frame  # Decode into the same array next time
+                converter.convert(frame, buffer)
+        except Exception as e:
+            logger.warning("Error processing frame: %s", e)
+            return False
+        t3 = time.time()
+        stats['convert'] += (t3 - t2) * 1000
 
-        logger.info("Camera capture thread stopped for %s camera", self.current_camera)
-        if DEBUG_CAMERA:
-            logger.debug("Final stats - Grab success: %d, Grab fail: %d, Retrieve fail: %d",
-                        grab_success_count, grab_fail_count, retrieve_fail_count)
+        pool.publish()
+        stats['published'] += 1
+        stats['publish'] += (time.time() - t3) * 1000
+        return True
 
     def initialise(self, camera_index=None, camera_device=None):
         """
@@ -554,16 +555,14 @@ class Camera:
                 # Check if thread actually stopped
                 if self.capture_thread.is_alive():
                     logger.warning("Camera capture thread did not stop within timeout")
-                    # Don't drain queue if thread still running (would race)
+                    # Don't touch the frame pool if thread still running (would race)
                     self.capture_thread = None
                     self.frame = None
                     return False  # Thread didn't stop - unsafe to release camera
-            # Thread stopped - safe to drain queue
-            while True:
-                try:
-                    self.frame_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # Thread stopped - safe to drop the pending frame
+            if self.frame_pool:
+                self.frame_pool.discard_pending()
+            self._raw_frame = None
             self.capture_thread = None
             # Clear the last frame to avoid showing stale image on next activation
             self.frame = None
@@ -596,11 +595,14 @@ class Camera:
                 and self.capture_thread
                 and self.capture_thread.is_alive()
             ):
-                try:
-                    self.frame = self.frame_queue.get_nowait()
+                if self.frame_pool and self.frame_pool.acquire():
+                    width, height = self.frame_pool.size
+                    self.frame = {
+                        "surface": self.frame_pool.surface,
+                        "x_offset": (DISPLAY_WIDTH - width) // 2,
+                        "y_offset": (DISPLAY_HEIGHT - height) // 2,
+                    }
                     result = True
-                except queue.Empty:
-                    pass
 
         # Update FPS counter - only count when we got a new frame
         if result:
@@ -645,8 +647,7 @@ class Camera:
 
         if not self.active or frame is None:
             if self.error_message:
-                font = pygame.font.Font(FONT_PATH, 24)
-                text = font.render(self.error_message, True, (255, 0, 0))
+                text = render_text(get_font(FONT_PATH, 24), self.error_message, (255, 0, 0))
                 text_rect = text.get_rect(
                     center=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
                 )
@@ -654,20 +655,9 @@ class Camera:
             return False
 
         try:
-            # Use frombuffer+blit for faster rendering (39% faster than direct pixel copy)
             if isinstance(frame, dict):
-                # Direct rendering from processed frame data
-                frame_data = frame["data"]
-                width = frame["width"]
-                height = frame["height"]
-                x_offset = frame["x_offset"]
-                y_offset = frame["y_offset"]
-
-                # Create surface from buffer and blit (faster than array copy)
-                frame_surface = pygame.image.frombuffer(
-                    frame_data.tobytes(), (width, height), 'RGB'
-                )
-                self.surface.blit(frame_surface, (x_offset, y_offset))
+                # Captured frame: its pool buffer backs the surface, blit without copying
+                self.surface.blit(frame["surface"], (frame["x_offset"], frame["y_offset"]))
 
             else:
                 # Fallback for test pattern or direct frames
@@ -776,8 +766,8 @@ class Camera:
             text = f"{distance_m:.1f} m"
 
         # Render text with shadow for visibility
-        shadow = font.render(text, True, (0, 0, 0))
-        text_surface = font.render(text, True, colour)
+        shadow = render_text(font, text, (0, 0, 0))
+        text_surface = render_text(font, text, colour)
 
         # Get and validate position from settings
         position = settings.get("laser_ranger.display_position", LASER_RANGER_DISPLAY_POSITION)
@@ -930,8 +920,8 @@ class Camera:
         for i, text in enumerate(lines):
             y_pos = start_y + i * line_spacing
 
-            shadow_surface = font.render(text, True, (0, 0, 0))
-            text_surface = font.render(text, True, colour)
+            shadow_surface = render_text(font, text, (0, 0, 0))
+            text_surface = render_text(font, text, colour)
 
             text_rect = text_surface.get_rect(center=(DISPLAY_WIDTH // 2, y_pos))
             shadow_rect = shadow_surface.get_rect(
@@ -0,0 +1,401 @@
+"""
+Preallocated camera frame buffers shared by the capture thread and renderer.
+
+FramePool holds three frame buffers, each backing a persistent pygame
+Surface (pygame.image.frombuffer shares the numpy array's memory). The
+capture thread writes pixels straight into a free buffer and publishes
+it; the renderer swaps to the newest published buffer and blits its
+Surface. Frames are never copied between the two: the only copy left is
+the blit to the screen (and the camera's own decode).
+
+Buffers are kept in the camera's BGR order where pygame supports BGR
+buffers, so when no rotation, mirroring or scaling is configured the
+camera decodes directly into the Surface's pixels (retrieve(image=...)).
+Otherwise FrameConverter writes each step into preallocated buffers, the
+last step into the pool buffer, using OpenCV's dst= outputs (or numpy
+when OpenCV is not installed, e.g. with SyntheticCamera in tests and
+benchmarks).
+
+When the camera resolution is well above the display's, MjpegDecoder
+decodes the camera's raw MJPEG bytes at 1/2, 1/4 or 1/8 scale (libjpeg
+DCT scaling skips most of the decode work) instead of decoding at full
+size and scaling down. RecordedMjpegCamera replays recorded JPEG frames
+as such a camera, for benchmarking without one.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+FRAME_POOL_SLOTS = 3  # Shown, newest published, being written
+MJPEG_DECODE_SCALES = (1, 2, 4, 8)  # Reductions libjpeg decodes at directly
+
+
+def _surface_for(buffer: np.ndarray, pixel_format: str) -> pygame.Surface:
+    height, width = buffer.shape[:2]
+    return pygame.image.frombuffer(buffer, (width, height), pixel_format)
+
+
+class FramePool:
+    """
+    Triple-buffered frames backing persistent Surfaces.
+
+    One writer (the capture thread) and one reader (the render loop). The
+    buffer being shown and the newest published one are never handed to
+    the writer, so the writer always has a free buffer and never blocks.
+    """
+
+    def __init__(self, width: int, height: int, slots: int = FRAME_POOL_SLOTS):
+        """
+        Allocate the frame buffers.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            slots: Number of buffers (at least three)
+        """
+        self.width = width
+        self.height = height
+        self.pixel_format = "BGR"
+        try:
+            _surface_for(np.zeros((1, 1, 3), dtype=np.uint8), "BGR")
+        except ValueError:
+            self.pixel_format = "RGB"  # pygame before 2.1.3
+
+        self.buffers = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(max(slots, 3))]
+        self._surfaces = [_surface_for(buffer, self.pixel_format) for buffer in self.buffers]
+        self._lock = threading.Lock()
+        self._writing: Optional[int] = None
+        self._ready: Optional[int] = None
+        self._shown: Optional[int] = None
+        self.published = 0
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def surface(self) -> Optional[pygame.Surface]:
+        """Surface of the frame being shown, or None before the first frame."""
+        shown = self._shown
+        return self._surfaces[shown] if shown is not None else None
+
+    def write_buffer(self) -> np.ndarray:
+        """Buffer to write the next frame into (writer thread)."""
+        with self._lock:
+            if self._writing is None:
+                busy = (self._ready, self._shown)
+                self._writing = next(i for i in range(len(self.buffers)) if i not in busy)
+            return self.buffers[self._writing]
+
+    def publish(self) -> None:
+        """Make the buffer from write_buffer() the newest frame (writer thread)."""
+        with self._lock:
+            if self._writing is not None:
+                self._ready = self._writing
+                self._writing = None
+                self.published += 1
+
+    def acquire(self) -> bool:
+        """
+        Show the newest published frame (render thread).
+
+        Returns:
+            True if a new frame is now shown, False if there was none
+        """
+        with self._lock:
+            if self._ready is None:
+                return False
+            self._shown = self._ready
+            self._ready = None
+            return True
+
+    def discard_pending(self) -> None:
+        """Drop a published frame not yet shown; the shown frame is kept."""
+        with self._lock:
+            self._ready = None
+            self._writing = None
+
+
+_PIXEL = np.dtype((np.void, 3))
+_ROTATE_CODES = {90: "ROTATE_90_CLOCKWISE", 180: "ROTATE_180", 270: "ROTATE_90_COUNTERCLOCKWISE"}
+
+
+class FrameConverter:
+    """
+    Rotates, mirrors, scales and reorders camera frames into pool buffers.
+
+    Every intermediate result goes into a buffer allocated on first use and
+    reused for later frames; the last step writes into the destination.
+    """
+
+    def __init__(self, rotate: int = 0, mirror: bool = False, pixel_format: str = "BGR"):
+        """
+        Initialise the converter.
+
+        Args:
+            rotate: Clockwise rotation in degrees (0, 90, 180 or 270)
+            mirror: Flip horizontally (after rotating)
+            pixel_format: Channel order of the destination ("BGR" or "RGB");
+                          camera frames are BGR
+        """
+        self.set_transform(rotate, mirror)
+        self.pixel_format = pixel_format
+        self._scratch: Dict[str, np.ndarray] = {}
+        self._resize_maps: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def set_transform(self, rotate: int, mirror: bool) -> None:
+        """Change rotation and mirroring (takes effect from the next frame)."""
+        self.rotate = rotate if rotate in _ROTATE_CODES else 0
+        self.mirror = mirror
+
+    def is_direct(self, frame_size: Tuple[int, int], dst_size: Tuple[int, int]) -> bool:
+        """True if frames of frame_size (w, h) can be decoded straight into the destination."""
+        return not self.rotate and not self.mirror and self.pixel_format == "BGR" and frame_size == dst_size
+
+    def convert(self, frame: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        """
+        Write a BGR camera frame into dst.
+
+        Args:
+            frame: BGR frame as captured, (height, width, 3)
+            dst: Destination buffer, (height, width, 3) at the display size
+
+        Returns:
+            dst
+        """
+        steps = []
+        if self.rotate:
+            steps.append("rotate")
+        if self.mirror:
+            steps.append("mirror")
+        rotated_shape = frame.shape if self.rotate in (0, 180) else (frame.shape[1], frame.shape[0], 3)
+        if rotated_shape[:2] != dst.shape[:2]:
+            steps.append("resize")
+        if self.pixel_format == "RGB":
+            steps.append("rgb")
+        if not steps:
+            if frame is not dst:
+                np.copyto(dst, frame)
+            return dst
+
+        if not CV2_AVAILABLE:
+            return self._convert_numpy(frame, dst, steps)
+
+        src = frame
+        for i, step in enumerate(steps):
+            if step == "resize":
+                shape = dst.shape
+            elif step == "rotate":
+                shape = rotated_shape
+            else:
+                shape = src.shape
+            out = dst if i == len(steps) - 1 else self._buffer(step, shape)
+            if step == "rotate":
+                cv2.rotate(src, getattr(cv2, _ROTATE_CODES[self.rotate]), dst=out)
+            elif step == "mirror":
+                cv2.flip(src, 1, dst=out)
+            elif step == "resize":
+                cv2.resize(src, (dst.shape[1], dst.shape[0]), dst=out, interpolation=cv2.INTER_NEAREST)
+            else:
+                cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=out)
+            src = out
+        return dst
+
+    def _convert_numpy(self, frame: np.ndarray, dst: np.ndarray, steps) -> np.ndarray:
+        """numpy equivalent of the OpenCV steps: views, then one copy into dst."""
+        src, out = frame, dst
+        if "rgb" not in steps and frame.flags.c_contiguous and dst.flags.c_contiguous:
+            # Move whole pixels: copying 3-byte items is faster than 3 strided bytes
+            src = frame.view(_PIXEL).reshape(frame.shape[:2])
+            out = dst.view(_PIXEL).reshape(dst.shape[:2])
+        if "rotate" in steps:
+            src = np.rot90(src, -self.rotate // 90)
+        if "mirror" in steps:
+            src = src[:, ::-1]
+        if "resize" in steps:
+            rows, cols = self._resize_map(src.shape[:2], dst.shape[:2])
+            src = src[rows[:, np.newaxis], cols]
+        if "rgb" in steps:
+            src = src[..., ::-1]
+        np.copyto(out, src)
+        return dst
+
+    def _resize_map(self, src_shape: Tuple[int, int], dst_shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Source rows and columns for nearest-neighbour scaling, as INTER_NEAREST picks them."""
+        key = (src_shape, dst_shape)
+        maps = self._resize_maps.get(key)
+        if maps is None:
+            maps = tuple(
+                np.minimum((np.arange(d) * (s / d)).astype(np.intp), s - 1)
+                for s, d in zip(src_shape, dst_shape)
+            )
+            self._resize_maps[key] = maps
+        return maps
+
+    def _buffer(self, name: str, shape) -> np.ndarray:
+        buffer = self._scratch.get(name)
+        if buffer is None or buffer.shape != tuple(shape):
+            buffer = self._scratch[name] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+
+def mjpeg_decode_scale(frame_size: Tuple[int, int], target_size: Tuple[int, int], scale: int = 0) -> int:
+    """
+    Reduction to decode MJPEG frames at.
+
+    Args:
+        frame_size: Camera frame (width, height)
+        target_size: Size the frames are shown at (width, height)
+        scale: Fixed reduction (1, 2, 4 or 8), or 0 to choose automatically
+
+    Returns:
+        The fixed reduction, or the largest one whose decoded frame still
+        covers target_size (1 if none does)
+    """
+    if scale in MJPEG_DECODE_SCALES:
+        return scale
+    width, height = frame_size
+    best = 1
+    for factor in MJPEG_DECODE_SCALES:
+        # libjpeg rounds scaled dimensions up
+        if -(-width // factor) >= target_size[0] and -(-height // factor) >= target_size[1]:
+            best = factor
+    return best
+
+
+class MjpegDecoder:
+    """Decodes raw MJPEG frames to BGR at a reduced scale."""
+
+    _FLAGS = {1: "IMREAD_COLOR", 2: "IMREAD_REDUCED_COLOR_2", 4: "IMREAD_REDUCED_COLOR_4", 8: "IMREAD_REDUCED_COLOR_8"}
+
+    def __init__(self, scale: int = 1):
+        """
+        Initialise the decoder.
+
+        Args:
+            scale: Reduction (1, 2, 4 or 8)
+        """
+        if not CV2_AVAILABLE:
+            raise RuntimeError("OpenCV (cv2) is required to decode MJPEG frames")
+        if scale not in self._FLAGS:
+            raise ValueError(f"MJPEG decode scale must be one of {MJPEG_DECODE_SCALES}, not {scale}")
+        self.scale = scale
+        self._flags = getattr(cv2, self._FLAGS[scale])
+
+    def decode(self, data: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Decode one frame.
+
+        Args:
+            data: JPEG bytes as a 1-D uint8 array (as retrieve() returns them
+                  with CAP_PROP_CONVERT_RGB off)
+
+        Returns:
+            BGR frame at 1/scale of the JPEG's size, or None if it is corrupt
+        """
+        return cv2.imdecode(data, self._flags)
+
+
+class _FrameSource:
+    """The cv2.VideoCapture calls the capture thread uses, paced to `fps` (0 for unpaced)."""
+
+    def __init__(self, fps: float = 0):
+        self.fps = fps
+        self.frames = 0
+        self._opened = True
+        self._next_time = 0.0
+
+    def isOpened(self) -> bool:  # noqa: N802 - cv2.VideoCapture API
+        return self._opened
+
+    def grab(self) -> bool:
+        if not self._opened:
+            return False
+        if self.fps:
+            now = time.perf_counter()
+            if now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time) + 1.0 / self.fps
+        self.frames += 1
+        return True
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def get(self, prop) -> float:
+        return 0.0
+
+    def release(self) -> None:
+        self._opened = False
+
+
+class SyntheticCamera(_FrameSource):
+    """
+    Frame source with the cv2.VideoCapture calls the capture thread uses.
+
+    Produces BGR frames with a moving bar, at up to `fps` frames per second
+    (0 for as fast as they are read), for tests and benchmarks.
+    """
+
+    def __init__(self, width: int, height: int, fps: float = 0):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        self._frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self._frame[:, :, 0] = np.linspace(0, 255, width, dtype=np.uint8)  # Blue ramp
+        self._frame[:, :, 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, np.newaxis]  # Green ramp
+
+    def retrieve(self, image: Optional[np.ndarray] = None):
+        if image is None or image.shape != self._frame.shape:
+            image = np.empty_like(self._frame)
+        np.copyto(image, self._frame)
+        bar = self.frames % self.width
+        image[:, bar:bar + 4, 2] = 255  # Red bar moving right
+        return True, image
+
+
+class RecordedMjpegCamera(_FrameSource):
+    """
+    Replays recorded JPEG frames as a camera delivering raw MJPEG.
+
+    retrieve() returns each frame's bytes as a 1-D uint8 array, as a V4L2
+    camera does with CAP_PROP_CONVERT_RGB off, looping over the frames.
+    """
+
+    def __init__(self, frames: Sequence[bytes], fps: float = 0):
+        """
+        Initialise the source.
+
+        Args:
+            frames: JPEG files' contents, in playback order
+            fps: Frames per second to deliver at (0 for as fast as read)
+        """
+        if not frames:
+            raise ValueError("No JPEG frames to replay")
+        super().__init__(fps)
+        self._frames = [np.frombuffer(frame, dtype=np.uint8) for frame in frames]
+
+    @classmethod
+    def from_directory(cls, path: str, fps: float = 0) -> "RecordedMjpegCamera":
+        """Replay the .jpg/.jpeg files in a directory, in name order."""
+        names = sorted(name for name in os.listdir(path) if name.lower().endswith((".jpg", ".jpeg")))
+        frames: List[bytes] = []
+        for name in names:
+            with open(os.path.join(path, name), "rb") as f:
+                frames.append(f.read())
+        return cls(frames, fps)
+
+    def retrieve(self, image: Optional[np.ndarray] = None):
+        return True, self._frames[(self.frames - 1) % len(self._frames)]
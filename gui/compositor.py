@@ -0,0 +1,141 @@
+"""
+Retained-mode compositor for pages built from independent widgets.
+
+Each widget has a fixed screen rect, a draw function and a set of inputs
+(snapshot objects, quantised values, display settings). The page is kept
+on an off-screen layer; each frame only widgets whose inputs changed are
+redrawn, together with anything overlapping them, in z-order. The rects
+that changed are returned so the caller can copy just those to the
+screen and pass them to pygame.display.update().
+
+Inputs are compared by value for plain values (numbers, strings, None and
+tuples of them) and by identity for anything else, so handlers must
+publish new objects (snapshots, arrays) rather than mutate old ones.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import pygame
+
+_VALUE_TYPES = (bool, int, float, str, type(None))
+
+
+def _same_input(a: Any, b: Any) -> bool:
+    """True if a widget input has not changed."""
+    if a is b:
+        return True
+    if isinstance(a, _VALUE_TYPES) and isinstance(b, _VALUE_TYPES):
+        return a == b
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return len(a) == len(b) and all(_same_input(x, y) for x, y in zip(a, b))
+    return False
+
+
+def merge_rects(rects: Sequence[pygame.Rect]) -> List[pygame.Rect]:
+    """Union overlapping rects so no area is redrawn or updated twice."""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Absorb merged rects this one touches, repeating as it grows
+        while True:
+            hit = rect.collidelist(merged)
+            if hit < 0:
+                break
+            rect.union_ip(merged.pop(hit))
+        merged.append(rect)
+    return merged
+
+
+@dataclass
+class Widget:
+    """One independently redrawn element of a composited page."""
+    name: str
+    rect: pygame.Rect
+    draw: Callable[..., None]  # Called with the widget's inputs
+
+
+class Compositor:
+    """
+    Off-screen page layer redrawn per widget when its inputs change.
+
+    Draw functions draw onto compositor.layer (for Display methods, inside
+    Display.drawing_to(compositor.layer)).
+
+    Usage:
+        compositor = Compositor((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+        compositor.add("FL_brake", rect, draw_brake)
+        with display.drawing_to(compositor.layer):
+            dirty = compositor.update({"FL_brake": (temp, show_text)})
+        screen.blit(compositor.layer, (0, 0))
+    """
+
+    def __init__(self, size: Tuple[int, int], background=(0, 0, 0)):
+        """
+        Initialise the compositor.
+
+        Args:
+            size: Layer size in pixels (normally the display size)
+            background: Colour behind all widgets
+        """
+        self.layer = pygame.Surface(size)
+        self.background = background
+        self._widgets: List[Widget] = []
+        self._inputs: Dict[str, tuple] = {}
+        self._full_redraw = True
+
+    def add(self, name: str, rect, draw: Callable[..., None]) -> None:
+        """
+        Add a widget above those already added.
+
+        Args:
+            name: Key for the widget's inputs in update()
+            rect: Screen area the widget draws within (draws are clipped to it)
+            draw: Function drawing the widget onto the layer from its inputs
+        """
+        self._widgets.append(Widget(name, pygame.Rect(rect), draw))
+        self._full_redraw = True
+
+    def invalidate(self) -> None:
+        """Redraw every widget on the next update()."""
+        self._full_redraw = True
+
+    def update(self, inputs: Dict[str, tuple]) -> List[pygame.Rect]:
+        """
+        Redraw widgets whose inputs changed.
+
+        Args:
+            inputs: Inputs for each widget by name (widgets without an entry
+                    take no inputs and only draw on a full redraw)
+
+        Returns:
+            Rects of the layer that changed (empty if nothing did)
+        """
+        if self._full_redraw:
+            dirty = [self.layer.get_rect()]
+        else:
+            dirty = merge_rects([
+                widget.rect for widget in self._widgets
+                if not _same_input(inputs.get(widget.name, ()),
+                                   self._inputs.get(widget.name, ()))
+            ])
+
+        for rect in dirty:
+            self._redraw(rect, inputs)
+
+        self._inputs = dict(inputs)
+        self._full_redraw = False
+        return dirty
+
+    def _redraw(self, rect: pygame.Rect, inputs: Dict[str, tuple]) -> None:
+        """Clear an area of the layer and draw every widget touching it, in order."""
+        layer = self.layer
+        layer.set_clip(rect)
+        try:
+            layer.fill(self.background, rect)
+            for widget in self._widgets:
+                if widget.rect.colliderect(rect):
+                    layer.set_clip(rect.clip(widget.rect))
+                    widget.draw(*inputs.get(widget.name, ()))
+        finally:
+            layer.set_clip(None)
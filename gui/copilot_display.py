@@ -27,6 +27,7 @@ from config import (
     SCALE_Y,
     STATUS_BAR_HEIGHT,
 )
+from gui.text_cache import render_text
 
 
 class CoPilotDisplay:
@@ -128,7 +129,7 @@ class CoPilotDisplay:
         pygame.draw.rect(screen, (30, 30, 45), (0, header_y, self.width, header_height))
 
         # Title
-        title = self.font_large.render("CoPilot", True, WHITE)
+        title = render_text(self.font_large, "CoPilot", WHITE)
         screen.blit(title, (int(20 * SCALE_X), header_y + int(10 * SCALE_Y)))
 
         # Status indicator
@@ -154,7 +155,7 @@ class CoPilotDisplay:
         pygame.draw.circle(screen, status_colour, (dot_x, dot_y), int(8 * SCALE_X))
 
         # Status text
-        status_surface = self.font_medium.render(status_text, True, status_colour)
+        status_surface = render_text(self.font_medium, status_text, status_colour)
         screen.blit(status_surface, (dot_x + int(15 * SCALE_X), header_y + int(12 * SCALE_Y)))
 
     def _draw_main_corner(self, screen, data):
@@ -195,25 +196,25 @@ class CoPilotDisplay:
             else:
                 sev_text = str(severity)
 
-            sev_surface = self.font_huge.render(sev_text, True, text_colour)
+            sev_surface = render_text(self.font_huge, sev_text, text_colour)
             sev_rect = sev_surface.get_rect(center=(centre_x, centre_y))
             screen.blit(sev_surface, sev_rect)
 
             # Draw distance below
             dist_text = f"{int(distance)}m"
-            dist_surface = self.font_xlarge.render(dist_text, True, text_colour)
+            dist_surface = render_text(self.font_xlarge, dist_text, text_colour)
             dist_rect = dist_surface.get_rect(center=(centre_x, centre_y + int(100 * SCALE_Y)))
             screen.blit(dist_surface, dist_rect)
 
             # Draw direction label
             dir_text = direction.upper()
-            dir_surface = self.font_medium.render(dir_text, True, WHITE)
+            dir_surface = render_text(self.font_medium, dir_text, WHITE)
             dir_rect = dir_surface.get_rect(center=(centre_x, centre_y + int(150 * SCALE_Y)))
             screen.blit(dir_surface, dir_rect)
         else:
             # No corner ahead - show straight
             text = "CLEAR"
-            text_surface = self.font_xlarge.render(text, True, self.colour_straight)
+            text_surface = render_text(self.font_xlarge, text, self.colour_straight)
             text_rect = text_surface.get_rect(center=(centre_x, centre_y))
             screen.blit(text_surface, text_rect)
 
@@ -278,7 +279,7 @@ class CoPilotDisplay:
         y_pos = self.content_top + int(self.content_height * 0.65)
 
         # Render callout text
-        callout_surface = self.font_large.render(callout, True, colour)
+        callout_surface = render_text(self.font_large, callout, colour)
         callout_rect = callout_surface.get_rect(center=(self.width // 2, y_pos))
 
         # Draw background box
@@ -307,7 +308,7 @@ class CoPilotDisplay:
         pygame.draw.rect(screen, (50, 50, 70), (panel_x, panel_y, panel_width, panel_height), 1)
 
         # Title
-        title = self.font_small.render("PATH INFO", True, GREY)
+        title = render_text(self.font_small, "PATH INFO", GREY)
         screen.blit(title, (panel_x + int(10 * SCALE_X), panel_y + int(8 * SCALE_Y)))
 
         # Info lines
@@ -339,8 +340,8 @@ class CoPilotDisplay:
 
         for item in info_lines:
             label, value, colour = item
-            label_surface = self.font_small.render(label, True, GREY)
-            value_surface = self.font_small.render(value, True, colour)
+            label_surface = render_text(self.font_small, label, GREY)
+            value_surface = render_text(self.font_small, value, colour)
             screen.blit(label_surface, (panel_x + int(10 * SCALE_X), y_offset))
             screen.blit(value_surface, (panel_x + int(90 * SCALE_X), y_offset))
             y_offset += line_height
@@ -368,12 +369,12 @@ class CoPilotDisplay:
             colour = self.colour_inactive
 
         # Draw title
-        title_surface = self.font_large.render(title, True, colour)
+        title_surface = render_text(self.font_large, title, colour)
         title_rect = title_surface.get_rect(center=(centre_x, centre_y))
         screen.blit(title_surface, title_rect)
 
         # Draw subtitle
-        sub_surface = self.font_small.render(subtitle, True, GREY)
+        sub_surface = render_text(self.font_small, subtitle, GREY)
         sub_rect = sub_surface.get_rect(center=(centre_x, centre_y + int(60 * SCALE_Y)))
         screen.blit(sub_surface, sub_rect)
 
@@ -401,7 +402,7 @@ class CoPilotDisplay:
             gps_text = f"GPS: {lat:.5f}, {lon:.5f}"
         else:
             gps_text = "GPS: --"
-        gps_surface = self.font_small.render(gps_text, True, GREY)
+        gps_surface = render_text(self.font_small, gps_text, GREY)
         screen.blit(gps_surface, (int(20 * SCALE_X), footer_y + int(12 * SCALE_Y)))
 
         # Settings info
@@ -412,7 +413,7 @@ class CoPilotDisplay:
             settings_text = f"{mode} | {int(lookahead)}m | Audio: {audio}"
         else:
             settings_text = "-- | -- | Audio: --"
-        settings_surface = self.font_small.render(settings_text, True, GREY)
+        settings_surface = render_text(self.font_small, settings_text, GREY)
         settings_rect = settings_surface.get_rect()
         settings_rect.right = self.width - int(20 * SCALE_X)
         settings_rect.top = footer_y + int(12 * SCALE_Y)
@@ -4,8 +4,9 @@ Handles rendering of dynamic telemetry data on the display.
 """
 
 import logging
+from contextlib import contextmanager
+
 import pygame
-import numpy as np
 
 logger = logging.getLogger('openTPT.display')
 from config import (
@@ -52,6 +53,8 @@ from config import (
     TYRE_HISTORY_BAND_COUNT,
     # ROTATION,
 )
+from gui.text_cache import draw_text, render_text
+from gui.thermal_tiles import ThermalTileRenderer
 from utils.settings import get_settings
 
 # Get settings singleton for unit preferences
@@ -81,6 +84,11 @@ class Display:
         # Cache for brake surfaces to avoid allocation in render loop
         self._brake_surface_cache: dict = {}
 
+        # Finished thermal images, rebuilt only when zone temperatures move
+        self.thermal_tiles = ThermalTileRenderer(
+            self.font_small, MLX_DISPLAY_WIDTH, MLX_DISPLAY_HEIGHT
+        )
+
         # Try loading the overlay mask from both the configured path and the root directory
         try:
             original_overlay = pygame.image.load(OVERLAY_PATH).convert_alpha()
@@ -109,6 +117,45 @@ class Display:
                     (DISPLAY_WIDTH, DISPLAY_HEIGHT), pygame.SRCALPHA
                 )
 
+    @contextmanager
+    def drawing_to(self, surface):
+        """Draw onto another surface (e.g. a compositor layer) within the block."""
+        original_surface = self.surface
+        self.surface = surface
+        try:
+            yield surface
+        finally:
+            self.surface = original_surface
+
+    # Screen areas of the telemetry page elements (for the compositor)
+
+    def pressure_temp_rect(self, position) -> pygame.Rect:
+        """Area draw_pressure_temp() draws in: pressure text and status above it."""
+        pressure_pos = TPMS_POSITIONS[position]["pressure"]
+        pressure_rect = pygame.Rect((0, 0), self.font_medarge.size("888.8"))
+        pressure_rect.center = pressure_pos
+        status_rect = pygame.Rect((0, 0), self.font_small.size("LOW_BATTERY"))
+        status_rect.center = (pressure_pos[0], pressure_pos[1] - FONT_SIZE_LARGE // 2 - 5)
+        return pressure_rect.union(status_rect).inflate(8, 4)
+
+    def brake_rect(self, position) -> pygame.Rect:
+        """Area draw_brake_temp() draws in, including temperature text."""
+        text_width, _ = self.font_small.size("888")
+        rect = pygame.Rect(0, 0, int(34 * SCALE_X) + text_width, int(114 * SCALE_Y) + 2)
+        rect.center = BRAKE_POSITIONS[position]
+        return rect
+
+    def thermal_rect(self, position) -> pygame.Rect:
+        """Area the thermal image draw methods draw in."""
+        return pygame.Rect(MLX_POSITIONS[position], (MLX_DISPLAY_WIDTH, MLX_DISPLAY_HEIGHT))
+
+    def mirroring_indicator_rect(self, position) -> pygame.Rect:
+        """Area draw_mirroring_indicator() draws in."""
+        points = self._chevron_points(position)
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+
     def _convert_to_colourkey(self, surface: pygame.Surface) -> pygame.Surface:
         """
         Convert RGBA surface to colourkey for faster blitting.
@@ -305,18 +352,8 @@ class Display:
         pressure_colour = self.get_colour_for_pressure(pressure, position)
 
         # Handle None pressure value
-        if pressure is None:
-            pressure_text = self.font_medarge.render("--", True, pressure_colour)
-        else:
-            pressure_text = self.font_medarge.render(
-                f"{pressure:.1f}", True, pressure_colour
-            )
-
-        # Create a rect for the text with center at pressure_pos
-        pressure_rect = pressure_text.get_rect(center=pressure_pos)
-
-        # Blit using the rect instead of the position directly
-        self.surface.blit(pressure_text, pressure_rect)
+        pressure_text = "--" if pressure is None else f"{pressure:.1f}"
+        draw_text(self.surface, self.font_medarge, pressure_text, pressure_colour, center=pressure_pos)
 
         # Render temperature with appropriate colour (if you want to enable this)
         # temp_colour = self.get_colour_for_temp(temp)
@@ -342,7 +379,7 @@ class Display:
             else:
                 status_colour = RED  # Default for unknown statuses
 
-            status_text = self.font_small.render(status, True, status_colour)
+            status_text = render_text(self.font_small, status, status_colour)
             status_rect = status_text.get_rect(center=status_pos)
             self.surface.blit(status_text, status_rect)
 
@@ -388,18 +425,9 @@ class Display:
 
             # Overlay temperature text when UI is visible
             if show_text and single_temp is not None:
-                temp_str = f"{single_temp:.0f}"
-                # Render black outline
-                outline_surface = self.font_small.render(temp_str, True, (0, 0, 0))
-                outline_rect = outline_surface.get_rect(center=pos)
-                for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1),
-                               (0, 1), (1, -1), (1, 0), (1, 1)]:
-                    self.surface.blit(outline_surface,
-                                      (outline_rect.x + dx, outline_rect.y + dy))
-                # Render white text on top
-                text_surface = self.font_small.render(temp_str, True, (255, 255, 255))
-                text_rect = text_surface.get_rect(center=pos)
-                self.surface.blit(text_surface, text_rect)
+                # White text with a black outline
+                text_surface = render_text(self.font_small, f"{single_temp:.0f}", WHITE, outline=BLACK)
+                self.surface.blit(text_surface, text_surface.get_rect(center=pos))
 
     def _draw_brake_dual_zone(self, pos, width, height, inner_temp, outer_temp,
                               position, show_text=False):
@@ -472,18 +500,9 @@ class Display:
             for temp, text_x, text_y in [(outer_temp, outer_x, outer_y),
                                           (inner_temp, inner_x, inner_y)]:
                 if temp is not None:
-                    temp_str = f"{temp:.0f}"
-                    # Render black outline
-                    outline_surface = self.font_small.render(temp_str, True, (0, 0, 0))
-                    outline_rect = outline_surface.get_rect(center=(text_x, text_y))
-                    for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1),
-                                   (0, 1), (1, -1), (1, 0), (1, 1)]:
-                        self.surface.blit(outline_surface,
-                                          (outline_rect.x + dx, outline_rect.y + dy))
-                    # Render white text on top
-                    text_surface = self.font_small.render(temp_str, True, (255, 255, 255))
-                    text_rect = text_surface.get_rect(center=(text_x, text_y))
-                    self.surface.blit(text_surface, text_rect)
+                    # White text with a black outline
+                    text_surface = render_text(self.font_small, f"{temp:.0f}", WHITE, outline=BLACK)
+                    self.surface.blit(text_surface, text_surface.get_rect(center=(text_x, text_y)))
 
     def _get_brake_colour(self, temp):
         """Get colour for brake temperature."""
@@ -533,162 +552,31 @@ class Display:
         # Get position
         pos = MLX_POSITIONS[position]
 
-        # Size of each section
-        section_width_px = MLX_DISPLAY_WIDTH // 3
-        section_height_px = MLX_DISPLAY_HEIGHT
-
-        # Create a surface for the thermal image
-        thermal_surface = pygame.Surface((MLX_DISPLAY_WIDTH, MLX_DISPLAY_HEIGHT))
-
         if thermal_data is None:
             # No data available - draw all sections as grey
-            for i in range(3):
-                x_offset = i * section_width_px
-                rect = pygame.Rect(x_offset, 0, section_width_px, section_height_px)
-                pygame.draw.rect(thermal_surface, GREY, rect)
-        else:
-            # Validate thermal data shape (MLX90640 is 24x32)
-            if thermal_data.shape != (24, 32):
-                logger.warning("Invalid thermal data shape %s for %s, expected (24, 32)",
-                              thermal_data.shape, position)
-                # Draw grey sections if data is invalid
-                for i in range(3):
-                    x_offset = i * section_width_px
-                    rect = pygame.Rect(x_offset, 0, section_width_px, section_height_px)
-                    pygame.draw.rect(thermal_surface, GREY, rect)
-                # Skip rendering and return early
-                self.surface.blit(thermal_surface, pos)
-                return
-
-            # Calculate temperatures for inner, middle and outer sections
-            # Divide the thermal data into three vertical sections
-            section_width = thermal_data.shape[1] // 3
-
-            # Extract each section
-            inner_section = thermal_data[:, :section_width]
-            middle_section = thermal_data[:, section_width : 2 * section_width]
-            outer_section = thermal_data[:, 2 * section_width :]
-
-            # Calculate average temperature for each section
-            inner_temp = np.mean(inner_section)
-            middle_temp = np.mean(middle_section)
-            outer_temp = np.mean(outer_section)
-
-            # Determine section layout based on position (left or right side)
-            is_right_side = position in ["FR", "RR"]
-
-            # Draw each section as a colour block
-            sections = [
-                (inner_section, inner_temp, 0),
-                (middle_section, middle_temp, section_width_px),
-                (outer_section, outer_temp, 2 * section_width_px),
-            ]
+            self.surface.blit(self.thermal_tiles.offline_tile(), pos)
+            return
 
-            # If right side, reverse the order to match the car orientation
-            if is_right_side:
-                sections = sections[::-1]
-
-            # Draw each section
-            for section_data, avg_temp, x_offset in sections:
-                colour = self._get_heat_colour(avg_temp)
-                rect = pygame.Rect(x_offset, 0, section_width_px, section_height_px)
-                pygame.draw.rect(thermal_surface, colour, rect)
-
-            # Overlay temperature text on each zone when UI is visible
-            if show_text:
-                for section_data, avg_temp, x_offset in sections:
-                    temp_str = f"{avg_temp:.1f}"
-                    # Centre text within the zone
-                    text_x = x_offset + (section_width_px // 2)
-                    text_y = section_height_px // 2
-
-                    # Render black outline (8 directions)
-                    outline_surface = self.font_small.render(temp_str, True, (0, 0, 0))
-                    outline_rect = outline_surface.get_rect(center=(text_x, text_y))
-                    for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1),
-                                   (0, 1), (1, -1), (1, 0), (1, 1)]:
-                        thermal_surface.blit(outline_surface,
-                                             (outline_rect.x + dx, outline_rect.y + dy))
-
-                    # Render white text on top
-                    text_surface = self.font_small.render(temp_str, True, (255, 255, 255))
-                    text_rect = text_surface.get_rect(center=(text_x, text_y))
-                    thermal_surface.blit(text_surface, text_rect)
-
-        # Always draw vertical lines at fixed intervals
-        pygame.draw.line(
-            thermal_surface,
-            (0, 0, 0),
-            (section_width_px, 0),
-            (section_width_px, section_height_px),
-            5,
-        )
-        pygame.draw.line(
-            thermal_surface,
-            (0, 0, 0),
-            (2 * section_width_px, 0),
-            (2 * section_width_px, section_height_px),
-            5,
+        # Validate thermal data shape (MLX90640 is 24x32)
+        if thermal_data.shape != (24, 32):
+            logger.warning("Invalid thermal data shape %s for %s, expected (24, 32)",
+                          thermal_data.shape, position)
+            # Draw grey sections if data is invalid
+            self.surface.blit(self.thermal_tiles.offline_tile(), pos)
+            return
+
+        # Average temperature of the inner, middle and outer thirds of the image
+        section_width = thermal_data.shape[1] // 3
+        inner_temp, middle_temp, outer_temp = (
+            thermal_data[:, :section_width].mean(),
+            thermal_data[:, section_width:2 * section_width].mean(),
+            thermal_data[:, 2 * section_width:].mean(),
         )
 
-        # Display the thermal image
-        self.surface.blit(thermal_surface, pos)
-
-        # Create text labels for the temperatures (only if we have data)
-        if thermal_data is not None:
-            # Validate shape again before processing sections (defensive programming)
-            if thermal_data.shape != (24, 32):
-                logger.warning("Skipping text labels - invalid thermal data shape %s for %s",
-                              thermal_data.shape, position)
-                return
-
-            # Calculate temperatures again for text labels
-            section_width = thermal_data.shape[1] // 3
-            inner_section = thermal_data[:, :section_width]
-            middle_section = thermal_data[:, section_width : 2 * section_width]
-            outer_section = thermal_data[:, 2 * section_width :]
-            inner_temp = np.mean(inner_section)
-            middle_temp = np.mean(middle_section)
-            outer_temp = np.mean(outer_section)
-
-            # Adjust positions based on whether it's left or right side
-            section_font = self.font_small
-            is_right_side = position in ["FR", "RR"]
-
-            # Position text below the thermal image
-            text_y = pos[1] + MLX_DISPLAY_HEIGHT + 6
-
-            # For text spacing
-            text_spacing = MLX_DISPLAY_WIDTH // 3
-
-            # Order of sections (left to right on display)
-            if is_right_side:
-                # Right side: Inner, Middle, Outer
-                sections_order = [
-                    (inner_temp, "I"),
-                    (middle_temp, "M"),
-                    (outer_temp, "O"),
-                ]
-            else:
-                # Left side: Outer, Middle, Inner
-                sections_order = [
-                    (outer_temp, "O"),
-                    (middle_temp, "M"),
-                    (inner_temp, "I"),
-                ]
-
-            # Draw the temperature labels
-            for i, (temp, label) in enumerate(sections_order):
-                # Position text centered under each section
-                text_x = pos[0] + (i * text_spacing) + (text_spacing // 2)
-
-                # Get colour based on temperature
-                text_colour = self.get_colour_for_temp(temp)
-
-                # Render text
-                text = section_font.render(f"{label}: {temp:.1f}", True, text_colour)
-                text_rect = text.get_rect(center=(text_x, text_y))
-                # self.surface.blit(text, text_rect)
+        # Zones left to right on screen: inner, middle, outer for every corner
+        zone_temps = (inner_temp, middle_temp, outer_temp)
+        tile = self.thermal_tiles.zones_tile(zone_temps, show_text, self.get_tyre_thresholds())
+        self.surface.blit(tile, pos)
 
     def draw_thermal_image_with_history(self, position, history_snapshot, show_text=False,
                                          flip_enabled=False):
@@ -711,143 +599,34 @@ class Display:
 
         pos = MLX_POSITIONS[position]
 
-        # Size of each section (3 horizontal zones)
-        section_width_px = MLX_DISPLAY_WIDTH // 3
-        section_height_px = MLX_DISPLAY_HEIGHT
-
-        # Create a surface for the thermal image
-        thermal_surface = pygame.Surface((MLX_DISPLAY_WIDTH, MLX_DISPLAY_HEIGHT))
-
         if history_snapshot is None or not isinstance(history_snapshot, TyreHistorySnapshot):
             # No data available - draw all sections as grey
-            for i in range(3):
-                x_offset = i * section_width_px
-                rect = pygame.Rect(x_offset, 0, section_width_px, section_height_px)
-                pygame.draw.rect(thermal_surface, GREY, rect)
+            self.surface.blit(self.thermal_tiles.offline_tile(), pos)
+            return
+
+        # Get band temperatures for each zone
+        # Tuple order: (current, 5s, 15s, 30s, 1m, 5m, 15m)
+        inner_bands = history_snapshot.inner_bands[:TYRE_HISTORY_BAND_COUNT]
+        outer_bands = history_snapshot.outer_bands[:TYRE_HISTORY_BAND_COUNT]
+        centre_bands = history_snapshot.centre_bands[:TYRE_HISTORY_BAND_COUNT]
+
+        # Apply flip if enabled (swap inner/outer)
+        if flip_enabled:
+            inner_bands, outer_bands = outer_bands, inner_bands
+
+        # Section order depends on which side of car
+        if position in ["FR", "RR"]:
+            # Right side: Inner, Centre, Outer (left to right)
+            zone_bands = (inner_bands, centre_bands, outer_bands)
         else:
-            # Get band temperatures for each zone
-            # Tuple order: (current, 5s, 15s, 30s, 1m, 5m, 15m)
-            inner_bands = history_snapshot.inner_bands
-            outer_bands = history_snapshot.outer_bands
-            centre_bands = history_snapshot.centre_bands
-
-            # Apply flip if enabled (swap inner/outer)
-            if flip_enabled:
-                inner_bands, outer_bands = outer_bands, inner_bands
-
-            # Determine if front or rear tyre for band ordering
-            is_front = position in ["FL", "FR"]
-            is_right_side = position in ["FR", "RR"]
-
-            # Band count from config (7 bands: current + 6 historical)
-            num_bands = TYRE_HISTORY_BAND_COUNT
-
-            # Pre-calculate all row colours for better performance
-            # Instead of drawing line-by-line, draw larger horizontal strips
-            # when consecutive rows have the same colour
-            last_colours = None
-            strip_start_y = 0
-
-            for y in range(section_height_px + 1):  # +1 to flush final strip
-                if y < section_height_px:
-                    # Calculate fractional band position (0 to num_bands-1)
-                    # Use (num_bands - 1) as max to map y range to band indices
-                    y_fraction = y / (section_height_px - 1) if section_height_px > 1 else 0
-                    if is_front:
-                        # Front: current at top (y=0), 15min at bottom (y=max)
-                        band_pos = y_fraction * (num_bands - 1)
-                    else:
-                        # Rear: 15min at top (y=0), current at bottom (y=max)
-                        band_pos = (1 - y_fraction) * (num_bands - 1)
-
-                    # Get the two bands to interpolate between
-                    band_lower = int(band_pos)
-                    band_upper = min(band_lower + 1, num_bands - 1)
-                    t = band_pos - band_lower  # Interpolation factor
-
-                    # Interpolate temperature for each zone
-                    inner_temp = inner_bands[band_lower] * (1 - t) + inner_bands[band_upper] * t
-                    centre_temp = centre_bands[band_lower] * (1 - t) + centre_bands[band_upper] * t
-                    outer_temp = outer_bands[band_lower] * (1 - t) + outer_bands[band_upper] * t
-
-                    # Get colours for each zone
-                    inner_colour = self._get_heat_colour(inner_temp)
-                    centre_colour = self._get_heat_colour(centre_temp)
-                    outer_colour = self._get_heat_colour(outer_temp)
-
-                    # Section order depends on which side of car
-                    if is_right_side:
-                        # Right side: Inner, Centre, Outer (left to right)
-                        current_colours = (inner_colour, centre_colour, outer_colour)
-                    else:
-                        # Left side: Outer, Centre, Inner (left to right)
-                        current_colours = (outer_colour, centre_colour, inner_colour)
-                else:
-                    # Final iteration to flush last strip
-                    current_colours = None
-
-                # Draw strip when colours change or at end
-                if current_colours != last_colours and last_colours is not None:
-                    strip_height = y - strip_start_y
-                    for i, colour in enumerate(last_colours):
-                        x_start = i * section_width_px
-                        rect = pygame.Rect(x_start, strip_start_y, section_width_px, strip_height)
-                        pygame.draw.rect(thermal_surface, colour, rect)
-                    strip_start_y = y
-
-                last_colours = current_colours
-
-            # Overlay temperature text on each zone when UI is visible
-            if show_text:
-                # Show current temperatures (first band)
-                inner_temp = inner_bands[0]
-                centre_temp = centre_bands[0]
-                outer_temp = outer_bands[0]
-
-                if is_right_side:
-                    sections = [(inner_temp, 0), (centre_temp, section_width_px),
-                                (outer_temp, 2 * section_width_px)]
-                else:
-                    sections = [(outer_temp, 0), (centre_temp, section_width_px),
-                                (inner_temp, 2 * section_width_px)]
-
-                for temp, x_offset in sections:
-                    temp_str = f"{temp:.1f}"
-                    # Centre text within the zone
-                    text_x = x_offset + (section_width_px // 2)
-                    text_y = section_height_px // 2
-
-                    # Render black outline (8 directions)
-                    outline_surface = self.font_small.render(temp_str, True, (0, 0, 0))
-                    outline_rect = outline_surface.get_rect(center=(text_x, text_y))
-                    for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1),
-                                   (0, 1), (1, -1), (1, 0), (1, 1)]:
-                        thermal_surface.blit(outline_surface,
-                                             (outline_rect.x + dx, outline_rect.y + dy))
-
-                    # Render white text on top
-                    text_surface = self.font_small.render(temp_str, True, (255, 255, 255))
-                    text_rect = text_surface.get_rect(center=(text_x, text_y))
-                    thermal_surface.blit(text_surface, text_rect)
-
-        # Draw vertical separator lines
-        pygame.draw.line(
-            thermal_surface,
-            (0, 0, 0),
-            (section_width_px, 0),
-            (section_width_px, section_height_px),
-            5,
-        )
-        pygame.draw.line(
-            thermal_surface,
-            (0, 0, 0),
-            (2 * section_width_px, 0),
-            (2 * section_width_px, section_height_px),
-            5,
-        )
+            # Left side: Outer, Centre, Inner (left to right)
+            zone_bands = (outer_bands, centre_bands, inner_bands)
 
-        # Display the thermal image
-        self.surface.blit(thermal_surface, pos)
+        # Front: current at top, 15min at bottom. Rear: the reverse
+        tile = self.thermal_tiles.history_tile(
+            zone_bands, position in ["FL", "FR"], show_text, self.get_tyre_thresholds()
+        )
+        self.surface.blit(tile, pos)
 
     def draw_mirroring_indicators(self, thermal_handler):
         """
@@ -864,39 +643,38 @@ class Display:
             # Get zone data to check if mirrored
             zone_data = thermal_handler.get_zone_data(position)
             if zone_data and zone_data.get("_mirrored_from_centre", False):
-                # Get position for this tyre
-                pos = MLX_POSITIONS[position]
-                chevron_center_x = pos[0] + MLX_DISPLAY_WIDTH // 2
-                chevron_size = 6
-
-                # Rear tyres: down-pointing chevron above the thermal image
-                # Front tyres: up-pointing chevron below the thermal image
-                is_rear = position in ["RL", "RR"]
-
-                if is_rear:
-                    # Down-pointing chevron above the thermal image
-                    chevron_y = pos[1] - chevron_size - 2
-                    chevron_points = [
-                        (chevron_center_x, chevron_y + chevron_size),  # Bottom point
-                        (chevron_center_x - chevron_size, chevron_y),  # Top left
-                        (chevron_center_x + chevron_size, chevron_y),  # Top right
-                    ]
-                else:
-                    # Up-pointing chevron below the thermal image
-                    chevron_y = pos[1] + MLX_DISPLAY_HEIGHT + 2
-                    chevron_points = [
-                        (chevron_center_x, chevron_y),  # Top point
-                        (
-                            chevron_center_x - chevron_size,
-                            chevron_y + chevron_size,
-                        ),  # Bottom left
-                        (
-                            chevron_center_x + chevron_size,
-                            chevron_y + chevron_size,
-                        ),  # Bottom right
-                    ]
-
-                pygame.draw.polygon(self.surface, RED, chevron_points)
+                self.draw_mirroring_indicator(position)
+
+    def draw_mirroring_indicator(self, position):
+        """Draw the red chevron showing a tyre's temperature is mirrored from centre."""
+        pygame.draw.polygon(self.surface, RED, self._chevron_points(position))
+
+    def _chevron_points(self, position):
+        """Chevron polygon for a tyre's mirroring indicator."""
+        pos = MLX_POSITIONS[position]
+        chevron_center_x = pos[0] + MLX_DISPLAY_WIDTH // 2
+        chevron_size = 6
+
+        # Rear tyres: down-pointing chevron above the thermal image
+        # Front tyres: up-pointing chevron below the thermal image
+        is_rear = position in ["RL", "RR"]
+
+        if is_rear:
+            # Down-pointing chevron above the thermal image
+            chevron_y = pos[1] - chevron_size - 2
+            return [
+                (chevron_center_x, chevron_y + chevron_size),  # Bottom point
+                (chevron_center_x - chevron_size, chevron_y),  # Top left
+                (chevron_center_x + chevron_size, chevron_y),  # Top right
+            ]
+
+        # Up-pointing chevron below the thermal image
+        chevron_y = pos[1] + MLX_DISPLAY_HEIGHT + 2
+        return [
+            (chevron_center_x, chevron_y),  # Top point
+            (chevron_center_x - chevron_size, chevron_y + chevron_size),  # Bottom left
+            (chevron_center_x + chevron_size, chevron_y + chevron_size),  # Bottom right
+        ]
 
     def _get_heat_colour(self, temp):
         """
@@ -1007,7 +785,7 @@ class Display:
         units_text = f"{temp_unit} / {pressure_unit}"
 
         # Render the text
-        units_surface = self.font_medium.render(units_text, True, WHITE)
+        units_surface = render_text(self.font_medium, units_text, WHITE)
 
         # Position in lower right corner
         units_pos = (
@@ -1044,7 +822,7 @@ class Display:
             return
 
         # Draw at the bottom center
-        status_text = self.font_medium.render(message, True, WHITE)
+        status_text = render_text(self.font_medium, message, WHITE)
         text_pos = (
             self.surface.get_width() // 2 - status_text.get_width() // 2,
             self.surface.get_height() - status_text.get_height() - 10,
@@ -1077,7 +855,7 @@ class Display:
         units_text = f"{temp_unit} / {pressure_unit}"
 
         # Render the text
-        units_surface = self.font_medium.render(units_text, True, WHITE)
+        units_surface = render_text(self.font_medium, units_text, WHITE)
 
         # Position in lower right corner (moved up to clear bottom status bar)
         units_pos = (
@@ -1095,9 +873,12 @@ class Display:
         Args:
             fps: Current UI/render frames per second
             camera_fps: Optional camera capture frames per second
+
+        Returns:
+            Rect drawn in, or None if the counter is disabled
         """
         if not FPS_COUNTER_ENABLED:
-            return
+            return None
 
         # Format FPS text - show both UI and camera FPS if available
         if camera_fps is not None:
@@ -1105,27 +886,20 @@ class Display:
         else:
             fps_text = f"FPS: {fps:.1f}"
 
-        fps_surface = self.font_small.render(fps_text, True, FPS_COUNTER_COLOUR)
-
         # Calculate position based on config
         padding = 10
         if FPS_COUNTER_POSITION == "top-left":
-            pos = (padding, padding)
-        elif FPS_COUNTER_POSITION == "top-right":
-            pos = (DISPLAY_WIDTH - fps_surface.get_width() - padding, padding)
+            anchor = {"topleft": (padding, padding)}
         elif FPS_COUNTER_POSITION == "bottom-left":
-            pos = (padding, DISPLAY_HEIGHT - fps_surface.get_height() - padding)
+            anchor = {"bottomleft": (padding, DISPLAY_HEIGHT - padding)}
         elif FPS_COUNTER_POSITION == "bottom-right":
-            pos = (
-                DISPLAY_WIDTH - fps_surface.get_width() - padding,
-                DISPLAY_HEIGHT - fps_surface.get_height() - padding,
-            )
+            anchor = {"bottomright": (DISPLAY_WIDTH - padding, DISPLAY_HEIGHT - padding)}
         else:
-            # Default to top-right
-            pos = (DISPLAY_WIDTH - fps_surface.get_width() - padding, padding)
+            # Top-right (default)
+            anchor = {"topright": (DISPLAY_WIDTH - padding, padding)}
 
         # Draw the FPS counter
-        self.surface.blit(fps_surface, pos)
+        return draw_text(self.surface, self.font_small, fps_text, FPS_COUNTER_COLOUR, **anchor)
 
     def draw_corner_indicator(
         self,
@@ -1176,8 +950,8 @@ class Display:
         distance_text = f"{int(distance)}m"
 
         # Render text
-        indicator_surface = self.font_medarge.render(indicator_text, True, colour)
-        distance_surface = self.font_small.render(distance_text, True, colour)
+        indicator_surface = render_text(self.font_medarge, indicator_text, colour)
+        distance_surface = render_text(self.font_small, distance_text, colour)
 
         # Calculate indicator size
         padding = int(10 * SCALE_X)
@@ -1232,7 +1006,7 @@ class Display:
             return
 
         # Render callout text
-        text_surface = self.font_small.render(callout_text, True, WHITE)
+        text_surface = render_text(self.font_small, callout_text, WHITE)
 
         # Calculate position
         margin = int(10 * SCALE_X)
@@ -26,6 +26,7 @@ from config import (
     FUEL_LOW_THRESHOLD_PERCENT,
     FUEL_CRITICAL_THRESHOLD_PERCENT,
 )
+from gui.text_cache import render_text
 
 
 class FuelDisplay:
@@ -125,11 +126,11 @@ class FuelDisplay:
 
     def _draw_no_data(self, screen):
         """Draw message when fuel data is unavailable."""
-        text = self.font_large.render("Fuel Data Unavailable", True, GREY)
+        text = render_text(self.font_large, "Fuel Data Unavailable", GREY)
         text_rect = text.get_rect(center=(self.width // 2, self.height // 2 - int(20 * SCALE_Y)))
         screen.blit(text, text_rect)
 
-        hint = self.font_small.render("Vehicle may not support fuel level PID (0x2F)", True, GREY)
+        hint = render_text(self.font_small, "Vehicle may not support fuel level PID (0x2F)", GREY)
         hint_rect = hint.get_rect(center=(self.width // 2, self.height // 2 + int(20 * SCALE_Y)))
         screen.blit(hint, hint_rect)
 
@@ -172,7 +173,7 @@ class FuelDisplay:
 
         # Draw fuel level text (centred on gauge)
         level_text = f"{fuel_litres:.1f} L ({fuel_percent:.0f}%)"
-        text_surface = self.font_medium.render(level_text, True, WHITE)
+        text_surface = render_text(self.font_medium, level_text, WHITE)
         text_rect = text_surface.get_rect(
             center=(self.gauge_x + self.gauge_width // 2, self.gauge_y + self.gauge_height // 2)
         )
@@ -180,7 +181,7 @@ class FuelDisplay:
 
         # Draw tank capacity label
         capacity_text = f"Tank: {tank_capacity:.0f} L"
-        capacity_surface = self.font_small.render(capacity_text, True, GREY)
+        capacity_surface = render_text(self.font_small, capacity_text, GREY)
         screen.blit(
             capacity_surface,
             (self.gauge_x, self.gauge_y + self.gauge_height + int(5 * SCALE_Y))
@@ -194,7 +195,7 @@ class FuelDisplay:
         line_height = int(45 * SCALE_Y)
 
         # Section header
-        header = self.font_medium.render("CONSUMPTION", True, WHITE)
+        header = render_text(self.font_medium, "CONSUMPTION", WHITE)
         screen.blit(header, (x_left, y_start))
 
         y = y_start + line_height
@@ -202,22 +203,22 @@ class FuelDisplay:
         # This lap
         current_lap = state.get('current_lap_consumption_litres')
         if current_lap is not None:
-            label = self.font_small.render("This Lap:", True, GREY)
-            value = self.font_medium.render(f"{current_lap:.2f} L", True, WHITE)
+            label = render_text(self.font_small, "This Lap:", GREY)
+            value = render_text(self.font_medium, f"{current_lap:.2f} L", WHITE)
         else:
-            label = self.font_small.render("This Lap:", True, GREY)
-            value = self.font_medium.render("--", True, GREY)
+            label = render_text(self.font_small, "This Lap:", GREY)
+            value = render_text(self.font_medium, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Average per lap
         avg_lap = state.get('avg_consumption_per_lap_litres')
         if avg_lap is not None:
-            label = self.font_small.render("Avg/Lap:", True, GREY)
-            value = self.font_medium.render(f"{avg_lap:.2f} L", True, WHITE)
+            label = render_text(self.font_small, "Avg/Lap:", GREY)
+            value = render_text(self.font_medium, f"{avg_lap:.2f} L", WHITE)
         else:
-            label = self.font_small.render("Avg/Lap:", True, GREY)
-            value = self.font_medium.render("--", True, GREY)
+            label = render_text(self.font_small, "Avg/Lap:", GREY)
+            value = render_text(self.font_medium, "--", GREY)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -226,18 +227,18 @@ class FuelDisplay:
         # Fuel rate (L/h) - left side
         fuel_rate = state.get('fuel_rate_lph')
         if fuel_rate is not None:
-            label = self.font_small.render("Rate:", True, GREY)
-            value = self.font_medium.render(f"{fuel_rate:.1f} L/h", True, WHITE)
+            label = render_text(self.font_small, "Rate:", GREY)
+            value = render_text(self.font_medium, f"{fuel_rate:.1f} L/h", WHITE)
         else:
-            label = self.font_small.render("Rate:", True, GREY)
-            value = self.font_medium.render("N/A", True, GREY)
+            label = render_text(self.font_small, "Rate:", GREY)
+            value = render_text(self.font_medium, "N/A", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Laps recorded - right side
         laps_recorded = state.get('laps_recorded', 0)
-        label = self.font_small.render("Laps:", True, GREY)
-        value = self.font_medium.render(f"{laps_recorded}", True, WHITE)
+        label = render_text(self.font_small, "Laps:", GREY)
+        value = render_text(self.font_medium, f"{laps_recorded}", WHITE)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -249,7 +250,7 @@ class FuelDisplay:
         line_height = int(45 * SCALE_Y)
 
         # Section header
-        header = self.font_medium.render("REMAINING", True, WHITE)
+        header = render_text(self.font_medium, "REMAINING", WHITE)
         screen.blit(header, (x_left, y_start))
 
         y = y_start + line_height
@@ -257,7 +258,7 @@ class FuelDisplay:
         # Estimated laps
         est_laps = state.get('estimated_laps_remaining')
         if est_laps is not None:
-            label = self.font_small.render("Laps:", True, GREY)
+            label = render_text(self.font_small, "Laps:", GREY)
             # Use yellow/red colouring for low lap estimates
             if est_laps <= 2:
                 value_colour = RED
@@ -265,17 +266,17 @@ class FuelDisplay:
                 value_colour = YELLOW
             else:
                 value_colour = GREEN
-            value = self.font_large.render(f"{est_laps:.0f}", True, value_colour)
+            value = render_text(self.font_large, f"{est_laps:.0f}", value_colour)
         else:
-            label = self.font_small.render("Laps:", True, GREY)
-            value = self.font_large.render("--", True, GREY)
+            label = render_text(self.font_small, "Laps:", GREY)
+            value = render_text(self.font_large, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Estimated time
         est_time = state.get('estimated_time_remaining_min')
         if est_time is not None:
-            label = self.font_small.render("Time:", True, GREY)
+            label = render_text(self.font_small, "Time:", GREY)
             # Format as hours:minutes if > 60 min
             if est_time >= 60:
                 hours = int(est_time // 60)
@@ -290,10 +291,10 @@ class FuelDisplay:
                 value_colour = YELLOW
             else:
                 value_colour = GREEN
-            value = self.font_large.render(time_str, True, value_colour)
+            value = render_text(self.font_large, time_str, value_colour)
         else:
-            label = self.font_small.render("Time:", True, GREY)
-            value = self.font_large.render("--", True, GREY)
+            label = render_text(self.font_small, "Time:", GREY)
+            value = render_text(self.font_large, "--", GREY)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -302,11 +303,11 @@ class FuelDisplay:
         # Estimated distance
         est_distance = state.get('estimated_distance_remaining_km')
         if est_distance is not None:
-            label = self.font_small.render("Distance:", True, GREY)
-            value = self.font_medium.render(f"{est_distance:.0f} km", True, WHITE)
+            label = render_text(self.font_small, "Distance:", GREY)
+            value = render_text(self.font_medium, f"{est_distance:.0f} km", WHITE)
         else:
-            label = self.font_small.render("Distance:", True, GREY)
-            value = self.font_medium.render("--", True, GREY)
+            label = render_text(self.font_small, "Distance:", GREY)
+            value = render_text(self.font_medium, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
@@ -318,7 +319,7 @@ class FuelDisplay:
         line_height = int(45 * SCALE_Y)
 
         # Section header
-        header = self.font_medium.render("SESSION", True, WHITE)
+        header = render_text(self.font_medium, "SESSION", WHITE)
         screen.blit(header, (x_left, y_start))
 
         y = y_start + line_height
@@ -326,18 +327,18 @@ class FuelDisplay:
         # Fuel used this session
         session_used = state.get('session_fuel_used_litres')
         if session_used is not None:
-            label = self.font_small.render("Used:", True, GREY)
-            value = self.font_medium.render(f"{session_used:.2f} L", True, WHITE)
+            label = render_text(self.font_small, "Used:", GREY)
+            value = render_text(self.font_medium, f"{session_used:.2f} L", WHITE)
         else:
-            label = self.font_small.render("Used:", True, GREY)
-            value = self.font_medium.render("--", True, GREY)
+            label = render_text(self.font_small, "Used:", GREY)
+            value = render_text(self.font_medium, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Distance travelled
         distance = state.get('session_distance_km', 0)
-        label = self.font_small.render("Distance:", True, GREY)
-        value = self.font_medium.render(f"{distance:.1f} km", True, WHITE)
+        label = render_text(self.font_small, "Distance:", GREY)
+        value = render_text(self.font_medium, f"{distance:.1f} km", WHITE)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -346,22 +347,22 @@ class FuelDisplay:
         # Consumption rate L/100km
         consumption = state.get('consumption_per_100km')
         if consumption is not None:
-            label = self.font_small.render("Economy:", True, GREY)
-            value = self.font_medium.render(f"{consumption:.1f} L/100km", True, WHITE)
+            label = render_text(self.font_small, "Economy:", GREY)
+            value = render_text(self.font_medium, f"{consumption:.1f} L/100km", WHITE)
         else:
-            label = self.font_small.render("Economy:", True, GREY)
-            value = self.font_medium.render("--", True, GREY)
+            label = render_text(self.font_small, "Economy:", GREY)
+            value = render_text(self.font_medium, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Fuel rate (L/h) if available
         fuel_rate = state.get('fuel_rate_lph')
         if fuel_rate is not None:
-            label = self.font_small.render("Rate:", True, GREY)
-            value = self.font_medium.render(f"{fuel_rate:.1f} L/h", True, WHITE)
+            label = render_text(self.font_small, "Rate:", GREY)
+            value = render_text(self.font_medium, f"{fuel_rate:.1f} L/h", WHITE)
         else:
-            label = self.font_small.render("Rate:", True, GREY)
-            value = self.font_medium.render("N/A", True, GREY)
+            label = render_text(self.font_small, "Rate:", GREY)
+            value = render_text(self.font_medium, "N/A", GREY)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -373,7 +374,7 @@ class FuelDisplay:
         line_height = int(45 * SCALE_Y)
 
         # Section header
-        header = self.font_medium.render("REMAINING", True, WHITE)
+        header = render_text(self.font_medium, "REMAINING", WHITE)
         screen.blit(header, (x_left, y_start))
 
         y = y_start + line_height
@@ -381,7 +382,7 @@ class FuelDisplay:
         # Estimated range
         est_range = state.get('estimated_range_km')
         if est_range is not None:
-            label = self.font_small.render("Range:", True, GREY)
+            label = render_text(self.font_small, "Range:", GREY)
             # Colour based on range
             if est_range <= 20:
                 value_colour = RED
@@ -389,17 +390,17 @@ class FuelDisplay:
                 value_colour = YELLOW
             else:
                 value_colour = GREEN
-            value = self.font_large.render(f"{est_range:.0f} km", True, value_colour)
+            value = render_text(self.font_large, f"{est_range:.0f} km", value_colour)
         else:
-            label = self.font_small.render("Range:", True, GREY)
-            value = self.font_large.render("--", True, GREY)
+            label = render_text(self.font_small, "Range:", GREY)
+            value = render_text(self.font_large, "--", GREY)
         screen.blit(label, (x_left, y))
         screen.blit(value, (x_left + int(100 * SCALE_X), y))
 
         # Estimated time (from fuel rate if available)
         est_time = state.get('estimated_time_remaining_min')
         if est_time is not None:
-            label = self.font_small.render("Time:", True, GREY)
+            label = render_text(self.font_small, "Time:", GREY)
             if est_time >= 60:
                 hours = int(est_time // 60)
                 mins = int(est_time % 60)
@@ -412,10 +413,10 @@ class FuelDisplay:
                 value_colour = YELLOW
             else:
                 value_colour = GREEN
-            value = self.font_large.render(time_str, True, value_colour)
+            value = render_text(self.font_large, time_str, value_colour)
         else:
-            label = self.font_small.render("Time:", True, GREY)
-            value = self.font_large.render("--", True, GREY)
+            label = render_text(self.font_small, "Time:", GREY)
+            value = render_text(self.font_large, "--", GREY)
         screen.blit(label, (x_right, y))
         screen.blit(value, (x_right + int(100 * SCALE_X), y))
 
@@ -429,7 +430,7 @@ class FuelDisplay:
             import time
             if int(time.time() * 2) % 2 == 0:
                 warning_text = "LOW FUEL - PIT NOW"
-                text = self.font_large.render(warning_text, True, RED)
+                text = render_text(self.font_large, warning_text, RED)
                 # Draw background box
                 text_rect = text.get_rect(center=(self.width // 2, self.height - int(60 * SCALE_Y)))
                 bg_rect = text_rect.inflate(int(20 * SCALE_X), int(10 * SCALE_Y))
@@ -438,6 +439,6 @@ class FuelDisplay:
                 screen.blit(text, text_rect)
         elif low:
             warning_text = "Low Fuel Warning"
-            text = self.font_medium.render(warning_text, True, YELLOW)
+            text = render_text(self.font_medium, warning_text, YELLOW)
             text_rect = text.get_rect(center=(self.width // 2, self.height - int(60 * SCALE_Y)))
             screen.blit(text, text_rect)
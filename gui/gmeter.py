@@ -5,6 +5,7 @@ Shows real-time lateral and longitudinal G-forces with peak tracking.
 
 import logging
 import math
+from collections.abc import Mapping
 import pygame
 
 logger = logging.getLogger('openTPT.gmeter')
@@ -26,6 +27,7 @@ from config import (
     SCALE_Y,
     SPEED_UNIT,
 )
+from gui.text_cache import draw_text, render_text
 from utils.settings import get_settings
 
 
@@ -123,7 +125,7 @@ class GMeterDisplay:
         self.last_update_time = time.time()
 
         # Update current values with smoothing (exponential moving average)
-        if isinstance(imu_data, dict):
+        if isinstance(imu_data, Mapping):
             raw_lateral = imu_data.get("accel_x", 0.0)
             raw_longitudinal = imu_data.get("accel_y", 0.0)
         else:
@@ -224,8 +226,8 @@ class GMeterDisplay:
 
         # Draw axis labels at ends
         # Left/Right for lateral
-        text_left = self.font_small.render("L", True, WHITE)
-        text_right = self.font_small.render("R", True, WHITE)
+        text_left = render_text(self.font_small, "L", WHITE)
+        text_right = render_text(self.font_small, "R", WHITE)
         screen.blit(
             text_left,
             (
@@ -242,8 +244,8 @@ class GMeterDisplay:
         )
 
         # Forward/Back for longitudinal (centered horizontally)
-        text_forward = self.font_small.render("F", True, WHITE)
-        text_back = self.font_small.render("B", True, WHITE)
+        text_forward = render_text(self.font_small, "F", WHITE)
+        text_back = render_text(self.font_small, "B", WHITE)
 
         # Center F above top of circle
         text_forward_rect = text_forward.get_rect(
@@ -325,23 +327,19 @@ class GMeterDisplay:
         combined_colour = WHITE if imu_connected else RED
 
         # Render the combined G reading
-        full_text = self.font_xlarge.render(f"{combined_g:.1f}g", True, combined_colour)
-
         # Draw at specified position
-        screen.blit(full_text, (x_pos, y_pos))
+        draw_text(screen, self.font_xlarge, f"{combined_g:.1f}g", combined_colour, topleft=(x_pos, y_pos))
 
         # Lateral and Longitudinal (smaller, left side of screen)
         x_pos = int(20 * SCALE_X)  # Left margin
         y_pos = int(120 * SCALE_Y)  # Below title
 
-        text_lateral = self.font_medium.render(
-            f"Lat: {self.current_lateral:+.1f}g", True, GREEN
-        )
+        text_lateral = render_text(self.font_medium, f"Lat: {self.current_lateral:+.1f}g", GREEN)
         screen.blit(text_lateral, (x_pos, y_pos))
 
         y_pos += int(35 * SCALE_Y)
-        text_longitudinal = self.font_medium.render(
-            f"Long: {self.current_longitudinal:+.1f}g", True, GREEN
+        text_longitudinal = render_text(
+            self.font_medium, f"Long: {self.current_longitudinal:+.1f}g", GREEN
         )
         screen.blit(text_longitudinal, (x_pos, y_pos))
 
@@ -353,8 +351,8 @@ class GMeterDisplay:
         y_pos = self.height - int(155 * SCALE_Y)
 
         # Peak combined
-        text_peak_combined = self.font_small.render(
-            f"Peak G: {self.peak_combined:.1f}g", True, YELLOW
+        text_peak_combined = render_text(
+            self.font_small, f"Peak G: {self.peak_combined:.1f}g", YELLOW
         )
         screen.blit(text_peak_combined, (x_pos, y_pos))
 
@@ -363,8 +361,8 @@ class GMeterDisplay:
         peak_lateral_display = max(
             abs(self.peak_lateral_left), abs(self.peak_lateral_right)
         )
-        text_peak_lateral = self.font_small.render(
-            f"Peak Lat: {peak_lateral_display:.1f}g", True, YELLOW
+        text_peak_lateral = render_text(
+            self.font_small, f"Peak Lat: {peak_lateral_display:.1f}g", YELLOW
         )
         screen.blit(text_peak_lateral, (x_pos, y_pos))
 
@@ -373,8 +371,8 @@ class GMeterDisplay:
         peak_long_display = max(
             abs(self.peak_longitudinal_forward), abs(self.peak_longitudinal_backward)
         )
-        text_peak_long = self.font_small.render(
-            f"Peak Long: {peak_long_display:.1f}g", True, YELLOW
+        text_peak_long = render_text(
+            self.font_small, f"Peak Long: {peak_long_display:.1f}g", YELLOW
         )
         screen.blit(text_peak_long, (x_pos, y_pos))
 
@@ -383,7 +381,7 @@ class GMeterDisplay:
         # Check if we have a status message instead of speed
         if self.current_speed_kmh is None and self.speed_status:
             # Show status message (e.g. "no fix")
-            text_speed = self.font_large.render(self.speed_status, True, GREY)
+            text_speed = render_text(self.font_large, self.speed_status, GREY)
             speed_rect = text_speed.get_rect()
             speed_rect.bottomright = (self.width - int(20 * SCALE_X), self.height - int(80 * SCALE_Y))
             screen.blit(text_speed, speed_rect)
@@ -402,13 +400,13 @@ class GMeterDisplay:
             unit_label = "km/h"
 
         # Speed display (xlarge font)
-        text_speed = self.font_xlarge.render(f"{display_speed}", True, WHITE)
-        speed_rect = text_speed.get_rect()
-        speed_rect.bottomright = (self.width - int(20 * SCALE_X), self.height - int(80 * SCALE_Y))
-        screen.blit(text_speed, speed_rect)
+        speed_rect = draw_text(
+            screen, self.font_xlarge, f"{display_speed}", WHITE,
+            bottomright=(self.width - int(20 * SCALE_X), self.height - int(80 * SCALE_Y)),
+        )
 
         # Label (smaller, below speed)
-        text_label = self.font_small.render(unit_label, True, GREY)
+        text_label = render_text(self.font_small, unit_label, GREY)
         label_rect = text_label.get_rect()
         label_rect.topright = (self.width - int(20 * SCALE_X), speed_rect.bottom + int(5 * SCALE_Y))
         screen.blit(text_label, label_rect)
@@ -417,7 +415,7 @@ class GMeterDisplay:
         """Draw additional labels and information."""
         # Title (top left, moved down to avoid top status bar)
         # text_title = self.font_medium.render("G-METER", True, WHITE)
-        text_title = self.font_medium.render("", True, WHITE)
+        text_title = render_text(self.font_medium, "", WHITE)
         screen.blit(text_title, (int(20 * SCALE_X), int(35 * SCALE_Y)))
 
     def set_speed(self, speed_kmh, status=None):
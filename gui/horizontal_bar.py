@@ -5,6 +5,8 @@ Bar grows from centre outwards symmetrically and uses colour coding.
 
 import pygame
 
+from gui.text_cache import render_text
+
 
 class HorizontalBar:
     """
@@ -49,6 +51,11 @@ class HorizontalBar:
             (95, (255, 0, 0)),     # Red at high values
         ]
 
+    @property
+    def rect(self):
+        """Screen area the bar draws in (the centre line ends a pixel below the bar)."""
+        return pygame.Rect(self.x, self.y, self.width, self.height + 1)
+
     def set_value(self, value):
         """Set current value."""
         self.value = max(self.min_value, min(self.max_value, value))
@@ -124,7 +131,7 @@ class HorizontalBar:
 
             # "No Data" text
             if self.font:
-                text_surface = self.font.render("No Data", True, (100, 100, 100))
+                text_surface = render_text(self.font, "No Data", (100, 100, 100))
                 text_rect = text_surface.get_rect(center=(centre_x, self.y + self.height // 2))
                 surface.blit(text_surface, text_rect)
             return
@@ -177,13 +184,13 @@ class HorizontalBar:
         if self.font:
             # Value text (centre)
             value_text = f"{self.value:.0f}{self.unit}"
-            text_surface = self.font.render(value_text, True, (255, 255, 255))
+            text_surface = render_text(self.font, value_text, (255, 255, 255))
             text_rect = text_surface.get_rect(center=(centre_x, self.y + self.height // 2))
             surface.blit(text_surface, text_rect)
 
             # Label text (left side)
             if self.label:
-                label_surface = self.font.render(self.label, True, (200, 200, 200))
+                label_surface = render_text(self.font, self.label, (200, 200, 200))
                 label_rect = label_surface.get_rect(
                     midleft=(self.x + 5, self.y + self.height // 2)
                 )
@@ -293,13 +300,13 @@ class DualDirectionBar(HorizontalBar):
             else:
                 value_text = f"{self.value:.1f}{self.unit}"
 
-            text_surface = self.font.render(value_text, True, (255, 255, 255))
+            text_surface = render_text(self.font, value_text, (255, 255, 255))
             text_rect = text_surface.get_rect(center=(centre_x, self.y + self.height // 2))
             surface.blit(text_surface, text_rect)
 
             # Label
             if self.label:
-                label_surface = self.font.render(self.label, True, (200, 200, 200))
+                label_surface = render_text(self.font, self.label, (200, 200, 200))
                 label_rect = label_surface.get_rect(
                     midleft=(self.x + 5, self.y + self.height // 2)
                 )
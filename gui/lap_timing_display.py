@@ -27,6 +27,7 @@ from config import (
     SCALE_Y,
     MAP_THEME_DEFAULT,
 )
+from gui.text_cache import draw_text, render_text
 from utils.settings import get_settings
 from utils.theme_loader import get_theme_loader
 
@@ -220,7 +221,7 @@ class LapTimingDisplay:
         """Draw message when no track is detected."""
         # Centre message
         text = "Waiting for track..."
-        text_surface = self.font_large.render(text, True, self.colour_no_data)
+        text_surface = render_text(self.font_large, text, self.colour_no_data)
         text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
         screen.blit(text_surface, text_rect)
 
@@ -230,19 +231,19 @@ class LapTimingDisplay:
 
         # Track name (left)
         if track_name:
-            track_surface = self.font_medium.render(track_name, True, WHITE)
+            track_surface = render_text(self.font_medium, track_name, WHITE)
             screen.blit(track_surface, (int(20 * SCALE_X), y_pos))
 
         # Lap number (centre)
         lap_text = f"LAP {lap_number}" if lap_number > 0 else "OUT LAP"
-        lap_surface = self.font_medium.render(lap_text, True, WHITE)
+        lap_surface = render_text(self.font_medium, lap_text, WHITE)
         lap_rect = lap_surface.get_rect(center=(self.width // 2, y_pos + 10))
         screen.blit(lap_surface, lap_rect)
 
         # Best lap (right)
         best_text = f"BEST: {self._format_time(best_lap_time)}"
         best_colour = self.colour_best if best_lap_time else self.colour_no_data
-        best_surface = self.font_medium.render(best_text, True, best_colour)
+        best_surface = render_text(self.font_medium, best_text, best_colour)
         best_rect = best_surface.get_rect(right=self.width - int(20 * SCALE_X), top=y_pos)
         screen.blit(best_surface, best_rect)
 
@@ -253,36 +254,35 @@ class LapTimingDisplay:
 
         time_text = self._format_time(current_time)
         time_colour = self.colour_current
-        time_surface = self.font_huge.render(time_text, True, time_colour)
-        time_rect = time_surface.get_rect(center=(self.width // 2, y_centre))
-        screen.blit(time_surface, time_rect)
+        draw_text(screen, self.font_huge, time_text, time_colour, center=(self.width // 2, y_centre))
 
         # Delta below (if we have a reference lap)
         if current_time is not None and delta != 0:
             delta_text = self._format_time(delta, show_sign=True)
             delta_colour = self.colour_faster if delta < 0 else self.colour_slower
-            delta_surface = self.font_xlarge.render(delta_text, True, delta_colour)
-            delta_rect = delta_surface.get_rect(center=(self.width // 2, y_centre + int(80 * SCALE_Y)))
-            screen.blit(delta_surface, delta_rect)
+            draw_text(
+                screen, self.font_xlarge, delta_text, delta_colour,
+                center=(self.width // 2, y_centre + int(80 * SCALE_Y)),
+            )
 
     def _draw_last_lap(self, screen, last_time, last_delta):
         """Draw last lap time and delta."""
         y_pos = int(self.height * 0.68)
 
         # Label
-        label_surface = self.font_small.render("LAST", True, GREY)
+        label_surface = render_text(self.font_small, "LAST", GREY)
         screen.blit(label_surface, (int(self.width * 0.25) - 50, y_pos - int(25 * SCALE_Y)))
 
         # Last lap time
         last_text = self._format_time(last_time)
-        last_surface = self.font_large.render(last_text, True, self.colour_last)
+        last_surface = render_text(self.font_large, last_text, self.colour_last)
         screen.blit(last_surface, (int(self.width * 0.25) - 50, y_pos))
 
         # Last lap delta (if available)
         if last_delta is not None:
             delta_text = self._format_time(last_delta, show_sign=True)
             delta_colour = self.colour_faster if last_delta < 0 else self.colour_slower
-            delta_surface = self.font_medium.render(delta_text, True, delta_colour)
+            delta_surface = render_text(self.font_medium, delta_text, delta_colour)
             screen.blit(delta_surface, (int(self.width * 0.25) - 50, y_pos + int(45 * SCALE_Y)))
 
     def _draw_sectors(self, screen, sectors, current_sector):
@@ -306,7 +306,7 @@ class LapTimingDisplay:
             # Sector label
             label = f"S{i + 1}"
             label_colour = self.colour_sector_current if is_current else GREY
-            label_surface = self.font_small.render(label, True, label_colour)
+            label_surface = render_text(self.font_small, label, label_colour)
             label_rect = label_surface.get_rect(center=(x_pos, y_pos - int(20 * SCALE_Y)))
             screen.blit(label_surface, label_rect)
 
@@ -325,7 +325,7 @@ class LapTimingDisplay:
                 time_text = "--.---"
                 time_colour = self.colour_no_data
 
-            time_surface = self.font_medium.render(time_text, True, time_colour)
+            time_surface = render_text(self.font_medium, time_text, time_colour)
             time_rect = time_surface.get_rect(center=(x_pos, y_pos + int(10 * SCALE_Y)))
             screen.blit(time_surface, time_rect)
 
@@ -372,7 +372,7 @@ class LapTimingDisplay:
         if track is None:
             # No track data available
             no_map_text = "Track map not available"
-            text_surface = self.font_medium.render(no_map_text, True, self.colour_no_data)
+            text_surface = render_text(self.font_medium, no_map_text, self.colour_no_data)
             text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
             screen.blit(text_surface, text_rect)
             return
@@ -455,26 +455,29 @@ class LapTimingDisplay:
 
         # Track name (left)
         if track_name:
-            track_surface = self.font_medium.render(track_name, True, WHITE)
+            track_surface = render_text(self.font_medium, track_name, WHITE)
             screen.blit(track_surface, (int(20 * SCALE_X), y_pos))
 
         # Lap number (centre-left)
         lap_text = f"LAP {lap_number}" if lap_number > 0 else "OUT LAP"
-        lap_surface = self.font_medium.render(lap_text, True, WHITE)
+        lap_surface = render_text(self.font_medium, lap_text, WHITE)
         screen.blit(lap_surface, (int(self.width * 0.35), y_pos))
 
         # Current lap time (centre-right)
         time_text = self._format_time(current_time)
-        time_surface = self.font_large.render(time_text, True, self.colour_current)
-        screen.blit(time_surface, (int(self.width * 0.55), y_pos - 5))
+        draw_text(
+            screen, self.font_large, time_text, self.colour_current,
+            topleft=(int(self.width * 0.55), y_pos - 5),
+        )
 
         # Delta (right)
         if current_time is not None and delta != 0:
             delta_text = self._format_time(delta, show_sign=True)
             delta_colour = self.colour_faster if delta < 0 else self.colour_slower
-            delta_surface = self.font_large.render(delta_text, True, delta_colour)
-            delta_rect = delta_surface.get_rect(right=self.width - int(20 * SCALE_X), top=y_pos - 5)
-            screen.blit(delta_surface, delta_rect)
+            draw_text(
+                screen, self.font_large, delta_text, delta_colour,
+                right=self.width - int(20 * SCALE_X), top=y_pos - 5,
+            )
 
     def _draw_delta_bar(self, screen, delta):
         """Draw a horizontal delta bar at the bottom of map view."""
@@ -524,9 +527,9 @@ class LapTimingDisplay:
             pygame.draw.rect(screen, fill_colour, fill_rect)
 
         # Labels
-        minus_surface = self.font_small.render("-10s", True, GREY)
+        minus_surface = render_text(self.font_small, "-10s", GREY)
         screen.blit(minus_surface, (bar_margin - int(40 * SCALE_X), bar_y + int(5 * SCALE_Y)))
 
-        plus_surface = self.font_small.render("+10s", True, GREY)
+        plus_surface = render_text(self.font_small, "+10s", GREY)
         plus_rect = plus_surface.get_rect(left=bar_margin + bar_width + int(5 * SCALE_X), top=bar_y + int(5 * SCALE_Y))
         screen.blit(plus_surface, plus_rect)
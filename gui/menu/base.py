@@ -40,6 +40,7 @@ from config import (
     OIL_TEMP_CRITICAL,
     INTAKE_TEMP_WARNING,
 )
+from gui.text_cache import render_text
 from utils.settings import get_settings
 
 # Import mixins
@@ -289,7 +290,7 @@ class Menu:
         )
 
         # Draw title
-        title_surface = self._font_title.render(self.title, True, MENU_HEADER_COLOUR)
+        title_surface = render_text(self._font_title, self.title, MENU_HEADER_COLOUR)
         title_x = menu_x + (menu_width - title_surface.get_width()) // 2
         title_y = menu_y + 12
         surface.blit(title_surface, (title_x, title_y))
@@ -302,7 +303,7 @@ class Menu:
 
         # Draw scroll indicator if needed
         if self.scroll_offset > 0:
-            arrow_up = self._font_hint.render("more", True, GREY)
+            arrow_up = render_text(self._font_hint, "more", GREY)
             surface.blit(arrow_up, (menu_x + menu_width - 80, item_start_y - 25))
 
         for display_idx, i in enumerate(
@@ -332,12 +333,12 @@ class Menu:
             if item.submenu:
                 label += " >"
 
-            item_surface = self._font_item.render(label, True, colour)
+            item_surface = render_text(self._font_item, label, colour)
             surface.blit(item_surface, (menu_x + item_padding, item_y))
 
         # Draw scroll indicator if more items below
         if self.scroll_offset + max_visible < len(self.items):
-            arrow_down = self._font_hint.render("more", True, GREY)
+            arrow_down = render_text(self._font_hint, "more", GREY)
             last_item_y = item_start_y + (max_visible * item_height)
             surface.blit(arrow_down, (menu_x + menu_width - 80, last_item_y - 25))
 
@@ -345,9 +346,7 @@ class Menu:
         if self.status_message and (
             time.time() - self.status_time < self.status_duration
         ):
-            status_surface = self._font_hint.render(
-                self.status_message, True, MENU_HEADER_COLOUR
-            )
+            status_surface = render_text(self._font_hint, self.status_message, MENU_HEADER_COLOUR)
             status_x = menu_x + (menu_width - status_surface.get_width()) // 2
             status_y = menu_y + menu_height - 30
             surface.blit(status_surface, (status_x, status_y))
@@ -17,6 +17,7 @@ from config import (
     FONT_SIZE_MEDIUM,
     TYRE_HISTORY_DISPLAY_DEFAULT,
 )
+from gui.text_cache import get_font, render_text
 from utils.settings import get_settings
 
 logger = logging.getLogger('openTPT.menu.tyre_temps')
@@ -355,14 +356,11 @@ class TyreTempsMenuMixin:
         pygame.draw.rect(screen, (100, 200, 255), heatmap_rect, 2)
 
         # Draw title and stats
-        try:
-            font = pygame.font.Font(FONT_PATH, FONT_SIZE_MEDIUM)
-        except (pygame.error, FileNotFoundError, IOError, OSError):
-            font = pygame.font.Font(None, 24)
+        font = get_font(FONT_PATH, FONT_SIZE_MEDIUM)
 
         # Title
         title = f"{position} Full Frame (24x32)"
-        title_surface = font.render(title, True, (200, 200, 255))
+        title_surface = render_text(font, title, (200, 200, 255))
         title_rect = title_surface.get_rect(centerx=DISPLAY_WIDTH // 2, top=20)
         screen.blit(title_surface, title_rect)
 
@@ -380,13 +378,13 @@ class TyreTempsMenuMixin:
             temp_avg = celsius_to_fahrenheit(temp_avg)
 
         stats = f"Min: {temp_min:.1f}{temp_unit}  Avg: {temp_avg:.1f}{temp_unit}  Max: {temp_max:.1f}{temp_unit}"
-        stats_surface = font.render(stats, True, (200, 200, 200))
+        stats_surface = render_text(font, stats, (200, 200, 200))
         stats_rect = stats_surface.get_rect(centerx=DISPLAY_WIDTH // 2, bottom=DISPLAY_HEIGHT - 50)
         screen.blit(stats_surface, stats_rect)
 
         # Instructions
         hint = "Press encoder to close"
-        hint_surface = font.render(hint, True, (150, 150, 150))
+        hint_surface = render_text(font, hint, (150, 150, 150))
         hint_rect = hint_surface.get_rect(centerx=DISPLAY_WIDTH // 2, bottom=DISPLAY_HEIGHT - 20)
         screen.blit(hint_surface, hint_rect)
 
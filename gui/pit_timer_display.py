@@ -25,6 +25,7 @@ from config import (
     SCALE_X,
     SCALE_Y,
 )
+from gui.text_cache import render_text
 
 
 class PitTimerDisplay:
@@ -129,10 +130,10 @@ class PitTimerDisplay:
 
         # Track name (left)
         if track_name:
-            track_surface = self.font_medium.render(track_name, True, WHITE)
+            track_surface = render_text(self.font_medium, track_name, WHITE)
             screen.blit(track_surface, (int(20 * SCALE_X), y_pos))
         else:
-            no_track_surface = self.font_medium.render("No track selected", True, GREY)
+            no_track_surface = render_text(self.font_medium, "No track selected", GREY)
             screen.blit(no_track_surface, (int(20 * SCALE_X), y_pos))
 
         # State indicator (centre)
@@ -144,7 +145,7 @@ class PitTimerDisplay:
         else:
             state_colour = self.colour_stationary
 
-        state_surface = self.font_medium.render(state_text, True, state_colour)
+        state_surface = render_text(self.font_medium, state_text, state_colour)
         state_rect = state_surface.get_rect(center=(self.width // 2, y_pos + 10))
         screen.blit(state_surface, state_rect)
 
@@ -157,8 +158,8 @@ class PitTimerDisplay:
 
         x_right = self.width - int(20 * SCALE_X)
 
-        entry_surface = self.font_small.render(entry_text, True, entry_colour)
-        exit_surface = self.font_small.render(exit_text, True, exit_colour)
+        entry_surface = render_text(self.font_small, entry_text, entry_colour)
+        exit_surface = render_text(self.font_small, exit_text, exit_colour)
 
         entry_rect = entry_surface.get_rect(right=x_right - int(50 * SCALE_X), top=y_pos)
         exit_rect = exit_surface.get_rect(right=x_right, top=y_pos)
@@ -188,18 +189,18 @@ class PitTimerDisplay:
             sub_text = f"{'Entry' if has_entry else 'Exit'} set, need {'exit' if has_entry else 'entry'} line"
             main_colour = YELLOW
 
-        main_surface = self.font_large.render(main_text, True, main_colour)
+        main_surface = render_text(self.font_large, main_text, main_colour)
         main_rect = main_surface.get_rect(center=(self.width // 2, y_centre))
         screen.blit(main_surface, main_rect)
 
-        sub_surface = self.font_small.render(sub_text, True, GREY)
+        sub_surface = render_text(self.font_small, sub_text, GREY)
         sub_rect = sub_surface.get_rect(center=(self.width // 2, y_centre + int(50 * SCALE_Y)))
         screen.blit(sub_surface, sub_rect)
 
         # Show current speed at bottom
         speed = data.get('speed_kmh', 0)
         speed_text = f"Speed: {speed:.0f} km/h"
-        speed_surface = self.font_medium.render(speed_text, True, WHITE)
+        speed_surface = render_text(self.font_medium, speed_text, WHITE)
         speed_rect = speed_surface.get_rect(center=(self.width // 2, int(self.height * 0.7)))
         screen.blit(speed_surface, speed_rect)
 
@@ -210,7 +211,7 @@ class PitTimerDisplay:
         # Large elapsed time
         elapsed = data.get('elapsed_pit_time_s', 0)
         time_text = self._format_time(elapsed, large=True)
-        time_surface = self.font_huge.render(time_text, True, self.colour_pit_lane)
+        time_surface = render_text(self.font_huge, time_text, self.colour_pit_lane)
         time_rect = time_surface.get_rect(center=(self.width // 2, y_centre))
         screen.blit(time_surface, time_rect)
 
@@ -228,7 +229,7 @@ class PitTimerDisplay:
             speed_colour = WHITE
 
         speed_text = f"{speed:.0f} / {limit:.0f} km/h"
-        speed_surface = self.font_large.render(speed_text, True, speed_colour)
+        speed_surface = render_text(self.font_large, speed_text, speed_colour)
         speed_rect = speed_surface.get_rect(center=(self.width // 2, y_centre + int(90 * SCALE_Y)))
         screen.blit(speed_surface, speed_rect)
 
@@ -247,53 +248,53 @@ class PitTimerDisplay:
         if safe:
             # Safe to leave - show GO
             go_text = "GO!"
-            go_surface = self.font_huge.render(go_text, True, self.colour_go)
+            go_surface = render_text(self.font_huge, go_text, self.colour_go)
             go_rect = go_surface.get_rect(center=(self.width // 2, y_centre))
             screen.blit(go_surface, go_rect)
 
             # Show total time below
             time_text = self._format_time(elapsed_pit, large=True)
-            time_surface = self.font_xlarge.render(time_text, True, WHITE)
+            time_surface = render_text(self.font_xlarge, time_text, WHITE)
             time_rect = time_surface.get_rect(center=(self.width // 2, y_centre + int(90 * SCALE_Y)))
             screen.blit(time_surface, time_rect)
 
-            label_surface = self.font_medium.render("TOTAL PIT TIME", True, GREY)
+            label_surface = render_text(self.font_medium, "TOTAL PIT TIME", GREY)
             label_rect = label_surface.get_rect(center=(self.width // 2, y_centre + int(130 * SCALE_Y)))
             screen.blit(label_surface, label_rect)
 
         elif countdown is not None and countdown > 0:
             # Countdown active
             countdown_text = f"{countdown:.1f}"
-            countdown_surface = self.font_huge.render(countdown_text, True, self.colour_wait)
+            countdown_surface = render_text(self.font_huge, countdown_text, self.colour_wait)
             countdown_rect = countdown_surface.get_rect(center=(self.width // 2, y_centre))
             screen.blit(countdown_surface, countdown_rect)
 
             wait_text = "WAIT"
-            wait_surface = self.font_large.render(wait_text, True, self.colour_wait)
+            wait_surface = render_text(self.font_large, wait_text, self.colour_wait)
             wait_rect = wait_surface.get_rect(center=(self.width // 2, y_centre + int(90 * SCALE_Y)))
             screen.blit(wait_surface, wait_rect)
 
             # Stationary time
             stat_text = f"Stationary: {self._format_time(elapsed_stat, large=True)}"
-            stat_surface = self.font_medium.render(stat_text, True, GREY)
+            stat_surface = render_text(self.font_medium, stat_text, GREY)
             stat_rect = stat_surface.get_rect(center=(self.width // 2, y_centre + int(140 * SCALE_Y)))
             screen.blit(stat_surface, stat_rect)
 
         else:
             # Stationary, no countdown
             stat_time = self._format_time(elapsed_stat, large=True)
-            stat_surface = self.font_huge.render(stat_time, True, self.colour_stationary)
+            stat_surface = render_text(self.font_huge, stat_time, self.colour_stationary)
             stat_rect = stat_surface.get_rect(center=(self.width // 2, y_centre))
             screen.blit(stat_surface, stat_rect)
 
             label_text = "STOPPED"
-            label_surface = self.font_large.render(label_text, True, self.colour_stationary)
+            label_surface = render_text(self.font_large, label_text, self.colour_stationary)
             label_rect = label_surface.get_rect(center=(self.width // 2, y_centre + int(90 * SCALE_Y)))
             screen.blit(label_surface, label_rect)
 
             # Total pit time
             total_text = f"Total: {self._format_time(elapsed_pit, large=True)}"
-            total_surface = self.font_medium.render(total_text, True, GREY)
+            total_surface = render_text(self.font_medium, total_text, GREY)
             total_rect = total_surface.get_rect(center=(self.width // 2, y_centre + int(140 * SCALE_Y)))
             screen.blit(total_surface, total_rect)
 
@@ -349,8 +350,8 @@ class PitTimerDisplay:
         zero_text = "0"
         limit_text = f"{limit:.0f}"
 
-        zero_surface = self.font_small.render(zero_text, True, GREY)
-        limit_surface = self.font_small.render(limit_text, True, GREY)
+        zero_surface = render_text(self.font_small, zero_text, GREY)
+        limit_surface = render_text(self.font_small, limit_text, GREY)
 
         screen.blit(zero_surface, (bar_x - int(15 * SCALE_X), y_pos + int(2 * SCALE_Y)))
         limit_rect = limit_surface.get_rect(left=bar_x + bar_width + int(5 * SCALE_X), top=y_pos + int(2 * SCALE_Y))
@@ -367,14 +368,14 @@ class PitTimerDisplay:
         else:
             last_text = "Last: --:--.---"
 
-        last_surface = self.font_small.render(last_text, True, GREY)
+        last_surface = render_text(self.font_small, last_text, GREY)
         screen.blit(last_surface, (int(20 * SCALE_X), y_pos))
 
         # Mode indicator (centre)
         mode = data.get('mode', 'entrance_to_exit')
         mode_label = "Entrance to Exit" if mode == "entrance_to_exit" else "Stationary Only"
 
-        mode_surface = self.font_small.render(f"Mode: {mode_label}", True, GREY)
+        mode_surface = render_text(self.font_small, f"Mode: {mode_label}", GREY)
         mode_rect = mode_surface.get_rect(center=(self.width // 2, y_pos + int(6 * SCALE_Y)))
         screen.blit(mode_surface, mode_rect)
 
@@ -385,6 +386,6 @@ class PitTimerDisplay:
         else:
             stop_text = "Min Stop: None"
 
-        stop_surface = self.font_small.render(stop_text, True, GREY)
+        stop_surface = render_text(self.font_small, stop_text, GREY)
         stop_rect = stop_surface.get_rect(right=self.width - int(20 * SCALE_X), top=y_pos)
         screen.blit(stop_surface, stop_rect)
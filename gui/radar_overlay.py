@@ -9,7 +9,8 @@ import pygame
 import math
 from typing import Dict, List, Tuple, Optional
 import time
-from config import FONT_PATH, TEXT_CACHE_MAX_SIZE
+from config import FONT_PATH
+from gui.text_cache import get_font, render_text
 
 # Overlay styling constants (3x larger, solid fill)
 ARROW_HEIGHT = 120  # 3x larger (was 40)
@@ -106,12 +107,9 @@ class RadarOverlayRenderer:
         self._arrow_cache: Dict[Tuple[int, int, int], pygame.Surface] = {}
         self._overtake_surfaces: Dict[str, pygame.Surface] = {}
         self._overtake_alert: Optional[dict] = None
-        self._text_cache: Dict[str, pygame.Surface] = {}
-        self._text_cache_max = TEXT_CACHE_MAX_SIZE
 
         # Font (Noto Sans)
-        pygame.font.init()
-        self.font = pygame.font.Font(FONT_PATH, 28)
+        self.font = get_font(FONT_PATH, 28)
 
     def render(self, surface: pygame.Surface, tracks: Dict[int, Dict]):
         """
@@ -228,17 +226,8 @@ class RadarOverlayRenderer:
         return MARKER_COLOUR_YELLOW
 
     def _get_cached_text(self, text: str, colour: Tuple[int, int, int]) -> pygame.Surface:
-        """Get cached text surface, rendering if needed."""
-        key = f"{text}:{colour[0]},{colour[1]},{colour[2]}"
-        if key not in self._text_cache:
-            # Evict oldest entries if cache is full
-            if len(self._text_cache) >= self._text_cache_max:
-                # Remove first quarter of entries (simple eviction)
-                keys_to_remove = list(self._text_cache.keys())[:self._text_cache_max // 4]
-                for k in keys_to_remove:
-                    del self._text_cache[k]
-            self._text_cache[key] = self.font.render(text, True, colour)
-        return self._text_cache[key]
+        """Get text surface from the shared text cache."""
+        return render_text(self.font, text, colour)
 
     def _draw_track_text(self, surface: pygame.Surface, track: Dict, centre_x: int):
         """Draw distance and speed text for track."""
@@ -30,6 +30,7 @@ from config import (
     PRESSURE_FRONT_OPTIMAL,
     PRESSURE_REAR_OPTIMAL,
 )
+from gui.text_cache import render_text
 from utils.settings import get_settings
 
 
@@ -376,7 +377,7 @@ class ScaleBars:
         # Draw temperature labels
         for temp, y_pos in labels:
             # Temperature value
-            text = self.font_small.render(f"{int(temp)}", True, WHITE)
+            text = render_text(self.font_small, f"{int(temp)}", WHITE)
             text_x = self.brake_bar_x + self.bar_width + 5
             text_y = self.brake_bar_y + y_pos - text.get_height() // 2
             self.surface.blit(text, (text_x, text_y))
@@ -454,7 +455,7 @@ class ScaleBars:
         # Draw temperature labels
         for temp, y_pos in labels:
             # Temperature value
-            text = self.font_small.render(f"{int(temp)}", True, WHITE)
+            text = render_text(self.font_small, f"{int(temp)}", WHITE)
             text_x = self.tyre_bar_x - text.get_width() - 5
             text_y = self.tyre_bar_y + y_pos - text.get_height() // 2
             self.surface.blit(text, (text_x, text_y))
@@ -588,11 +589,11 @@ class ScaleBars:
         )
 
         # Add pressure labels
-        front_text = self.font_small.render(
-            f"F: {front_optimal:.1f}±{PRESSURE_OFFSET:.1f}", True, WHITE
+        front_text = render_text(
+            self.font_small, f"F: {front_optimal:.1f}±{PRESSURE_OFFSET:.1f}", WHITE
         )
-        rear_text = self.font_small.render(
-            f"R: {rear_optimal:.1f}±{PRESSURE_OFFSET:.1f}", True, WHITE
+        rear_text = render_text(
+            self.font_small, f"R: {rear_optimal:.1f}±{PRESSURE_OFFSET:.1f}", WHITE
         )
 
         # Position labels
@@ -606,7 +607,7 @@ class ScaleBars:
         )
 
         # Add unit label
-        unit_text = self.font_small.render(self._get_pressure_unit_str(), True, WHITE)
+        unit_text = render_text(self.font_small, self._get_pressure_unit_str(), WHITE)
         self.surface.blit(
             unit_text,
             (
@@ -0,0 +1,296 @@
+"""
+Shared cache of rendered text for all GUI components.
+
+Every font.render() call allocates a new surface and blends each glyph
+into it. TextCache keeps rendered surfaces in one LRU keyed by
+(font, text, colour, outline), so labels and slowly changing values are
+rendered once; the Font object stands for the face and size, so fonts
+should be shared through get_font() rather than created per frame.
+
+Numeric readouts (speeds, temperatures, lap times, FPS) change constantly
+and would only churn the LRU, so draw_text() blits strings made entirely
+of ATLAS_CHARS (digits, punctuation and unit letters) straight onto the
+destination from a per-font, per-colour atlas of glyphs, each rendered on
+first use: no surface is allocated. The atlas is only used for a font
+whose glyphs reproduce font.render() exactly, and only for strings whose
+advance widths add up to the width font.render() would give and whose
+glyphs do not overlap, so the pixels drawn are the same.
+
+Usage:
+    from gui.text_cache import draw_text, render_text
+    surface = render_text(self.font_small, "LAST", GREY)
+    draw_text(self.surface, self.font_small, f"{fps:.1f} FPS", YELLOW, topright=(x, y))
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from config import TEXT_CACHE_MAX_KB, TEXT_CACHE_MAX_SIZE
+
+logger = logging.getLogger("openTPT.text_cache")
+
+# Characters numeric readouts (with their units) are drawn from
+ATLAS_CHARS = "0123456789.,:-+%/° LCFPSabghikmps"
+
+# Offsets of the one pixel outline
+_OUTLINE_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+_ATLAS_SET = frozenset(ATLAS_CHARS)
+_ATLAS_CHECK = "0123456789 +-.:,%"
+
+Colour = Tuple[int, ...]
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces with a glyph-atlas fast path.
+
+    Surfaces returned by render() are shared: blit them, do not draw on them.
+    """
+
+    def __init__(self, max_entries: int = TEXT_CACHE_MAX_SIZE, max_bytes: int = TEXT_CACHE_MAX_KB * 1024):
+        """
+        Initialise the cache.
+
+        Args:
+            max_entries: Rendered strings kept
+            max_bytes: Pixel memory kept for rendered strings
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._bytes = 0
+        # (font, colour) -> {char: (glyph, ink offset, advance)}
+        self._atlases: Dict[tuple, Dict[str, tuple]] = {}
+        self._atlas_bytes = 0
+        # font -> atlas glyphs reproduce font.render()
+        self._atlas_ok: Dict[pygame.font.Font, bool] = {}
+        self.hits = 0
+        self.misses = 0
+        self.atlas_draws = 0
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        colour: Colour,
+        outline: Optional[Colour] = None,
+    ) -> pygame.Surface:
+        """
+        Antialiased text, rendered once per (font, text, colour, outline).
+
+        Args:
+            font: Font to render with
+            text: String to render
+            colour: Text colour
+            outline: Colour of a one pixel outline, or None for plain text
+
+        Returns:
+            Surface with per-pixel alpha (shared; do not modify)
+        """
+        key = (font, text, tuple(colour), tuple(outline) if outline is not None else None)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, colour)
+        if outline is not None:
+            surface = self._outline(surface, font.render(text, True, outline))
+        self._surfaces[key] = surface
+        self._bytes += _surface_bytes(surface)
+        while self._surfaces and (len(self._surfaces) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._surfaces.popitem(last=False)
+            self._bytes -= _surface_bytes(evicted)
+        return surface
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        font: pygame.font.Font,
+        text: str,
+        colour: Colour,
+        **anchor,
+    ) -> pygame.Rect:
+        """
+        Draw text onto a surface, from the glyph atlas where possible.
+
+        Args:
+            surface: Surface to draw on
+            font: Font to render with
+            text: String to draw
+            colour: Text colour
+            **anchor: Position of the text rect, as for Rect attributes
+                      (e.g. center=(x, y), topright=(x, y)); topleft (0, 0)
+                      if omitted
+
+        Returns:
+            Rect the text occupies (as font.render(text).get_rect(**anchor))
+        """
+        colour = tuple(colour)
+        if self._use_atlas(font, text, colour):
+            rect = pygame.Rect((0, 0), font.size(text))
+            rect.height = font.get_height()
+            for name, value in anchor.items():
+                setattr(rect, name, value)
+            if self._blit_glyphs(surface, font, text, colour, rect.topleft):
+                self.atlas_draws += 1
+                return rect
+
+        text_surface = self.render(font, text, colour)
+        rect = text_surface.get_rect(**anchor)
+        surface.blit(text_surface, rect)
+        return rect
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with hits, misses (strings rendered with FreeType),
+            atlas_draws (strings drawn from glyphs), hit_rate (fraction of
+            requests that were not misses), entries and bytes (LRU plus
+            atlases)
+        """
+        total = self.hits + self.misses + self.atlas_draws
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "atlas_draws": self.atlas_draws,
+            "hit_rate": (total - self.misses) / total if total else 0.0,
+            "entries": len(self._surfaces),
+            "bytes": self._bytes + self._atlas_bytes,
+        }
+
+    def clear(self) -> None:
+        """Drop all rendered text and atlases, and reset the statistics."""
+        self._surfaces.clear()
+        self._atlases.clear()
+        self._atlas_ok.clear()
+        self._bytes = 0
+        self._atlas_bytes = 0
+        self.hits = self.misses = self.atlas_draws = 0
+
+    def _use_atlas(self, font: pygame.font.Font, text: str, colour: Colour) -> bool:
+        if not text or not _ATLAS_SET.issuperset(text):
+            return False
+        ok = self._atlas_ok.get(font)
+        if ok is None:
+            ok = self._check_atlas(font, colour)
+            self._atlas_ok[font] = ok
+        return ok
+
+    def _check_atlas(self, font: pygame.font.Font, colour: Colour) -> bool:
+        """True if drawing from glyphs reproduces blitting font.render() for this font."""
+        reference = font.render(_ATLAS_CHECK, True, colour)
+        if reference.get_size() != (font.size(_ATLAS_CHECK)[0], font.get_height()):
+            return False
+        expected = pygame.Surface(reference.get_size())
+        expected.blit(reference, (0, 0))
+        drawn = pygame.Surface(reference.get_size())
+        ok = self._blit_glyphs(drawn, font, _ATLAS_CHECK, colour, (0, 0)) and np.array_equal(
+            pygame.surfarray.array3d(drawn), pygame.surfarray.array3d(expected)
+        )
+        if not ok:
+            logger.debug("Glyph atlas disabled for font %s (glyphs do not reproduce font.render)", font)
+        return ok
+
+    def _glyph(self, font: pygame.font.Font, colour: Colour, char: str) -> tuple:
+        """Glyph cropped to its ink, its ink offset and its advance, rendered on first use."""
+        atlas = self._atlases.setdefault((font, colour), {})
+        glyph = atlas.get(char)
+        if glyph is None:
+            rendered = font.render(char, True, colour)
+            ink = rendered.get_bounding_rect()
+            metrics = font.metrics(char)[0]
+            advance = metrics[4] if metrics else rendered.get_width()
+            glyph = atlas[char] = (rendered.subsurface(ink).copy(), ink.topleft, advance)
+            self._atlas_bytes += _surface_bytes(glyph[0])
+        return glyph
+
+    def _blit_glyphs(
+        self, surface: pygame.Surface, font: pygame.font.Font, text: str, colour: Colour, topleft: Tuple[int, int]
+    ) -> bool:
+        """Blit text glyph by glyph; False (nothing drawn) if it would not match font.render()."""
+        glyphs = [self._glyph(font, colour, char) for char in text]
+        blits = []
+        x = 0
+        ink_right = 0
+        for glyph, (dx, dy), advance in glyphs:
+            width = glyph.get_width()
+            if width:
+                if x + dx < ink_right:
+                    return False  # Overlapping glyphs would blend twice
+                blits.append((glyph, (topleft[0] + x + dx, topleft[1] + dy)))
+                ink_right = x + dx + width
+            x += advance
+        if x != font.size(text)[0]:
+            return False  # Kerning
+        surface.blits(blits, doreturn=False)
+        return True
+
+    @staticmethod
+    def _outline(text_surface: pygame.Surface, outline_surface: pygame.Surface) -> pygame.Surface:
+        width, height = text_surface.get_size()
+        surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+        for dx, dy in _OUTLINE_OFFSETS:
+            surface.blit(outline_surface, (1 + dx, 1 + dy))
+        surface.blit(text_surface, (1, 1))
+        return surface
+
+
+_text_cache: Optional[TextCache] = None
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+
+def get_text_cache() -> TextCache:
+    """Get the shared text cache."""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+
+def render_text(
+    font: pygame.font.Font, text: str, colour: Colour, outline: Optional[Colour] = None
+) -> pygame.Surface:
+    """Render text through the shared cache (see TextCache.render)."""
+    return get_text_cache().render(font, text, colour, outline)
+
+
+def draw_text(surface: pygame.Surface, font: pygame.font.Font, text: str, colour: Colour, **anchor) -> pygame.Rect:
+    """Draw text through the shared cache (see TextCache.draw)."""
+    return get_text_cache().draw(surface, font, text, colour, **anchor)
+
+
+def get_font(path: Optional[str], size: int) -> pygame.font.Font:
+    """
+    Shared font for a face and size, loaded once.
+
+    Falls back to the system monospace font if the file cannot be loaded.
+
+    Args:
+        path: Font file, or None for pygame's default font
+        size: Point size
+    """
+    font = _fonts.get((path, size))
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            font = pygame.font.Font(path, size)
+        except Exception as e:
+            logger.warning("Could not load font %s (%s), using monospace", path, e)
+            font = pygame.font.SysFont("monospace", size)
+        _fonts[(path, size)] = font
+    return font
@@ -0,0 +1,239 @@
+"""
+Cached tyre thermal tile rendering.
+
+A tile is the finished image for one tyre: three zone columns (solid for
+the current temperatures, a vertical gradient for history bands), the
+separator lines and, when the UI is visible, outlined zone temperatures.
+Gradient colours are computed with numpy into a surfarray buffer, and
+finished tiles are kept in a small LRU cache keyed on the zone
+temperatures quantised to THERMAL_TILE_TEMP_STEP, so a tile is only
+rebuilt when a temperature moves by at least that much (or the layout,
+thresholds or text change).
+"""
+
+import math
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from config import (
+    BLACK,
+    BLUE,
+    GREEN,
+    GREY,
+    THERMAL_TILE_CACHE_SIZE,
+    THERMAL_TILE_TEMP_STEP,
+    TYRE_TEMP_HOT_TO_BLACK,
+    TYRE_TEMP_OPTIMAL_RANGE,
+    WHITE,
+)
+from gui.text_cache import render_text
+
+
+def heat_colours(temps: np.ndarray, thresholds: Tuple[float, float, float]) -> np.ndarray:
+    """
+    Tyre temperature colours for an array of temperatures.
+
+    Vectorised Display.get_colour_for_temp: the same scale, to the same
+    integer colour values.
+
+    Args:
+        temps: Temperatures in the current unit
+        thresholds: (cold, optimal, hot) from Display.get_tyre_thresholds()
+
+    Returns:
+        uint8 array of shape temps.shape + (3,)
+    """
+    cold, optimal, hot = thresholds
+    temps = np.asarray(temps, dtype=np.float64)
+    colours = np.zeros(temps.shape + (3,), dtype=np.float64)
+    optimal_low = optimal - TYRE_TEMP_OPTIMAL_RANGE
+    optimal_high = optimal + TYRE_TEMP_OPTIMAL_RANGE
+
+    # Bands in the order get_colour_for_temp tests them; the first match wins
+    too_cold = temps < cold
+    warming = ~too_cold & (temps < optimal_low)
+    in_range = ~too_cold & ~warming & (temps <= optimal_high)
+    heating = ~too_cold & ~warming & ~in_range & (temps < hot)
+    overheating = ~too_cold & ~warming & ~in_range & ~heating & (temps < hot + TYRE_TEMP_HOT_TO_BLACK)
+
+    colours[too_cold] = BLUE
+    ratio = (temps[warming] - cold) / (optimal_low - cold)
+    colours[warming, 1] = np.trunc(255 * ratio)
+    colours[warming, 2] = np.trunc(255 * (1 - ratio))
+    colours[in_range] = GREEN
+    ratio = (temps[heating] - optimal_high) / (hot - optimal_high)
+    colours[heating, 0] = np.trunc(255 * ratio)
+    colours[heating, 1] = 255
+
+    # Yellow to red, then red to black
+    ratio = (temps[overheating] - hot) / TYRE_TEMP_HOT_TO_BLACK
+    to_red = ratio < 0.5
+    red = np.where(to_red, 255, np.trunc(255 * (1 - (ratio - 0.5) * 2)))
+    green = np.where(to_red, np.trunc(255 * (1 - ratio * 2)), 0)
+    colours[overheating, 0] = red
+    colours[overheating, 1] = green
+    return colours.astype(np.uint8)
+
+
+class ThermalTileRenderer:
+    """
+    Builds and caches thermal tiles for the four tyres.
+
+    Usage:
+        tiles = ThermalTileRenderer(font, MLX_DISPLAY_WIDTH, MLX_DISPLAY_HEIGHT)
+        surface.blit(tiles.zones_tile(zone_temps, show_text, thresholds), pos)
+    """
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        width: int,
+        height: int,
+        temp_step: float = THERMAL_TILE_TEMP_STEP,
+        max_tiles: int = THERMAL_TILE_CACHE_SIZE,
+    ):
+        """
+        Initialise the renderer.
+
+        Args:
+            font: Font for zone temperatures
+            width: Tile width in pixels (three equal zone columns)
+            height: Tile height in pixels
+            temp_step: Temperature change that rebuilds a tile
+            max_tiles: Tiles kept in the cache
+        """
+        self.font = font
+        self.width = width
+        self.height = height
+        self.temp_step = temp_step
+        self.max_tiles = max_tiles
+        self.section_width = width // 3
+        self._tiles: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._offline: Optional[pygame.Surface] = None
+
+    def offline_tile(self) -> pygame.Surface:
+        """Tile for a tyre with no data: three grey zones."""
+        if self._offline is None:
+            self._offline = self._finish(self._solid_zones([GREY] * 3), None)
+        return self._offline
+
+    def zones_tile(
+        self,
+        zone_temps: Sequence[float],
+        show_text: bool,
+        thresholds: Tuple[float, float, float],
+    ) -> pygame.Surface:
+        """
+        Tile of three solid zones.
+
+        Args:
+            zone_temps: Temperatures of the zones, left to right on screen
+            show_text: Overlay each zone's temperature
+            thresholds: (cold, optimal, hot) tyre thresholds
+        """
+        quantised = self._quantise(zone_temps)
+        key = ("zones", quantised, show_text, thresholds)
+        tile = self._cached(key)
+        if tile is None:
+            temps = self._temperatures(quantised)
+            tile = self._solid_zones(heat_colours(temps, thresholds).tolist())
+            tile = self._store(key, self._finish(tile, temps if show_text else None))
+        return tile
+
+    def history_tile(
+        self,
+        zone_bands: Sequence[Sequence[float]],
+        newest_at_top: bool,
+        show_text: bool,
+        thresholds: Tuple[float, float, float],
+    ) -> pygame.Surface:
+        """
+        Tile of three zones shading from current to oldest history band.
+
+        Args:
+            zone_bands: Band temperatures (current first) of the zones, left
+                        to right on screen
+            newest_at_top: Current band at the top (front tyres) or bottom
+            show_text: Overlay each zone's current temperature
+            thresholds: (cold, optimal, hot) tyre thresholds
+        """
+        quantised = tuple(self._quantise(bands) for bands in zone_bands)
+        key = ("history", quantised, newest_at_top, show_text, thresholds)
+        tile = self._cached(key)
+        if tile is None:
+            bands = self._temperatures(quantised)
+            row_temps = self._interpolate_rows(bands, newest_at_top)
+            tile = self._gradient_zones([heat_colours(temps, thresholds) for temps in row_temps])
+            tile = self._store(key, self._finish(tile, bands[:, 0] if show_text else None))
+        return tile
+
+    def clear(self) -> None:
+        """Drop all cached tiles."""
+        self._tiles.clear()
+        self._offline = None
+
+    def _quantise(self, temps: Sequence[float]) -> Tuple[Optional[int], ...]:
+        """Temperatures in temp_step units; None for a NaN or infinite reading."""
+        return tuple(
+            int(round(float(t) / self.temp_step)) if math.isfinite(t) else None for t in temps
+        )
+
+    def _temperatures(self, quantised) -> np.ndarray:
+        """Temperatures back from _quantise() keys, NaN (drawn black) where they were not finite."""
+        steps = np.array(quantised, dtype=np.float64)  # None becomes NaN
+        return steps * self.temp_step
+
+    def _interpolate_rows(self, bands: np.ndarray, newest_at_top: bool) -> np.ndarray:
+        """Temperature of each pixel row, linearly between bands: (zones, height)."""
+        num_bands = bands.shape[1]
+        y_fraction = np.arange(self.height) / max(self.height - 1, 1)
+        if not newest_at_top:
+            y_fraction = 1 - y_fraction
+        band_pos = y_fraction * (num_bands - 1)
+        lower = band_pos.astype(np.int64)
+        upper = np.minimum(lower + 1, num_bands - 1)
+        t = band_pos - lower
+        return bands[:, lower] * (1 - t) + bands[:, upper] * t
+
+    def _solid_zones(self, colours) -> pygame.Surface:
+        """Tile with one colour per zone."""
+        tile = pygame.Surface((self.width, self.height))
+        for i, colour in enumerate(colours):
+            tile.fill(colour, (i * self.section_width, 0, self.section_width, self.height))
+        return tile
+
+    def _gradient_zones(self, columns) -> pygame.Surface:
+        """Tile from a (height, 3) array of row colours per zone."""
+        pixels = np.zeros((self.width, self.height, 3), dtype=np.uint8)
+        for i, column in enumerate(columns):
+            x = i * self.section_width
+            pixels[x:x + self.section_width] = column[np.newaxis]
+        return pygame.surfarray.make_surface(pixels)
+
+    def _finish(self, tile: pygame.Surface, text_temps: Optional[np.ndarray]) -> pygame.Surface:
+        """Add zone temperatures (if given) and separator lines to a tile."""
+        if text_temps is not None:
+            for i, temp in enumerate(text_temps):
+                text = render_text(self.font, f"{temp:.1f}", WHITE, outline=BLACK)
+                centre = (i * self.section_width + self.section_width // 2, self.height // 2)
+                tile.blit(text, text.get_rect(center=centre))
+
+        for x in (self.section_width, 2 * self.section_width):
+            pygame.draw.line(tile, (0, 0, 0), (x, 0), (x, self.height), 5)
+        return tile.convert() if pygame.display.get_surface() else tile
+
+    def _cached(self, key: tuple) -> Optional[pygame.Surface]:
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def _store(self, key: tuple, tile: pygame.Surface) -> pygame.Surface:
+        if self.max_tiles > 0:
+            self._tiles[key] = tile
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return tile
@@ -53,7 +53,7 @@ class ANTHRHandler(BoundedQueueHardwareHandler):
         Args:
             timeout_s: Data timeout in seconds before marking as stale
         """
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
 
         self.timeout_s = timeout_s
         self._settings = get_settings()
@@ -10,21 +10,30 @@ Modes:
 """
 
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from utils.hardware_base import BoundedQueueHardwareHandler
-from config import COPILOT_MAP_DIR
+from config import (
+    COPILOT_MAP_DIR,
+    COPILOT_PREFETCH_AHEAD_M,
+    COPILOT_PREFETCH_MARGIN_M,
+    COPILOT_PREFETCH_RETRY_S,
+    COPILOT_ROAD_FETCH_RADIUS_M,
+    COPILOT_ROAD_KEEP_RADIUS_M,
+)
 
 try:
     from copilot.gps import Position
-    from copilot.map_loader import MapLoader, RoadNetwork
+    from copilot.compact_network import CompactRoadNetwork, merge_compact_networks
+    from copilot.map_loader import MapLoader
     from copilot.path_projector import PathProjector
     from copilot.corners import CornerDetector
     from copilot.pacenotes import PacenoteGenerator
     from copilot.audio import AudioPlayer
-    from copilot.geometry import haversine_distance
+    from copilot.geometry import bearing, haversine_distance, point_along_bearing
     from copilot.simulator import GPXRouteLoader
     COPILOT_AVAILABLE = True
 except ImportError:
@@ -66,6 +75,19 @@ class OpenTPTGPSAdapter:
         """Disconnect from GPS - openTPT manages this lifecycle."""
         pass  # GPS disconnected when openTPT shuts down
 
+    def wait_for_update(self, since_seq: int, timeout: float) -> int:
+        """
+        Block until the GPS publishes a snapshot newer than since_seq.
+
+        Args:
+            since_seq: Last GPS sequence number processed
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Current GPS sequence number
+        """
+        return self._gps.wait_for_update(since_seq, timeout=timeout)
+
     def read_position(self) -> Optional["Position"]:
         """
         Read current position from GPS.
@@ -127,7 +149,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
             audio_volume: Audio volume (0.0 - 1.0)
             lap_timing_handler: Optional LapTimingHandler for route integration
         """
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
 
         if not COPILOT_AVAILABLE:
             raise ImportError("CoPilot dependencies not available")
@@ -136,6 +158,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         self.lookahead_m = lookahead_m
         self.update_interval_s = update_interval_s
         self.audio_enabled = audio_enabled
+        self.audio_volume = audio_volume
         self.lap_timing_handler = lap_timing_handler
 
         # Operating mode
@@ -149,9 +172,17 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
             map_path = Path(COPILOT_MAP_DIR)
         self.map_path = Path(map_path)
         self._map_loader: Optional[MapLoader] = None
-        self._network: Optional[RoadNetwork] = None
+        self._network: Optional[CompactRoadNetwork] = None
         self._projector: Optional[PathProjector] = None
-        self._last_fetch_pos: Optional[Position] = None
+        self._fetch_center: Optional[Tuple[float, float]] = None
+
+        # Background road prefetch; the worker swaps in the result
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._pending_lock = threading.Lock()
+        self._pending_roads: Optional[
+            Tuple[CompactRoadNetwork, PathProjector, Tuple[float, float]]
+        ] = None
+        self._prefetch_failed_time: Optional[float] = None  # Monotonic time of the last failure
 
         # Corner detection and pacenote generation
         self._corner_detector = CornerDetector(
@@ -166,7 +197,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         # Audio
         self._audio: Optional[AudioPlayer] = None
         if audio_enabled:
-            self._audio = AudioPlayer()
+            self._audio = AudioPlayer(volume=self.audio_volume)
 
         # State for status display
         self._last_callout_text = ""
@@ -226,6 +257,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
             return False
 
         self._mode = mode
+        self._reset_path()
         logger.info("CoPilot mode set to: %s", mode)
         return True
 
@@ -248,6 +280,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
             if loader.load():
                 self._route_loader = loader
                 self._route_name = Path(gpx_path).stem
+                self._reset_path()
                 logger.info(
                     "Loaded GPX route '%s' with %d points",
                     self._route_name, loader.point_count
@@ -265,8 +298,14 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         self._route_loader = None
         self._route_name = ""
         self._mode = MODE_JUST_DRIVE
+        self._reset_path()
         logger.info("Route cleared, mode set to just_drive")
 
+    def _reset_path(self):
+        """Re-project the path from scratch on the next cycle (route changed)."""
+        if self._projector:
+            self._projector.reset_path()
+
     def start(self):
         """Start the CoPilot handler."""
         # Initialise map loader
@@ -298,13 +337,22 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         """Worker thread loop for CoPilot updates."""
         logger.info("CoPilot worker thread started")
 
+        gps_seq = 0
         while self.running:
+            cycle_start = time.time()
             try:
                 self._update_cycle()
             except Exception as e:
                 logger.error("CoPilot update error: %s", e, exc_info=True)
 
-            time.sleep(self.update_interval_s)
+            # Hold the configured cycle rate, then start the next cycle on the
+            # next GPS fix so callouts are computed from fresh positions
+            remaining = self.update_interval_s - (time.time() - cycle_start)
+            if remaining > 0:
+                time.sleep(remaining)
+            gps_seq = self.gps_adapter.wait_for_update(
+                gps_seq, timeout=self.update_interval_s
+            )
 
         logger.info("CoPilot worker thread stopped")
 
@@ -322,8 +370,9 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
             })
             return
 
-        # Load map if needed
-        if self._map_loader and self._should_refetch(pos):
+        # Swap in roads loaded in the background, or block for the first load
+        self._apply_pending_roads()
+        if self._map_loader and self._network is None and not self._prefetch_running():
             self._fetch_roads(pos)
 
         if not self._network or not self._projector:
@@ -352,8 +401,13 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
                     max_distance=self.lookahead_m
                 )
 
-        # Project path ahead (with optional route guidance)
-        path = self._projector.project_path(
+        # Load the next area ahead before the car leaves the current one
+        if self._map_loader and self._should_prefetch(pos, route_waypoints):
+            self._start_prefetch(pos, route_waypoints)
+
+        # Project path ahead (with optional route guidance), extending the
+        # path kept from the last cycle rather than re-projecting it
+        path = self._projector.project_path_incremental(
             pos.lat, pos.lon, pos.heading, self.lookahead_m,
             route_waypoints=route_waypoints
         )
@@ -372,9 +426,13 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
 
         # Extract geometry
         points = [(p.lat, p.lon) for p in path.points]
+        first_distance = path.points[0].distance_from_start
+        distances = [p.distance_from_start - first_distance for p in path.points]
 
-        # Detect corners
-        corners = self._corner_detector.detect_corners(points)
+        # Detect corners, reusing curvature cached with the path
+        corners = self._corner_detector.detect_corners(
+            points, curvatures=path.curvatures, distances=distances
+        )
 
         # Generate pacenotes
         notes = self._pacenote_gen.generate(
@@ -441,38 +499,142 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         # Periodically clear old called notes
         self._pacenote_gen.clear_called()
 
-    def _should_refetch(self, pos: Position) -> bool:
-        """Check if we need to fetch new road data."""
-        if not self._last_fetch_pos or not self._network:
-            return True
+    def _predict_position(
+        self,
+        pos: Position,
+        distance_m: float,
+        route_waypoints: Optional[List[Tuple[float, float]]] = None,
+    ) -> Tuple[float, float]:
+        """
+        Estimate where the car will be after driving distance_m.
+
+        Follows the route waypoints when there are any, continuing along
+        the last route bearing past their end; otherwise dead-reckons
+        along the current heading.
+        """
+        lat, lon, heading = pos.lat, pos.lon, pos.heading
+        remaining = distance_m
+        for wp_lat, wp_lon in route_waypoints or []:
+            step = haversine_distance(lat, lon, wp_lat, wp_lon)
+            if step <= 0:
+                continue
+            heading = bearing(lat, lon, wp_lat, wp_lon)
+            if step >= remaining:
+                break
+            lat, lon = wp_lat, wp_lon
+            remaining -= step
+        return point_along_bearing(lat, lon, heading, remaining)
+
+    def _prefetch_running(self) -> bool:
+        """Check if a background road load is in progress."""
+        return self._prefetch_thread is not None and self._prefetch_thread.is_alive()
+
+    def _should_prefetch(
+        self,
+        pos: Position,
+        route_waypoints: Optional[List[Tuple[float, float]]] = None,
+    ) -> bool:
+        """
+        Check if the next area should be loaded.
 
+        True once the point lookahead plus margin ahead of the car is
+        outside the loaded area, so the next load completes while the
+        current roads still cover the lookahead. Not retried for
+        COPILOT_PREFETCH_RETRY_S after a failed load.
+        """
+        if self._prefetch_running() or not self._fetch_center:
+            return False
+        if (self._prefetch_failed_time is not None
+                and time.monotonic() - self._prefetch_failed_time < COPILOT_PREFETCH_RETRY_S):
+            return False  # Back off while the map source is failing
+
+        ahead_lat, ahead_lon = self._predict_position(
+            pos, self.lookahead_m + COPILOT_PREFETCH_MARGIN_M, route_waypoints
+        )
         distance = haversine_distance(
-            self._last_fetch_pos.lat, self._last_fetch_pos.lon,
-            pos.lat, pos.lon,
+            self._fetch_center[0], self._fetch_center[1], ahead_lat, ahead_lon
         )
-
-        return distance > 500  # Refetch when 500m from last load centre
+        return distance > COPILOT_ROAD_FETCH_RADIUS_M
 
     def _fetch_roads(self, pos: Position):
-        """Fetch road data around current position."""
+        """Fetch road data around current position (blocking, first load only)."""
         try:
             logger.info(
                 "CoPilot loading roads near %.4f, %.4f",
                 pos.lat, pos.lon
             )
-            self._network = self._map_loader.load_around(
-                pos.lat, pos.lon, radius_m=2000
+            self._network = self._map_loader.load_around_compact(
+                pos.lat, pos.lon, radius_m=COPILOT_ROAD_FETCH_RADIUS_M
             )
             self._projector = PathProjector(self._network)
-            self._last_fetch_pos = pos
+            self._fetch_center = (pos.lat, pos.lon)
             logger.info(
                 "CoPilot loaded %d roads, %d junctions",
-                len(self._network.ways),
+                self._network.way_count,
                 len(self._network.junctions)
             )
         except Exception as e:
             logger.error("CoPilot road load failed: %s", e)
 
+    def _start_prefetch(
+        self,
+        pos: Position,
+        route_waypoints: Optional[List[Tuple[float, float]]] = None,
+    ):
+        """
+        Start loading the area ahead on a background thread.
+
+        The new roads are merged into the current network and the path
+        projector (segment index) is built off the worker thread, so the
+        worker only swaps references when the load completes.
+        """
+        center = self._predict_position(pos, COPILOT_PREFETCH_AHEAD_M, route_waypoints)
+        base = self._network
+
+        def prefetch_worker():
+            try:
+                loaded = self._map_loader.load_around_compact(
+                    center[0], center[1], radius_m=COPILOT_ROAD_FETCH_RADIUS_M
+                )
+                network = merge_compact_networks(
+                    base, loaded, center[0], center[1], COPILOT_ROAD_KEEP_RADIUS_M
+                )
+                projector = PathProjector(network)
+                with self._pending_lock:
+                    self._pending_roads = (network, projector, center)
+                self._prefetch_failed_time = None
+            except Exception as e:
+                self._prefetch_failed_time = time.monotonic()
+                logger.error(
+                    "CoPilot road prefetch failed (retrying in %.0fs): %s",
+                    COPILOT_PREFETCH_RETRY_S, e
+                )
+
+        logger.info("CoPilot prefetching roads near %.4f, %.4f", center[0], center[1])
+        self._prefetch_thread = threading.Thread(target=prefetch_worker, daemon=True)
+        self._prefetch_thread.start()
+
+    def _apply_pending_roads(self):
+        """Swap in a network loaded by the prefetch thread."""
+        with self._pending_lock:
+            pending = self._pending_roads
+            self._pending_roads = None
+        if pending is None:
+            return
+
+        network, projector, center = pending
+        if self._projector:
+            # Keep matching the road we are on across the swap
+            projector.last_way_id = self._projector.last_way_id
+        self._network = network
+        self._projector = projector
+        self._fetch_center = center
+        logger.info(
+            "CoPilot merged roads: %d roads, %d junctions",
+            network.way_count,
+            len(network.junctions)
+        )
+
     def get_last_callout(self) -> str:
         """Get the last callout text for display."""
         return self._last_callout_text
@@ -494,7 +656,7 @@ class CoPilotHandler(BoundedQueueHardwareHandler):
         """Enable or disable audio callouts."""
         self.audio_enabled = enabled
         if enabled and not self._audio:
-            self._audio = AudioPlayer()
+            self._audio = AudioPlayer(volume=self.audio_volume)
             self._audio.start()
         elif not enabled and self._audio:
             self._audio.stop()
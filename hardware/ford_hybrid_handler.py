@@ -47,7 +47,7 @@ class FordHybridHandler(BoundedQueueHardwareHandler):
     OBD_RESPONSE_ID = 0x7E8     # Ford hybrid module response
 
     def __init__(self):
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.bus = None
         self.channel = FORD_HYBRID_CHANNEL
         self.bitrate = FORD_HYBRID_BITRATE
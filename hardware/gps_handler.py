@@ -77,7 +77,7 @@ class GPSHandler(BoundedQueueHardwareHandler):
     """
 
     def __init__(self):
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.enabled = GPS_ENABLED
         self.serial_port = None
         self.hardware_available = False
@@ -94,7 +94,7 @@ class IMUHandler(BoundedQueueHardwareHandler):
     """
 
     def __init__(self):
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.imu = None
         self.imu_type = IMU_TYPE
         self.enabled = IMU_ENABLED
@@ -17,15 +17,12 @@ from config import (
     LAP_TIMING_ENABLED,
     TRACK_AUTO_DETECT,
     TRACK_SEARCH_RADIUS_KM,
+    TRACK_AUTO_DETECT_REQUERY_M,
     LAP_TIMING_DATA_DIR,
     LAP_TIMING_CORNER_DETECTOR,
-    LAP_TIMING_CORNER_MIN_RADIUS_M,
-    LAP_TIMING_CORNER_MIN_ANGLE_DEG,
-    LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
-    LAP_TIMING_CORNER_STRAIGHT_FILL_M,
-    LAP_TIMING_CORNER_MERGE_CHICANES,
     ensure_tracks_available,
     DATA_DIR,
+    HANDLER_UPDATE_WAIT_TIMEOUT_S,
 )
 from utils.settings import get_settings
 from utils.lap_timing_store import get_lap_timing_store, LapRecord
@@ -37,12 +34,10 @@ try:
     from lap_timing.core.delta_calculator import DeltaCalculator
     from lap_timing.data.models import GPSPoint, Lap, Delta, TrackPosition, Corner, CornerSpeedRecord
     from lap_timing.data.track_loader import Track
+    from lap_timing.data.track_cache import create_corner_detector, load_track_cached
     from lap_timing.data.track_selector import TrackSelector
     from lap_timing.analysis.corner_analyzer import CornerAnalyzer
-    from lap_timing.analysis.hybrid_corner_detector import HybridCornerDetector
-    from lap_timing.analysis.asc_corner_detector import ASCCornerDetector
-    from lap_timing.analysis.corner_detector import CornerDetector
-    from lap_timing.analysis.curvefinder_detector import CurveFinderDetector
+    from lap_timing.utils.geometry import haversine_distance
     LAP_TIMING_AVAILABLE = True
 except ImportError as e:
     logger.warning("Lap timing modules not available: %s", e)
@@ -67,7 +62,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
             gps_handler: GPSHandler instance to consume GPS data from
             fuel_tracker: Optional FuelTracker instance for fuel consumption tracking
         """
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.gps_handler = gps_handler
         self.fuel_tracker = fuel_tracker
         self._settings = get_settings()
@@ -120,6 +115,8 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
         # Track auto-detection - read from settings, fallback to config
         self.track_detected = False
         self.auto_detect_enabled = self._settings.get("lap_timing.auto_detect", TRACK_AUTO_DETECT)
+        # Position of the last auto-detect search (None = search on next fix)
+        self.auto_detect_origin: Optional[tuple] = None
 
         # Error tracking
         self.consecutive_errors = 0
@@ -171,11 +168,14 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
         self.position_tracker = PositionTracker(track)
         self.delta_calculator = DeltaCalculator(track.length)
 
-        # Calculate sector boundaries (equal thirds)
-        self.sector_boundaries = [
-            track.length * (i + 1) / self.sector_count
-            for i in range(self.sector_count - 1)
-        ]
+        # Sector boundaries: precompiled with the track, else equal thirds
+        if len(track.sector_boundaries) == self.sector_count - 1:
+            self.sector_boundaries = list(track.sector_boundaries)
+        else:
+            self.sector_boundaries = [
+                track.length * (i + 1) / self.sector_count
+                for i in range(self.sector_count - 1)
+            ]
 
         # Detect corners on track
         self._detect_corners(track)
@@ -203,6 +203,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
         self.position_tracker = None
         self.delta_calculator = None
         self.track_detected = False
+        self.auto_detect_origin = None
 
         # Reset lap state
         self.current_lap_number = 0
@@ -236,40 +237,13 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
             track: Track with centerline for corner detection
         """
         try:
-            # Select detector based on config
             detector_type = LAP_TIMING_CORNER_DETECTOR.lower()
 
-            if detector_type == "hybrid":
-                detector = HybridCornerDetector(
-                    min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
-                    min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
-                    min_cut_distance=LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
-                    straight_fill_distance=LAP_TIMING_CORNER_STRAIGHT_FILL_M,
-                    merge_chicanes=LAP_TIMING_CORNER_MERGE_CHICANES,
-                )
-            elif detector_type == "asc":
-                # Note: ASCCornerDetector's merge_same_direction controls merging
-                # consecutive corners of the same direction, not chicanes.
-                # Let it use the default (True) as chicane merging is HybridCornerDetector only.
-                detector = ASCCornerDetector(
-                    min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
-                    min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
-                    min_cut_distance=LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
-                    straight_fill_distance=LAP_TIMING_CORNER_STRAIGHT_FILL_M,
-                )
-            elif detector_type == "curvefinder":
-                detector = CurveFinderDetector(
-                    min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
-                    min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
-                )
-            else:  # threshold
-                detector = CornerDetector(
-                    min_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
-                    min_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
-                )
-
-            # Detect corners
-            self.corners = detector.detect_corners(track)
+            # Use corners compiled with the track, else detect them now
+            if track.corners is not None:
+                self.corners = track.corners
+            else:
+                self.corners = create_corner_detector(detector_type).detect_corners(track)
 
             # Initialise corner analyzer if corners found
             if self.corners:
@@ -287,8 +261,19 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
 
     def _worker_loop(self):
         """Background thread for lap timing calculations."""
+        gps_seq = 0
         while self.running:
             try:
+                # Wake on each new GPS fix rather than polling
+                seq = self.gps_handler.wait_for_update(
+                    gps_seq, timeout=HANDLER_UPDATE_WAIT_TIMEOUT_S
+                )
+                if seq == gps_seq:
+                    # No new GPS data - keep the running lap clock fresh
+                    self._publish_state()
+                    continue
+                gps_seq = seq
+
                 # Get latest GPS snapshot (lock-free)
                 gps_snapshot = self.gps_handler.get_snapshot()
 
@@ -314,9 +299,6 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
                     # No GPS fix, publish empty state
                     self._publish_state()
 
-                # Poll at ~10Hz (matching GPS rate)
-                time.sleep(0.1)
-
             except Exception as e:
                 self.consecutive_errors += 1
                 if self.consecutive_errors == 3:
@@ -339,10 +321,22 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
         )
 
     def _auto_detect_track(self, gps_point: GPSPoint):
-        """Attempt to auto-detect track from GPS position."""
+        """
+        Attempt to auto-detect track from GPS position.
+
+        After a search finds nothing, the next search waits until the car
+        has moved TRACK_AUTO_DETECT_REQUERY_M from where it last searched.
+        """
         if not self.track_selector:
             return
 
+        if self.auto_detect_origin is not None and haversine_distance(
+            self.auto_detect_origin[0], self.auto_detect_origin[1],
+            gps_point.lat, gps_point.lon
+        ) < TRACK_AUTO_DETECT_REQUERY_M:
+            return
+        self.auto_detect_origin = (gps_point.lat, gps_point.lon)
+
         try:
             nearby = self.track_selector.find_nearby_tracks(
                 gps_point.lat,
@@ -355,8 +349,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
                 logger.info("Lap timing: Found %d nearby track(s), selecting closest: %s", len(nearby), track_info.name)
 
                 if track_info.kmz_path:
-                    from lap_timing.data.track_loader import load_track_from_kmz
-                    track = load_track_from_kmz(track_info.kmz_path)
+                    track = load_track_cached(track_info.kmz_path)
                     if track:
                         self.set_track(track)
                         logger.info("Lap timing: Auto-detected track: %s", track.name)
@@ -478,6 +471,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
         self.current_lap_start_time = crossing_time
         self.current_lap_points = []
         self.current_lap_positions = []
+        self.delta_calculator.start_lap(crossing_time, self.current_lap_number)
         self.current_sector = 0
         self.sector_times = [None] * self.sector_count
         self.sector_start_time = crossing_time
@@ -516,9 +510,11 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
 
         # Calculate delta seconds
         delta_seconds = 0.0
+        delta_rate = 0.0
         predicted_time = None
         if self.current_delta:
             delta_seconds = self.current_delta.time_delta
+            delta_rate = self.current_delta.delta_rate
             predicted_time = self.current_delta.predicted_lap_time
 
         # Build sector data
@@ -547,6 +543,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
 
             # Delta
             'delta_seconds': delta_seconds,
+            'delta_rate': delta_rate,
             'predicted_time': predicted_time,
 
             # Position
@@ -754,8 +751,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
             if track_info['name'] == track_name:
                 if track_info['kmz_path']:
                     try:
-                        from lap_timing.data.track_loader import load_track_from_kmz
-                        track = load_track_from_kmz(track_info['kmz_path'])
+                        track = load_track_cached(track_info['kmz_path'])
                         if track:
                             self.set_track(track)
                             logger.info("Lap timing: Selected track: %s", track.name)
@@ -789,8 +785,7 @@ class LapTimingHandler(BoundedQueueHardwareHandler):
             True if track was loaded successfully
         """
         try:
-            from lap_timing.data.track_loader import load_track
-            track = load_track(file_path)
+            track = load_track_cached(file_path)
             if track:
                 self.set_track(track)
                 return True
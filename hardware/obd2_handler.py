@@ -104,7 +104,7 @@ class OBD2Handler(BoundedQueueHardwareHandler):
     """
 
     def __init__(self):
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.bus = None
         self.channel = OBD_CHANNEL
         self.bitrate = OBD_BITRATE
@@ -37,6 +37,7 @@ from config import (
     PIT_STATIONARY_SPEED_KMH,
     PIT_STATIONARY_DURATION_S,
     PIT_MIN_STOP_TIME_DEFAULT_S,
+    HANDLER_UPDATE_WAIT_TIMEOUT_S,
 )
 
 logger = logging.getLogger('openTPT.pit_timer')
@@ -91,7 +92,7 @@ class PitTimerHandler(BoundedQueueHardwareHandler):
             gps_handler: GPSHandler instance for GPS data
             lap_timing_handler: Optional LapTimingHandler for track info
         """
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
         self.gps_handler = gps_handler
         self.lap_timing_handler = lap_timing_handler
         self._settings = get_settings()
@@ -137,8 +138,19 @@ class PitTimerHandler(BoundedQueueHardwareHandler):
 
     def _worker_loop(self):
         """Background thread for pit timer processing."""
+        gps_seq = 0
         while self.running:
             try:
+                # Wake on each new GPS fix rather than polling
+                seq = self.gps_handler.wait_for_update(
+                    gps_seq, timeout=HANDLER_UPDATE_WAIT_TIMEOUT_S
+                )
+                if seq == gps_seq:
+                    # No new GPS data - keep countdowns fresh
+                    self._publish_state()
+                    continue
+                gps_seq = seq
+
                 # Get latest GPS snapshot
                 gps_snapshot = self.gps_handler.get_snapshot()
 
@@ -149,9 +161,6 @@ class PitTimerHandler(BoundedQueueHardwareHandler):
                     # No GPS fix, publish current state
                     self._publish_state()
 
-                # Poll at ~10Hz (matching GPS rate)
-                time.sleep(0.1)
-
             except Exception as e:
                 self.consecutive_errors += 1
                 if self.consecutive_errors == 3:
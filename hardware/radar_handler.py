@@ -77,7 +77,7 @@ class RadarHandlerOptimised(BoundedQueueHardwareHandler):
         enabled: bool = True,
         keepalive_enabled: bool = True,
     ):
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
 
         self.radar_type = radar_type.lower()
         self.enabled = enabled and RADAR_AVAILABLE
@@ -235,7 +235,8 @@ class RadarHandlerOptimised(BoundedQueueHardwareHandler):
                 last_read = current_time
                 self._read_and_process()
 
-            time.sleep(0.01)  # Small sleep to prevent CPU hogging
+            # Sleep until the next read is due rather than waking every 10 ms
+            time.sleep(max(0.0, last_read + read_interval - time.time()))
 
     def _read_and_process(self):
         """Read radar tracks and publish to queue."""
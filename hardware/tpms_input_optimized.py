@@ -47,7 +47,7 @@ class TPMSHandlerOptimised(BoundedQueueHardwareHandler):
         Args:
             timeout_s: Data timeout in seconds
         """
-        super().__init__(queue_depth=2)
+        super().__init__(queue_depth=2, zero_copy=True)
 
         self.timeout_s = timeout_s
 
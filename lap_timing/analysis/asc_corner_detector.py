@@ -16,6 +16,7 @@ from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from lap_timing.data.track_loader import Track, TrackPoint
 from lap_timing.utils.geometry import haversine_distance
+from utils import geometry_kernels as gk
 
 
 @dataclass
@@ -145,61 +146,13 @@ class ASCCornerDetector:
         """
         Calculate curvature at each centerline point.
 
-        Uses three-point circle fitting (circumcircle method).
+        Uses three-point circle fitting (circumcircle method), wrapping
+        around the ends of the centerline.
         Curvature = 1/radius (positive = left turn, negative = right turn)
         """
-        curvatures = []
-
-        for i in range(len(centerline)):
-            i_prev = (i - 1) % len(centerline)
-            i_next = (i + 1) % len(centerline)
-
-            p1 = centerline[i_prev]
-            p2 = centerline[i]
-            p3 = centerline[i_next]
-
-            curvature = self._curvature_from_points(p1, p2, p3)
-            curvatures.append(curvature)
-
-        return curvatures
-
-    def _curvature_from_points(
-        self,
-        p1: TrackPoint,
-        p2: TrackPoint,
-        p3: TrackPoint
-    ) -> float:
-        """Calculate signed curvature from three points using circumcircle."""
-        # Convert to local meters (p2 as origin)
-        x1 = (p1.lon - p2.lon) * 111320 * math.cos(math.radians(p2.lat))
-        y1 = (p1.lat - p2.lat) * 110540
-        x2 = 0.0
-        y2 = 0.0
-        x3 = (p3.lon - p2.lon) * 111320 * math.cos(math.radians(p2.lat))
-        y3 = (p3.lat - p2.lat) * 110540
-
-        # Triangle area
-        area = abs((x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2)) / 2.0)
-
-        if area < 1e-6:
-            return 0.0  # Collinear
-
-        # Side lengths
-        a = math.sqrt((x2 - x3)**2 + (y2 - y3)**2)
-        b = math.sqrt((x1 - x3)**2 + (y1 - y3)**2)
-        c = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-
-        # Circumradius
-        radius = (a * b * c) / (4.0 * area)
-
-        if radius < 0.1:
-            return 0.0
-
-        # Sign from cross product (positive = left turn)
-        cross = (x3 - x1) * (y2 - y1) - (y3 - y1) * (x2 - x1)
-        sign = 1.0 if cross > 0 else -1.0
-
-        return sign / radius
+        lats = [p.lat for p in centerline]
+        lons = [p.lon for p in centerline]
+        return gk.curvature(lats, lons, closed=True).tolist()
 
     def _phase1_peak_detection(
         self,
@@ -10,6 +10,7 @@ from typing import List, Tuple
 from dataclasses import dataclass
 from lap_timing.data.track_loader import Track, TrackPoint
 from lap_timing.utils.geometry import haversine_distance
+from utils import geometry_kernels as gk
 
 
 @dataclass
@@ -115,69 +116,12 @@ class CornerDetector:
 
         Curvature = 1/radius (positive = left turn, negative = right turn)
 
-        Uses three-point circle fitting method.
+        Uses three-point circle fitting method, wrapping around the ends
+        of the centerline.
         """
-        curvatures = []
-
-        for i in range(len(centerline)):
-            # Use points before, at, and after current point
-            i_prev = (i - 1) % len(centerline)
-            i_curr = i
-            i_next = (i + 1) % len(centerline)
-
-            p1 = centerline[i_prev]
-            p2 = centerline[i_curr]
-            p3 = centerline[i_next]
-
-            # Calculate curvature from three points
-            curvature = self._calculate_curvature_from_points(p1, p2, p3)
-            curvatures.append(curvature)
-
-        return curvatures
-
-    def _calculate_curvature_from_points(
-        self,
-        p1: TrackPoint,
-        p2: TrackPoint,
-        p3: TrackPoint
-    ) -> float:
-        """
-        Calculate curvature from three points using circumcircle method.
-
-        Returns curvature in 1/meters (signed: positive=left, negative=right)
-        """
-        # Convert to approximate meters (small scale approximation)
-        # Use p2 as origin
-        x1 = (p1.lon - p2.lon) * 111320 * math.cos(math.radians(p2.lat))
-        y1 = (p1.lat - p2.lat) * 110540
-        x2 = 0.0
-        y2 = 0.0
-        x3 = (p3.lon - p2.lon) * 111320 * math.cos(math.radians(p2.lat))
-        y3 = (p3.lat - p2.lat) * 110540
-
-        # Calculate circumcircle radius using cross product method
-        # Area of triangle
-        area = abs((x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2)) / 2.0)
-
-        if area < 1e-6:
-            return 0.0  # Points are collinear (straight line)
-
-        # Side lengths
-        a = math.sqrt((x2 - x3)**2 + (y2 - y3)**2)
-        b = math.sqrt((x1 - x3)**2 + (y1 - y3)**2)
-        c = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-
-        # Circumradius
-        radius = (a * b * c) / (4.0 * area)
-
-        if radius < 0.1:  # Avoid division by zero
-            return 0.0
-
-        # Determine sign (left vs right turn) using cross product
-        cross = (x3 - x1) * (y2 - y1) - (y3 - y1) * (x2 - x1)
-        sign = 1.0 if cross > 0 else -1.0
-
-        return sign / radius
+        lats = [p.lat for p in centerline]
+        lons = [p.lon for p in centerline]
+        return gk.curvature(lats, lons, closed=True).tolist()
 
     def _find_corner_regions(
         self,
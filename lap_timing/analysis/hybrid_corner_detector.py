@@ -15,6 +15,7 @@ from typing import List, Tuple
 from dataclasses import dataclass
 import numpy as np
 from lap_timing.data.track_loader import Track, TrackPoint
+from utils import geometry_kernels as gk
 from lap_timing.analysis.asc_corner_detector import ASCCornerDetector
 
 
@@ -146,15 +147,13 @@ class HybridCornerDetector:
         if not centerline:
             return np.array([])
 
-        ref_lat = centerline[0].lat
-        ref_lon = centerline[0].lon
-
-        coords = np.zeros((len(centerline), 2))
-        for i, pt in enumerate(centerline):
-            coords[i, 0] = (pt.lon - ref_lon) * 111320 * math.cos(math.radians(ref_lat))
-            coords[i, 1] = (pt.lat - ref_lat) * 110540
-
-        return coords
+        east, north = gk.to_local(
+            [pt.lat for pt in centerline],
+            [pt.lon for pt in centerline],
+            centerline[0].lat,
+            centerline[0].lon,
+        )
+        return np.column_stack((east, north))
 
     def _kasa_fit(self, x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
         """
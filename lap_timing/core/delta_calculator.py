@@ -5,29 +5,118 @@ Compares current lap progress against reference lap to calculate
 time delta and predict final lap time.
 """
 
-from typing import List, Optional
+from typing import Optional
 from dataclasses import dataclass
 from lap_timing.data.models import GPSPoint, TrackPosition, Lap, Delta
+from config import (
+    LAP_TIMING_DELTA_RESOLUTION_M,
+    LAP_TIMING_DELTA_TREND_HORIZON_S,
+    LAP_TIMING_SPEED_WINDOW,
+)
 import math
 
+import numpy as np
+
 
 @dataclass
 class ReferenceData:
     """Preprocessed reference lap data for fast lookups."""
     lap: Lap
-    # Time at each meter along track (distance -> elapsed time)
-    time_at_distance: List[float]
+    # Elapsed time at each table step along track (float32, index * resolution = metres)
+    time_at_distance: np.ndarray
     total_time: float
 
 
+class RollingTrend:
+    """
+    Speed and delta trend over the most recent track positions.
+
+    Keeps a fixed-size ring of (timestamp, distance, time delta) samples so
+    nothing is allocated per update. Rates are taken between the oldest and
+    newest samples in the window.
+    """
+
+    def __init__(self, size: int = LAP_TIMING_SPEED_WINDOW):
+        """
+        Initialise the window.
+
+        Args:
+            size: Number of samples in the window (at least 2)
+        """
+        self.size = max(2, size)
+        self._timestamps = [0.0] * self.size
+        self._distances = [0.0] * self.size
+        self._deltas = [0.0] * self.size
+        self._next = 0
+        self.count = 0
+
+    def reset(self):
+        """Forget all samples (e.g. at the start of a lap)."""
+        self._next = 0
+        self.count = 0
+
+    def add(self, timestamp: float, distance: float, time_delta: float):
+        """
+        Add a sample, overwriting the oldest once the window is full.
+
+        Args:
+            timestamp: Position timestamp (seconds)
+            distance: Distance along track (metres)
+            time_delta: Time delta at this position (seconds)
+        """
+        i = self._next
+        self._timestamps[i] = timestamp
+        self._distances[i] = distance
+        self._deltas[i] = time_delta
+        self._next = (i + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def _span(self):
+        """Return (oldest, newest, elapsed) slot indices and time, or None."""
+        if self.count < 2:
+            return None
+        newest = (self._next - 1) % self.size
+        oldest = (self._next - self.count) % self.size
+        elapsed = self._timestamps[newest] - self._timestamps[oldest]
+        if elapsed <= 0:
+            return None
+        return oldest, newest, elapsed
+
+    def speed(self) -> Optional[float]:
+        """Speed along track in m/s, or None if not enough samples."""
+        span = self._span()
+        if span is None:
+            return None
+        oldest, newest, elapsed = span
+        return max(0.0, (self._distances[newest] - self._distances[oldest]) / elapsed)
+
+    def delta_rate(self) -> float:
+        """Rate of change of time delta in s/s (0 if not enough samples)."""
+        span = self._span()
+        if span is None:
+            return 0.0
+        oldest, newest, elapsed = span
+        return (self._deltas[newest] - self._deltas[oldest]) / elapsed
+
+
 class DeltaCalculator:
     """Calculate real-time delta vs reference lap with predictive timing."""
 
-    def __init__(self, track_length: float):
+    def __init__(self, track_length: float, resolution: float = LAP_TIMING_DELTA_RESOLUTION_M):
+        """
+        Initialise the delta calculator.
+
+        Args:
+            track_length: Track length in metres
+            resolution: Reference table spacing in metres (may be sub-metre)
+        """
         self.track_length = track_length
+        self.resolution = resolution
         self.reference_lap: Optional[ReferenceData] = None
         self.current_lap_start_time: Optional[float] = None
         self.current_lap_number = 0
+        self.trend = RollingTrend()
 
     def set_reference_lap(self, lap: Lap):
         """
@@ -41,7 +130,7 @@ class DeltaCalculator:
         if not lap.positions or not lap.gps_points:
             raise ValueError("Reference lap must have positions and GPS points")
 
-        # Build time lookup table at 1-meter intervals
+        # Build time lookup table at the configured resolution
         time_at_distance = self._build_time_lookup_table(lap)
 
         self.reference_lap = ReferenceData(
@@ -50,57 +139,57 @@ class DeltaCalculator:
             total_time=lap.duration
         )
 
-    def _build_time_lookup_table(self, lap: Lap) -> List[float]:
+    def clear_reference(self):
+        """Forget the reference lap (delta is unavailable until a new one is set)."""
+        self.reference_lap = None
+
+    def _build_time_lookup_table(self, lap: Lap) -> np.ndarray:
         """
-        Build lookup table of elapsed time at each meter along track.
+        Build lookup table of elapsed time at each step along track.
 
         Args:
             lap: Lap with positions and GPS points
 
         Returns:
-            List where index is distance (meters) and value is elapsed time (seconds)
+            float32 array where index * resolution is distance (metres) and
+            value is elapsed time (seconds)
         """
-        # Create table with 1-meter resolution
-        num_meters = int(self.track_length) + 1
-        time_at_distance = [0.0] * num_meters
-
+        num_steps = math.ceil(self.track_length / self.resolution) + 1
         if not lap.positions:
-            return time_at_distance
-
-        # Interpolate time at each meter mark
-        for i in range(num_meters):
-            target_distance = float(i)
-
-            # Find positions bracketing this distance
-            prev_pos = None
-            next_pos = None
-
-            for pos in lap.positions:
-                if pos.distance_along_track <= target_distance:
-                    prev_pos = pos
-                elif pos.distance_along_track > target_distance and next_pos is None:
-                    next_pos = pos
-                    break
-
-            if prev_pos is None:
-                # Before first position
-                time_at_distance[i] = 0.0
-            elif next_pos is None:
-                # After last position
-                time_at_distance[i] = lap.duration
-            else:
-                # Interpolate between prev and next
-                dist_range = next_pos.distance_along_track - prev_pos.distance_along_track
-                if dist_range > 0:
-                    t = (target_distance - prev_pos.distance_along_track) / dist_range
-                    elapsed_prev = prev_pos.timestamp - lap.start_time
-                    elapsed_next = next_pos.timestamp - lap.start_time
-                    time_at_distance[i] = elapsed_prev + t * (elapsed_next - elapsed_prev)
-                else:
-                    elapsed = prev_pos.timestamp - lap.start_time
-                    time_at_distance[i] = elapsed
-
-        return time_at_distance
+            return np.zeros(num_steps, dtype=np.float32)
+
+        distances = np.fromiter(
+            (pos.distance_along_track for pos in lap.positions),
+            dtype=np.float64, count=len(lap.positions)
+        )
+        elapsed = np.fromiter(
+            (pos.timestamp for pos in lap.positions),
+            dtype=np.float64, count=len(lap.positions)
+        ) - lap.start_time
+
+        # Skip leading samples still reported at the end of the previous lap
+        # (S/F line crossed before the position wrapped to zero)
+        on_lap = np.flatnonzero(distances < self.track_length / 2)
+        if len(on_lap):
+            distances = distances[on_lap[0]:]
+            elapsed = elapsed[on_lap[0]:]
+
+        # Distance must be monotonic for interpolation: GPS jitter can step it
+        # backwards, so take the running maximum and keep the first sample at
+        # each distance
+        distances = np.maximum.accumulate(distances)
+        first = np.empty(len(distances), dtype=bool)
+        first[0] = True
+        np.greater(distances[1:], distances[:-1], out=first[1:])
+        distances = distances[first]
+        elapsed = elapsed[first]
+
+        # Before the first position: 0, after the last position: lap time
+        targets = np.arange(num_steps, dtype=np.float64) * self.resolution
+        time_at_distance = np.interp(
+            targets, distances, elapsed, left=0.0, right=lap.duration
+        )
+        return time_at_distance.astype(np.float32)
 
     def start_lap(self, timestamp: float, lap_number: int):
         """
@@ -112,6 +201,7 @@ class DeltaCalculator:
         """
         self.current_lap_start_time = timestamp
         self.current_lap_number = lap_number
+        self.trend.reset()
 
     def calculate_delta(self, position: TrackPosition) -> Optional[Delta]:
         """
@@ -129,30 +219,36 @@ class DeltaCalculator:
         # Current elapsed time
         current_elapsed = position.timestamp - self.current_lap_start_time
 
-        # Look up reference time at this distance
-        distance_idx = int(position.distance_along_track)
-        if distance_idx < 0 or distance_idx >= len(self.reference_lap.time_at_distance):
+        # Look up reference time at this distance, interpolating between steps
+        table = self.reference_lap.time_at_distance
+        step = position.distance_along_track / self.resolution
+        if step < 0 or step > len(table) - 1:
             return None
 
-        reference_elapsed = self.reference_lap.time_at_distance[distance_idx]
+        index = int(step)
+        reference_elapsed = float(table[index])
+        if index < len(table) - 1:
+            fraction = step - index
+            reference_elapsed += fraction * (float(table[index + 1]) - reference_elapsed)
 
         # Calculate delta (positive = slower, negative = faster)
         time_delta = current_elapsed - reference_elapsed
+        self.trend.add(position.timestamp, position.distance_along_track, time_delta)
 
-        # Calculate distance delta (approximate)
-        # How far ahead/behind we would be if traveling at reference pace
+        # Calculate distance delta: how far ahead (+) or behind (-) the
+        # reference we are at current speed
         current_speed = self._estimate_current_speed(position)
-        if current_speed > 0:
-            distance_delta = time_delta * current_speed
-        else:
-            distance_delta = 0.0
+        distance_delta = -time_delta * current_speed
 
         # Predict final lap time
+        delta_rate = self.trend.delta_rate()
         predicted_time = self._predict_lap_time(
             position.progress_fraction,
             current_elapsed,
             time_delta,
-            self.reference_lap.total_time
+            self.reference_lap.total_time,
+            delta_rate,
+            self.reference_lap.total_time - reference_elapsed,
         )
 
         return Delta(
@@ -160,23 +256,24 @@ class DeltaCalculator:
             time_delta=time_delta,
             distance_delta=distance_delta,
             reference_lap=self.current_lap_number,
-            predicted_lap_time=predicted_time
+            predicted_lap_time=predicted_time,
+            delta_rate=delta_rate,
         )
 
     def _estimate_current_speed(self, position: TrackPosition) -> float:
         """
-        Estimate current speed based on recent positions.
+        Estimate current speed from recent positions.
 
         Args:
-            position: Current position
+            position: Current position (already added to the trend window)
 
         Returns:
-            Speed in m/s (returns 0 if cannot estimate)
+            Speed in m/s (reference lap average until the window has data)
         """
-        # This is a placeholder - in real implementation we'd track
-        # recent positions to calculate instantaneous speed
-        # For now, use reference lap average speed
-        if self.reference_lap:
+        speed = self.trend.speed()
+        if speed is not None:
+            return speed
+        if self.reference_lap and self.reference_lap.total_time > 0:
             return self.track_length / self.reference_lap.total_time
         return 0.0
 
@@ -185,7 +282,9 @@ class DeltaCalculator:
         progress: float,
         current_elapsed: float,
         current_delta: float,
-        reference_time: float
+        reference_time: float,
+        delta_rate: float = 0.0,
+        reference_remaining: float = 0.0
     ) -> float:
         """
         Predict final lap time using progressive weighting.
@@ -193,11 +292,17 @@ class DeltaCalculator:
         Early in lap: Weight toward reference time (unknown pace)
         Late in lap: Weight toward current pace (known pace)
 
+        The reference-based prediction also projects the current delta
+        trend a short way ahead, so gaining or losing time shows up in the
+        prediction before it accumulates in the delta.
+
         Args:
             progress: Lap progress (0.0 to 1.0)
             current_elapsed: Current elapsed time
             current_delta: Current time delta
             reference_time: Reference lap time
+            delta_rate: Rate of change of delta (s/s)
+            reference_remaining: Reference time left to the end of the lap
 
         Returns:
             Predicted final lap time in seconds
@@ -212,8 +317,9 @@ class DeltaCalculator:
         else:
             pace_prediction = reference_time
 
-        # Prediction based on reference + current delta
-        delta_prediction = reference_time + current_delta
+        # Prediction based on reference + current delta + short-term trend
+        horizon = min(LAP_TIMING_DELTA_TREND_HORIZON_S, max(0.0, reference_remaining))
+        delta_prediction = reference_time + current_delta + delta_rate * horizon
 
         # Blend predictions
         predicted = weight * pace_prediction + (1 - weight) * delta_prediction
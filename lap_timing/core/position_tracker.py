@@ -1,14 +1,22 @@
 """
 Position tracker - maps GPS coordinates to track positions.
 
-Uses KD-tree spatial indexing for O(log n) lookups.
+The centreline is projected once into a local metric (east/north) frame.
+Each fix is projected onto the centreline segments in a short window around
+the last matched segment, giving continuous distance along track without
+jumping to another part of the circuit where it passes close by (hairpins,
+figure-eight crossings). A KD-tree over the centreline is only used to
+acquire a lock, at start-up or after the car leaves the track.
 """
 
 import logging
 import math
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
+import numpy as np
+
+from config import LAP_TIMING_TRACKER_LOCK_DISTANCE_M, LAP_TIMING_TRACKER_WINDOW_M
 from lap_timing.data.models import GPSPoint, TrackPosition
 from lap_timing.data.track_loader import Track, TrackPoint
 from lap_timing.utils.geometry import haversine_distance
@@ -22,6 +30,13 @@ except ImportError:
     HAS_SCIPY = False
     logger.warning("scipy not available, falling back to linear search")
 
+# Mean Earth radius in metres (matches haversine_distance)
+EARTH_RADIUS_M = 6371000.0
+
+# Segments either side of the nearest vertex checked when acquiring a lock
+# (segment i starts at vertex i, so offsets -N..N-1 from the vertex)
+_ACQUIRE_SEGMENTS = 2
+
 
 @dataclass
 class NearestResult:
@@ -32,24 +47,199 @@ class NearestResult:
 
 
 class PositionTracker:
-    """Maps GPS coordinates to track positions using KD-tree spatial index."""
+    """Maps GPS coordinates to track positions by windowed segment projection."""
 
-    def __init__(self, track: Track):
+    def __init__(
+        self,
+        track: Track,
+        window_m: float = LAP_TIMING_TRACKER_WINDOW_M,
+        lock_distance_m: float = LAP_TIMING_TRACKER_LOCK_DISTANCE_M,
+    ):
+        """
+        Initialise the tracker and project the centreline.
+
+        Args:
+            track: Track with centreline
+            window_m: Distance ahead of the last position searched each fix
+            lock_distance_m: Distance from the centreline beyond which the
+                             lock is dropped and re-acquired via the KD-tree
+        """
         self.track = track
         self.centerline = track.centerline
         self.track_length = track.length
+        self.closed = not track.is_point_to_point
+        self.lock_distance_m = lock_distance_m
+
+        # Index of the segment matched on the last fix (None = no lock)
+        self.locked_segment: Optional[int] = None
+
+        self._build_local_frame()
+        self._build_window(window_m)
 
         # Build spatial index
-        if HAS_SCIPY:
+        if HAS_SCIPY and len(self.centerline):
             self._build_kdtree()
         else:
             self.kdtree = None
 
+    def _build_local_frame(self):
+        """Project the centreline into east/north metres around its centre."""
+        lats = np.array([p.lat for p in self.centerline], dtype=np.float64)
+        lons = np.array([p.lon for p in self.centerline], dtype=np.float64)
+        self._origin = (
+            float(lats.mean()) if len(lats) else 0.0,
+            float(lons.mean()) if len(lons) else 0.0,
+        )
+        self._scale_y = math.radians(1.0) * EARTH_RADIUS_M
+        self._scale_x = self._scale_y * math.cos(math.radians(self._origin[0]))
+        self._xy = np.column_stack((
+            (lons - self._origin[1]) * self._scale_x,
+            (lats - self._origin[0]) * self._scale_y,
+        ))
+
+        # Segment i runs from centreline point i to i + 1
+        distances = np.array([p.distance for p in self.centerline], dtype=np.float64)
+        self._seg_start = self._xy[:-1]
+        self._seg_vec = self._xy[1:] - self._xy[:-1]
+        length_sq = np.einsum('ij,ij->i', self._seg_vec, self._seg_vec)
+        valid = length_sq > 1e-9
+        self._seg_inv_len_sq = np.divide(
+            1.0, length_sq, out=np.zeros_like(length_sq), where=valid
+        )
+        self._seg_dir = self._segment_directions(valid)
+        self._seg_distance = distances[:-1]
+        self._seg_track_len = distances[1:] - distances[:-1]
+        self.segment_count = len(self._seg_vec)
+
+    def _segment_directions(self, valid: np.ndarray) -> np.ndarray:
+        """
+        Unit direction of each segment, for the side of the line a point is on.
+
+        Zero-length segments (repeated centreline points) take the direction
+        of the next real segment, or the previous one at the end of the line.
+        Zero if the whole centreline is a single point.
+        """
+        directions = np.zeros_like(self._seg_vec)
+        if not valid.any():
+            return directions
+        directions[valid] = self._seg_vec[valid] / np.sqrt(
+            np.einsum('ij,ij->i', self._seg_vec[valid], self._seg_vec[valid])
+        )[:, None]
+        indices = np.arange(len(valid))
+        real = indices[valid]
+        following = np.searchsorted(real, indices)
+        source = real[np.minimum(following, len(real) - 1)]
+        return directions[source]
+
+    def _build_window(self, window_m: float):
+        """
+        Precompute segment offsets searched around the locked segment.
+
+        The window looks ahead by window_m, since the car moves forward along
+        the track between fixes, and a quarter as far behind to absorb GPS
+        jitter and slow reversing.
+        """
+        if self.segment_count == 0:
+            self._window = np.zeros(0, dtype=np.intp)
+            return
+        spacing = max(self.track_length / self.segment_count, 0.1)
+        ahead = max(2, int(math.ceil(window_m / spacing)))
+        behind = max(1, ahead // 4)
+        ahead = min(ahead, self.segment_count - 1)
+        behind = min(behind, self.segment_count - 1 - ahead)
+        self._window = np.arange(-max(behind, 0), ahead + 1, dtype=np.intp)
+
     def _build_kdtree(self):
-        """Build KD-tree spatial index of centerline points."""
-        # Convert centerline to array of (lat, lon) for KD-tree
-        coords = [(p.lat, p.lon) for p in self.centerline]
-        self.kdtree = cKDTree(coords)
+        """Build KD-tree spatial index of centerline points (local metres)."""
+        self.kdtree = cKDTree(self._xy)
+
+    def to_local(self, lat: float, lon: float) -> Tuple[float, float]:
+        """
+        Convert a GPS coordinate to the tracker's local frame.
+
+        Args:
+            lat, lon: GPS coordinates
+
+        Returns:
+            (east, north) in metres from the centreline centre
+        """
+        return (
+            (lon - self._origin[1]) * self._scale_x,
+            (lat - self._origin[0]) * self._scale_y,
+        )
+
+    def reset(self):
+        """Drop the lock so the next fix is matched against the whole track."""
+        self.locked_segment = None
+
+    def _candidate_segments(self, centre: int, offsets: np.ndarray) -> np.ndarray:
+        """Segment indices around centre, wrapped (circuits) or clipped (stages)."""
+        indices = centre + offsets
+        if self.closed:
+            return indices % self.segment_count
+        return np.unique(np.clip(indices, 0, self.segment_count - 1))
+
+    def _project(self, x: float, y: float, segments: np.ndarray) -> Tuple[int, float, float]:
+        """
+        Project a point onto the given segments and pick the closest.
+
+        Returns:
+            (segment index, fraction along segment, squared distance in m^2)
+        """
+        start = self._seg_start[segments]
+        vec = self._seg_vec[segments]
+        px = x - start[:, 0]
+        py = y - start[:, 1]
+        t = (px * vec[:, 0] + py * vec[:, 1]) * self._seg_inv_len_sq[segments]
+        np.clip(t, 0.0, 1.0, out=t)
+        dx = px - t * vec[:, 0]
+        dy = py - t * vec[:, 1]
+        dist_sq = dx * dx + dy * dy
+        best = int(np.argmin(dist_sq))
+        return int(segments[best]), float(t[best]), float(dist_sq[best])
+
+    def _nearest_vertex(self, x: float, y: float) -> int:
+        """Index of the centreline vertex nearest a local point."""
+        if self.kdtree is not None:
+            _, idx = self.kdtree.query((x, y))
+            return int(idx)
+        diff = self._xy - (x, y)
+        return int(np.argmin(np.einsum('ij,ij->i', diff, diff)))
+
+    def _acquire(self, x: float, y: float) -> Tuple[int, float, float]:
+        """Match a point against the whole track (no lock)."""
+        vertex = min(self._nearest_vertex(x, y), self.segment_count - 1)
+        # N segments leading into the vertex and N leading out of it
+        offsets = np.arange(-_ACQUIRE_SEGMENTS, _ACQUIRE_SEGMENTS, dtype=np.intp)
+        return self._project(x, y, self._candidate_segments(vertex, offsets))
+
+    def _match(self, x: float, y: float) -> Tuple[int, float, float]:
+        """Match a point, using the window around the lock when held."""
+        lock_sq = self.lock_distance_m * self.lock_distance_m
+        if self.locked_segment is not None:
+            match = self._project(
+                x, y, self._candidate_segments(self.locked_segment, self._window)
+            )
+            if match[2] <= lock_sq:
+                self.locked_segment = match[0]
+                return match
+            logger.debug("Position tracker lost lock (%.1fm off centreline)",
+                         math.sqrt(match[2]))
+
+        match = self._acquire(x, y)
+        self.locked_segment = match[0] if match[2] <= lock_sq else None
+        return match
+
+    def _position_on_segment(self, segment: int, t: float) -> float:
+        """Distance along track of a point on a segment."""
+        return float(self._seg_distance[segment] + t * self._seg_track_len[segment])
+
+    def _signed_offset(self, x: float, y: float, segment: int) -> float:
+        """Perpendicular distance from a segment (+ve = right, -ve = left)."""
+        dx, dy = self._seg_dir[segment]
+        sx, sy = self._seg_start[segment]
+        # Cross product of direction and offset is positive to the left
+        return float(-(dx * (y - sy) - dy * (x - sx)))
 
     def find_nearest_centerline_point(self, lat: float, lon: float) -> NearestResult:
         """
@@ -61,40 +251,13 @@ class PositionTracker:
         Returns:
             NearestResult with index and distance
         """
-        if HAS_SCIPY and self.kdtree:
-            # Query KD-tree (fast: O(log n))
-            # Note: This uses Euclidean distance on lat/lon, which is approximate
-            # but sufficient for finding nearest point
-            dist, idx = self.kdtree.query([lat, lon])
-
-            # Calculate accurate distance using haversine
-            nearest_point = self.centerline[idx]
-            accurate_dist = haversine_distance(
-                lat, lon,
-                nearest_point.lat, nearest_point.lon
-            )
-
-            return NearestResult(
-                index=idx,
-                distance=accurate_dist,
-                track_point=nearest_point
-            )
-        else:
-            # Fallback: Linear search (slower: O(n))
-            min_dist = float('inf')
-            nearest_idx = 0
-
-            for i, point in enumerate(self.centerline):
-                dist = haversine_distance(lat, lon, point.lat, point.lon)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_idx = i
-
-            return NearestResult(
-                index=nearest_idx,
-                distance=min_dist,
-                track_point=self.centerline[nearest_idx]
-            )
+        idx = self._nearest_vertex(*self.to_local(lat, lon))
+        nearest_point = self.centerline[idx]
+        return NearestResult(
+            index=idx,
+            distance=haversine_distance(lat, lon, nearest_point.lat, nearest_point.lon),
+            track_point=nearest_point
+        )
 
     def get_track_position(self, gps_point: GPSPoint) -> TrackPosition:
         """
@@ -106,30 +269,27 @@ class PositionTracker:
         Returns:
             TrackPosition with distance along track and lateral offset
         """
-        # Find nearest centerline point
-        nearest = self.find_nearest_centerline_point(
-            gps_point.lat,
-            gps_point.lon
-        )
+        if self.segment_count == 0:
+            return TrackPosition(
+                distance_along_track=0.0,
+                lateral_offset=0.0,
+                segment_index=0,
+                progress_fraction=0.0,
+                timestamp=gps_point.timestamp
+            )
 
-        # Distance along track is the cumulative distance of nearest point
-        distance_along_track = nearest.track_point.distance
+        x, y = self.to_local(gps_point.lat, gps_point.lon)
+        segment, t, _ = self._match(x, y)
 
-        # Lateral offset (perpendicular distance from centerline)
-        # Positive = right of centerline, negative = left
-        lateral_offset = self._calculate_lateral_offset(
-            gps_point.lat,
-            gps_point.lon,
-            nearest.index
-        )
+        distance_along_track = self._position_on_segment(segment, t)
 
         # Progress fraction (0.0 to 1.0)
         progress_fraction = distance_along_track / self.track_length if self.track_length > 0 else 0.0
 
         return TrackPosition(
             distance_along_track=distance_along_track,
-            lateral_offset=lateral_offset,
-            segment_index=nearest.index,
+            lateral_offset=self._signed_offset(x, y, segment),
+            segment_index=segment,
             progress_fraction=progress_fraction,
             timestamp=gps_point.timestamp
         )
@@ -138,42 +298,15 @@ class PositionTracker:
         """
         Calculate lateral offset from centerline (signed distance).
 
-        Uses cross product to determine which side of centerline vehicle is on.
-
         Args:
             lat, lon: GPS coordinates
-            segment_idx: Index of nearest centerline segment
+            segment_idx: Index of centerline segment
 
         Returns:
             Lateral offset in meters (+ve = right, -ve = left)
         """
-        # Get centerline segment
-        current_point = self.centerline[segment_idx]
-
-        # Get next point for direction vector
-        if segment_idx < len(self.centerline) - 1:
-            next_point = self.centerline[segment_idx + 1]
-        else:
-            # Wrap around to start for last segment
-            next_point = self.centerline[0]
-
-        # Vector from current to next point (centerline direction)
-        dx = next_point.lon - current_point.lon
-        dy = next_point.lat - current_point.lat
-
-        # Vector from current point to GPS point
-        px = lon - current_point.lon
-        py = lat - current_point.lat
-
-        # Cross product determines side
-        # Positive = right, negative = left
-        cross = dx * py - dy * px
-
-        # Calculate perpendicular distance
-        distance = haversine_distance(lat, lon, current_point.lat, current_point.lon)
-
-        # Apply sign based on side
-        return distance if cross > 0 else -distance
+        segment = min(segment_idx, self.segment_count - 1)
+        return self._signed_offset(*self.to_local(lat, lon), segment)
 
     def get_interpolated_position(
         self,
@@ -184,7 +317,8 @@ class PositionTracker:
         """
         Get interpolated position with sub-meter precision.
 
-        Interpolates between centerline segments for more accurate positioning.
+        Stateless: projects onto the segments around the nearest centreline
+        point without using or updating the tracking lock.
 
         Args:
             lat, lon: GPS coordinates
@@ -193,68 +327,20 @@ class PositionTracker:
         Returns:
             TrackPosition with interpolated distance
         """
-        # Find nearest point
-        nearest = self.find_nearest_centerline_point(lat, lon)
-        base_idx = nearest.index
-
-        # Check surrounding segments for better interpolation
-        best_dist = nearest.distance
-        best_idx = base_idx
-        best_progress = 0.0
-
-        for offset in range(-look_ahead, look_ahead + 1):
-            idx = (base_idx + offset) % len(self.centerline)
-            next_idx = (idx + 1) % len(self.centerline)
-
-            current = self.centerline[idx]
-            next_point = self.centerline[next_idx]
-
-            # Project GPS point onto this segment
-            # Calculate projection factor (0.0 to 1.0 along segment)
-            dx = next_point.lon - current.lon
-            dy = next_point.lat - current.lat
-            px = lon - current.lon
-            py = lat - current.lat
-
-            segment_length_sq = dx * dx + dy * dy
-            if segment_length_sq < 1e-10:
-                continue
-
-            t = max(0.0, min(1.0, (px * dx + py * dy) / segment_length_sq))
-
-            # Interpolated point on segment
-            interp_lat = current.lat + t * dy
-            interp_lon = current.lon + t * dx
-
-            # Distance from GPS point to interpolated point
-            dist = haversine_distance(lat, lon, interp_lat, interp_lon)
-
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = idx
-                best_progress = t
-
-        # Calculate interpolated distance along track
-        current = self.centerline[best_idx]
-        next_point = self.centerline[(best_idx + 1) % len(self.centerline)]
-
-        segment_length = haversine_distance(
-            current.lat, current.lon,
-            next_point.lat, next_point.lon
-        )
-
-        interpolated_distance = current.distance + best_progress * segment_length
+        x, y = self.to_local(lat, lon)
+        vertex = min(self._nearest_vertex(x, y), self.segment_count - 1)
+        offsets = np.arange(-look_ahead, look_ahead + 1, dtype=np.intp)
+        segment, t, _ = self._project(x, y, self._candidate_segments(vertex, offsets))
 
-        # Lateral offset
-        lateral_offset = self._calculate_lateral_offset(lat, lon, best_idx)
+        interpolated_distance = self._position_on_segment(segment, t)
 
         # Progress fraction
         progress_fraction = interpolated_distance / self.track_length if self.track_length > 0 else 0.0
 
         return TrackPosition(
             distance_along_track=interpolated_distance,
-            lateral_offset=lateral_offset,
-            segment_index=best_idx,
+            lateral_offset=self._signed_offset(x, y, segment),
+            segment_index=segment,
             progress_fraction=progress_fraction,
             timestamp=0.0  # Will be set by caller
         )
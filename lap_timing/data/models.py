@@ -80,13 +80,13 @@ class StartFinishLine:
     Attributes:
         point1: One end of line as (lat, lon) tuple in decimal degrees.
         point2: Other end of line as (lat, lon) tuple in decimal degrees.
-        centre: Midpoint of line as (lat, lon) tuple in decimal degrees.
+        center: Midpoint of line as (lat, lon) tuple in decimal degrees.
         heading: Direction perpendicular to track in degrees (0-360).
         width: Total line width in metres (distance from point1 to point2).
     """
     point1: Tuple[float, float]
     point2: Tuple[float, float]
-    centre: Tuple[float, float]
+    center: Tuple[float, float]
     heading: float
     width: float
 
@@ -141,12 +141,15 @@ class Delta:
         reference_lap: Lap number of the reference lap being compared to.
         predicted_lap_time: Estimated final lap time in seconds based on
             current delta and remaining distance.
+        delta_rate: Rate of change of time_delta in seconds per second.
+            Positive = losing time to the reference, negative = gaining.
     """
     position: TrackPosition
     time_delta: float
     distance_delta: float
     reference_lap: int
     predicted_lap_time: float
+    delta_rate: float = 0.0
 
 
 @dataclass
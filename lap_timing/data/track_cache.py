@@ -0,0 +1,333 @@
+"""
+Compiled track cache for lap timing.
+
+Loading a KMZ/GPX track unzips and parses KML, interpolates, smooths and
+aligns boundaries and generates the centreline - too slow to do on a Pi
+every time a track is auto-detected. The result is compiled once into a
+binary file keyed by the source file's hash and the loader version, along
+with sector boundaries and the corners found by the configured detector.
+Later loads memory-map the file and rebuild the Track in a few milliseconds.
+
+File layout (little-endian):
+    MAGIC (8 bytes) | uint32 header length | header JSON | padding to 8 |
+    float64 arrays of (lat, lon, distance) rows for each point list
+
+The header holds the track metadata, S/F line, sector boundaries, corners
+(with the detector settings they were found with) and the offset and row
+count of each array.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    LAP_TIMING_TRACK_CACHE_DIR,
+    LAP_TIMING_SECTOR_COUNT,
+    LAP_TIMING_CORNER_DETECTOR,
+    LAP_TIMING_CORNER_MIN_RADIUS_M,
+    LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+    LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
+    LAP_TIMING_CORNER_STRAIGHT_FILL_M,
+    LAP_TIMING_CORNER_MERGE_CHICANES,
+)
+from lap_timing.data.models import StartFinishLine
+from lap_timing.data.track_loader import Track, TrackPoint, load_track
+from lap_timing.analysis import (
+    asc_corner_detector,
+    corner_detector,
+    curvefinder_detector,
+    hybrid_corner_detector,
+)
+
+logger = logging.getLogger('openTPT.lap_timing.track_cache')
+
+# Bump when track_loader output or the cache layout changes
+TRACK_CACHE_VERSION = 1
+
+MAGIC = b"OTPTTRK\x01"
+CACHE_SUFFIX = ".trk"
+_HEADER_STRUCT = struct.Struct("<I")
+_ARRAY_ALIGN = 8
+
+# Corner class for each detector type (each detector defines its own)
+_CORNER_CLASSES = {
+    "hybrid": hybrid_corner_detector.Corner,
+    "asc": asc_corner_detector.Corner,
+    "curvefinder": curvefinder_detector.Corner,
+    "threshold": corner_detector.Corner,
+}
+
+
+def corner_settings(detector_type: str = LAP_TIMING_CORNER_DETECTOR) -> Dict[str, Any]:
+    """Detector type and parameters that cached corners depend on."""
+    return {
+        "detector": detector_type.lower(),
+        "min_radius": LAP_TIMING_CORNER_MIN_RADIUS_M,
+        "min_angle": LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+        "min_cut_distance": LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
+        "straight_fill": LAP_TIMING_CORNER_STRAIGHT_FILL_M,
+        "merge_chicanes": LAP_TIMING_CORNER_MERGE_CHICANES,
+    }
+
+
+def create_corner_detector(detector_type: str = LAP_TIMING_CORNER_DETECTOR):
+    """
+    Create the corner detector configured for lap timing.
+
+    Args:
+        detector_type: hybrid, asc, curvefinder, or threshold
+
+    Returns:
+        Detector with a detect_corners(track) method
+    """
+    detector_type = detector_type.lower()
+    if detector_type == "hybrid":
+        return hybrid_corner_detector.HybridCornerDetector(
+            min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
+            min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+            min_cut_distance=LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
+            straight_fill_distance=LAP_TIMING_CORNER_STRAIGHT_FILL_M,
+            merge_chicanes=LAP_TIMING_CORNER_MERGE_CHICANES,
+        )
+    if detector_type == "asc":
+        # Note: ASCCornerDetector's merge_same_direction controls merging
+        # consecutive corners of the same direction, not chicanes.
+        # Let it use the default (True) as chicane merging is HybridCornerDetector only.
+        return asc_corner_detector.ASCCornerDetector(
+            min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
+            min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+            min_cut_distance=LAP_TIMING_CORNER_MIN_CUT_DISTANCE_M,
+            straight_fill_distance=LAP_TIMING_CORNER_STRAIGHT_FILL_M,
+        )
+    if detector_type == "curvefinder":
+        return curvefinder_detector.CurveFinderDetector(
+            min_corner_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
+            min_corner_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+        )
+    # threshold
+    return corner_detector.CornerDetector(
+        min_radius=LAP_TIMING_CORNER_MIN_RADIUS_M,
+        min_angle=LAP_TIMING_CORNER_MIN_ANGLE_DEG,
+    )
+
+
+def equal_sector_boundaries(length: float, count: int = LAP_TIMING_SECTOR_COUNT) -> List[float]:
+    """Distances from S/F splitting the lap into equal sectors."""
+    return [length * (i + 1) / count for i in range(count - 1)]
+
+
+def file_hash(path: str) -> str:
+    """SHA-1 of a file's contents (hex)."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(source_hash: str, cache_dir: str = LAP_TIMING_TRACK_CACHE_DIR) -> str:
+    """Cache file path for a source file hash and the current loader version."""
+    return os.path.join(cache_dir, f"{source_hash}_v{TRACK_CACHE_VERSION}{CACHE_SUFFIX}")
+
+
+def _points_array(points: List[TrackPoint]) -> np.ndarray:
+    return np.array([(p.lat, p.lon, p.distance) for p in points], dtype="<f8").reshape(-1, 3)
+
+
+def _points_from_array(rows: np.ndarray) -> List[TrackPoint]:
+    return [TrackPoint(lat, lon, distance) for lat, lon, distance in rows.tolist()]
+
+
+def _json_scalar(value):
+    """Convert numpy scalars left in corner fields by the detectors."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def write_compiled_track(path: str, track: Track, source_hash: str, corner_config: Dict[str, Any]):
+    """
+    Write a compiled track file (atomically, via a temporary file).
+
+    Args:
+        path: Destination cache file
+        track: Track with corners and sector_boundaries filled in
+        source_hash: Hash of the source file the track was loaded from
+        corner_config: Settings the corners were detected with
+    """
+    arrays = {"centerline": _points_array(track.centerline)}
+    if track.outer_boundary is not track.centerline:
+        arrays["outer_boundary"] = _points_array(track.outer_boundary)
+    if track.inner_boundary is not track.centerline:
+        arrays["inner_boundary"] = _points_array(track.inner_boundary)
+
+    sf = track.sf_line
+    header = {
+        "version": TRACK_CACHE_VERSION,
+        "source_hash": source_hash,
+        "name": track.name,
+        "length": track.length,
+        "is_point_to_point": track.is_point_to_point,
+        "source_file": track.source_file,
+        "sf_line": {
+            "point1": list(sf.point1),
+            "point2": list(sf.point2),
+            "center": list(sf.center),
+            "heading": sf.heading,
+            "width": sf.width,
+        },
+        "sector_boundaries": list(track.sector_boundaries),
+        "corner_config": corner_config,
+        "corners": [dataclasses.asdict(c) for c in track.corners or []],
+        "arrays": {},
+    }
+
+    # Lay the arrays out after the header, each 8-byte aligned for mapping.
+    # Offsets depend on the header size, so settle them iteratively.
+    offsets_fixed = False
+    while not offsets_fixed:
+        raw = json.dumps(header, default=_json_scalar).encode("utf-8")
+        offset = len(MAGIC) + _HEADER_STRUCT.size + len(raw)
+        offset += -offset % _ARRAY_ALIGN
+        layout = {}
+        for name, data in arrays.items():
+            layout[name] = [offset, len(data)]
+            offset += data.nbytes
+        offsets_fixed = layout == header["arrays"]
+        header["arrays"] = layout
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + _HEADER_STRUCT.pack(len(raw)) + raw)
+        for name, data in arrays.items():
+            f.seek(header["arrays"][name][0])
+            f.write(data.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_compiled_track(path: str) -> Tuple[Track, Dict[str, Any]]:
+    """
+    Load a compiled track file.
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        (Track with corners and sector_boundaries set, corner settings the
+        corners were detected with)
+
+    Raises:
+        ValueError: If the file is not a compiled track for this version
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a compiled track file: {path}")
+            start = len(MAGIC) + _HEADER_STRUCT.size
+            (header_len,) = _HEADER_STRUCT.unpack_from(mm, len(MAGIC))
+            header = json.loads(mm[start:start + header_len].decode("utf-8"))
+            if header.get("version") != TRACK_CACHE_VERSION:
+                raise ValueError(f"Compiled track version mismatch: {path}")
+
+            points = {}
+            for name, (offset, rows) in header["arrays"].items():
+                data = np.frombuffer(mm, dtype="<f8", count=rows * 3, offset=offset)
+                points[name] = _points_from_array(data.reshape(rows, 3))
+                del data  # Release the buffer before the map closes
+
+    centerline = points["centerline"]
+    sf = header["sf_line"]
+    corner_config = header["corner_config"]
+    corner_class = _CORNER_CLASSES.get(corner_config.get("detector"))
+    corners = None
+    if corner_class is not None:
+        corners = [corner_class(**c) for c in header["corners"]]
+
+    track = Track(
+        name=header["name"],
+        outer_boundary=points.get("outer_boundary", centerline),
+        inner_boundary=points.get("inner_boundary", centerline),
+        centerline=centerline,
+        sf_line=StartFinishLine(
+            point1=tuple(sf["point1"]),
+            point2=tuple(sf["point2"]),
+            center=tuple(sf["center"]),
+            heading=sf["heading"],
+            width=sf["width"],
+        ),
+        length=header["length"],
+        is_point_to_point=header["is_point_to_point"],
+        source_file=header["source_file"],
+        sector_boundaries=header["sector_boundaries"],
+        corners=corners,
+    )
+    return track, corner_config
+
+
+def compile_track(source_path: str, cache_dir: str = LAP_TIMING_TRACK_CACHE_DIR,
+                  source_hash: Optional[str] = None) -> Track:
+    """
+    Load a track from its source file and write its compiled cache entry.
+
+    Args:
+        source_path: KMZ or GPX file
+        cache_dir: Cache directory
+        source_hash: Precomputed hash of source_path (optional)
+
+    Returns:
+        The loaded Track, with corners and sector boundaries filled in
+    """
+    source_hash = source_hash or file_hash(source_path)
+    track = load_track(source_path)
+    track.sector_boundaries = equal_sector_boundaries(track.length)
+    corner_config = corner_settings()
+    try:
+        track.corners = create_corner_detector(corner_config["detector"]).detect_corners(track)
+    except Exception as e:
+        # Not cached, so corners are detected again on the next load
+        logger.warning("Corner detection failed for %s: %s", source_path, e)
+        track.corners = []
+        return track
+
+    try:
+        write_compiled_track(cache_path(source_hash, cache_dir), track, source_hash, corner_config)
+    except (IOError, OSError) as e:
+        logger.warning("Could not write track cache for %s: %s", source_path, e)
+    return track
+
+
+def load_track_cached(source_path: str, cache_dir: str = LAP_TIMING_TRACK_CACHE_DIR) -> Track:
+    """
+    Load a track, using the compiled cache when it is current.
+
+    Falls back to parsing the source file (and refreshing the cache) when
+    there is no entry for this file content and loader version, the entry is
+    unreadable, or the corner detector settings have changed.
+
+    Args:
+        source_path: KMZ or GPX file
+
+    Returns:
+        Track object (with corners and sector_boundaries)
+    """
+    source_path = str(source_path)
+    source_hash = file_hash(source_path)
+    path = cache_path(source_hash, cache_dir)
+    if os.path.exists(path):
+        try:
+            track, corner_config = read_compiled_track(path)
+            if corner_config == corner_settings():
+                return track
+            logger.info("Corner settings changed, recompiling %s", source_path)
+        except (ValueError, KeyError, TypeError, IOError, OSError) as e:
+            logger.warning("Ignoring unreadable track cache %s: %s", path, e)
+    return compile_track(source_path, cache_dir, source_hash)
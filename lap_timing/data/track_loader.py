@@ -36,6 +36,8 @@ class Track:
     length: float  # Total track length in meters
     is_point_to_point: bool = False  # True for stages, False for circuits
     source_file: str = ""  # Original file path
+    sector_boundaries: List[float] = field(default_factory=list)  # Distances from S/F (empty = not set)
+    corners: Optional[list] = None  # Precomputed corners (None = not detected yet)
 
 
 def parse_kml_coordinates(coord_text: str) -> List[Tuple[float, float]]:
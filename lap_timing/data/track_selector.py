@@ -1,15 +1,19 @@
 """
 Track selection based on GPS location.
 
-Automatically detects nearby tracks from SQLite databases with spatial indexing
-and selects the appropriate one based on current GPS position.
+Automatically detects nearby tracks from SQLite databases and selects the
+appropriate one based on current GPS position. The S/F points of all tracks
+are read once into an in-memory index so repeated searches do no disk I/O.
 """
 
 import logging
 import os
 import sqlite3
+import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from config import (
     TRACK_SEARCH_RADIUS_KM,
@@ -18,107 +22,13 @@ from config import (
     LAP_TIMING_CUSTOM_TRACKS_DIR,
     LAP_TIMING_RACELOGIC_TRACKS_DIR,
 )
-from lap_timing.data.track_loader import Track, load_track_from_kmz
-from lap_timing.utils.geometry import haversine_distance
+from lap_timing.data.track_cache import load_track_cached
+from lap_timing.data.track_loader import Track
+from utils import geometry_kernels as gk
 
 logger = logging.getLogger('openTPT.lap_timing.track_selector')
 
 
-# =============================================================================
-# Geohash Implementation (for spatial queries)
-# =============================================================================
-
-GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
-
-
-def encode_geohash(lat: float, lon: float, precision: int = 6) -> str:
-    """Encode latitude/longitude to geohash string."""
-    lat_range = (-90.0, 90.0)
-    lon_range = (-180.0, 180.0)
-
-    geohash = []
-    bits = [16, 8, 4, 2, 1]
-    bit = 0
-    ch = 0
-    is_lon = True
-
-    while len(geohash) < precision:
-        if is_lon:
-            mid = (lon_range[0] + lon_range[1]) / 2
-            if lon >= mid:
-                ch |= bits[bit]
-                lon_range = (mid, lon_range[1])
-            else:
-                lon_range = (lon_range[0], mid)
-        else:
-            mid = (lat_range[0] + lat_range[1]) / 2
-            if lat >= mid:
-                ch |= bits[bit]
-                lat_range = (mid, lat_range[1])
-            else:
-                lat_range = (lat_range[0], mid)
-
-        is_lon = not is_lon
-
-        if bit < 4:
-            bit += 1
-        else:
-            geohash.append(GEOHASH_BASE32[ch])
-            bit = 0
-            ch = 0
-
-    return ''.join(geohash)
-
-
-def decode_geohash_bounds(geohash: str) -> tuple:
-    """Decode geohash to bounding box (min_lat, max_lat, min_lon, max_lon)."""
-    lat_range = [-90.0, 90.0]
-    lon_range = [-180.0, 180.0]
-
-    is_lon = True
-
-    for char in geohash.lower():
-        idx = GEOHASH_BASE32.index(char)
-        for bit in [16, 8, 4, 2, 1]:
-            if is_lon:
-                mid = (lon_range[0] + lon_range[1]) / 2
-                if idx & bit:
-                    lon_range[0] = mid
-                else:
-                    lon_range[1] = mid
-            else:
-                mid = (lat_range[0] + lat_range[1]) / 2
-                if idx & bit:
-                    lat_range[0] = mid
-                else:
-                    lat_range[1] = mid
-            is_lon = not is_lon
-
-    return (lat_range[0], lat_range[1], lon_range[0], lon_range[1])
-
-
-def geohash_neighbors(geohash: str) -> List[str]:
-    """Get the 8 neighboring geohash cells (plus self = 9 cells)."""
-    min_lat, max_lat, min_lon, max_lon = decode_geohash_bounds(geohash)
-
-    lat_delta = (max_lat - min_lat) / 2
-    lon_delta = (max_lon - min_lon) / 2
-    center_lat = (min_lat + max_lat) / 2
-    center_lon = (min_lon + max_lon) / 2
-
-    precision = len(geohash)
-    neighbors = []
-
-    for dlat in [-1, 0, 1]:
-        for dlon in [-1, 0, 1]:
-            nlat = center_lat + dlat * lat_delta * 2
-            nlon = center_lon + dlon * lon_delta * 2
-            if -90 <= nlat <= 90 and -180 <= nlon <= 180:
-                neighbors.append(encode_geohash(nlat, nlon, precision))
-
-    return list(set(neighbors))
-
-
 # =============================================================================
 # Track Info
 # =============================================================================
@@ -167,6 +77,12 @@ class TrackSelector:
         # Verify databases exist
         self._check_databases()
 
+        # In-memory S/F point index, built on first search:
+        # (track rows, S/F latitudes, S/F longitudes)
+        self._index_lock = threading.Lock()
+        self._index: Optional[Tuple[List[tuple], np.ndarray, np.ndarray]] = None
+        self._kmz_paths: Dict[tuple, Optional[str]] = {}
+
     def _check_databases(self):
         """Check which databases are available."""
         self.has_custom_db = os.path.exists(self.tracks_db_path)
@@ -178,80 +94,54 @@ class TrackSelector:
                 self.tracks_db_path, self.racelogic_db_path
             )
 
-    def _query_database(
-        self,
-        db_path: str,
-        lat: float,
-        lon: float,
-        radius_km: float,
-        source: str
-    ) -> List[TrackInfo]:
-        """
-        Query a single database for nearby tracks.
-
-        Uses geohash prefix filtering followed by haversine distance calculation.
-        """
-        if not os.path.exists(db_path):
-            return []
-
-        radius_m = radius_km * 1000
-
-        # Choose geohash precision based on search radius
-        if radius_km >= 30:
-            precision = 4
-            geohash_col = 'geohash_4'
-        elif radius_km >= 5:
-            precision = 5
-            geohash_col = 'geohash_5'
-        else:
-            precision = 6
-            geohash_col = 'geohash_6'
-
-        # Get geohash of search center and neighbors
-        center_geohash = encode_geohash(lat, lon, precision)
-        search_hashes = geohash_neighbors(center_geohash)
-
-        results = []
-
+    def _load_database(self, db_path: str, source: str) -> List[tuple]:
+        """Read the S/F point and metadata of every track in a database."""
         try:
             conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-
-            placeholders = ','.join(['?' for _ in search_hashes])
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT name, country, start_lat, start_lon, length_meters, source_file
-                FROM tracks
-                WHERE {geohash_col} IN ({placeholders})
-            """, search_hashes)
-
-            for row in cursor.fetchall():
-                dist = haversine_distance(lat, lon, row['start_lat'], row['start_lon'])
-                if dist <= radius_m:
-                    # Resolve KMZ path
-                    kmz_path = self._find_kmz_file(
-                        row['name'],
-                        row['country'],
-                        source
-                    )
-
-                    results.append(TrackInfo(
-                        name=row['name'],
-                        country=row['country'],
-                        kmz_path=kmz_path,
-                        distance_to_sf=dist,
-                        sf_lat=row['start_lat'],
-                        sf_lon=row['start_lon'],
-                        length=row['length_meters'],
-                        source=source
-                    ))
+            try:
+                rows = conn.execute(
+                    "SELECT name, country, start_lat, start_lon, length_meters FROM tracks"
+                ).fetchall()
+            finally:
+                conn.close()
+        except (sqlite3.Error, IOError, OSError) as e:
+            logger.warning("Error loading %s: %s", db_path, e)
+            return []
+        return [row + (source,) for row in rows]
 
-            conn.close()
+    def _ensure_index(self) -> Tuple[List[tuple], np.ndarray, np.ndarray]:
+        """
+        The in-memory S/F point index, built on first use.
 
-        except (sqlite3.Error, IOError, OSError) as e:
-            logger.warning("Error querying %s: %s", db_path, e)
+        Both databases are read once; nearby-track searches are then a
+        vectorised distance check with no disk access.
 
-        return results
+        Returns:
+            (track rows, S/F latitudes, S/F longitudes)
+        """
+        index = self._index
+        if index is not None:
+            return index
+        with self._index_lock:
+            if self._index is not None:
+                return self._index
+            rows = []
+            if self.has_custom_db:
+                rows.extend(self._load_database(self.tracks_db_path, 'custom'))
+            if self.has_racelogic_db:
+                rows.extend(self._load_database(self.racelogic_db_path, 'racelogic'))
+
+            coords = np.array([(r[2], r[3]) for r in rows], dtype=np.float64).reshape(-1, 2)
+            self._index = (rows, coords[:, 0].copy(), coords[:, 1].copy())
+            logger.debug("Track index loaded: %d tracks", len(rows))
+            return self._index
+
+    def _kmz_path(self, name: str, country: Optional[str], source: str) -> Optional[str]:
+        """Resolve a track's KMZ file, probing the filesystem once per track."""
+        key = (name, country, source)
+        if key not in self._kmz_paths:
+            self._kmz_paths[key] = self._find_kmz_file(name, country, source)
+        return self._kmz_paths[key]
 
     def _find_kmz_file(
         self,
@@ -287,7 +177,8 @@ class TrackSelector:
         """
         Find tracks within specified distance of GPS position.
 
-        Searches both custom and RaceLogic databases.
+        Searches both custom and RaceLogic databases via the in-memory
+        S/F point index (loaded on first call).
 
         Args:
             lat, lon: GPS coordinates (decimal degrees)
@@ -299,21 +190,25 @@ class TrackSelector:
         if max_distance_km is None:
             max_distance_km = TRACK_SEARCH_RADIUS_KM
 
-        nearby = []
+        rows, sf_lats, sf_lons = self._ensure_index()
+        if not rows:
+            return []
 
-        # Query custom tracks database
-        if self.has_custom_db:
-            custom_tracks = self._query_database(
-                self.tracks_db_path, lat, lon, max_distance_km, 'custom'
-            )
-            nearby.extend(custom_tracks)
+        distances = gk.haversine(lat, lon, sf_lats, sf_lons)
 
-        # Query RaceLogic database
-        if self.has_racelogic_db:
-            racelogic_tracks = self._query_database(
-                self.racelogic_db_path, lat, lon, max_distance_km, 'racelogic'
-            )
-            nearby.extend(racelogic_tracks)
+        nearby = []
+        for i in np.flatnonzero(distances <= max_distance_km * 1000):
+            name, country, sf_lat, sf_lon, length, source = rows[i]
+            nearby.append(TrackInfo(
+                name=name,
+                country=country,
+                kmz_path=self._kmz_path(name, country, source),
+                distance_to_sf=float(distances[i]),
+                sf_lat=sf_lat,
+                sf_lon=sf_lon,
+                length=length,
+                source=source
+            ))
 
         # Sort by distance (nearest first)
         nearby.sort(key=lambda t: t.distance_to_sf)
@@ -356,7 +251,7 @@ class TrackSelector:
             )
 
             if track_info.kmz_path:
-                return load_track_from_kmz(track_info.kmz_path)
+                return load_track_cached(track_info.kmz_path)
             else:
                 logger.warning("KMZ file not found for %s", track_info.name)
                 return None
@@ -392,7 +287,7 @@ class TrackSelector:
                     logger.info("Selected: %s", selected.name)
 
                     if selected.kmz_path:
-                        return load_track_from_kmz(selected.kmz_path)
+                        return load_track_cached(selected.kmz_path)
                     else:
                         logger.warning("KMZ file not found for %s", selected.name)
                         return None
@@ -438,11 +333,11 @@ class TrackSelector:
                 row = cursor.fetchone()
 
                 if row:
-                    kmz_path = self._find_kmz_file(row['name'], row['country'], source)
+                    kmz_path = self._kmz_path(row['name'], row['country'], source)
                     if kmz_path:
                         logger.info("Loading: %s", row['name'])
                         conn.close()
-                        return load_track_from_kmz(kmz_path)
+                        return load_track_cached(kmz_path)
 
                 # Try partial match
                 cursor.execute(
@@ -453,14 +348,14 @@ class TrackSelector:
                 conn.close()
 
                 if len(matches) == 1:
-                    kmz_path = self._find_kmz_file(
+                    kmz_path = self._kmz_path(
                         matches[0]['name'],
                         matches[0]['country'],
                         source
                     )
                     if kmz_path:
                         logger.info("Loading: %s", matches[0]['name'])
-                        return load_track_from_kmz(kmz_path)
+                        return load_track_cached(kmz_path)
                 elif len(matches) > 1:
                     logger.info("Multiple tracks match '%s':", track_name)
                     for m in matches[:10]:
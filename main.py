@@ -39,6 +39,7 @@ logger.info("Using optimised TPMS handler with bounded queues")
 
 # Import telemetry recorder
 from utils.telemetry_recorder import TelemetryRecorder
+from utils.telemetry_assembler import TelemetryRowAssembler
 
 # Import persistent settings manager
 from utils.settings import get_settings
@@ -130,6 +131,13 @@ class OpenTPT(
         self.cached_ui_units = None  # Track units when UI surface was cached
         self.cached_ui_thresholds = None  # Track thresholds when UI surface was cached
 
+        # Telemetry page compositor (built on first render) and in-place screen updates
+        self._telemetry_compositor = None
+        self._telemetry_style = None  # Units and thresholds the page was drawn with
+        self._screen_retained = False  # Screen still holds last frame's telemetry page
+        self._retained_brightness = None
+        self._fps_rect = None
+
         # Performance monitoring
         self.perf_monitor = get_global_monitor() if PERFORMANCE_MONITORING else None
         self.perf_summary_interval = 10.0  # Print summary every 10 seconds
@@ -158,6 +166,7 @@ class OpenTPT(
 
         # Telemetry recording
         self.recorder = TelemetryRecorder()
+        self.telemetry_assembler = TelemetryRowAssembler()
         self.last_recording_time = 0.0
         self.recording_interval = 1.0 / RECORDING_RATE_HZ  # 10 Hz = 0.1s interval
 
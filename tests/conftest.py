@@ -13,6 +13,23 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False,
+        help="Run wall-clock timing checks (marked benchmark)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing checks by default: shared CI runners make them flaky."""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="timing check, run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def temp_settings_file():
     """Create a temporary settings file for testing SettingsManager."""
@@ -0,0 +1,212 @@
+"""Tests for copilot/audio_engine.py - in-process pacenote audio."""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from copilot.audio import AudioPlayer
+from copilot.audio_engine import (
+    ENGINE_SAMPLE_RATE,
+    AudioEngine,
+    NullSink,
+    decode_wav,
+    intercom_effect,
+)
+
+RATE = ENGINE_SAMPLE_RATE
+
+
+def _wav_bytes(pcm, rate=RATE, channels=1):
+    """16-bit WAV of float PCM (interleaved if channels > 1)."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.asarray(pcm) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def _tone(freq, seconds, rate=RATE):
+    t = np.arange(int(seconds * rate)) / rate
+    return 0.5 * np.sin(2 * np.pi * freq * t)
+
+
+def _written(sink):
+    return np.concatenate(sink.blocks) if sink.blocks else np.zeros(0, dtype=np.int16)
+
+
+@pytest.fixture
+def engine_sink():
+    sink = NullSink(keep=True)
+    engine = AudioEngine(sink)
+    engine.start()
+    yield engine, sink
+    engine.stop()
+
+
+class TestDecodeWav:
+    """Tests for decode_wav."""
+
+    @pytest.mark.unit
+    def test_stereo_downmixed_and_resampled(self):
+        """Channels are averaged and the rate converted to the engine rate."""
+        left, right = _tone(440, 0.5, 44100), np.zeros(int(0.5 * 44100))
+        stereo = np.column_stack([left, right]).ravel()
+
+        pcm = decode_wav(_wav_bytes(stereo, 44100, channels=2))
+
+        assert pcm.dtype == np.float32
+        assert len(pcm) == int(0.5 * RATE)
+        assert np.abs(pcm).max() == pytest.approx(0.25, abs=0.01)
+
+    @pytest.mark.unit
+    def test_not_a_wav(self):
+        """Other data raises wave.Error."""
+        with pytest.raises(wave.Error):
+            decode_wav(b"not a wav file at all")
+
+
+class TestIntercomEffect:
+    """Tests for intercom_effect."""
+
+    @pytest.mark.unit
+    def test_band_limits_speech(self):
+        """Tones inside the intercom band pass, tones outside are cut."""
+        passed = np.abs(intercom_effect(_tone(1000, 0.5))).max()
+        low = np.abs(intercom_effect(_tone(80, 0.5))).max()
+        high = np.abs(intercom_effect(_tone(9000, 0.5))).max()
+
+        assert passed > 4 * low
+        assert passed > 4 * high
+        assert passed <= 1.0
+
+    @pytest.mark.unit
+    def test_empty(self):
+        assert len(intercom_effect(np.zeros(0, dtype=np.float32))) == 0
+
+
+class TestAudioEngine:
+    """Tests for AudioEngine playback and preemption."""
+
+    @pytest.mark.unit
+    def test_plays_clip_to_sink(self, engine_sink):
+        """Every sample reaches the sink as int16, and the clip completes."""
+        engine, sink = engine_sink
+        clip = _tone(500, 0.2)
+
+        playback = engine.play(clip)
+
+        assert playback.wait(timeout=2)
+        assert not playback.preempted
+        assert np.allclose(_written(sink) / 32767, clip, atol=1e-4)
+        assert engine.idle
+
+    @pytest.mark.unit
+    def test_queued_clips_play_in_priority_order(self):
+        """Waiting clips play most urgent first, then in arrival order."""
+        sink = NullSink(realtime=True, keep=True)
+        engine = AudioEngine(sink)
+        engine.start()
+        try:
+            first = engine.play(np.full(RATE // 10, 0.1), priority=1)
+            later = [engine.play(np.full(100, level), priority=priority)
+                     for level, priority in ((0.2, 5), (0.3, 2), (0.4, 5))]
+            for playback in [first] + later:
+                assert playback.wait(timeout=2)
+        finally:
+            engine.stop()
+
+        levels = np.unique(_written(sink), return_index=True)
+        order = [level for _, level in sorted(zip(levels[1], np.round(levels[0] / 32767, 1)))]
+        assert order == [0.1, 0.3, 0.2, 0.4]
+        assert not any(playback.preempted for playback in [first] + later)
+
+    @pytest.mark.unit
+    def test_urgent_clip_cuts_off_current(self):
+        """A more urgent clip stops the playing one after a short fade."""
+        sink = NullSink(realtime=True)
+        engine = AudioEngine(sink)
+        engine.start()
+        try:
+            long_clip = engine.play(_tone(300, 2.0), priority=5)
+            while sink.first_sample_at is None:
+                pass
+            urgent = engine.play(_tone(600, 0.1), priority=1)
+
+            assert long_clip.wait(timeout=1)
+            assert long_clip.preempted
+            assert urgent.wait(timeout=1)
+            assert not urgent.preempted
+            assert sink.samples_written < RATE
+        finally:
+            engine.stop()
+
+    @pytest.mark.unit
+    def test_preempt(self):
+        """preempt() cuts off only less urgent clips."""
+        sink = NullSink(realtime=True)
+        engine = AudioEngine(sink)
+        engine.start()
+        try:
+            clip = engine.play(_tone(300, 2.0), priority=3)
+            while sink.first_sample_at is None:
+                pass
+
+            assert not engine.preempt(3)
+            assert engine.preempt(2)
+            assert clip.wait(timeout=1) and clip.preempted
+        finally:
+            engine.stop()
+
+    @pytest.mark.unit
+    def test_stop_releases_waiting_clips(self):
+        """Clips not yet played are dropped on stop()."""
+        engine = AudioEngine(NullSink(realtime=True))
+        engine.start()
+        clips = [engine.play(_tone(300, 1.0)) for _ in range(2)]
+        engine.stop()
+
+        assert all(clip.done and clip.preempted for clip in clips)
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    """A sample pack with one take for a few folders, each a distinct length."""
+    for length, folder in enumerate(["corner_4_left", "detail_into", "corner_3_right",
+                                     "number_200"], start=1):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "1.wav").write_bytes(_wav_bytes(np.full(length * 100, 0.1)))
+    return tmp_path
+
+
+class TestAudioPlayerEngine:
+    """Tests for AudioPlayer speaking through an AudioEngine."""
+
+    @pytest.mark.unit
+    def test_samples_chained_in_memory(self, sample_dir):
+        """Notes are concatenated from decoded samples, with "into" between."""
+        sink = NullSink()
+        player = AudioPlayer(sample_dir=sample_dir, enable_mpris=False, sink=sink)
+        player.start()
+        try:
+            player._speak_chain(["two hundred left four", "right three"], priority=3)
+        finally:
+            player.stop()
+
+        # number_200, corner_4_left, detail_into, corner_3_right
+        assert sink.samples_written == 400 + 100 + 200 + 300
+
+    @pytest.mark.unit
+    def test_volume_applied(self, sample_dir):
+        sink = NullSink(keep=True)
+        player = AudioPlayer(sample_dir=sample_dir, enable_mpris=False, sink=sink, volume=0.5)
+        player.start()
+        try:
+            player._speak_chain(["left four"])
+        finally:
+            player.stop()
+
+        assert np.abs(_written(sink)).max() == pytest.approx(0.05 * 32767, rel=0.01)
@@ -0,0 +1,262 @@
+"""Tests for gui/camera_frames.py - zero-copy camera frame handover."""
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gui.camera_frames import (  # noqa: E402
+    CV2_AVAILABLE,
+    FrameConverter,
+    FramePool,
+    MjpegDecoder,
+    RecordedMjpegCamera,
+    SyntheticCamera,
+    mjpeg_decode_scale,
+)
+
+
+def _frame(width=8, height=6):
+    """BGR frame with a distinct value in every pixel and channel."""
+    return np.arange(height * width * 3, dtype=np.uint8).reshape(height, width, 3)
+
+
+def _surface_rgb(surface):
+    """Surface pixels as a (height, width, 3) RGB array."""
+    return pygame.surfarray.array3d(surface).swapaxes(0, 1)
+
+
+class TestFramePool:
+    """Tests for FramePool."""
+
+    @pytest.mark.unit
+    def test_surface_shares_buffer_memory(self):
+        pool = FramePool(8, 6)
+        buffer = pool.write_buffer()
+        buffer[:] = _frame()
+        pool.publish()
+        assert pool.acquire()
+
+        buffer[2, 3] = (10, 20, 30)  # Written after publishing: no copy was taken
+
+        expected = (30, 20, 10) if pool.pixel_format == "BGR" else (10, 20, 30)
+        assert tuple(pool.surface.get_at((3, 2)))[:3] == expected
+
+    @pytest.mark.unit
+    def test_writer_never_gets_shown_or_pending_buffer(self):
+        pool = FramePool(4, 4)
+        shown = pool.write_buffer()
+        pool.publish()
+        pool.acquire()
+        pending = pool.write_buffer()
+        pool.publish()
+
+        for _ in range(5):
+            buffer = pool.write_buffer()
+            assert buffer is not shown and buffer is not pending
+            assert pool.write_buffer() is buffer  # Same buffer until published
+
+    @pytest.mark.unit
+    def test_acquire_shows_newest_frame_once(self):
+        pool = FramePool(4, 4)
+        assert not pool.acquire()
+        assert pool.surface is None
+
+        for value in (1, 2):
+            pool.write_buffer()[:] = value
+            pool.publish()
+
+        assert pool.acquire()
+        assert tuple(pool.surface.get_at((0, 0)))[:3] == (2, 2, 2)
+        assert not pool.acquire()
+
+    @pytest.mark.unit
+    def test_discard_pending_keeps_shown_frame(self):
+        pool = FramePool(4, 4)
+        pool.write_buffer()[:] = 1
+        pool.publish()
+        pool.acquire()
+        pool.write_buffer()[:] = 2
+        pool.publish()
+
+        pool.discard_pending()
+
+        assert not pool.acquire()
+        assert tuple(pool.surface.get_at((0, 0)))[:3] == (1, 1, 1)
+
+
+class TestFrameConverter:
+    """Tests for FrameConverter (OpenCV if installed, otherwise numpy)."""
+
+    @pytest.mark.unit
+    def test_direct_only_without_transforms(self):
+        assert FrameConverter().is_direct((8, 6), (8, 6))
+        assert not FrameConverter().is_direct((8, 6), (16, 12))
+        assert not FrameConverter(mirror=True).is_direct((8, 6), (8, 6))
+        assert not FrameConverter(pixel_format="RGB").is_direct((8, 6), (8, 6))
+
+    @pytest.mark.unit
+    def test_rotate_mirror_and_rgb(self):
+        frame = _frame()
+        dst = np.zeros((8, 6, 3), dtype=np.uint8)
+
+        FrameConverter(rotate=90, mirror=True, pixel_format="RGB").convert(frame, dst)
+
+        assert np.array_equal(dst, np.rot90(frame, -1)[:, ::-1, ::-1])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rotate", [0, 180, 270])
+    def test_rotate_and_mirror_keep_bgr(self, rotate):
+        frame = _frame()
+        expected = np.rot90(frame, -rotate // 90)[:, ::-1]
+        dst = np.zeros(expected.shape, dtype=np.uint8)
+
+        FrameConverter(rotate=rotate, mirror=True).convert(frame, dst)
+
+        assert np.array_equal(dst, expected)
+
+    @pytest.mark.unit
+    def test_nearest_neighbour_scaling(self):
+        frame = _frame(4, 3)
+        dst = np.zeros((6, 8, 3), dtype=np.uint8)
+
+        FrameConverter().convert(frame, dst)
+
+        assert np.array_equal(dst, frame.repeat(2, axis=0).repeat(2, axis=1))
+
+    @pytest.mark.unit
+    def test_buffers_reused_between_frames(self):
+        converter = FrameConverter(rotate=180, mirror=True)
+        dst = np.zeros((6, 8, 3), dtype=np.uint8)
+        converter.convert(_frame(), dst)
+        scratch = dict(converter._scratch)
+
+        converter.convert(_frame(), dst)
+
+        assert all(converter._scratch[name] is buffer for name, buffer in scratch.items())
+
+
+class TestMjpegDecode:
+    """Tests for reduced-scale MJPEG decoding and recorded frames."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "frame_size, target_size, expected",
+        [
+            ((800, 600), (800, 600), 1),
+            ((1600, 1200), (800, 600), 2),
+            ((1601, 1201), (801, 601), 2),  # Scaled sizes round up
+            ((1920, 1080), (1024, 576), 1),  # Half size would not cover the display
+            ((3200, 2400), (800, 600), 4),
+            ((6400, 4800), (640, 480), 8),
+        ],
+    )
+    def test_auto_scale_covers_target(self, frame_size, target_size, expected):
+        assert mjpeg_decode_scale(frame_size, target_size) == expected
+
+    @pytest.mark.unit
+    def test_fixed_scale_used_as_configured(self):
+        assert mjpeg_decode_scale((1920, 1080), (1024, 576), scale=2) == 2
+        assert mjpeg_decode_scale((800, 600), (800, 600), scale=4) == 4
+
+    @pytest.mark.unit
+    def test_recorded_frames_replayed_as_raw_bytes(self, tmp_path):
+        for name, data in (("0002.jpg", b"second"), ("0001.jpg", b"first"), ("notes.txt", b"x")):
+            (tmp_path / name).write_bytes(data)
+        camera = RecordedMjpegCamera.from_directory(str(tmp_path))
+
+        replayed = []
+        for _ in range(3):
+            assert camera.grab()
+            ret, data = camera.retrieve()
+            assert ret and data.ndim == 1 and data.dtype == np.uint8
+            replayed.append(data.tobytes())
+
+        assert replayed == [b"first", b"second", b"first"]
+
+    @pytest.mark.unit
+    def test_recording_without_frames_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            RecordedMjpegCamera.from_directory(str(tmp_path))
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(CV2_AVAILABLE, reason="OpenCV installed")
+    def test_decoder_needs_opencv(self):
+        with pytest.raises(RuntimeError):
+            MjpegDecoder(2)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("scale", [1, 2, 4])
+    def test_decoded_at_reduced_scale(self, scale):
+        cv2 = pytest.importorskip("cv2")
+        _, jpeg = cv2.imencode(".jpg", SyntheticCamera(320, 240).retrieve()[1])
+
+        frame = MjpegDecoder(scale).decode(jpeg)
+
+        assert frame.shape == (240 // scale, 320 // scale, 3)
+
+
+class TestCameraCapture:
+    """Tests for the Camera capture path with a synthetic frame source."""
+
+    @pytest.fixture
+    def camera(self, monkeypatch):
+        pygame.init()
+        import gui.camera
+        from gui.camera import Camera
+
+        monkeypatch.setattr(gui.camera, "CV2_AVAILABLE", True)  # Frames come from SyntheticCamera
+
+        screen = pygame.Surface((1024, 600))
+        camera = Camera(screen)
+        camera.camera = SyntheticCamera(camera.camera_width, camera.camera_height)
+        camera.active = True
+        camera.thread_running = True
+        camera.capture_thread = type("Alive", (), {"is_alive": lambda self: True})()
+        camera.camera_settings[camera.current_camera] = {'rotate': 0, 'mirror': False}
+        yield camera
+        camera.thread_running = False
+        camera.capture_thread = None
+
+    @pytest.mark.unit
+    def test_frame_decoded_into_pool_and_blitted(self, camera):
+        pool = camera._frame_pool_for(camera.camera_width, camera.camera_height)
+        converter = FrameConverter(pixel_format=pool.pixel_format)
+        stats = camera._new_capture_stats()
+
+        assert camera._capture_frame(pool, converter, stats)
+        assert camera.update()
+        assert camera.render()
+
+        if pool.pixel_format == "BGR":
+            assert stats['direct'] == 1  # Decoded straight into the pool buffer
+        frame = camera.camera.retrieve()[1]
+        x, y = camera.frame["x_offset"], camera.frame["y_offset"]
+        shown = _surface_rgb(camera.surface)[y:y + pool.height, x:x + pool.width]
+        assert np.array_equal(shown, frame[..., ::-1])
+
+    @pytest.mark.unit
+    def test_raw_mjpeg_decoded_into_pool(self, camera):
+        cv2 = pytest.importorskip("cv2")
+        width, height = camera.camera_width, camera.camera_height
+        frame = SyntheticCamera(width * 2, height * 2).retrieve()[1]
+        camera.camera = RecordedMjpegCamera([cv2.imencode(".jpg", frame)[1].tobytes()])
+        pool = camera._frame_pool_for(width, height)
+        stats = camera._new_capture_stats()
+
+        assert camera._capture_frame(pool, FrameConverter(pixel_format=pool.pixel_format), stats, MjpegDecoder(2))
+        assert camera.update()
+
+        assert stats['published'] == 1 and stats['decode_fail'] == 0
+        assert camera.frame["surface"].get_size() == (width, height)
+
+    @pytest.mark.unit
+    def test_update_without_new_frame_keeps_frame(self, camera):
+        pool = camera._frame_pool_for(camera.camera_width, camera.camera_height)
+        converter = FrameConverter(pixel_format=pool.pixel_format)
+        camera._capture_frame(pool, converter, camera._new_capture_stats())
+        camera.update()
+        shown = camera.frame
+
+        assert not camera.update()
+        assert camera.frame is shown
@@ -0,0 +1,165 @@
+"""Tests for copilot/compact_network.py - array-backed road networks."""
+
+import numpy as np
+import pytest
+
+from copilot.compact_network import (
+    CompactRoadNetwork,
+    as_compact_network,
+    merge_compact_networks,
+)
+from copilot.map_loader import Junction, Node, RoadNetwork, Way, merge_road_networks
+from copilot.path_projector import PathProjector
+
+LAT0, LON0 = 52.0, -1.0
+DEG_PER_KM = 1 / 111.0
+
+
+def _road_network(ways, **tags):
+    """Network from {way_id: [(node_id, north_km), ...]} roads running north."""
+    network = RoadNetwork()
+    for way_id, nodes in ways.items():
+        for node_id, north_km in nodes:
+            network.nodes[node_id] = Node(node_id, LAT0 + north_km * DEG_PER_KM, LON0)
+            network.node_to_ways.setdefault(node_id, []).append(way_id)
+        network.ways[way_id] = Way(way_id, [n for n, _ in nodes], **tags)
+    return network
+
+
+@pytest.fixture
+def network():
+    """Two roads meeting at node 2, one a named bridge."""
+    network = _road_network({
+        1: [(1, 0.0), (2, 1.0), (3, 2.0)],
+        2: [(4, 0.0), (2, 1.0)],
+    }, highway_type="residential")
+    network.ways[1].name = "High Street"
+    network.ways[1].bridge = True
+    network.ways[1].width = 2.5
+    network.junctions[2] = Junction(2, LAT0 + DEG_PER_KM, LON0, [1, 2])
+    return network
+
+
+class TestCompactRoadNetwork:
+    """Tests for CompactRoadNetwork.from_network and its accessors."""
+
+    @pytest.mark.unit
+    def test_same_roads_as_network(self, network):
+        """Geometry, node order and node-to-way index match the dict form."""
+        compact = CompactRoadNetwork.from_network(network)
+
+        assert compact.way_count == 2 and compact.node_count == 4
+        for way_id, way in network.ways.items():
+            w = compact.way_index[way_id]
+            assert compact.get_way_geometry(way_id) == network.get_way_geometry(way_id)
+            assert compact.way_nodes(w).tolist() == way.nodes
+        for node_id, way_ids in network.node_to_ways.items():
+            assert compact.ways_at_node(node_id) == way_ids
+        assert compact.node_location(3) == (network.nodes[3].lat, network.nodes[3].lon)
+        assert compact.junctions is network.junctions
+
+    @pytest.mark.unit
+    def test_way_tags(self, network):
+        """Tags come back decoded, unnamed ways have the empty string."""
+        compact = CompactRoadNetwork.from_network(network)
+        bridge, plain = compact.way_index[1], compact.way_index[2]
+
+        assert compact.way_tag(bridge, "name") == "High Street"
+        assert compact.way_tag(plain, "name") == ""
+        assert compact.way_tag(bridge, "highway_type") == "residential"
+        assert compact.way_tag(bridge, "bridge") is True
+        assert compact.way_tag(bridge, "width") == 2.5
+
+    @pytest.mark.unit
+    def test_geometry_is_a_view(self, network):
+        """Way geometry shares memory with the network arrays."""
+        compact = CompactRoadNetwork.from_network(network)
+        lats, lons = compact.way_geometry(compact.way_index[2])
+
+        assert np.shares_memory(lats, compact.lats)
+        assert np.shares_memory(lons, compact.lons)
+        assert lats.tolist() == [network.nodes[4].lat, network.nodes[2].lat]
+
+    @pytest.mark.unit
+    def test_node_lookups(self, network):
+        """Node index within a way, and missing nodes and ways."""
+        compact = CompactRoadNetwork.from_network(network)
+
+        assert compact.node_index(compact.way_index[1], 2) == 1
+        assert compact.node_index(compact.way_index[2], 2) == 1
+        assert compact.node_index(compact.way_index[2], 3) == -1
+        assert compact.ways_at_node(99) == []
+        assert compact.node_location(99) is None
+        assert compact.get_way_geometry(99) == []
+
+    @pytest.mark.unit
+    def test_way_nodes_without_coordinates_left_out(self, network):
+        """As get_way_geometry(), nodes missing from network.nodes are skipped."""
+        del network.nodes[3]
+        compact = CompactRoadNetwork.from_network(network)
+
+        assert compact.way_nodes(compact.way_index[1]).tolist() == [1, 2]
+        assert compact.get_way_geometry(1) == network.get_way_geometry(1)
+
+    @pytest.mark.unit
+    def test_empty_network(self):
+        """An empty network projects no path."""
+        compact = as_compact_network(RoadNetwork())
+
+        assert compact.way_count == 0 and compact.node_count == 0
+        assert CompactRoadNetwork.empty().way_count == 0
+        assert PathProjector(compact).project_path(LAT0, LON0, 0.0) is None
+
+    @pytest.mark.unit
+    def test_as_compact_network_keeps_compact(self, network):
+        """A network already in compact form is used as is."""
+        compact = CompactRoadNetwork.from_network(network)
+        assert as_compact_network(compact) is compact
+        assert PathProjector(compact).network is compact
+
+
+class TestMergeCompactNetworks:
+    """Tests for merge_compact_networks."""
+
+    @pytest.mark.unit
+    def test_matches_dict_merge(self):
+        """Same ways, nodes and features as merge_road_networks."""
+        base = _road_network({
+            1: [(1, 0.0), (2, 1.0)], 2: [(2, 1.0), (3, 5.0)], 3: [(3, 5.0), (5, 5.5)],
+        })
+        base.junctions[1] = Junction(1, LAT0, LON0, [1])
+        base.junctions[3] = Junction(3, LAT0 + 5 * DEG_PER_KM, LON0, [2, 3])
+        update = _road_network({3: [(3, 5.0), (5, 5.5)], 4: [(5, 5.5), (6, 6.0)]})
+
+        expected = merge_road_networks(base, update, LAT0 + 6 * DEG_PER_KM, LON0, 2000)
+        merged = merge_compact_networks(
+            CompactRoadNetwork.from_network(base),
+            CompactRoadNetwork.from_network(update),
+            LAT0 + 6 * DEG_PER_KM, LON0, 2000,
+        )
+
+        assert merged.way_ids.tolist() == list(expected.ways)
+        for way_id in expected.ways:
+            assert merged.get_way_geometry(way_id) == expected.get_way_geometry(way_id)
+        for node_id, way_ids in expected.node_to_ways.items():
+            assert merged.ways_at_node(node_id) == way_ids
+        assert set(merged.junctions) == set(expected.junctions) == {3}
+
+    @pytest.mark.unit
+    def test_tags_kept_across_string_tables(self):
+        """Update tags are re-coded into the merged string table."""
+        base = _road_network({1: [(1, 0.0), (2, 1.0)]}, highway_type="primary")
+        update = _road_network({2: [(2, 1.0), (3, 2.0)]}, name="Mill Lane", surface="gravel")
+
+        merged = merge_compact_networks(
+            CompactRoadNetwork.from_network(base),
+            CompactRoadNetwork.from_network(update),
+            LAT0, LON0, 3000,
+        )
+
+        first, second = merged.way_index[1], merged.way_index[2]
+        assert merged.way_tag(first, "highway_type") == "primary"
+        assert merged.way_tag(first, "name") == ""
+        assert merged.way_tag(second, "name") == "Mill Lane"
+        assert merged.way_tag(second, "surface") == "gravel"
+        assert merged.way_tag(second, "highway_type") == ""
@@ -0,0 +1,96 @@
+"""Tests for gui/compositor.py - retained-mode telemetry page layer."""
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gui.compositor import Compositor, merge_rects  # noqa: E402
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+@pytest.fixture
+def page():
+    """A base widget with a smaller widget on top of one corner, recording draws."""
+    compositor = Compositor((100, 100))
+    draws = []
+
+    def drawer(name, rect):
+        def draw(colour):
+            draws.append(name)
+            compositor.layer.fill(colour, rect)
+        return draw
+
+    compositor.add("base", (0, 0, 50, 50), drawer("base", pygame.Rect(0, 0, 50, 50)))
+    compositor.add("top", (40, 40, 20, 20), drawer("top", pygame.Rect(40, 40, 20, 20)))
+    compositor.add("apart", (80, 80, 10, 10), drawer("apart", pygame.Rect(80, 80, 10, 10)))
+    compositor.update({"base": (RED,), "top": (BLUE,), "apart": (RED,)})
+    del draws[:]
+    return compositor, draws
+
+
+class TestCompositor:
+    """Tests for Compositor.update."""
+
+    @pytest.mark.unit
+    def test_first_update_draws_everything(self):
+        compositor = Compositor((100, 100))
+        compositor.add("widget", (10, 10, 5, 5), lambda: compositor.layer.fill(RED, (10, 10, 5, 5)))
+
+        assert compositor.update({}) == [pygame.Rect(0, 0, 100, 100)]
+        assert compositor.layer.get_at((12, 12))[:3] == RED
+
+    @pytest.mark.unit
+    def test_unchanged_inputs_draw_nothing(self, page):
+        compositor, draws = page
+
+        assert compositor.update({"base": (RED,), "top": (BLUE,), "apart": (RED,)}) == []
+        assert draws == []
+
+    @pytest.mark.unit
+    def test_changed_widget_redrawn_under_widgets_above(self, page):
+        """Widgets overlapping a changed one are redrawn in order, clipped to its rect."""
+        compositor, draws = page
+
+        dirty = compositor.update({"base": (BLUE,), "top": (BLUE,), "apart": (RED,)})
+
+        assert dirty == [pygame.Rect(0, 0, 50, 50)]
+        assert draws == ["base", "top"]
+        assert compositor.layer.get_at((10, 10))[:3] == BLUE
+        assert compositor.layer.get_at((45, 45))[:3] == BLUE  # Top still above base
+        assert compositor.layer.get_at((85, 85))[:3] == RED
+
+    @pytest.mark.unit
+    def test_objects_compared_by_identity(self):
+        """A new array is a change even if equal; the same array is not."""
+        compositor = Compositor((10, 10))
+        compositor.add("thermal", (0, 0, 10, 10), lambda *inputs: None)
+        data = np.zeros((24, 32))
+        compositor.update({"thermal": (data, True)})
+
+        assert compositor.update({"thermal": (data, True)}) == []
+        assert compositor.update({"thermal": (data.copy(), True)}) != []
+        assert compositor.update({"thermal": (data, (1.0, "kPa"))}) != []
+
+    @pytest.mark.unit
+    def test_invalidate(self, page):
+        compositor, draws = page
+        compositor.invalidate()
+
+        compositor.update({"base": (RED,), "top": (BLUE,), "apart": (RED,)})
+
+        assert draws == ["base", "top", "apart"]
+
+
+class TestMergeRects:
+    """Tests for merge_rects."""
+
+    @pytest.mark.unit
+    def test_chain_of_overlaps_merged(self):
+        """A rect joining two earlier separate rects merges all three."""
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(20, 0, 10, 10), pygame.Rect(5, 0, 20, 5),
+                 pygame.Rect(50, 50, 5, 5)]
+
+        assert sorted(map(tuple, merge_rects(rects))) == [(0, 0, 30, 10), (50, 50, 5, 5)]
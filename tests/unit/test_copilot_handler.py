@@ -0,0 +1,141 @@
+"""Tests for hardware/copilot_handler.py - background road prefetch."""
+
+import threading
+
+import pytest
+
+import hardware.copilot_handler as copilot_handler
+from config import COPILOT_PREFETCH_AHEAD_M, COPILOT_PREFETCH_RETRY_S, COPILOT_ROAD_FETCH_RADIUS_M
+from copilot.compact_network import CompactRoadNetwork
+from copilot.geometry import haversine_distance, point_along_bearing
+from copilot.gps import Position
+from copilot.map_loader import Node, RoadNetwork, Way
+from copilot.path_projector import PathProjector
+from hardware.copilot_handler import CoPilotHandler
+
+LAT0, LON0 = 52.0, -1.0
+
+
+def _road(way_id, start_north_m, length_m=3000):
+    """Compact network with one road running north from start_north_m."""
+    network = RoadNetwork()
+    node_ids = []
+    for i, north in enumerate(range(start_north_m, start_north_m + length_m + 1, 100)):
+        node_id = way_id * 1000 + i
+        lat, lon = point_along_bearing(LAT0, LON0, 0.0, north)
+        network.nodes[node_id] = Node(node_id, lat, lon)
+        network.node_to_ways[node_id] = [way_id]
+        node_ids.append(node_id)
+    network.ways[way_id] = Way(way_id, node_ids, highway_type="secondary")
+    return CompactRoadNetwork.from_network(network)
+
+
+class _StubLoader:
+    """Map loader whose loads wait for release() and then return, or raise, a result."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+        self.released = threading.Event()
+
+    def release(self):
+        self.released.set()
+
+    def load_around_compact(self, lat, lon, radius_m):
+        self.calls.append((lat, lon))
+        self.released.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """Handler with roads loaded around LAT0, LON0 and no audio or GPS."""
+    handler = CoPilotHandler(None, map_path=tmp_path, audio_enabled=False)
+    handler._network = _road(1, 0)
+    handler._projector = PathProjector(handler._network)
+    handler._fetch_center = (LAT0, LON0)
+    return handler
+
+
+def _position(north_m, heading=0.0):
+    lat, lon = point_along_bearing(LAT0, LON0, 0.0, north_m)
+    return Position(lat=lat, lon=lon, heading=heading, speed=20.0)
+
+
+def _finish_prefetch(handler):
+    handler._map_loader.release()
+    handler._prefetch_thread.join(timeout=5)
+
+
+class TestPredictPosition:
+    """Tests for CoPilotHandler._predict_position."""
+
+    @pytest.mark.unit
+    def test_dead_reckons_along_heading(self, handler):
+        lat, lon = handler._predict_position(_position(0, heading=90.0), 500)
+
+        assert haversine_distance(LAT0, LON0, lat, lon) == pytest.approx(500, abs=1)
+        assert lat == pytest.approx(LAT0, abs=1e-6)
+        assert lon > LON0
+
+    @pytest.mark.unit
+    def test_follows_route_then_last_bearing(self, handler):
+        """300 m north to the waypoint, then 200 m on east past the end of the route."""
+        waypoint = point_along_bearing(LAT0, LON0, 0.0, 300)
+        corner = point_along_bearing(*waypoint, 90.0, 100)
+
+        lat, lon = handler._predict_position(_position(0), 500, [waypoint, corner])
+
+        expected = point_along_bearing(*waypoint, 90.0, 200)
+        assert haversine_distance(lat, lon, *expected) < 1
+
+
+class TestPrefetch:
+    """Tests for the background prefetch and swap in CoPilotHandler."""
+
+    @pytest.mark.unit
+    def test_prefetch_only_near_edge_of_loaded_area(self, handler):
+        handler._map_loader = _StubLoader()
+
+        assert not handler._should_prefetch(_position(0))
+        assert handler._should_prefetch(_position(COPILOT_ROAD_FETCH_RADIUS_M))
+
+    @pytest.mark.unit
+    def test_slow_load_swapped_in_when_done(self, handler):
+        """Roads keep working while the load runs; the merged network is swapped in after."""
+        handler._map_loader = _StubLoader(result=_road(2, 2500))
+        pos = _position(COPILOT_ROAD_FETCH_RADIUS_M)
+        handler._projector.find_current_way(pos.lat, pos.lon, pos.heading)
+        old_network = handler._network
+
+        handler._start_prefetch(pos)
+        assert not handler._should_prefetch(pos)  # One load at a time
+        handler._apply_pending_roads()
+        assert handler._network is old_network
+
+        _finish_prefetch(handler)
+        handler._apply_pending_roads()
+
+        assert set(handler._network.way_index) == {1, 2}
+        assert handler._projector.last_way_id == 1
+        expected_center = point_along_bearing(pos.lat, pos.lon, 0.0, COPILOT_PREFETCH_AHEAD_M)
+        assert haversine_distance(*handler._fetch_center, *expected_center) < 1
+
+    @pytest.mark.unit
+    def test_failed_load_retried_after_backoff(self, handler, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(copilot_handler.time, "monotonic", lambda: clock[0])
+        handler._map_loader = _StubLoader(error=OSError("map database unavailable"))
+        pos = _position(COPILOT_ROAD_FETCH_RADIUS_M)
+
+        handler._start_prefetch(pos)
+        _finish_prefetch(handler)
+        handler._apply_pending_roads()
+
+        assert handler._fetch_center == (LAT0, LON0)
+        assert not handler._should_prefetch(pos)
+        clock[0] += COPILOT_PREFETCH_RETRY_S + 1
+        assert handler._should_prefetch(pos)
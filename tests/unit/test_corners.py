@@ -286,6 +286,17 @@ class TestFindIndexAtDistance:
 
         assert idx == 2  # 20.0 is closest to 22.0
 
+    def test_tie_and_repeated_distances(self):
+        """Ties and repeated distances resolve to the first index."""
+        detector = CornerDetector()
+
+        distances = [0.0, 10.0, 10.0, 20.0, 20.0]
+
+        assert detector._find_index_at_distance(distances, 15.0) == 1
+        assert detector._find_index_at_distance(distances, 50.0) == 3
+        assert detector._find_index_at_distance(distances, -5.0) == 0
+        assert detector._find_index_at_distance([], 5.0) is None
+
 
 class TestClassifySeverity:
     """Test severity classification."""
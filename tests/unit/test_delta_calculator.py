@@ -0,0 +1,218 @@
+"""
+Unit tests for the lap timing delta calculator.
+Tests lap_timing/core/delta_calculator.py with synthetic laps.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from lap_timing.core.delta_calculator import DeltaCalculator, RollingTrend
+from lap_timing.data.models import GPSPoint, Lap, TrackPosition
+
+
+TRACK_LENGTH = 1000.0
+
+
+def _position(distance, timestamp):
+    return TrackPosition(
+        distance_along_track=distance,
+        lateral_offset=0.0,
+        segment_index=0,
+        progress_fraction=distance / TRACK_LENGTH,
+        timestamp=timestamp,
+    )
+
+
+def _lap(distances, start_time=100.0, rate_hz=10.0):
+    """Build a lap with one position per GPS sample at the given distances."""
+    timestamps = [start_time + i / rate_hz for i in range(len(distances))]
+    duration = len(distances) / rate_hz
+    return Lap(
+        lap_number=1,
+        start_time=start_time,
+        end_time=start_time + duration,
+        duration=duration,
+        gps_points=[GPSPoint(timestamp=t, lat=0.0, lon=0.0) for t in timestamps],
+        positions=[_position(d, t) for d, t in zip(distances, timestamps)],
+    )
+
+
+class TestReferenceTable:
+    """Tests for the reference lap time lookup table."""
+
+    @pytest.mark.unit
+    def test_constant_speed_lap(self):
+        """Test table entries for a lap driven at 20 m/s."""
+        calc = DeltaCalculator(TRACK_LENGTH, resolution=0.5)
+        calc.set_reference_lap(_lap([i * 2.0 for i in range(500)]))
+
+        table = calc.reference_lap.time_at_distance
+        assert table.dtype == np.float32
+        assert len(table) == 2001
+        assert table[0] == pytest.approx(0.0)
+        assert table[201] == pytest.approx(5.025)
+        # Beyond the last sample the lap time is used
+        assert table[-1] == pytest.approx(50.0)
+
+    @pytest.mark.unit
+    def test_distance_going_backwards_is_ignored(self):
+        """Test that GPS jitter stepping distance back keeps the table monotonic."""
+        calc = DeltaCalculator(TRACK_LENGTH, resolution=1.0)
+        calc.set_reference_lap(_lap([0.0, 10.0, 8.0, 20.0, 30.0]))
+
+        table = calc.reference_lap.time_at_distance
+        assert np.all(np.diff(table) >= 0)
+        assert table[15] == pytest.approx(0.2, abs=1e-6)
+
+    @pytest.mark.unit
+    def test_leading_samples_from_previous_lap_skipped(self):
+        """Test samples still at the end of the previous lap are skipped."""
+        calc = DeltaCalculator(TRACK_LENGTH, resolution=1.0)
+        calc.set_reference_lap(_lap([998.0, 999.5, 1.0, 21.0, 41.0]))
+
+        table = calc.reference_lap.time_at_distance
+        assert table[11] == pytest.approx(0.25, abs=1e-6)
+
+    @pytest.mark.unit
+    def test_clear_reference(self):
+        """Test clearing the reference disables delta."""
+        calc = DeltaCalculator(TRACK_LENGTH)
+        calc.set_reference_lap(_lap([i * 2.0 for i in range(500)]))
+        calc.clear_reference()
+        calc.start_lap(0.0, 2)
+
+        assert calc.calculate_delta(_position(100.0, 5.0)) is None
+
+    @pytest.mark.unit
+    @pytest.mark.benchmark
+    def test_build_time_for_long_lap(self):
+        """Test a 5 km, 10 Hz reference lap is processed in milliseconds."""
+        track_length = 5000.0
+        calc = DeltaCalculator(track_length, resolution=0.5)
+        lap = _lap(np.linspace(0.0, track_length, 1500).tolist())
+
+        start = time.perf_counter()
+        calc.set_reference_lap(lap)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.05
+
+
+class TestCalculateDelta:
+    """Tests for delta lookup against the reference lap."""
+
+    @pytest.fixture
+    def calc(self):
+        calc = DeltaCalculator(TRACK_LENGTH, resolution=1.0)
+        calc.set_reference_lap(_lap([i * 2.0 for i in range(500)]))
+        calc.start_lap(0.0, 2)
+        return calc
+
+    @pytest.mark.unit
+    def test_delta_interpolates_between_steps(self, calc):
+        """Test the reference time is interpolated below table resolution."""
+        # Reference reaches 100.5 m at 5.025 s
+        delta = calc.calculate_delta(_position(100.5, 5.0))
+        assert delta.time_delta == pytest.approx(-0.025, abs=1e-5)
+
+    @pytest.mark.unit
+    def test_delta_is_continuous(self, calc):
+        """Test the delta changes smoothly rather than in table steps."""
+        deltas = [
+            calc.calculate_delta(_position(d, 5.0)).time_delta
+            for d in np.arange(100.0, 101.0, 0.1)
+        ]
+        steps = np.diff(deltas)
+        assert np.allclose(steps, steps[0], atol=1e-5)
+
+    @pytest.mark.unit
+    def test_delta_outside_track_is_none(self, calc):
+        """Test positions off either end of the table return None."""
+        assert calc.calculate_delta(_position(-1.0, 5.0)) is None
+        assert calc.calculate_delta(_position(TRACK_LENGTH + 1.0, 5.0)) is None
+        assert calc.calculate_delta(_position(TRACK_LENGTH, 5.0)) is not None
+
+
+class TestRollingTrend:
+    """Tests for the rolling speed and delta trend window."""
+
+    @pytest.mark.unit
+    def test_needs_two_samples(self):
+        """Test no speed is reported until the window has two samples."""
+        trend = RollingTrend(size=4)
+        assert trend.speed() is None
+        trend.add(0.0, 0.0, 0.0)
+        assert trend.speed() is None
+        assert trend.delta_rate() == 0.0
+
+    @pytest.mark.unit
+    def test_speed_and_rate_over_window(self):
+        """Test rates use only the most recent samples once the ring wraps."""
+        trend = RollingTrend(size=3)
+        # 10 m/s for the first samples, then 30 m/s while losing 0.1 s/s
+        trend.add(0.0, 0.0, 0.0)
+        trend.add(1.0, 10.0, 0.0)
+        trend.add(2.0, 40.0, 0.1)
+        trend.add(3.0, 70.0, 0.2)
+
+        assert trend.count == 3
+        assert trend.speed() == pytest.approx(30.0)
+        assert trend.delta_rate() == pytest.approx(0.1)
+
+    @pytest.mark.unit
+    def test_reset(self):
+        """Test reset empties the window."""
+        trend = RollingTrend(size=3)
+        trend.add(0.0, 0.0, 0.0)
+        trend.add(1.0, 10.0, 0.0)
+        trend.reset()
+        assert trend.speed() is None
+
+
+class TestPrediction:
+    """Tests for speed-based distance delta and predicted lap time."""
+
+    @pytest.fixture
+    def calc(self):
+        # Reference: 1000 m at 20 m/s (50 s)
+        calc = DeltaCalculator(TRACK_LENGTH, resolution=1.0)
+        calc.set_reference_lap(_lap([i * 2.0 for i in range(501)]))
+        calc.start_lap(0.0, 2)
+        return calc
+
+    @pytest.mark.unit
+    def test_distance_delta_uses_current_speed(self, calc):
+        """Test distance delta comes from measured speed, not reference average."""
+        # Driving at 10 m/s: half reference pace, so falling behind
+        delta = None
+        for i in range(10):
+            t = 5.0 + i * 0.1
+            delta = calc.calculate_delta(_position(100.0 + i, t))
+
+        assert delta.time_delta > 0
+        assert delta.distance_delta == pytest.approx(-delta.time_delta * 10.0)
+
+    @pytest.mark.unit
+    def test_delta_rate_reflects_losing_time(self, calc):
+        """Test a slower pace gives a positive delta rate and later prediction."""
+        delta = None
+        for i in range(10):
+            t = i * 0.1
+            delta = calc.calculate_delta(_position(i * 1.0, t))
+
+        # Reference covers 1 m in 0.05 s, we take 0.1 s: lose 0.5 s per second
+        assert delta.delta_rate == pytest.approx(0.5)
+        assert delta.predicted_lap_time > 50.0 + delta.time_delta
+
+    @pytest.mark.unit
+    def test_prediction_stable_at_reference_pace(self, calc):
+        """Test driving exactly at reference pace predicts the reference time."""
+        predictions = [
+            calc.calculate_delta(_position(d, d / 20.0)).predicted_lap_time
+            for d in range(10, 990, 10)
+        ]
+        # Reference lap time is 50.1 s (last sample at 50.0 s)
+        assert min(predictions) >= 50.0 - 1e-6
+        assert max(predictions) <= 50.1 + 1e-6
@@ -0,0 +1,108 @@
+"""Tests for utils/geometry_kernels.py - vectorised GPS geometry."""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from copilot.geometry import (
+    bearing,
+    calculate_curvature,
+    cumulative_distances,
+    haversine_distance,
+)
+from utils import geometry_kernels as gk
+
+
+@pytest.fixture
+def winding_path():
+    """A 2km winding path of (lat, lon) points, with a straight section."""
+    rng = random.Random(3)
+    lat, lon, heading = 52.0, -1.0, 0.0
+    points = []
+    for i in range(400):
+        if not 100 <= i < 150:
+            heading += rng.uniform(-0.2, 0.2)
+        lat += 5 * math.cos(heading) / 110540
+        lon += 5 * math.sin(heading) / (111320 * math.cos(math.radians(lat)))
+        points.append((lat, lon))
+    return points
+
+
+class TestDistanceKernels:
+    """Tests for haversine, bearing and cumulative distance kernels."""
+
+    @pytest.mark.unit
+    def test_haversine_and_bearing_match_scalar(self, winding_path):
+        """Batched results match the scalar helpers pairwise."""
+        lats, lons = np.array(winding_path).T
+        dist = gk.haversine(lats[:-1], lons[:-1], lats[1:], lons[1:])
+        head = gk.bearing(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+        for i in range(len(dist)):
+            args = (lats[i], lons[i], lats[i + 1], lons[i + 1])
+            assert dist[i] == pytest.approx(haversine_distance(*args), abs=1e-9)
+            assert head[i] == pytest.approx(bearing(*args), abs=1e-9)
+
+    @pytest.mark.unit
+    def test_cumulative_distances_match_scalar(self, winding_path):
+        """Cumulative distance starts at 0 and matches the scalar loop."""
+        lats, lons = np.array(winding_path).T
+        result = gk.cumulative_distances(lats, lons)
+
+        assert result[0] == 0.0
+        assert result.tolist() == pytest.approx(cumulative_distances(winding_path), abs=1e-6)
+
+    @pytest.mark.unit
+    def test_cumulative_distances_short_paths(self):
+        """Empty and single point paths give 0 or no distances."""
+        assert gk.cumulative_distances([], []).tolist() == []
+        assert gk.cumulative_distances([52.0], [-1.0]).tolist() == [0.0]
+
+    @pytest.mark.unit
+    def test_to_local(self):
+        """Local frame is metres east/north of the reference point."""
+        east, north = gk.to_local([52.0, 52.001], [-1.0, -0.999], 52.0, -1.0)
+
+        assert east.tolist() == pytest.approx([0.0, 111.32 * math.cos(math.radians(52.0))])
+        assert north.tolist() == pytest.approx([0.0, 110.54])
+
+
+class TestCurvatureKernel:
+    """Tests for the three-point curvature kernel."""
+
+    @pytest.mark.unit
+    def test_open_path_matches_scalar(self, winding_path):
+        """Interior points match calculate_curvature, end points are 0."""
+        lats, lons = np.array(winding_path).T
+        result = gk.curvature(lats, lons)
+
+        expected = [0.0] + [
+            calculate_curvature(*winding_path[i - 1:i + 2])
+            for i in range(1, len(winding_path) - 1)
+        ] + [0.0]
+        assert result.tolist() == pytest.approx(expected, abs=1e-12)
+        # The straight section is collinear
+        assert np.all(result[102:148] == 0.0)
+
+    @pytest.mark.unit
+    def test_closed_path_wraps(self):
+        """A closed circle has constant 1/radius curvature, signed by direction."""
+        radius = 100.0
+        angles = np.linspace(0, 2 * math.pi, 72, endpoint=False)
+        lats = 52.0 + radius * np.sin(angles) / 110540
+        lons = -1.0 + radius * np.cos(angles) / (111320 * math.cos(math.radians(52.0)))
+
+        result = gk.curvature(lats, lons, closed=True)
+        reverse = gk.curvature(lats[::-1], lons[::-1], closed=True)
+
+        assert np.abs(result) == pytest.approx(np.full(72, 1 / radius), rel=0.01)
+        assert np.all(np.sign(result) == np.sign(result[0]))
+        assert reverse == pytest.approx(-result[::-1])
+
+    @pytest.mark.unit
+    def test_short_paths(self):
+        """Paths too short for a triangle have zero curvature."""
+        assert gk.curvature([], []).tolist() == []
+        assert gk.curvature([52.0, 52.001], [-1.0, -1.0]).tolist() == [0.0, 0.0]
@@ -4,6 +4,7 @@ Tests ExponentialBackoff and BoundedQueueHardwareHandler logic.
 """
 
 import pytest
+import threading
 import time
 from unittest.mock import patch, MagicMock
 from utils.hardware_base import (
@@ -374,3 +375,152 @@ class TestBoundedQueuePerformance:
 
         # Latest snapshot should be seq=3
         assert handler.current_snapshot.data['seq'] == 3
+
+
+class TestUpdateNotification:
+    """Tests for sequence-numbered update notification (wait_for_update)."""
+
+    @pytest.fixture
+    def handler(self):
+        class TestHandler(BoundedQueueHardwareHandler):
+            def _worker_loop(self):
+                pass
+
+        return TestHandler()
+
+    @pytest.mark.unit
+    def test_sequence_increments_per_publish(self, handler):
+        """Test that every publish bumps the sequence number."""
+        assert handler.update_seq == 0
+        handler._publish_snapshot({'a': 1})
+        handler._publish_snapshot({'a': 2})
+        assert handler.update_seq == 2
+
+    @pytest.mark.unit
+    def test_wait_returns_immediately_when_behind(self, handler):
+        """Test that waiting with a stale sequence does not block."""
+        handler._publish_snapshot({'a': 1})
+        start = time.perf_counter()
+        assert handler.wait_for_update(0, timeout=10.0) == 1
+        assert time.perf_counter() - start < 5.0  # Far inside the timeout, even on a busy runner
+
+    @pytest.mark.unit
+    def test_wait_times_out_without_update(self, handler):
+        """Test that waiting returns the same sequence on timeout."""
+        handler._publish_snapshot({'a': 1})
+        assert handler.wait_for_update(1, timeout=0.02) == 1
+
+    @pytest.mark.unit
+    def test_publish_wakes_waiter(self, handler):
+        """Test that a publish from another thread wakes the waiter."""
+        publisher = threading.Timer(0.02, handler._publish_snapshot, args=({'a': 1},))
+        publisher.start()
+        try:
+            assert handler.wait_for_update(0, timeout=2.0) == 1
+        finally:
+            publisher.cancel()
+
+    @pytest.mark.unit
+    @pytest.mark.benchmark
+    def test_update_latency_vs_polling(self, handler):
+        """
+        Benchmark publish-to-consumer latency (e.g. GPS fix to lap delta).
+
+        A consumer sleep-polling at 10 Hz sees a new fix on average ~50 ms
+        late; waiting on the update notification should see it within a
+        few milliseconds.
+        """
+        latencies = []
+        done = threading.Event()
+
+        def consumer():
+            seq = 0
+            while not done.is_set():
+                new_seq = handler.wait_for_update(seq, timeout=0.5)
+                if new_seq != seq:
+                    seq = new_seq
+                    latencies.append(time.time() - handler.get_snapshot().timestamp)
+
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        for i in range(20):
+            time.sleep(0.013)
+            handler._publish_snapshot({'fix': i})
+        time.sleep(0.02)
+        done.set()
+        thread.join()
+
+        assert len(latencies) == 20
+        mean_latency = sum(latencies) / len(latencies)
+        poll_interval = 0.1
+        # Expected latency of the old sleep(0.1) polling loop
+        assert mean_latency < poll_interval / 2 / 10
+
+
+class TestZeroCopyPublishing:
+    """Tests for zero-copy snapshot publishing through the reference slot."""
+
+    @pytest.fixture
+    def handler(self):
+        class TestHandler(BoundedQueueHardwareHandler):
+            def __init__(self):
+                super().__init__(queue_depth=2, zero_copy=True)
+
+            def _worker_loop(self):
+                pass
+
+        return TestHandler()
+
+    @pytest.mark.unit
+    def test_snapshot_stamped_with_sequence(self, handler):
+        """Test that each snapshot carries its publish sequence number."""
+        handler._publish_snapshot({'value': 1})
+        handler._publish_snapshot({'value': 2})
+
+        snapshot = handler.get_snapshot()
+        assert snapshot.seq == 2
+        assert snapshot.seq == handler.update_seq
+        assert snapshot.data['value'] == 2
+
+    @pytest.mark.unit
+    def test_readers_share_snapshot_without_copy(self, handler):
+        """Test that readers get the published object itself."""
+        data = {'value': 1}
+        handler._publish_snapshot(data)
+
+        assert handler.get_snapshot() is handler.get_snapshot()
+        assert handler.get_data() is handler.get_snapshot().data
+        assert handler.data_queue.empty()
+
+    @pytest.mark.unit
+    def test_snapshot_data_is_read_only(self, handler):
+        """Test that readers cannot modify published data."""
+        handler._publish_snapshot({'value': 1}, {'status': 'ok'})
+        snapshot = handler.get_snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.data['value'] = 2
+        with pytest.raises(TypeError):
+            snapshot.metadata['status'] = 'error'
+
+    @pytest.mark.unit
+    def test_empty_before_first_publish(self, handler):
+        """Test that no data is reported before the first publish."""
+        assert handler.get_snapshot() is None
+        assert handler.get_data() == {}
+
+    @pytest.mark.unit
+    def test_queue_mode_snapshots_also_sequenced(self):
+        """Test that queue mode keeps copying but stamps sequence numbers."""
+        class QueueHandler(BoundedQueueHardwareHandler):
+            def _worker_loop(self):
+                pass
+
+        handler = QueueHandler()
+        data = {'value': 1}
+        handler._publish_snapshot(data)
+        data['value'] = 2
+
+        snapshot = handler.get_snapshot()
+        assert snapshot.seq == 1
+        assert snapshot.data['value'] == 1
@@ -0,0 +1,60 @@
+"""Tests for copilot/map_loader.py - incremental road network merging."""
+
+import pytest
+
+from copilot.map_loader import Junction, Node, RoadNetwork, Way, merge_road_networks
+
+LAT0, LON0 = 52.0, -1.0
+DEG_PER_KM = 1 / 111.0
+
+
+def _road_network(ways):
+    """Network from {way_id: [(node_id, north_km), ...]} roads running north."""
+    network = RoadNetwork()
+    for way_id, nodes in ways.items():
+        for node_id, north_km in nodes:
+            network.nodes[node_id] = Node(node_id, LAT0 + north_km * DEG_PER_KM, LON0)
+            network.node_to_ways.setdefault(node_id, []).append(way_id)
+        network.ways[way_id] = Way(way_id, [n for n, _ in nodes], highway_type="primary")
+    return network
+
+
+class TestMergeRoadNetworks:
+    """Tests for merge_road_networks."""
+
+    @pytest.mark.unit
+    def test_roads_joined_across_load_boundary(self):
+        """Roads from both loads are kept and share their boundary node."""
+        base = _road_network({1: [(1, 0.0), (2, 1.0)], 2: [(2, 1.0), (3, 2.0)]})
+        update = _road_network({2: [(2, 1.0), (3, 2.0)], 3: [(3, 2.0), (4, 3.0)]})
+
+        merged = merge_road_networks(base, update, LAT0 + 2 * DEG_PER_KM, LON0, 3000)
+
+        assert set(merged.ways) == {1, 2, 3}
+        assert set(merged.nodes) == {1, 2, 3, 4}
+        assert merged.node_to_ways[3] == [2, 3]
+        assert merged.node_to_ways[2] == [1, 2]
+
+    @pytest.mark.unit
+    def test_far_roads_dropped(self):
+        """Roads behind the keep radius are dropped, with their features."""
+        base = _road_network({1: [(1, 0.0), (2, 1.0)], 2: [(2, 1.0), (3, 5.0)]})
+        base.junctions[1] = Junction(1, LAT0, LON0, [1])
+        update = _road_network({3: [(3, 5.0), (4, 6.0)]})
+
+        merged = merge_road_networks(base, update, LAT0 + 6 * DEG_PER_KM, LON0, 2000)
+
+        assert set(merged.ways) == {2, 3}
+        assert 1 not in merged.nodes
+        assert merged.junctions == {}
+
+    @pytest.mark.unit
+    def test_inputs_not_modified(self):
+        """Loaded networks may be cached by the loader, so are left as is."""
+        base = _road_network({1: [(1, 0.0), (2, 1.0)]})
+        update = _road_network({2: [(2, 1.0), (3, 2.0)]})
+
+        merge_road_networks(base, update, LAT0, LON0, 3000)
+
+        assert set(base.ways) == {1} and base.node_to_ways[2] == [1]
+        assert set(update.ways) == {2} and update.node_to_ways[2] == [2]
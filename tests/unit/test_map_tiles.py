@@ -0,0 +1,205 @@
+"""Tests for copilot/map_tiles.py - memory-mapped road tiles."""
+
+import pytest
+
+from copilot.map_loader import (
+    Barrier,
+    Junction,
+    MapLoader,
+    Node,
+    RailwayCrossing,
+    RoadNetwork,
+    Way,
+)
+from copilot.map_tiles import MappedTile, read_tile_bounds, write_tile
+
+LAT0, LON0 = 52.0, -1.0
+DEG_PER_KM = 1 / 111.0
+
+
+def _node(nid, east_km, north_km, lat0=LAT0):
+    return Node(nid, lat0 + north_km * DEG_PER_KM, LON0 + east_km * DEG_PER_KM / 0.6157)
+
+
+def _network(ways, nodes):
+    network = RoadNetwork()
+    network.nodes = {n.id: n for n in nodes}
+    network.ways = ways
+    for way in ways.values():
+        for node_id in way.nodes:
+            network.node_to_ways.setdefault(node_id, []).append(way.id)
+    return network
+
+
+@pytest.fixture
+def network():
+    """
+    A cross of two roads at the origin, plus a road 10km away.
+
+    Way 1 runs north through the origin out to 5km (beyond a 2km query),
+    with node ids out of order along the way. Way 2 crosses it east-west.
+    Way 3 leaves way 1's far end, outside the query area.
+    """
+    nodes = [
+        _node(30, 0.0, -1.0), _node(10, 0.0, 0.0), _node(20, 0.0, 1.0),
+        _node(5, 0.0, 5.0),
+        _node(40, -1.0, 0.0), _node(41, 1.0, 0.0),
+        _node(50, 1.0, 5.0),
+        _node(60, 10.0, 10.0), _node(61, 10.0, 11.0),
+    ]
+    network = _network({
+        1: Way(1, [30, 10, 20, 5], name="High Street", highway_type="primary",
+               bridge=True, speed_limit=50),
+        2: Way(2, [40, 10, 41], highway_type="residential"),
+        3: Way(3, [5, 50], highway_type="residential"),
+        4: Way(4, [60, 61], highway_type="residential"),
+    }, nodes)
+    by_id = network.nodes
+    network.junctions[10] = Junction(10, by_id[10].lat, by_id[10].lon, [1, 2])
+    network.junctions[5] = Junction(5, by_id[5].lat, by_id[5].lon, [1, 3])
+    network.railway_crossings[41] = RailwayCrossing(41, by_id[41].lat, by_id[41].lon)
+    network.barriers[40] = Barrier(40, by_id[40].lat, by_id[40].lon, "cattle_grid")
+    network.barriers[60] = Barrier(60, by_id[60].lat, by_id[60].lon, "gate")
+    return network
+
+
+@pytest.fixture
+def tile(tmp_path, network):
+    path = tmp_path / "test.roads.tile"
+    write_tile(path, network)
+    tile = MappedTile(path)
+    yield tile
+    tile.close()
+
+
+class TestMappedTile:
+    """Tests for write_tile and MappedTile.load_region."""
+
+    @pytest.mark.unit
+    def test_ways_touching_region_with_full_geometry(self, tile, network):
+        """Ways with a node in the region load with all their nodes, in order."""
+        region = tile.load_region(LAT0, LON0, 2000)
+
+        assert sorted(region.way_ids.tolist()) == [1, 2]
+        assert region.way_nodes(region.way_index[1]).tolist() == [30, 10, 20, 5]
+        assert region.get_way_geometry(1) == network.get_way_geometry(1)
+        assert region.get_way_geometry(2) == network.get_way_geometry(2)
+        assert tile.way_count == 4
+
+    @pytest.mark.unit
+    def test_way_attributes(self, tile):
+        """Way tags survive the string table."""
+        region = tile.load_region(LAT0, LON0, 2000)
+        high_street, lane = region.way_index[1], region.way_index[2]
+
+        assert region.way_tag(high_street, "name") == "High Street"
+        assert region.way_tag(high_street, "highway_type") == "primary"
+        assert region.way_tag(high_street, "bridge") is True
+        assert region.way_tag(high_street, "speed_limit") == 50
+        assert region.way_tag(lane, "name") == ""
+        assert region.way_tag(lane, "highway_type") == "residential"
+
+    @pytest.mark.unit
+    def test_junctions_and_node_index(self, tile):
+        """Junctions list every connected way, including ways outside the region."""
+        region = tile.load_region(LAT0, LON0, 2000)
+
+        assert region.ways_at_node(10) == [1, 2]
+        assert set(region.junctions) == {10}
+        assert region.junctions[10].connected_ways == [1, 2]
+
+        region = tile.load_region(LAT0 + 5 * DEG_PER_KM, LON0, 500)
+        assert sorted(region.way_ids.tolist()) == [1, 3]
+        assert region.junctions[5].connected_ways == [1, 3]
+
+    @pytest.mark.unit
+    def test_crossings_and_barriers_on_loaded_roads(self, tile):
+        """Only crossings and barriers on the loaded roads are loaded."""
+        region = tile.load_region(LAT0, LON0, 2000)
+
+        assert set(region.railway_crossings) == {41}
+        assert region.barriers[40].barrier_type == "cattle_grid"
+        assert 60 not in region.barriers
+
+    @pytest.mark.unit
+    def test_empty_region(self, tile):
+        """A region with no roads gives an empty network."""
+        region = tile.load_region(LAT0 - 1.0, LON0, 2000)
+
+        assert region.way_count == 0 and region.node_count == 0
+        assert region.junctions == {}
+
+    @pytest.mark.unit
+    def test_round_trip_to_network(self, tile, network):
+        """Loading the whole tile gives back the original network."""
+        restored = tile.load_region(LAT0 + 5 * DEG_PER_KM, LON0, 20000).to_network()
+
+        assert set(restored.ways) == set(network.ways)
+        for way_id, way in network.ways.items():
+            assert restored.ways[way_id].nodes == way.nodes
+            assert restored.get_way_geometry(way_id) == network.get_way_geometry(way_id)
+        assert restored.barriers[60].barrier_type == "gate"
+
+    @pytest.mark.unit
+    def test_empty_network(self, tmp_path):
+        """An empty network writes a tile with no roads."""
+        path = tmp_path / "empty.roads.tile"
+        write_tile(path, RoadNetwork())
+
+        tile = MappedTile(path)
+        assert tile.way_count == 0
+        assert tile.load_region(LAT0, LON0, 2000).way_count == 0
+        tile.close()
+
+
+class TestTileHeader:
+    """Tests for read_tile_bounds."""
+
+    @pytest.mark.unit
+    def test_bounds_from_header(self, tmp_path, network):
+        """Bounds cover every node in the tile."""
+        path = tmp_path / "test.roads.tile"
+        write_tile(path, network)
+
+        min_lat, min_lon, max_lat, max_lon = read_tile_bounds(path)
+        lats = [n.lat for n in network.nodes.values()]
+        lons = [n.lon for n in network.nodes.values()]
+        assert (min_lat, max_lat) == (min(lats), max(lats))
+        assert (min_lon, max_lon) == (min(lons), max(lons))
+
+    @pytest.mark.unit
+    def test_not_a_tile(self, tmp_path):
+        """Other files are rejected with ValueError."""
+        path = tmp_path / "bad.roads.tile"
+        path.write_bytes(b"not a road tile" * 100)
+
+        with pytest.raises(ValueError):
+            read_tile_bounds(path)
+        with pytest.raises(ValueError):
+            MappedTile(path)
+
+
+class TestMapLoaderTiles:
+    """Tests for MapLoader with a directory of tiles."""
+
+    @pytest.fixture
+    def loader(self, tmp_path):
+        """Two regions 20km apart, each a single road."""
+        for name, lat0, way_id in (("south", LAT0, 1), ("north", LAT0 + 0.2, 2)):
+            nodes = [_node(way_id * 10, 0.0, -1.0, lat0), _node(way_id * 10 + 1, 0.0, 1.0, lat0)]
+            write_tile(tmp_path / f"{name}.roads.tile",
+                       _network({way_id: Way(way_id, [n.id for n in nodes])}, nodes))
+        return MapLoader(tmp_path)
+
+    @pytest.mark.unit
+    def test_region_index_from_headers(self, loader):
+        """Each tile is a region, indexed without loading its roads."""
+        assert set(loader._region_bounds) == {"south", "north"}
+        assert loader._mapped_tiles == {}
+
+    @pytest.mark.unit
+    def test_load_around_each_region(self, loader):
+        """Roads load from whichever region covers the position."""
+        assert set(loader.load_around(LAT0, LON0, 2000).ways) == {1}
+        assert loader.load_around_compact(LAT0 + 0.2, LON0, 2000).way_ids.tolist() == [2]
+        assert loader.load_around_compact(LAT0 + 0.1, LON0, 2000).way_count == 0
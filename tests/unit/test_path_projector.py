@@ -0,0 +1,331 @@
+"""Tests for copilot/path_projector.py - current road matching."""
+
+import math
+import random
+import time
+
+import pytest
+
+from copilot.geometry import (
+    angle_difference,
+    bearing,
+    closest_point_on_segment,
+    haversine_distance,
+)
+from copilot.corners import CornerDetector
+from copilot.map_loader import Node, RoadNetwork, Way
+from copilot.path_projector import PathProjector, SegmentIndex
+
+LAT0, LON0 = 52.0, -1.0
+M_LAT = 1 / 110540
+M_LON = 1 / (111320 * math.cos(math.radians(LAT0)))
+
+
+def _network(roads):
+    """Build a network from {way_id: (highway_type, [(east_m, north_m), ...])}."""
+    network = RoadNetwork()
+    node_id = 1
+    for way_id, (highway, points) in roads.items():
+        ids = []
+        for east, north in points:
+            network.nodes[node_id] = Node(node_id, LAT0 + north * M_LAT, LON0 + east * M_LON)
+            ids.append(node_id)
+            node_id += 1
+        network.ways[way_id] = Way(way_id, ids, highway_type=highway)
+    return network
+
+
+def _grid_network(size_m=2000, spacing_m=50, step_m=20):
+    """A dense town-like grid of residential streets."""
+    roads = {}
+    way_id = 1
+    for offset in range(0, size_m + 1, spacing_m):
+        along = range(0, size_m + 1, step_m)
+        roads[way_id] = ("residential", [(offset, a) for a in along])
+        roads[way_id + 1] = ("residential", [(a, offset) for a in along])
+        way_id += 2
+    return _network(roads)
+
+
+def _winding_road(length_m=3000, spacing_m=8, way_nodes=40):
+    """A long winding road split into consecutive ways, one of them a bridge."""
+    points = []
+    east = north = heading = 0.0
+    for i in range(int(length_m / spacing_m)):
+        heading += 0.15 * math.sin(i / 15.0)
+        east += spacing_m * math.sin(heading)
+        north += spacing_m * math.cos(heading)
+        points.append((east, north))
+
+    roads = {}
+    way_id = 1
+    for start in range(0, len(points) - 1, way_nodes - 1):
+        roads[way_id] = ("secondary", points[start:start + way_nodes])
+        way_id += 1
+    network = _network(roads)
+    network.ways[3].bridge = True
+
+    # Consecutive ways share their end node
+    for way in network.ways.values():
+        prev = network.ways.get(way.id - 1)
+        if prev:
+            network.nodes.pop(way.nodes[0])
+            way.nodes[0] = prev.nodes[-1]
+        for node_id in way.nodes:
+            network.node_to_ways.setdefault(node_id, []).append(way.id)
+    return network
+
+
+def _loop_road(circumference_m=1900, spacing_m=8, ways=6):
+    """A closed circuit split into consecutive ways, the last ending where the first starts."""
+    radius = circumference_m / (2 * math.pi)
+    count = int(circumference_m / spacing_m)
+    points = [
+        (radius * math.sin(2 * math.pi * i / count), radius * math.cos(2 * math.pi * i / count))
+        for i in range(count)
+    ]
+    per_way = count // ways
+    roads = {}
+    for way_id in range(1, ways + 1):
+        start = (way_id - 1) * per_way
+        end = start + per_way + 1 if way_id < ways else count
+        roads[way_id] = ("secondary", points[start:end])
+    network = _network(roads)
+
+    # Consecutive ways share their end node, and the last way closes the loop
+    ways_in_order = [network.ways[way_id] for way_id in range(1, ways + 1)]
+    for prev, way in zip(ways_in_order, ways_in_order[1:]):
+        network.nodes.pop(way.nodes[0])
+        way.nodes[0] = prev.nodes[-1]
+    ways_in_order[-1].nodes.append(ways_in_order[0].nodes[0])
+    for way in ways_in_order:
+        for node_id in way.nodes:
+            network.node_to_ways.setdefault(node_id, []).append(way.id)
+    return network
+
+
+def _brute_force(network, lat, lon, radius):
+    """Segments within radius, found by checking every segment."""
+    found = {}
+    for way_id in network.ways:
+        geometry = network.get_way_geometry(way_id)
+        for i in range(len(geometry) - 1):
+            closest, _ = closest_point_on_segment((lat, lon), geometry[i], geometry[i + 1])
+            dist = haversine_distance(lat, lon, closest[0], closest[1])
+            if dist <= radius:
+                found[(way_id, i)] = dist
+    return found
+
+
+def _aligned(network, way_id, i, heading, tolerance=45.0):
+    """Whether segment i of a way runs along heading in either direction."""
+    p1, p2 = network.get_way_geometry(way_id)[i:i + 2]
+    diff = abs(angle_difference(heading, bearing(p1[0], p1[1], p2[0], p2[1])))
+    return min(diff, 180 - diff) <= tolerance
+
+
+class TestSegmentIndex:
+    """Tests for the uniform segment grid."""
+
+    @pytest.mark.unit
+    def test_matches_brute_force(self):
+        """Grid query finds the same segments as checking all of them."""
+        network = _grid_network(size_m=600, spacing_m=100)
+        index = SegmentIndex(network, cell_size=150)
+        rng = random.Random(1)
+
+        for _ in range(50):
+            lat = LAT0 + rng.uniform(-50, 650) * M_LAT
+            lon = LON0 + rng.uniform(-50, 650) * M_LON
+            segs, dist = index.query(lat, lon, 150)
+            found = {
+                (int(index.way_ids[s]), int(index.seg_indices[s])): d
+                for s, d in zip(segs, dist)
+            }
+            expected = _brute_force(network, lat, lon, 150)
+            # Ignore segments right at the radius boundary
+            core = {k for k, d in expected.items() if d < 149}
+            assert core <= set(found)
+            for key in core:
+                assert found[key] == pytest.approx(expected[key], rel=0.01)
+
+    @pytest.mark.unit
+    def test_empty_network(self):
+        """An empty network returns no segments."""
+        segs, dist = SegmentIndex(RoadNetwork()).query(LAT0, LON0, 150)
+        assert len(segs) == 0 and len(dist) == 0
+
+
+class TestFindCurrentWay:
+    """Tests for PathProjector.find_current_way."""
+
+    @pytest.mark.unit
+    def test_heading_selects_direction(self):
+        """Travel direction follows heading along the road."""
+        projector = PathProjector(_network({1: ("primary", [(0, 0), (0, 100), (0, 200)])}))
+        lat, lon = LAT0 + 150 * M_LAT, LON0 + 5 * M_LON
+
+        assert projector.find_current_way(lat, lon, 0.0) == (1, 1, True)
+        assert projector.find_current_way(lat, lon, 180.0) == (1, 1, False)
+
+    @pytest.mark.unit
+    def test_prefers_main_road_and_heading(self):
+        """A main road beats a closer service road; crossing roads are ignored."""
+        projector = PathProjector(_network({
+            1: ("service", [(10, 0), (10, 200)]),
+            2: ("primary", [(60, 0), (60, 200)]),
+            3: ("primary", [(-100, 100), (200, 100)]),
+        }))
+        assert projector.find_current_way(LAT0 + 100 * M_LAT, LON0, 0.0)[0] == 2
+
+    @pytest.mark.unit
+    def test_fallback_to_close_misaligned_road(self):
+        """With no aligned road, only a very close road is matched."""
+        projector = PathProjector(_network({1: ("primary", [(-100, 0), (100, 0)])}))
+
+        assert projector.find_current_way(LAT0 + 20 * M_LAT, LON0, 0.0) == (1, 0, True)
+        assert projector.find_current_way(LAT0 + 50 * M_LAT, LON0, 0.0) is None
+
+    @pytest.mark.unit
+    def test_continuity_with_previous_way(self):
+        """At a near tie, the road matched last cycle is kept."""
+        projector = PathProjector(_network({
+            1: ("residential", [(0, 0), (0, 200)]),
+            2: ("residential", [(50, 0), (50, 200)]),
+        }))
+        assert projector.find_current_way(LAT0 + 50 * M_LAT, LON0 + 5 * M_LON, 0.0)[0] == 1
+        # Now slightly closer to way 2, but stays on way 1
+        assert projector.find_current_way(LAT0 + 60 * M_LAT, LON0 + 30 * M_LON, 0.0)[0] == 1
+        # Clearly on way 2
+        assert projector.find_current_way(LAT0 + 70 * M_LAT, LON0 + 40 * M_LON, 0.0)[0] == 2
+
+    @staticmethod
+    def _grid_queries(count=100):
+        """Random (lat, lon, heading) on the dense grid, headings along its streets."""
+        rng = random.Random(2)
+        for _ in range(count):
+            east, north = rng.uniform(0, 2000), rng.uniform(0, 2000)
+            heading = rng.choice([0.0, 90.0, 180.0, 270.0]) + rng.uniform(-10, 10)
+            yield LAT0 + north * M_LAT, LON0 + east * M_LON, heading
+
+    @pytest.mark.unit
+    def test_matches_linear_scan_on_dense_grid(self):
+        """Same way as the original full scan."""
+        network = _grid_network()
+        projector = PathProjector(network)
+
+        for lat, lon, heading in self._grid_queries():
+            projector.last_way_id = None
+            way_id, _, _ = projector.find_current_way(lat, lon, heading)
+
+            # Linear scan: nearest heading-aligned segment
+            best = min(
+                (d, w) for (w, i), d in _brute_force(network, lat, lon, 150).items()
+                if _aligned(network, w, i, heading)
+            )
+            assert way_id == best[1]
+
+    @pytest.mark.unit
+    @pytest.mark.benchmark
+    def test_query_time_on_dense_grid(self):
+        """Matching the current way on a dense grid takes well under a millisecond."""
+        projector = PathProjector(_grid_network())
+        queries = list(self._grid_queries())
+
+        start = time.perf_counter()
+        for lat, lon, heading in queries:
+            projector.last_way_id = None
+            projector.find_current_way(lat, lon, heading)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed / len(queries) < 0.001
+
+
+class TestIncrementalProjection:
+    """Tests for PathProjector.project_path_incremental."""
+
+    @staticmethod
+    def _drive(network, steps=200, laps=1):
+        """Positions and headings every half node along the road."""
+        nodes = [network.nodes[n] for w in network.ways.values() for n in w.nodes[:-1]] * laps
+        for a, b in zip(nodes[:steps], nodes[1:steps + 1]):
+            heading = bearing(a.lat, a.lon, b.lat, b.lon)
+            yield (a.lat + b.lat) / 2, (a.lon + b.lon) / 2, heading
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "network, steps, laps",
+        [
+            (_winding_road(), 200, 1),
+            (_loop_road(), 400, 2),  # Walks back onto the ways it has passed
+            (_loop_road(circumference_m=800), 200, 2),  # Shorter than the lookahead
+        ],
+        ids=["winding", "circuit", "short_circuit"],
+    )
+    def test_matches_full_projection(self, network, steps, laps):
+        """The sliding window gives the same path and features every cycle."""
+        incremental = PathProjector(network)
+        full = PathProjector(network)
+
+        for lat, lon, heading in self._drive(network, steps, laps):
+            a = incremental.project_path_incremental(lat, lon, heading, 1000)
+            b = full.project_path(lat, lon, heading, 1000)
+
+            assert [(p.way_id, p.node_index) for p in a.points] == [
+                (p.way_id, p.node_index) for p in b.points
+            ]
+            for pa, pb in zip(a.points, b.points):
+                assert pa.distance_from_start == pytest.approx(pb.distance_from_start, abs=1e-6)
+            assert [(x.way_id, round(x.distance_m, 6)) for x in a.bridges] == [
+                (x.way_id, round(x.distance_m, 6)) for x in b.bridges
+            ]
+
+    @pytest.mark.unit
+    def test_cached_curvature_gives_same_corners(self):
+        """Corners from the cached curvature match a full detection."""
+        network = _winding_road()
+        projector = PathProjector(network)
+        detector = CornerDetector()
+
+        for lat, lon, heading in self._drive(network, steps=60):
+            path = projector.project_path_incremental(lat, lon, heading, 1000)
+            points = [(p.lat, p.lon) for p in path.points]
+            first = path.points[0].distance_from_start
+            cached = detector.detect_corners(
+                points,
+                curvatures=path.curvatures,
+                distances=[p.distance_from_start - first for p in path.points],
+            )
+            expected = detector.detect_corners(points)
+
+            assert path.curvatures == pytest.approx(detector._calculate_curvatures(points))
+            assert [c.severity for c in cached] == [c.severity for c in expected]
+            assert [c.entry_distance for c in cached] == pytest.approx(
+                [c.entry_distance for c in expected]
+            )
+
+    @pytest.mark.unit
+    def test_window_reused_and_invalidated(self):
+        """The kept path is extended while on it and rebuilt when it changes."""
+        network = _winding_road()
+        projector = PathProjector(network)
+        drive = list(self._drive(network, steps=20))
+
+        projector.project_path_incremental(*drive[0], 1000)
+        walker = projector._walker
+        projector.project_path_incremental(*drive[10], 1000)
+        assert projector._walker is walker
+        assert walker.first_index > 0
+
+        # Turning round leaves the kept path
+        lat, lon, heading = drive[10]
+        projector.project_path_incremental(lat, lon, (heading + 180) % 360, 1000)
+        assert projector._walker is not walker
+
+        # Route guidance switching on re-projects
+        walker = projector._walker
+        projector.project_path_incremental(lat, lon, heading, 1000, route_waypoints=[])
+        assert projector._walker is not walker
+
+        projector.reset_path()
+        assert projector._walker is None
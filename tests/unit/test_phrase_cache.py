@@ -0,0 +1,178 @@
+"""Tests for copilot/phrase_cache.py - cached TTS phrases."""
+
+import os
+
+import numpy as np
+import pytest
+
+from copilot.audio import AudioPlayer
+from copilot.audio_engine import NullSink
+from copilot.pacenotes import PacenoteGenerator
+from copilot.phrase_cache import PhraseCache, join_phrases
+
+RATE = 22050
+SETTINGS = ("espeak-ng", "en-gb", 210, True, RATE)
+
+
+def _clip(seconds, level=0.5):
+    return np.full(int(seconds * RATE), level, dtype=np.float32)
+
+
+class TestPhraseCache:
+    """Tests for PhraseCache memory and disk layers."""
+
+    @pytest.mark.unit
+    def test_disk_round_trip(self, tmp_path):
+        """A phrase cached by one instance is read back by the next."""
+        PhraseCache(tmp_path, SETTINGS).put("left four", _clip(0.1))
+
+        pcm = PhraseCache(tmp_path, SETTINGS).get("left four")
+
+        assert pcm.dtype == np.float32
+        assert np.allclose(pcm, 0.5, atol=1e-4)
+        assert len(pcm) == int(0.1 * RATE)
+
+    @pytest.mark.unit
+    def test_settings_change_key(self, tmp_path):
+        """Clips rendered with other settings are not reused."""
+        PhraseCache(tmp_path, SETTINGS).put("left four", _clip(0.1))
+        faster = PhraseCache(tmp_path, SETTINGS[:2] + (250,) + SETTINGS[3:])
+
+        assert faster.get("left four") is None
+        assert "left four" in PhraseCache(tmp_path, SETTINGS)
+        assert "right four" not in PhraseCache(tmp_path, SETTINGS)
+
+    @pytest.mark.unit
+    def test_memory_lru_eviction(self):
+        """The least recently used phrase leaves memory first."""
+        clip_bytes = _clip(0.1).nbytes
+        cache = PhraseCache(None, SETTINGS, max_memory_bytes=2 * clip_bytes)
+        cache.put("one", _clip(0.1))
+        cache.put("two", _clip(0.1))
+        cache.get("one")
+        cache.put("three", _clip(0.1))
+
+        assert "one" in cache and "three" in cache
+        assert cache.get("two") is None
+
+    @pytest.mark.unit
+    def test_disk_lru_eviction(self, tmp_path):
+        """Files beyond the disk budget go oldest access first."""
+        cache = PhraseCache(tmp_path, SETTINGS, max_memory_bytes=0)
+        cache.put("one", _clip(0.1))
+        file_bytes = os.path.getsize(tmp_path / f"{cache.key('one')}.npy")
+        cache.max_disk_bytes = 2 * file_bytes
+        cache.put("two", _clip(0.1))
+        for name, age in (("one", 20), ("two", 10)):
+            path = tmp_path / f"{cache.key(name)}.npy"
+            os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+
+        cache.get("one")  # Now the most recently used
+        cache.put("three", _clip(0.1))
+
+        assert sorted(p.name for p in tmp_path.glob("*.npy")) == sorted(
+            f"{cache.key(name)}.npy" for name in ("one", "three")
+        )
+
+    @pytest.mark.unit
+    def test_get_or_render_renders_once(self):
+        rendered = []
+
+        def render(text):
+            rendered.append(text)
+            return _clip(0.1)
+
+        cache = PhraseCache(None, SETTINGS)
+        cache.get_or_render("gate", render)
+        cache.get_or_render("gate", render)
+
+        assert rendered == ["gate"]
+
+
+class TestJoinPhrases:
+    """Tests for join_phrases."""
+
+    @pytest.mark.unit
+    def test_silence_trimmed_to_gap(self):
+        silence = np.zeros(1000, dtype=np.float32)
+        clips = [np.concatenate([silence, _clip(0.1), silence]) for _ in range(2)]
+
+        joined = join_phrases(clips, RATE, gap_s=0.01)
+
+        assert len(joined) == 2 * int(0.1 * RATE) + int(0.01 * RATE)
+        assert joined[0] == pytest.approx(0.5) and joined[-1] == pytest.approx(0.5)
+
+
+class TestVocabulary:
+    """Tests for PacenoteGenerator.vocabulary and split_phrases."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", [
+        "two hundred left four tightens",
+        "one thousand hairpin right",
+        "fifty chicane left right into square left",
+        "three hundred onto gravel",
+        "one hundred junction left",
+        "eighty cattle grid",
+    ])
+    def test_pacenotes_split_into_vocabulary(self, text):
+        phrases = PacenoteGenerator.split_phrases(text)
+
+        assert phrases is not None
+        assert " ".join(phrases) == text
+        assert set(phrases) <= set(PacenoteGenerator.vocabulary())
+
+    @pytest.mark.unit
+    def test_longest_match(self):
+        assert PacenoteGenerator.split_phrases("junction right over bridge") == [
+            "junction right", "over bridge",
+        ]
+
+    @pytest.mark.unit
+    def test_unknown_words(self):
+        assert PacenoteGenerator.split_phrases("left four caution") is None
+
+
+class TestAudioPlayerPhraseCache:
+    """Tests for AudioPlayer speech through the phrase cache."""
+
+    @pytest.fixture
+    def player(self, tmp_path):
+        """A player with no samples whose speech renderer records its calls."""
+        player = AudioPlayer(sample_dir=tmp_path / "none", enable_mpris=False,
+                             sink=NullSink(), phrase_cache_dir=tmp_path / "tts")
+        player._has_espeak = True
+        player.rendered = []
+
+        def render(text, sample_rate):
+            player.rendered.append(text)
+            return _clip(0.05)
+
+        player._render_speech = render
+        player.start()
+        player._warm_thread.join(timeout=5)
+        yield player
+        player.stop()
+
+    @pytest.mark.unit
+    def test_vocabulary_warmed(self, player):
+        assert player.rendered == PacenoteGenerator.vocabulary()
+
+    @pytest.mark.unit
+    def test_callouts_joined_from_cached_phrases(self, player):
+        """Pacenotes need no synthesis once the vocabulary is warm."""
+        del player.rendered[:]
+
+        pcm = player._synthesise("two hundred left four into over bridge", RATE)
+
+        assert player.rendered == []
+        assert len(pcm) == 4 * int(0.05 * RATE) + 3 * int(0.04 * RATE)
+
+    @pytest.mark.unit
+    def test_other_text_rendered_once(self, player):
+        del player.rendered[:]
+
+        player._synthesise("left four caution", RATE)
+        player._synthesise("left four caution", RATE)
+
+        assert player.rendered == ["left four caution"]
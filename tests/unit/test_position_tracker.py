@@ -0,0 +1,151 @@
+"""
+Unit tests for the lap timing position tracker.
+Tests lap_timing/core/position_tracker.py with synthetic tracks.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from lap_timing.core.position_tracker import PositionTracker
+from lap_timing.data.models import GPSPoint
+from lap_timing.data.track_loader import Track, calculate_cumulative_distances
+
+ORIGIN_LAT = 52.0
+ORIGIN_LON = -1.0
+METRES_PER_DEG_LAT = 111195.0
+METRES_PER_DEG_LON = METRES_PER_DEG_LAT * math.cos(math.radians(ORIGIN_LAT))
+
+
+def _latlon(x, y):
+    """Convert local east/north metres to lat/lon."""
+    return ORIGIN_LAT + y / METRES_PER_DEG_LAT, ORIGIN_LON + x / METRES_PER_DEG_LON
+
+
+def _track(xy, closed=True):
+    centerline = calculate_cumulative_distances([_latlon(x, y) for x, y in xy])
+    return Track(
+        name="test",
+        outer_boundary=[],
+        inner_boundary=[],
+        centerline=centerline,
+        sf_line=None,
+        length=centerline[-1].distance,
+        is_point_to_point=not closed,
+    )
+
+
+def _circle(radius=200.0, points=250):
+    """Clockwise circle starting at the top, closed back to the start."""
+    angles = np.linspace(0.0, 2 * math.pi, points + 1)
+    return [(radius * math.sin(a), radius * math.cos(a)) for a in angles]
+
+
+def _figure_eight(size=300.0, points=400):
+    """Figure-eight whose two legs cross at the origin."""
+    angles = np.linspace(0.0, 2 * math.pi, points + 1)
+    return [(size * math.sin(a), size * math.sin(a) * math.cos(a)) for a in angles]
+
+
+def _fix(x, y, timestamp=0.0):
+    lat, lon = _latlon(x, y)
+    return GPSPoint(timestamp=timestamp, lat=lat, lon=lon)
+
+
+class TestPositionTracker:
+    """Tests for windowed segment projection."""
+
+    @pytest.mark.unit
+    def test_distance_is_continuous_between_vertices(self):
+        """Test distance along a straight is not quantised to vertex spacing."""
+        tracker = PositionTracker(_track([(0.0, 0.0), (0.0, 100.0), (0.0, 200.0)], closed=False))
+
+        distances = [
+            tracker.get_track_position(_fix(0.0, y)).distance_along_track
+            for y in np.arange(10.0, 90.0, 7.5)
+        ]
+        assert distances == pytest.approx(list(np.arange(10.0, 90.0, 7.5)), abs=0.2)
+
+    @pytest.mark.unit
+    def test_lateral_offset_sign(self):
+        """Test offsets are positive right of the direction of travel."""
+        tracker = PositionTracker(_track([(0.0, 0.0), (0.0, 100.0), (0.0, 200.0)], closed=False))
+
+        right = tracker.get_track_position(_fix(5.0, 50.0))
+        left = tracker.get_track_position(_fix(-3.0, 50.0))
+        assert right.lateral_offset == pytest.approx(5.0, abs=0.05)
+        assert left.lateral_offset == pytest.approx(-3.0, abs=0.05)
+
+    @pytest.mark.unit
+    def test_lateral_offset_sign_at_repeated_point(self):
+        """Test a zero-length segment (duplicated point) keeps the side of the line."""
+        xy = [(0.0, 0.0), (0.0, 100.0), (0.0, 100.0), (0.0, 200.0)]
+        tracker = PositionTracker(_track(xy, closed=False))
+
+        assert tracker._calculate_lateral_offset(*_latlon(4.0, 100.0), 1) == pytest.approx(4.0, abs=0.05)
+        assert tracker._calculate_lateral_offset(*_latlon(-4.0, 100.0), 1) == pytest.approx(-4.0, abs=0.05)
+        # Degenerate last segment takes the direction of the one before
+        tail = PositionTracker(_track(xy[:3], closed=False))
+        assert tail._calculate_lateral_offset(*_latlon(-4.0, 100.0), 1) == pytest.approx(-4.0, abs=0.05)
+
+    @pytest.mark.unit
+    def test_lap_of_circuit(self):
+        """Test a lap of a circle covers the track length and wraps at S/F."""
+        track = _track(_circle())
+        tracker = PositionTracker(track)
+
+        distances = []
+        for a in np.linspace(0.05, 2 * math.pi + 0.05, 200):
+            position = tracker.get_track_position(_fix(205 * math.sin(a), 205 * math.cos(a)))
+            distances.append(position.distance_along_track)
+
+        steps = np.diff(distances)
+        # Monotonic except for the single wrap back to zero
+        assert (steps < 0).sum() == 1
+        assert max(distances) == pytest.approx(track.length, rel=0.01)
+
+    @pytest.mark.unit
+    def test_figure_eight_crossing_keeps_leg(self):
+        """Test passing through the crossing does not jump to the other leg."""
+        track = _track(_figure_eight())
+        tracker = PositionTracker(track)
+
+        distances = []
+        for a in np.linspace(0.05, 2 * math.pi - 0.05, 400):
+            x = 300.0 * math.sin(a)
+            y = 300.0 * math.sin(a) * math.cos(a)
+            distances.append(tracker.get_track_position(_fix(x, y)).distance_along_track)
+
+        steps = np.diff(distances)
+        assert (steps > 0).all()
+        assert steps.max() < 15.0
+
+    @pytest.mark.unit
+    def test_reacquires_after_losing_lock(self):
+        """Test the lock is dropped off track and re-acquired elsewhere."""
+        track = _track(_circle())
+        tracker = PositionTracker(track, lock_distance_m=20.0)
+
+        tracker.get_track_position(_fix(0.0, 200.0))
+        assert tracker.locked_segment is not None
+
+        # Far from the track: no lock held
+        tracker.get_track_position(_fix(0.0, 0.0))
+        assert tracker.locked_segment is None
+
+        # Jump to the opposite side of the circuit
+        position = tracker.get_track_position(_fix(0.0, -200.0))
+        assert position.distance_along_track == pytest.approx(track.length / 2, rel=0.01)
+        assert tracker.locked_segment is not None
+
+    @pytest.mark.unit
+    def test_interpolated_position_is_stateless(self):
+        """Test get_interpolated_position does not touch the tracking lock."""
+        track = _track(_circle())
+        tracker = PositionTracker(track)
+        lat, lon = _latlon(200.0, 0.0)
+
+        position = tracker.get_interpolated_position(lat, lon)
+        assert position.distance_along_track == pytest.approx(track.length / 4, rel=0.01)
+        assert tracker.locked_segment is None
@@ -0,0 +1,219 @@
+"""Tests for utils/raw_channel_log.py - high-rate raw channel logging."""
+
+import csv
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from utils.hardware_base import BoundedQueueHardwareHandler
+from utils.raw_channel_log import (
+    ChannelTap,
+    RawChannelLogger,
+    export_csv,
+    iter_blocks,
+    radar_track_rows,
+)
+from utils.telemetry_recorder import TelemetryFrame, TelemetryRecorder
+
+
+class _Handler(BoundedQueueHardwareHandler):
+    """Minimal handler for publishing snapshots directly."""
+
+    def _worker_loop(self):
+        pass
+
+
+class TestChannelTap:
+    """Tests for the per-handler ring buffer."""
+
+    @pytest.mark.unit
+    def test_push_and_drain(self):
+        """Samples drain in order with timestamps, NaN for missing keys."""
+        tap = ChannelTap("imu", ("accel_x", "accel_y"), capacity=8)
+        tap.push(1.0, {"accel_x": 0.1, "accel_y": 0.2})
+        tap.push(2.0, {"accel_x": 0.3})
+
+        rows = tap.drain()
+        assert rows.shape == (2, 3)
+        assert rows[0].tolist() == [1.0, 0.1, 0.2]
+        assert rows[1, 1] == 0.3
+        assert np.isnan(rows[1, 2])
+        assert len(tap.drain()) == 0
+
+    @pytest.mark.unit
+    def test_drain_across_wrap(self):
+        """Draining across the end of the ring keeps sample order."""
+        tap = ChannelTap("obd2", ("engine_rpm",), capacity=4)
+        for i in range(3):
+            tap.push(float(i), {"engine_rpm": i})
+        tap.drain()
+        for i in range(3, 6):
+            tap.push(float(i), {"engine_rpm": i})
+
+        assert tap.drain()[:, 1].tolist() == [3.0, 4.0, 5.0]
+        assert tap.samples_lost == 0
+
+    @pytest.mark.unit
+    def test_overrun_keeps_newest(self):
+        """When the consumer falls behind, the oldest samples are lost."""
+        tap = ChannelTap("imu", ("accel_x",), capacity=4)
+        for i in range(10):
+            tap.push(float(i), {"accel_x": i})
+
+        assert tap.drain()[:, 0].tolist() == [7.0, 8.0, 9.0]
+        assert tap.samples_lost == 7
+
+    @pytest.mark.unit
+    def test_multi_row_snapshot(self):
+        """Radar snapshots become one row per track."""
+        tap = ChannelTap("radar", ("track_id", "long_dist"), rows_of=radar_track_rows)
+        tap.push(1.0, {
+            3: {"track_id": 3, "long_dist": 20.0, "new_track": False},
+            7: {"track_id": 7, "long_dist": 35.5, "new_track": True},
+        })
+
+        rows = tap.drain()
+        assert rows[:, 1].tolist() == [3.0, 7.0]
+        assert rows[:, 2].tolist() == [20.0, 35.5]
+
+    @pytest.mark.unit
+    def test_non_numeric_sample_skipped(self):
+        """Samples with non-numeric captured values are skipped."""
+        tap = ChannelTap("gps", ("latitude",))
+        tap.push(1.0, {"latitude": "invalid"})
+        tap.push(2.0, {"latitude": 52.0})
+
+        assert tap.drain()[:, 0].tolist() == [2.0]
+
+    @pytest.mark.unit
+    def test_handler_publish_feeds_tap(self):
+        """Every published snapshot reaches the attached tap."""
+        handler = _Handler()
+        tap = ChannelTap("imu", ("accel_x",))
+        handler.set_log_tap(tap)
+        for i in range(5):
+            handler._publish_snapshot({"accel_x": i * 0.1})
+        handler.set_log_tap(None)
+        handler._publish_snapshot({"accel_x": 9.0})
+
+        assert len(tap.drain()) == 5
+
+
+class TestRawChannelLogger:
+    """Tests for the logger thread and file format."""
+
+    @pytest.mark.unit
+    def test_concurrent_producer_round_trip(self, tmp_path):
+        """Samples pushed from a producer thread all reach the file."""
+        path = str(tmp_path / "s.raw.tlm")
+        imu = ChannelTap("imu", ("accel_x",), capacity=1024)
+        obd = ChannelTap("obd2", ("engine_rpm",), capacity=256)
+        raw_logger = RawChannelLogger(path, [imu, obd], flush_interval_s=0.005)
+        raw_logger.start(time.time())
+
+        def produce():
+            for i in range(1000):
+                imu.push(float(i), {"accel_x": i})
+                if i % 10 == 0:
+                    obd.push(float(i), {"engine_rpm": 3000 + i})
+                if i % 100 == 0:
+                    time.sleep(0.002)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join()
+        raw_logger.stop()
+
+        by_source = {}
+        for name, keys, block in iter_blocks(path):
+            by_source.setdefault(name, []).append(block)
+        imu_rows = np.concatenate(by_source["imu"])
+        obd_rows = np.concatenate(by_source["obd2"])
+
+        assert imu.samples_lost == 0
+        assert imu_rows["accel_x"].tolist() == [float(i) for i in range(1000)]
+        assert len(obd_rows) == 100
+        assert obd_rows["engine_rpm"][1] == 3010.0
+
+    @pytest.mark.unit
+    def test_export_csv_per_source(self, tmp_path):
+        """Export writes one CSV per source with its own columns."""
+        path = str(tmp_path / "s.raw.tlm")
+        tap = ChannelTap("gps", ("latitude", "speed_kmh"))
+        raw_logger = RawChannelLogger(path, [tap], flush_interval_s=10.0)
+        raw_logger.start(time.time())
+        tap.push(1704067200.05, {"latitude": 52.0712, "speed_kmh": None})
+        raw_logger.stop()
+
+        outputs = export_csv(path, str(tmp_path / "s"))
+        with open(outputs["gps"], newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        assert list(rows[0].keys()) == ["timestamp", "latitude", "speed_kmh"]
+        assert rows[0]["latitude"] == "52.0712"
+        assert rows[0]["speed_kmh"] == ""
+        assert float(rows[0]["timestamp"]) == 1704067200.05
+
+    @pytest.mark.unit
+    def test_gps_position_full_precision(self, tmp_path):
+        """Latitude and longitude are stored as float64, other channels as float32."""
+        path = str(tmp_path / "s.raw.tlm")
+        tap = ChannelTap("gps", ("latitude", "longitude", "speed_kmh"))
+        raw_logger = RawChannelLogger(path, [tap], flush_interval_s=10.0)
+        raw_logger.start(time.time())
+        tap.push(1704067200.0, {"latitude": 52.0712345, "longitude": -1.0167891, "speed_kmh": 1.1})
+        raw_logger.stop()
+
+        (_, _, block), = iter_blocks(path)
+        assert abs(block["latitude"][0] - 52.0712345) < 1e-6
+        assert abs(block["longitude"][0] - -1.0167891) < 1e-6
+        assert block.dtype["speed_kmh"] == np.dtype("<f4")
+
+        outputs = export_csv(path, str(tmp_path / "s"))
+        with open(outputs["gps"], newline="", encoding="utf-8") as f:
+            row = next(csv.DictReader(f))
+        assert row["latitude"] == "52.0712345"
+
+
+class TestRecorderRawSources:
+    """Tests for TelemetryRecorder raw source integration."""
+
+    @pytest.mark.unit
+    def test_recording_taps_registered_handlers(self, tmp_path):
+        """Registered handlers are tapped only while recording."""
+        handler = _Handler()
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.register_raw_source("imu", handler, ("accel_x",))
+
+        recorder.start_recording()
+        assert handler.log_tap is not None
+        raw_partial = recorder.raw_path
+        for i in range(20):
+            handler._publish_snapshot({"accel_x": float(i)})
+        recorder.record_frame(TelemetryFrame(timestamp=time.time()))
+        recorder.stop_recording()
+        recorder.save()
+
+        assert handler.log_tap is None
+        raw_path = raw_partial[:-len(".partial")]
+        assert os.path.exists(raw_path)
+        blocks = [block for _, _, block in iter_blocks(raw_path)]
+        assert sum(len(b) for b in blocks) == 20
+
+    @pytest.mark.unit
+    def test_discard_removes_raw_log(self, tmp_path):
+        """Discarding removes the raw partial file and detaches taps."""
+        handler = _Handler()
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.register_raw_source("imu", handler, ("accel_x",))
+
+        recorder.start_recording()
+        handler._publish_snapshot({"accel_x": 1.0})
+        recorder.stop_recording()
+        recorder.discard()
+
+        assert handler.log_tap is None
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,258 @@
+"""Tests for copilot/sqlite_cache.py - region loads from the SQLite map cache."""
+
+import struct
+
+import pytest
+
+from copilot.sqlite_cache import (
+    Barrier,
+    Node,
+    RailwayCrossing,
+    SQLiteMapCache,
+    Way,
+    _block_ranges,
+    _pbf_blocks,
+)
+
+LAT0, LON0 = 52.0, -1.0
+DEG_PER_KM = 1 / 111.0
+
+
+def _node(nid, east_km, north_km):
+    return Node(nid, LAT0 + north_km * DEG_PER_KM, LON0 + east_km * DEG_PER_KM / 0.6157)
+
+
+def _way_node_indices(cache):
+    return {row[1] for row in cache._get_conn().execute("PRAGMA index_list(way_nodes)")}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    A cross of two roads at the origin, plus a road 10km away.
+
+    Way 1 runs north through the origin out to 5km (beyond a 2km query),
+    with node ids out of order along the way. Way 2 crosses it east-west.
+    Way 3 leaves way 1's far end, outside the query area.
+    """
+    nodes = {
+        n.id: n for n in [
+            _node(30, 0.0, -1.0), _node(10, 0.0, 0.0), _node(20, 0.0, 1.0),
+            _node(5, 0.0, 5.0),
+            _node(40, -1.0, 0.0), _node(41, 1.0, 0.0),
+            _node(50, 1.0, 5.0),
+            _node(60, 10.0, 10.0), _node(61, 10.0, 11.0),
+        ]
+    }
+    ways = {
+        1: Way(1, [30, 10, 20, 5], name="High Street", highway_type="primary",
+               bridge=True, speed_limit=50),
+        2: Way(2, [40, 10, 41], highway_type="residential"),
+        3: Way(3, [5, 50], highway_type="residential"),
+        4: Way(4, [60, 61], highway_type="residential"),
+    }
+    crossings = {41: RailwayCrossing(41, nodes[41].lat, nodes[41].lon)}
+    barriers = {
+        40: Barrier(40, nodes[40].lat, nodes[40].lon, "cattle_grid"),
+        60: Barrier(60, nodes[60].lat, nodes[60].lon, "gate"),
+    }
+    cache = SQLiteMapCache(tmp_path / "test.roads.db")
+    cache.import_network(nodes, ways, crossings, barriers)
+    yield cache
+    cache.close()
+
+
+class TestLoadRegion:
+    """Tests for SQLiteMapCache.load_region."""
+
+    @pytest.mark.unit
+    def test_ways_touching_region_with_full_geometry(self, cache):
+        """Ways with a node in the region load with all their nodes, in order."""
+        network = cache.load_region(LAT0, LON0, 2000)
+
+        assert set(network.ways) == {1, 2}
+        assert network.ways[1].nodes == [30, 10, 20, 5]
+        assert network.ways[2].nodes == [40, 10, 41]
+        # Node 5 is outside the region but part of way 1
+        assert set(network.nodes) == {30, 10, 20, 5, 40, 41}
+        assert network.get_way_geometry(1)[-1] == pytest.approx(
+            (LAT0 + 5 * DEG_PER_KM, LON0)
+        )
+
+    @pytest.mark.unit
+    def test_way_attributes(self, cache):
+        """Way tags are loaded."""
+        way = cache.load_region(LAT0, LON0, 2000).ways[1]
+
+        assert way.name == "High Street"
+        assert way.highway_type == "primary"
+        assert way.bridge is True and way.tunnel is False
+        assert way.speed_limit == 50
+
+    @pytest.mark.unit
+    def test_junctions_and_node_index(self, cache):
+        """Shared nodes are junctions listing every connected way."""
+        network = cache.load_region(LAT0, LON0, 2000)
+
+        assert network.node_to_ways[10] == [1, 2]
+        assert network.node_to_ways[5] == [1]
+        assert set(network.junctions) == {10}
+        assert network.junctions[10].connected_ways == [1, 2]
+
+        # Node 5 joins way 3, which is outside the region
+        network = cache.load_region(LAT0 + 5 * DEG_PER_KM, LON0, 500)
+        assert set(network.ways) == {1, 3}
+        assert network.junctions[5].connected_ways == [1, 3]
+
+    @pytest.mark.unit
+    def test_crossings_and_barriers_on_loaded_roads(self, cache):
+        """Only crossings and barriers in the region are loaded."""
+        network = cache.load_region(LAT0, LON0, 2000)
+
+        assert set(network.railway_crossings) == {41}
+        assert network.barriers[40].barrier_type == "cattle_grid"
+        assert 60 not in network.barriers
+
+    @pytest.mark.unit
+    def test_empty_region(self, cache):
+        """A region with no roads gives an empty network."""
+        network = cache.load_region(LAT0 - 1.0, LON0, 2000)
+
+        assert network.ways == {} and network.nodes == {}
+        assert network.junctions == {}
+
+    @pytest.mark.unit
+    def test_repeated_loads_independent(self, cache):
+        """The temp tables from one load do not leak into the next."""
+        cache.load_region(LAT0, LON0, 2000)
+        network = cache.load_region(LAT0 + 10 * DEG_PER_KM, LON0 + 10 * DEG_PER_KM / 0.6157, 500)
+
+        assert set(network.ways) == {4}
+
+    @pytest.mark.unit
+    def test_no_transaction_left_open(self, cache):
+        """Loads end their temp table transaction, whether or not roads were found."""
+        cache.load_region(LAT0, LON0, 2000)
+        assert not cache._get_conn().in_transaction
+
+        cache.load_region(LAT0 - 1.0, LON0, 2000)
+        assert not cache._get_conn().in_transaction
+
+
+class TestImportNetwork:
+    """Tests for the tables SQLiteMapCache.import_network builds."""
+
+    @pytest.mark.unit
+    def test_indices_and_rtrees_built_after_insert(self, cache):
+        """Bulk loads drop the way_nodes indices; they and the R-trees are rebuilt."""
+        conn = cache._get_conn()
+
+        assert {"idx_way_nodes_node", "idx_way_nodes_way"} <= _way_node_indices(cache)
+        assert conn.execute("SELECT COUNT(*) FROM node_rtree").fetchone()[0] == 9
+        assert conn.execute("SELECT COUNT(*) FROM barrier_rtree").fetchone()[0] == 2
+
+    @pytest.mark.unit
+    def test_failed_import_restores_indices(self, cache, monkeypatch):
+        """An import that raises does not leave way_nodes without its indices."""
+        def fail(*args):
+            raise RuntimeError("import aborted")
+
+        monkeypatch.setattr(cache, "_insert_nodes", fail)
+        with pytest.raises(RuntimeError):
+            cache.import_network({}, {1: Way(1, [1, 2])})
+
+        assert {"idx_way_nodes_node", "idx_way_nodes_way"} <= _way_node_indices(cache)
+
+    @pytest.mark.unit
+    def test_reopen_recreates_missing_indices(self, cache):
+        """Opening a current-schema cache rebuilds indices a crashed import dropped."""
+        cache._get_conn().executescript("""
+            DROP INDEX idx_way_nodes_node;
+            DROP INDEX idx_way_nodes_way;
+        """)
+        cache.close()
+
+        reopened = SQLiteMapCache(cache.db_path)
+        try:
+            assert {"idx_way_nodes_node", "idx_way_nodes_way"} <= _way_node_indices(reopened)
+        finally:
+            reopened.close()
+
+    @pytest.mark.unit
+    def test_reimport_replaces_bounds(self, cache):
+        """Bounds cached by one import are not reused by the next."""
+        nodes = {1: _node(1, 0.0, 20.0), 2: _node(2, 0.0, 21.0)}
+        cache.import_network(nodes, {1: Way(1, [1, 2])})
+
+        min_lat, _, max_lat, _ = cache.get_bounds()
+        assert min_lat == pytest.approx(LAT0 + 20 * DEG_PER_KM, abs=1e-5)
+        assert max_lat == pytest.approx(LAT0 + 21 * DEG_PER_KM, abs=1e-5)
+
+    @pytest.mark.unit
+    def test_t_junction(self, tmp_path):
+        """A side road meeting a through road at right angles is a T-junction."""
+        nodes = {n.id: n for n in [
+            _node(1, 0.0, -1.0), _node(2, 0.0, 0.0), _node(3, 0.0, 1.0), _node(4, 1.0, 0.0),
+        ]}
+        cache = SQLiteMapCache(tmp_path / "t.roads.db")
+        cache.import_network(nodes, {1: Way(1, [1, 2, 3]), 2: Way(2, [2, 4])})
+
+        network = cache.load_region(LAT0, LON0, 2000)
+        assert network.junctions[2].is_t_junction is True
+        assert network.junctions[2].connected_ways == [1, 2]
+        cache.close()
+
+
+def _blob_header(blob_type, data_size):
+    """Encode a PBF BlobHeader (type and datasize fields)."""
+    encoded = blob_type.encode()
+    return bytes([0x0A, len(encoded)]) + encoded + bytes([0x18]) + _varint(data_size)
+
+
+def _varint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class TestPbfBlocks:
+    """Tests for splitting PBF files into blocks for the nodes pass."""
+
+    @pytest.mark.unit
+    def test_header_and_data_blocks(self, tmp_path):
+        """The OSMHeader block is returned whole, data blocks as offsets."""
+        blocks = [("OSMHeader", 10), ("OSMData", 300), ("OSMData", 5), ("OSMData", 200)]
+        data = b""
+        expected = []
+        for blob_type, size in blocks:
+            header = _blob_header(blob_type, size)
+            block = struct.pack(">I", len(header)) + header + bytes(size)
+            if blob_type == "OSMData":
+                expected.append((len(data), len(block)))
+            else:
+                header_block = block
+            data += block
+        path = tmp_path / "test.osm.pbf"
+        path.write_bytes(data)
+
+        header, found = _pbf_blocks(path)
+
+        assert header == header_block
+        assert found == expected
+        assert _block_ranges(found, 2) == [
+            (expected[0][0], expected[1][0] + expected[1][1]),
+            (expected[2][0], len(data)),
+        ]
+
+    @pytest.mark.unit
+    def test_not_a_pbf(self, tmp_path):
+        """Files without an OSMHeader block are rejected."""
+        path = tmp_path / "test.osm.pbf"
+        header = _blob_header("OSMData", 4)
+        path.write_bytes(struct.pack(">I", len(header)) + header + bytes(4))
+
+        with pytest.raises(ValueError):
+            _pbf_blocks(path)
@@ -0,0 +1,137 @@
+"""Tests for utils/telemetry_assembler.py - telemetry row assembly."""
+
+import math
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.hardware_base import HardwareSnapshot
+from utils.telemetry_assembler import TelemetryRowAssembler
+from utils.telemetry_stream import CHANNEL_INDEX, CHANNEL_NAMES
+
+
+def _handler(**methods):
+    return SimpleNamespace(**{name: (lambda v=v: v) for name, v in methods.items()})
+
+
+def _sources(**overrides):
+    """Fake handlers mirroring the shapes of the real get_* results."""
+    zones = {
+        "FL": {"left_median": 80.0, "centre_median": 82.0, "right_median": 84.0},
+        "FR": {"left_median": 81.0, "centre_median": 83.0, "right_median": 85.0},
+        "RL": None,
+        "RR": {"left_median": 70.0, "centre_median": 71.0, "right_median": 72.0},
+    }
+    sources = SimpleNamespace(
+        tpms=_handler(get_data={
+            "FL": {"pressure": 2.1, "temp": 30.0, "status": "OK"},
+            "FR": {"pressure": 2.2, "temp": 31.0, "status": "OK"},
+            "RL": {"pressure": None, "temp": None, "status": "N/A"},
+            "RR": {"pressure": 2.0, "temp": 29.0, "status": "OK"},
+        }),
+        thermal=SimpleNamespace(get_zone_data=zones.get),
+        brakes=_handler(get_temps={
+            "FL": {"temp": 350.0}, "FR": {"temp": 355.0},
+            "RL": {"temp": None}, "RR": 300.0,
+        }),
+        imu=_handler(get_data={"accel_x": 0.5, "accel_y": -1.2, "accel_z": 1.0}),
+        obd2=_handler(get_data={"engine_rpm": 6500, "obd_speed_kmh": 120.0}),
+        gps=_handler(get_snapshot=HardwareSnapshot(
+            timestamp=0.0,
+            data={"has_fix": True, "latitude": 52.07, "longitude": -1.01,
+                  "speed_kmh": 121.0, "heading": 90.0},
+        )),
+        lap_timing=_handler(get_snapshot=HardwareSnapshot(
+            timestamp=0.0,
+            data={"lap_number": 3, "current_lap_time": 45.2, "delta_seconds": -0.4,
+                  "current_sector": 2, "sector_times": [30.1, 15.1],
+                  "track_position": 0.42, "track_name": "Silverstone"},
+        )),
+        fuel_tracker=_handler(get_state={
+            "data_available": True, "fuel_level_percent": 55.0,
+            "fuel_rate_lph": 20.0, "current_lap_consumption_litres": 1.2,
+        }),
+        ant_hr=_handler(get_heart_rate=150),
+    )
+    for name, value in overrides.items():
+        setattr(sources, name, value)
+    return sources
+
+
+def _value(row, channel):
+    return row[CHANNEL_INDEX[channel]]
+
+
+class TestTelemetryRowAssembler:
+    """Tests for TelemetryRowAssembler."""
+
+    @pytest.mark.unit
+    def test_assembles_all_sources(self):
+        """Every handler's values land in their channel slots."""
+        assembler = TelemetryRowAssembler()
+        row, strings = assembler.assemble(_sources(), 1704067200.0)
+
+        assert len(row) == len(CHANNEL_NAMES)
+        assert _value(row, "timestamp") == 1704067200.0
+        assert _value(row, "tpms_fr_pressure") == 2.2
+        assert math.isnan(_value(row, "tpms_rl_pressure"))
+        assert _value(row, "tyre_fl_inner") == 80.0
+        assert _value(row, "tyre_rr_outer") == 72.0
+        assert math.isnan(_value(row, "tyre_rl_centre"))
+        assert _value(row, "brake_fr") == 355.0
+        assert _value(row, "brake_rr") == 300.0
+        assert math.isnan(_value(row, "brake_rl"))
+        assert _value(row, "accel_y") == -1.2
+        assert math.isnan(_value(row, "gyro_x"))
+        assert _value(row, "engine_rpm") == 6500
+        assert _value(row, "gps_heading") == 90.0
+        assert _value(row, "lap_delta") == -0.4
+        assert _value(row, "sector_time") == 15.1
+        assert _value(row, "fuel_consumption_lap_litres") == 1.2
+        assert _value(row, "heart_rate_bpm") == 150
+        assert strings["track_name"] == "Silverstone"
+
+    @pytest.mark.unit
+    def test_missing_handlers_and_gates(self):
+        """Absent handlers, no GPS fix and no fuel data leave slots missing."""
+        sources = _sources(
+            tpms=None, thermal=None, brakes=None, imu=None, obd2=None,
+            lap_timing=None, ant_hr=None,
+            gps=_handler(get_snapshot=HardwareSnapshot(
+                timestamp=0.0, data={"has_fix": False, "latitude": 1.0},
+            )),
+            fuel_tracker=_handler(get_state={"data_available": False}),
+        )
+        row, strings = TelemetryRowAssembler().assemble(sources, 1.0)
+
+        assert np.isnan(np.delete(row, CHANNEL_INDEX["timestamp"])).all()
+        assert strings["track_name"] is None
+
+    @pytest.mark.unit
+    def test_row_is_reset_between_frames(self):
+        """Values from a previous frame do not leak into the next."""
+        assembler = TelemetryRowAssembler()
+        assembler.assemble(_sources(), 1.0)
+        row, strings = assembler.assemble(_sources(obd2=None, lap_timing=None), 2.0)
+
+        assert math.isnan(_value(row, "engine_rpm"))
+        assert strings["track_name"] is None
+
+    @pytest.mark.unit
+    @pytest.mark.benchmark
+    def test_per_frame_cost(self):
+        """Assembling a frame stays well inside the render frame budget."""
+        assembler = TelemetryRowAssembler()
+        sources = _sources()
+        for _ in range(100):
+            assembler.assemble(sources, 0.0)
+
+        iterations = 2000
+        start = time.perf_counter()
+        for _ in range(iterations):
+            assembler.assemble(sources, 0.0)
+        per_frame_us = (time.perf_counter() - start) / iterations * 1e6
+
+        assert per_frame_us < 50.0
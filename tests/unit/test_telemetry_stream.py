@@ -0,0 +1,231 @@
+"""Tests for utils/telemetry_stream.py and streaming TelemetryRecorder."""
+
+import csv
+import os
+import time
+
+import numpy as np
+import pytest
+
+from utils.telemetry_recorder import TelemetryFrame, TelemetryRecorder
+from utils.telemetry_stream import (
+    CHANNEL_INDEX,
+    CHANNEL_NAMES,
+    INT_MISSING,
+    TelemetryStreamWriter,
+    export_csv,
+    iter_blocks,
+)
+
+
+def _frame(i):
+    """Build a frame with a mix of float, int, string and missing fields."""
+    return TelemetryFrame(
+        timestamp=1704067200.0 + i * 0.1,
+        tpms_fl_pressure=2.1,
+        brake_fl=350.5 + i,
+        engine_rpm=3000 + i,
+        gps_latitude=52.0712 if i % 2 == 0 else None,
+        track_name="Silverstone" if i < 5 else "Brands Hatch",
+    )
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class TestTelemetryStreamWriter:
+    """Tests for the block writer and reader."""
+
+    @pytest.mark.unit
+    def test_round_trip_across_blocks(self, tmp_path):
+        """Rows written across several blocks read back in order."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=4)
+        writer.open(time.time())
+        for i in range(10):
+            writer.append_frame(_frame(i))
+        writer.close()
+
+        blocks = list(iter_blocks(path))
+        assert [len(b) for b, _ in blocks] == [4, 4, 2]
+        rows = np.concatenate([b for b, _ in blocks])
+        assert rows["engine_rpm"].tolist() == [3000 + i for i in range(10)]
+        assert rows["timestamp"][9] == pytest.approx(1704067200.9)
+        assert np.isnan(rows["gps_latitude"][1])
+        assert rows["lap_number"][0] == INT_MISSING
+        assert writer.rows_written == 10
+
+    @pytest.mark.unit
+    def test_gps_position_full_precision(self, tmp_path):
+        """Latitude and longitude survive the round trip to better than 1e-6 degrees."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=4)
+        writer.open(time.time())
+        writer.append_frame(TelemetryFrame(
+            timestamp=1704067200.0, gps_latitude=52.0712345, gps_longitude=-1.0167891,
+        ))
+        writer.close()
+
+        (block, _), = iter_blocks(path)
+        assert abs(block["gps_latitude"][0] - 52.0712345) < 1e-6
+        assert abs(block["gps_longitude"][0] - -1.0167891) < 1e-6
+
+        csv_path = str(tmp_path / "s.csv")
+        export_csv(path, csv_path)
+        row = _read_csv(csv_path)[0]
+        assert row["gps_latitude"] == "52.0712345"
+        assert row["gps_longitude"] == "-1.0167891"
+
+    @pytest.mark.unit
+    def test_append_row_with_strings(self, tmp_path):
+        """Preassembled rows and string channels round-trip."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=4)
+        writer.open(time.time())
+        row = np.full(len(CHANNEL_NAMES), np.nan)
+        row[CHANNEL_INDEX["timestamp"]] = 1704067200.0
+        row[CHANNEL_INDEX["engine_rpm"]] = 40000  # Out of int16 range
+        row[CHANNEL_INDEX["brake_fl"]] = 400.0
+        writer.append_row(row, {"track_name": "Snetterton"})
+        writer.close()
+
+        (block, strings), = list(iter_blocks(path))
+        assert block["brake_fl"][0] == 400.0
+        assert block["engine_rpm"][0] == INT_MISSING
+        assert strings[block["track_name"][0]] == "Snetterton"
+
+    @pytest.mark.unit
+    def test_truncated_file_reads_complete_blocks(self, tmp_path):
+        """A file cut mid-block yields every block before the cut."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=4)
+        writer.open(time.time())
+        for i in range(8):
+            writer.append_frame(_frame(i))
+        writer.close()
+
+        size = os.path.getsize(path)
+        with open(path, "r+b") as f:
+            f.truncate(size - 10)
+
+        blocks = list(iter_blocks(path))
+        assert len(blocks) == 1
+        assert len(blocks[0][0]) == 4
+
+    @pytest.mark.unit
+    def test_not_a_stream_file(self, tmp_path):
+        """Non-stream files are rejected."""
+        path = tmp_path / "x.tlm"
+        path.write_bytes(b"timestamp,brake_fl\n")
+        with pytest.raises(ValueError):
+            list(iter_blocks(str(path)))
+
+    @pytest.mark.unit
+    def test_dropped_block_when_writer_behind(self, tmp_path):
+        """Blocks are dropped, not queued without bound, if the writer stalls."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=1, max_pending_blocks=1)
+        # Not opened: no writer thread drains the queue
+        for i in range(3):
+            writer.append_frame(_frame(i))
+        assert writer.blocks_dropped == 2
+
+
+class TestExportCSV:
+    """Tests for CSV export."""
+
+    @pytest.mark.unit
+    def test_export_matches_frame_layout(self, tmp_path):
+        """Exported CSV has TelemetryFrame.to_dict() columns and values."""
+        path = str(tmp_path / "s.tlm")
+        writer = TelemetryStreamWriter(path, block_rows=3)
+        writer.open(time.time())
+        for i in range(7):
+            writer.append_frame(_frame(i))
+        writer.close()
+
+        csv_path = str(tmp_path / "s.csv")
+        assert export_csv(path, csv_path) == 7
+
+        rows = _read_csv(csv_path)
+        assert tuple(rows[0].keys()) == tuple(_frame(0).to_dict().keys())
+        assert tuple(rows[0].keys()) == CHANNEL_NAMES
+        assert rows[0]["brake_fl"] == "350.5"
+        assert rows[0]["tpms_fl_pressure"] == "2.1"
+        assert rows[0]["engine_rpm"] == "3000"
+        assert rows[0]["gps_latitude"] == "52.0712"
+        assert rows[1]["gps_latitude"] == ""
+        assert rows[0]["lap_number"] == ""
+        assert rows[4]["track_name"] == "Silverstone"
+        assert rows[6]["track_name"] == "Brands Hatch"
+        assert float(rows[3]["timestamp"]) == pytest.approx(1704067200.3)
+
+
+class TestTelemetryRecorder:
+    """Tests for the streaming TelemetryRecorder."""
+
+    @pytest.mark.unit
+    def test_save_writes_stream_and_csv(self, tmp_path):
+        """Saving finalises the stream file and has exported CSV on return."""
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.start_recording()
+        partial = recorder.stream_path
+        assert partial.endswith(".tlm.partial")
+        assert os.path.exists(partial)
+
+        for i in range(5):
+            recorder.record_frame(_frame(i))
+        assert recorder.get_frame_count() == 5
+
+        recorder.stop_recording()
+        csv_path = recorder.save()
+
+        assert not os.path.exists(partial)
+        assert os.path.exists(partial[:-len(".partial")])
+        assert len(_read_csv(csv_path)) == 5
+
+    @pytest.mark.unit
+    def test_save_in_background(self, tmp_path):
+        """The background export has written the CSV once wait_for_export returns."""
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.start_recording()
+        for i in range(5):
+            recorder.record_frame(_frame(i))
+        recorder.stop_recording()
+
+        csv_path = recorder.save_in_background()
+
+        assert recorder.wait_for_export(timeout=5.0)
+        assert len(_read_csv(csv_path)) == 5
+
+    @pytest.mark.unit
+    def test_discard_removes_partial_file(self, tmp_path):
+        """Discarding deletes the partial stream file."""
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.start_recording()
+        partial = recorder.stream_path
+        recorder.record_frame(_frame(0))
+        recorder.stop_recording()
+        recorder.discard()
+
+        assert not os.path.exists(partial)
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.unit
+    def test_save_without_frames(self, tmp_path):
+        """Saving an empty recording returns None and leaves no files."""
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.start_recording()
+        recorder.stop_recording()
+
+        assert recorder.save() is None
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.unit
+    def test_frames_ignored_when_not_recording(self, tmp_path):
+        """Frames outside a recording are ignored."""
+        recorder = TelemetryRecorder(output_dir=str(tmp_path))
+        recorder.record_frame(_frame(0))
+        assert recorder.get_frame_count() == 0
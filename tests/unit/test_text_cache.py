@@ -0,0 +1,115 @@
+"""Tests for gui/text_cache.py - shared text and glyph cache."""
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from config import FONT_PATH  # noqa: E402
+from gui.text_cache import TextCache, get_font  # noqa: E402
+
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return pygame.font.Font(FONT_PATH, 24)
+
+
+class TestTextCache:
+    """Tests for TextCache.render and TextCache.draw."""
+
+    @pytest.mark.unit
+    def test_label_rendered_once(self, font):
+        cache = TextCache()
+
+        first = cache.render(font, "Tyres", WHITE)
+
+        assert cache.render(font, "Tyres", WHITE) is first
+        assert cache.render(font, "Tyres", RED) is not first
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", ["59.9", "1:23.456", "-0.45", "120 km/h", "32.1 psi", "85°C"])
+    def test_numbers_drawn_from_atlas_match_font(self, font, text):
+        """Numeric readouts are drawn from glyphs, pixel for pixel as blitting font.render()."""
+        cache = TextCache()
+        expected = pygame.Surface((200, 50))
+        expected.fill((20, 40, 60))
+        drawn = expected.copy()
+        rendered = font.render(text, True, RED)
+        expected.blit(rendered, rendered.get_rect(center=(100, 25)))
+
+        rect = cache.draw(drawn, font, text, RED, center=(100, 25))
+
+        assert rect == rendered.get_rect(center=(100, 25))
+        assert np.array_equal(pygame.surfarray.array3d(drawn), pygame.surfarray.array3d(expected))
+        assert cache.stats()["atlas_draws"] == 1
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.unit
+    def test_draw_falls_back_to_rendered_text(self, font):
+        cache = TextCache()
+        surface = pygame.Surface((200, 50))
+
+        cache.draw(surface, font, "Tyres", WHITE)
+
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["atlas_draws"] == 0
+
+    @pytest.mark.unit
+    def test_outline_adds_a_pixel_border(self, font):
+        cache = TextCache()
+        plain = font.render("88", True, WHITE)
+
+        outlined = cache.render(font, "88", WHITE, outline=(0, 0, 0))
+
+        assert outlined.get_size() == (plain.get_width() + 2, plain.get_height() + 2)
+        assert cache.render(font, "88", WHITE, outline=(0, 0, 0)) is outlined
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self, font):
+        cache = TextCache(max_entries=2)
+        first = cache.render(font, "Front", WHITE)
+        second = cache.render(font, "Rear", WHITE)
+        cache.render(font, "Front", WHITE)
+        cache.render(font, "Best", WHITE)
+
+        assert cache.render(font, "Front", WHITE) is first
+        assert cache.render(font, "Rear", WHITE) is not second
+
+    @pytest.mark.unit
+    def test_memory_budget(self, font):
+        cache = TextCache(max_bytes=1)
+
+        cache.render(font, "Tyres", WHITE)
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    @pytest.mark.unit
+    def test_hit_rate_counts_atlas_draws(self, font):
+        cache = TextCache()
+        surface = pygame.Surface((100, 50))
+        cache.render(font, "Best", WHITE)
+        cache.render(font, "Best", WHITE)
+        cache.draw(surface, font, "1.0", WHITE)
+        cache.draw(surface, font, "1.1", WHITE)
+
+        assert cache.stats()["hit_rate"] == pytest.approx(0.75)
+
+
+class TestGetFont:
+    """Tests for get_font."""
+
+    @pytest.mark.unit
+    def test_font_shared_per_path_and_size(self):
+        assert get_font(FONT_PATH, 20) is get_font(FONT_PATH, 20)
+        assert get_font(FONT_PATH, 20) is not get_font(FONT_PATH, 22)
+
+    @pytest.mark.unit
+    def test_missing_file_falls_back(self):
+        assert get_font("/nonexistent/font.ttf", 20).get_height() > 0
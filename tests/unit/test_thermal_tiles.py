@@ -0,0 +1,134 @@
+"""Tests for gui/thermal_tiles.py - cached thermal tile rendering."""
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gui.display import Display  # noqa: E402
+from gui.thermal_tiles import ThermalTileRenderer, heat_colours  # noqa: E402
+
+THRESHOLDS = (40.0, 80.0, 100.0)
+WIDTH, HEIGHT = 90, 70
+
+
+@pytest.fixture
+def tiles():
+    pygame.font.init()
+    return ThermalTileRenderer(pygame.font.Font(None, 18), WIDTH, HEIGHT, temp_step=0.5)
+
+
+def _column_colours(tile, zone):
+    """Colour of each row at the middle of a zone's column (clear of text and lines)."""
+    x = zone * (WIDTH // 3) + 3
+    return [tuple(tile.get_at((x, y)))[:3] for y in range(HEIGHT)]
+
+
+class TestHeatColours:
+    """Tests for heat_colours."""
+
+    @pytest.mark.unit
+    def test_matches_display_scale(self, monkeypatch):
+        """Every band of the scale gives Display.get_colour_for_temp's colour."""
+        display = Display.__new__(Display)
+        monkeypatch.setattr(display, "get_tyre_thresholds", lambda: THRESHOLDS, raising=False)
+        temps = np.arange(0.0, 200.0, 0.37)
+
+        colours = heat_colours(temps, THRESHOLDS)
+
+        expected = [display.get_colour_for_temp(t) for t in temps]
+        assert [tuple(c) for c in colours.tolist()] == expected
+
+
+class TestThermalTileRenderer:
+    """Tests for ThermalTileRenderer."""
+
+    @pytest.mark.unit
+    def test_zones_coloured_left_to_right(self, tiles):
+        tile = tiles.zones_tile((30.0, 80.0, 200.0), False, THRESHOLDS)
+
+        assert _column_colours(tile, 0)[HEIGHT // 2] == (0, 0, 255)
+        assert _column_colours(tile, 1)[HEIGHT // 2] == (0, 255, 0)
+        assert _column_colours(tile, 2)[HEIGHT // 2] == (0, 0, 0)
+
+    @pytest.mark.unit
+    def test_missing_zone_temperature_drawn_black(self, tiles):
+        """A NaN zone (as Display.get_colour_for_temp draws it) does not stop the tile."""
+        tile = tiles.zones_tile((30.0, float("nan"), 80.0), True, THRESHOLDS)
+
+        assert _column_colours(tile, 0)[0] == (0, 0, 255)
+        assert _column_colours(tile, 1)[0] == (0, 0, 0)
+        assert _column_colours(tile, 2)[0] == (0, 255, 0)
+        assert tiles.zones_tile((30.0, float("nan"), 80.0), True, THRESHOLDS) is tile
+
+        bands = (30.0, float("nan"), 80.0)
+        history = tiles.history_tile((bands, bands, bands), True, False, THRESHOLDS)
+        assert _column_colours(history, 0)[-1] == (0, 255, 0)  # Oldest band, 80
+
+    @pytest.mark.unit
+    def test_cached_until_temperature_moves_a_step(self, tiles):
+        """Changes under half a step reuse the tile; text and thresholds rebuild it."""
+        tile = tiles.zones_tile((70.0, 80.0, 90.0), False, THRESHOLDS)
+
+        assert tiles.zones_tile((70.2, 80.1, 89.9), False, THRESHOLDS) is tile
+        assert tiles.zones_tile((70.5, 80.0, 90.0), False, THRESHOLDS) is not tile
+        assert tiles.zones_tile((70.0, 80.0, 90.0), True, THRESHOLDS) is not tile
+        assert tiles.zones_tile((70.0, 80.0, 90.0), False, (30.0, 80.0, 100.0)) is not tile
+
+    @pytest.mark.unit
+    def test_cache_evicts_least_recently_used(self, tiles):
+        tiles.max_tiles = 2
+        first = tiles.zones_tile((60.0, 60.0, 60.0), False, THRESHOLDS)
+        second = tiles.zones_tile((61.0, 61.0, 61.0), False, THRESHOLDS)
+        tiles.zones_tile((60.0, 60.0, 60.0), False, THRESHOLDS)
+        tiles.zones_tile((62.0, 62.0, 62.0), False, THRESHOLDS)
+
+        assert tiles.zones_tile((60.0, 60.0, 60.0), False, THRESHOLDS) is first
+        assert tiles.zones_tile((61.0, 61.0, 61.0), False, THRESHOLDS) is not second
+
+    @pytest.mark.unit
+    def test_history_gradient_from_current_to_oldest(self, tiles):
+        """Rows shade through the bands, newest at the top for front tyres."""
+        bands = (30.0, 35.0, 50.0, 60.0, 80.0, 100.0, 125.0)
+        zone_bands = (bands, bands, bands)
+
+        front = _column_colours(tiles.history_tile(zone_bands, True, False, THRESHOLDS), 0)
+        rear = _column_colours(tiles.history_tile(zone_bands, False, False, THRESHOLDS), 0)
+
+        assert front[0] == (0, 0, 255)  # 30, too cold
+        assert front[-1] == (255, 0, 0)  # 125, half way to black
+        assert rear == front[::-1]
+        row = 25  # Between bands 2 and 3 (50 and 60)
+        band_pos = row / (HEIGHT - 1) * 6
+        temp = 50.0 + (band_pos - 2) * 10.0
+        assert front[row] == tuple(heat_colours(np.array([temp]), THRESHOLDS)[0])
+
+    @pytest.mark.unit
+    def test_offline_tile_grey(self, tiles):
+        assert _column_colours(tiles.offline_tile(), 1)[0] == (128, 128, 128)
+
+
+class TestDrawThermalImage:
+    """Tests for Display.draw_thermal_image zone order."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("position", ["FL", "FR", "RL", "RR"])
+    def test_zones_inner_to_outer_for_every_corner(self, tiles, monkeypatch, position):
+        """Every corner draws inner, centre, outer from left to right."""
+        blitted = []
+        display = Display.__new__(Display)
+        display.thermal_tiles = tiles
+        display.surface = type("Surface", (), {"blit": lambda self, tile, pos: blitted.append(tile)})()
+        monkeypatch.setattr(display, "get_tyre_thresholds", lambda: THRESHOLDS, raising=False)
+        thermal_data = np.full((24, 32), 80.0)
+        thermal_data[:, :10] = 30.0
+        thermal_data[:, 20:] = 120.0
+
+        display.draw_thermal_image(position, thermal_data)
+
+        (tile,) = blitted
+        assert [_column_colours(tile, zone)[HEIGHT // 2] for zone in range(3)] == [
+            (0, 0, 255),
+            (0, 255, 0),
+            tuple(heat_colours(np.array([120.0]), THRESHOLDS)[0]),
+        ]
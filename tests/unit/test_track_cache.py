@@ -0,0 +1,147 @@
+"""
+Unit tests for the compiled track cache.
+Tests lap_timing/data/track_cache.py with a generated KMZ track.
+"""
+
+import math
+import os
+import time
+import zipfile
+
+import pytest
+
+from lap_timing.data import track_cache
+from lap_timing.data.track_cache import (
+    cache_path,
+    file_hash,
+    load_track_cached,
+    read_compiled_track,
+)
+from lap_timing.data.track_loader import load_track_from_kmz
+
+KML_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+<Document>
+<name>Test Circuit</name>
+<Placemark><name>Track Path</name><LineString><coordinates>{path}</coordinates></LineString></Placemark>
+<Placemark><name>Start / Finish</name><Point><coordinates>{sf}</coordinates></Point></Placemark>
+</Document>
+</kml>
+"""
+
+
+@pytest.fixture
+def kmz_path(tmp_path):
+    """A rounded-rectangle circuit around 52N, 1W as a simple-format KMZ."""
+    coords = []
+    for i in range(240):
+        a = 2 * math.pi * i / 240
+        # Superellipse: long straights joined by tight corners
+        x = 800 * math.copysign(abs(math.cos(a)) ** 0.3, math.cos(a))
+        y = 300 * math.copysign(abs(math.sin(a)) ** 0.3, math.sin(a))
+        lat = 52.0 + y / 111195.0
+        lon = -1.0 + x / (111195.0 * math.cos(math.radians(52.0)))
+        coords.append(f"{lon:.7f},{lat:.7f},0")
+    coords.append(coords[0])
+
+    kml = KML_TEMPLATE.format(path=" ".join(coords), sf=coords[0])
+    path = tmp_path / "Test Circuit.kmz"
+    with zipfile.ZipFile(path, "w") as kmz:
+        kmz.writestr("doc.kml", kml)
+    return str(path)
+
+
+class TestTrackCache:
+    """Tests for compiling and reloading tracks."""
+
+    @pytest.mark.unit
+    def test_round_trip_matches_loader(self, kmz_path, tmp_path):
+        """Test a cached track matches the one parsed from the KMZ."""
+        cache_dir = str(tmp_path / "cache")
+        compiled = load_track_cached(kmz_path, cache_dir)
+        assert os.path.exists(cache_path(file_hash(kmz_path), cache_dir))
+
+        cached = load_track_cached(kmz_path, cache_dir)
+        parsed = load_track_from_kmz(kmz_path)
+
+        assert cached.name == parsed.name == "Test Circuit"
+        assert cached.length == parsed.length
+        assert cached.is_point_to_point == parsed.is_point_to_point
+        assert cached.centerline == parsed.centerline
+        assert cached.outer_boundary == parsed.outer_boundary
+        assert cached.sf_line == parsed.sf_line
+        assert cached.sector_boundaries == pytest.approx(
+            [parsed.length / 3, 2 * parsed.length / 3]
+        )
+        assert len(compiled.corners) > 0
+        assert cached.corners == compiled.corners
+
+    @pytest.mark.unit
+    @pytest.mark.benchmark
+    def test_cache_hit_is_fast(self, kmz_path, tmp_path):
+        """Test loading from the cache avoids the KMZ processing cost."""
+        cache_dir = str(tmp_path / "cache")
+        load_track_cached(kmz_path, cache_dir)
+
+        start = time.perf_counter()
+        read_compiled_track(cache_path(file_hash(kmz_path), cache_dir))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.05
+
+    @pytest.mark.unit
+    def test_changed_source_recompiles(self, kmz_path, tmp_path):
+        """Test editing the source file produces a new cache entry."""
+        cache_dir = str(tmp_path / "cache")
+        load_track_cached(kmz_path, cache_dir)
+        old_hash = file_hash(kmz_path)
+
+        with zipfile.ZipFile(kmz_path, "a") as kmz:
+            kmz.writestr("notes.txt", "edited")
+        load_track_cached(kmz_path, cache_dir)
+
+        assert file_hash(kmz_path) != old_hash
+        assert len(os.listdir(cache_dir)) == 2
+
+    @pytest.mark.unit
+    def test_corrupt_cache_falls_back_to_source(self, kmz_path, tmp_path):
+        """Test an unreadable cache entry is rebuilt from the source file."""
+        cache_dir = str(tmp_path / "cache")
+        load_track_cached(kmz_path, cache_dir)
+        path = cache_path(file_hash(kmz_path), cache_dir)
+        with open(path, "wb") as f:
+            f.write(b"garbage")
+
+        track = load_track_cached(kmz_path, cache_dir)
+        assert track.name == "Test Circuit"
+        assert read_compiled_track(path)[0].name == "Test Circuit"
+
+    @pytest.mark.unit
+    def test_corner_settings_change_recompiles(self, kmz_path, tmp_path, monkeypatch):
+        """Test corners are re-detected when the detector settings change."""
+        cache_dir = str(tmp_path / "cache")
+        load_track_cached(kmz_path, cache_dir)
+
+        monkeypatch.setattr(track_cache, "LAP_TIMING_CORNER_MIN_ANGLE_DEG", 45.0)
+        load_track_cached(kmz_path, cache_dir)
+
+        _, corner_config = read_compiled_track(cache_path(file_hash(kmz_path), cache_dir))
+        assert corner_config["min_angle"] == 45.0
+
+    @pytest.mark.unit
+    def test_failed_corner_detection_not_cached(self, kmz_path, tmp_path, monkeypatch):
+        """Test a detector error leaves no cache entry, so corners are retried."""
+        cache_dir = str(tmp_path / "cache")
+
+        def broken_detector(detector_type):
+            raise RuntimeError("detector failed")
+
+        with monkeypatch.context() as m:
+            m.setattr(track_cache, "create_corner_detector", broken_detector)
+            track = load_track_cached(kmz_path, cache_dir)
+        assert track.corners == []
+        assert not os.path.exists(cache_path(file_hash(kmz_path), cache_dir))
+
+        track = load_track_cached(kmz_path, cache_dir)
+        assert track.corners
+        assert os.path.exists(cache_path(file_hash(kmz_path), cache_dir))
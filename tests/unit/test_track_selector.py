@@ -0,0 +1,90 @@
+"""
+Unit tests for track selection by GPS position.
+Tests lap_timing/data/track_selector.py with generated track databases.
+"""
+
+import sqlite3
+
+import pytest
+
+from lap_timing.data.track_selector import TrackSelector
+from lap_timing.utils.geometry import haversine_distance
+
+
+def _make_db(path, tracks):
+    """Create a minimal tracks database with (name, country, lat, lon) rows."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tracks (name TEXT, country TEXT, start_lat REAL, "
+        "start_lon REAL, length_meters INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO tracks VALUES (?, ?, ?, ?, 3000)", tracks
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def selector(tmp_path):
+    """Selector over a custom and a RaceLogic database with one KMZ present."""
+    custom_db = str(tmp_path / "tracks.db")
+    racelogic_db = str(tmp_path / "racelogic.db")
+    _make_db(custom_db, [("Local Loop", None, 52.0500, -1.0200)])
+    _make_db(racelogic_db, [
+        ("Near Circuit", "UK", 52.0100, -1.0000),
+        ("Far Circuit", "UK", 53.0000, -1.0000),
+        ("Other Side", "NZ", -43.5000, 172.6000),
+    ])
+    (tmp_path / "racelogic" / "UK").mkdir(parents=True)
+    (tmp_path / "racelogic" / "UK" / "Near Circuit.kmz").write_bytes(b"")
+    return TrackSelector(
+        tracks_db_path=custom_db,
+        racelogic_db_path=racelogic_db,
+        custom_tracks_dir=str(tmp_path / "maps"),
+        racelogic_tracks_dir=str(tmp_path / "racelogic"),
+    )
+
+
+class TestFindNearbyTracks:
+    """Tests for the in-memory S/F point index."""
+
+    @pytest.mark.unit
+    def test_nearby_sorted_across_databases(self, selector):
+        """Tracks from both databases within the radius, nearest first."""
+        nearby = selector.find_nearby_tracks(52.0, -1.0, max_distance_km=10)
+
+        assert [t.name for t in nearby] == ["Near Circuit", "Local Loop"]
+        assert [t.source for t in nearby] == ["racelogic", "custom"]
+        expected = haversine_distance(52.0, -1.0, 52.01, -1.0)
+        assert nearby[0].distance_to_sf == pytest.approx(expected, abs=1e-3)
+
+    @pytest.mark.unit
+    def test_kmz_paths_resolved(self, selector, tmp_path):
+        """KMZ paths are resolved for tracks whose file exists."""
+        nearby = {t.name: t for t in selector.find_nearby_tracks(52.0, -1.0, 10)}
+
+        assert nearby["Near Circuit"].kmz_path == str(
+            tmp_path / "racelogic" / "UK" / "Near Circuit.kmz"
+        )
+        assert nearby["Local Loop"].kmz_path is None
+
+    @pytest.mark.unit
+    def test_nothing_in_range(self, selector):
+        """No tracks are returned away from any circuit."""
+        assert selector.find_nearby_tracks(0.0, 0.0, max_distance_km=10) == []
+
+    @pytest.mark.unit
+    def test_repeat_search_does_no_disk_io(self, selector, monkeypatch):
+        """After the first search, no database or filesystem access happens."""
+        selector.find_nearby_tracks(52.0, -1.0, 10)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("disk access after index load")
+
+        monkeypatch.setattr(sqlite3, "connect", fail)
+        monkeypatch.setattr("os.path.exists", fail)
+
+        nearby = selector.find_nearby_tracks(52.0, -1.0, 10)
+
+        assert len(nearby) == 2
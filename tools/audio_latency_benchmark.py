@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark CoPilot callout latency: text queued to first sample out.
+
+Speaks a set of pacenotes through AudioPlayer with its AudioEngine writing
+to a NullSink, and reports the time from say() to the first sample reaching
+the sink. Uses the Janne Laahanen sample pack if given, otherwise a
+synthetic pack of tones with the same folder names. With sox installed, also
+times the sox concatenation the subprocess path runs before aplay starts.
+
+Usage:
+    python tools/audio_latency_benchmark.py
+    python tools/audio_latency_benchmark.py --samples "/path/to/codriver_Janne Laahanen"
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from copilot.audio import AudioPlayer, JanneSampleLibrary  # noqa: E402
+from copilot.audio_engine import NullSink  # noqa: E402
+
+PHRASES = [
+    "left four",
+    "two hundred right three tightens",
+    "one hundred hairpin left over bridge",
+    "left two into right five",
+    "fifty square right caution",
+]
+
+
+def write_synthetic_pack(directory):
+    """Half-second 44.1kHz stereo tones for every mapped sample folder."""
+    folders = {
+        *JanneSampleLibrary.CORNER_MAP.values(),
+        *JanneSampleLibrary.DETAIL_MAP.values(),
+        *JanneSampleLibrary.NUMBER_MAP.values(),
+    }
+    t = np.arange(22050) / 44100
+    for i, folder in enumerate(sorted(folders)):
+        tone = 0.3 * np.sin(2 * np.pi * (200 + 10 * i) * t)
+        frames = (np.column_stack([tone, tone]) * 32767).astype("<i2").tobytes()
+        (directory / folder).mkdir()
+        for take in (1, 2):
+            with wave.open(str(directory / folder / f"{take}.wav"), "wb") as wav:
+                wav.setnchannels(2)
+                wav.setsampwidth(2)
+                wav.setframerate(44100)
+                wav.writeframes(frames)
+
+
+def time_engine(sample_dir, repeat):
+    """Seconds from say() to first sample, per phrase."""
+    sink = NullSink()
+    player = AudioPlayer(sample_dir=sample_dir, enable_mpris=False, sink=sink)
+    start = time.perf_counter()
+    player.start()
+    print(f"Startup (decode samples, open output): {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    results = {}
+    try:
+        for phrase in PHRASES:
+            latencies = []
+            for _ in range(repeat):
+                sink.first_sample_at = None
+                said_at = time.perf_counter()
+                player.say(phrase, priority=3)
+                while sink.first_sample_at is None:
+                    time.sleep(0.0001)
+                latencies.append(sink.first_sample_at - said_at)
+                while not (player._engine.idle and player._queue.empty()):
+                    time.sleep(0.001)
+                time.sleep(0.005)  # Let the player return to its queue
+            results[phrase] = latencies
+    finally:
+        player.stop()
+    return results
+
+
+def time_sox_concat(sample_dir, repeat):
+    """Seconds for the subprocess path's sox concatenation of a phrase."""
+    player = AudioPlayer(sample_dir=sample_dir, enable_mpris=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "chain.wav")
+        results = {}
+        for phrase in PHRASES:
+            folders = player._sample_folders(phrase.split(" into "))
+            latencies = []
+            for _ in range(repeat):
+                files = [str(player.samples.get_sample_file(folder)) for folder in folders]
+                start = time.perf_counter()
+                subprocess.run(["sox"] + files + [output], check=True, capture_output=True)
+                latencies.append(time.perf_counter() - start)
+            results[phrase] = latencies
+    return results
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"  {'Phrase':<40} {'median':>9} {'max':>9}")
+    for phrase, latencies in results.items():
+        print(f"  {phrase:<40} {statistics.median(latencies) * 1000:>7.2f}ms "
+              f"{max(latencies) * 1000:>7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CoPilot callout latency")
+    parser.add_argument("--samples", type=Path, help="Janne Laahanen sample pack directory")
+    parser.add_argument("--repeat", type=int, default=20, help="Callouts per phrase")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample_dir = args.samples
+        if sample_dir is None:
+            sample_dir = Path(tmp)
+            write_synthetic_pack(sample_dir)
+            print("Using synthetic sample pack")
+
+        print_results("In-process engine: say() to first sample",
+                      time_engine(sample_dir, args.repeat))
+        if shutil.which("sox"):
+            print_results("Subprocess path: sox concatenation before aplay starts",
+                          time_sox_concat(sample_dir, args.repeat))
+        else:
+            print("\nsox not installed, skipping the subprocess path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Prebuild the compiled track cache for openTPT lap timing.
+
+Compiles every KMZ/GPX track in the RaceLogic library and custom track
+directories (or the directories given) so the first track load at the
+circuit is a cache hit. Tracks whose cache entry is already current are
+skipped unless --force is given.
+
+Usage:
+    python tools/build_track_cache.py
+    python tools/build_track_cache.py /path/to/tracks --cache-dir /path/to/cache
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (  # noqa: E402
+    LAP_TIMING_CUSTOM_TRACKS_DIR,
+    LAP_TIMING_RACELOGIC_TRACKS_DIR,
+    LAP_TIMING_ROUTES_DIR,
+    LAP_TIMING_TRACK_CACHE_DIR,
+)
+from lap_timing.data.track_cache import (  # noqa: E402
+    cache_path,
+    compile_track,
+    file_hash,
+)
+
+TRACK_EXTENSIONS = (".kmz", ".gpx")
+
+
+def _find_tracks(directories):
+    """Yield track files under the given directories."""
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(TRACK_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prebuild the openTPT compiled track cache"
+    )
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=[
+            LAP_TIMING_RACELOGIC_TRACKS_DIR,
+            LAP_TIMING_CUSTOM_TRACKS_DIR,
+            LAP_TIMING_ROUTES_DIR,
+        ],
+        help="Directories to search for .kmz/.gpx tracks (default: track library)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=LAP_TIMING_TRACK_CACHE_DIR,
+        help=f"Cache directory (default: {LAP_TIMING_TRACK_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Recompile tracks even if their cache entry is current",
+    )
+
+    args = parser.parse_args()
+
+    compiled = skipped = failed = 0
+    start = time.time()
+    for path in _find_tracks(args.directories):
+        source_hash = file_hash(path)
+        if not args.force and os.path.exists(cache_path(source_hash, args.cache_dir)):
+            skipped += 1
+            continue
+        try:
+            track = compile_track(path, args.cache_dir, source_hash)
+        except Exception as e:
+            print(f"FAILED {path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        compiled += 1
+        print(f"{track.name}: {track.length:.0f}m, {len(track.corners)} corners")
+
+    print(f"Compiled {compiled}, up to date {skipped}, failed {failed} "
+          f"in {time.time() - start:.1f}s -> {args.cache_dir}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark the camera frame path from capture to screen.
+
+Feeds frames from SyntheticCamera at the configured camera resolution and
+compares the previous path (retrieve a new array, convert to RGB, copy to
+bytes, wrap in a new Surface, then blit) with the frame pool (decode or
+convert into a pool buffer, blit its persistent Surface). Reports the
+capture-side and render-side time per frame, with and without mirroring,
+then the capture throughput with a capture thread feeding a 60 FPS render
+loop. Runs without a screen (SDL dummy video driver).
+
+Usage:
+    python tools/camera_frame_benchmark.py
+    python tools/camera_frame_benchmark.py --frames 1000 --seconds 5
+"""
+
+import argparse
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from config import CAMERA_HEIGHT, CAMERA_WIDTH, DISPLAY_HEIGHT, DISPLAY_WIDTH  # noqa: E402
+from gui.camera_frames import FrameConverter, FramePool, SyntheticCamera  # noqa: E402
+
+FPS = 60
+
+
+class CopyPath:
+    """Frame handling before the frame pool: a new array, bytes and Surface per frame."""
+
+    def __init__(self, camera, mirror):
+        self.camera = camera
+        self.mirror = mirror
+        self.frame = None
+
+    def capture(self):
+        self.camera.grab()
+        _, frame = self.camera.retrieve()
+        if self.mirror:
+            frame = frame[:, ::-1]
+        rgb = np.ascontiguousarray(frame[..., ::-1])
+        self.frame = rgb.tobytes()
+
+    def render(self, screen, offset):
+        surface = pygame.image.frombuffer(self.frame, (CAMERA_WIDTH, CAMERA_HEIGHT), "RGB")
+        screen.blit(surface, offset)
+
+
+class PoolPath:
+    """Frame pool: decode or convert into a pool buffer, blit its Surface."""
+
+    def __init__(self, camera, mirror):
+        self.camera = camera
+        self.pool = FramePool(CAMERA_WIDTH, CAMERA_HEIGHT)
+        self.converter = FrameConverter(mirror=mirror, pixel_format=self.pool.pixel_format)
+        self.raw = None
+
+    def capture(self):
+        self.camera.grab()
+        buffer = self.pool.write_buffer()
+        direct = self.converter.is_direct((CAMERA_WIDTH, CAMERA_HEIGHT), self.pool.size)
+        _, frame = self.camera.retrieve(buffer if direct else self.raw)
+        if frame is not buffer:
+            self.raw = frame
+            self.converter.convert(frame, buffer)
+        self.pool.publish()
+
+    def render(self, screen, offset):
+        self.pool.acquire()
+        screen.blit(self.pool.surface, offset)
+
+
+def time_path(path, screen, offset, frames):
+    """Median capture and render milliseconds per frame."""
+    capture, render = [], []
+    for _ in range(frames):
+        start = time.perf_counter()
+        path.capture()
+        middle = time.perf_counter()
+        path.render(screen, offset)
+        capture.append(middle - start)
+        render.append(time.perf_counter() - middle)
+    return statistics.median(capture) * 1000, statistics.median(render) * 1000
+
+
+def threaded_throughput(seconds):
+    """Frames captured per second by a capture thread while rendering at 60 FPS."""
+    screen = pygame.display.get_surface()
+    path = PoolPath(SyntheticCamera(CAMERA_WIDTH, CAMERA_HEIGHT), mirror=False)
+    running = True
+    captured = queue.SimpleQueue()
+
+    def capture_loop():
+        count = 0
+        while running:
+            path.capture()
+            count += 1
+        captured.put(count)
+
+    thread = threading.Thread(target=capture_loop, daemon=True)
+    thread.start()
+    shown = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame_start = time.perf_counter()
+        if path.pool.acquire():
+            shown += 1
+        if path.pool.surface is not None:
+            screen.blit(path.pool.surface, (0, 0))
+        time.sleep(max(0.0, 1.0 / FPS - (time.perf_counter() - frame_start)))
+    running = False
+    thread.join()
+    return captured.get() / seconds, shown / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the camera frame path")
+    parser.add_argument("--frames", type=int, default=300, help="Frames timed per path")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of the threaded run")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    offset = ((DISPLAY_WIDTH - CAMERA_WIDTH) // 2, (DISPLAY_HEIGHT - CAMERA_HEIGHT) // 2)
+
+    print(f"{CAMERA_WIDTH}x{CAMERA_HEIGHT} frames on a {DISPLAY_WIDTH}x{DISPLAY_HEIGHT} display, "
+          f"{args.frames} frames per path")
+    for mirror in (False, True):
+        label = "mirrored" if mirror else "direct"
+        for name, path_class in (("copy", CopyPath), ("frame pool", PoolPath)):
+            path = path_class(SyntheticCamera(CAMERA_WIDTH, CAMERA_HEIGHT), mirror)
+            capture, render = time_path(path, screen, offset, args.frames)
+            print(f"  {label:<9} {name:<11} capture {capture:6.3f} ms, render {render:6.3f} ms, "
+                  f"total {capture + render:6.3f} ms/frame")
+
+    capture_fps, shown_fps = threaded_throughput(args.seconds)
+    print(f"  threaded: {capture_fps:.0f} frames/s captured, {shown_fps:.1f} frames/s shown")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Convert CoPilot map caches to memory-mapped road tiles (.roads.tile).
+
+Accepts legacy pickle caches (.roads.pkl), OSM extracts (.osm.pbf, needs
+osmium) and SQLite caches (.roads.db), or directories of them. Each map is
+written next to its source as <region>.roads.tile, which MapLoader then
+maps read-only instead of unpickling.
+
+Usage:
+    python tools/convert_map_tiles.py /mnt/usb/.opentpt/copilot/maps
+    python tools/convert_map_tiles.py county.roads.pkl --output-dir /tmp/tiles
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from copilot.map_loader import MapLoader  # noqa: E402
+from copilot.map_tiles import TILE_SUFFIX, write_tile  # noqa: E402
+
+SOURCE_SUFFIXES = (".roads.pkl", ".osm.pbf", ".roads.db")
+
+
+def source_files(paths):
+    """Map files to convert, expanding directories."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            for suffix in SOURCE_SUFFIXES:
+                files.extend(sorted(path.glob(f"*{suffix}")))
+        else:
+            files.append(path)
+    return files
+
+
+def load_network(path):
+    """Load a whole map file as a RoadNetwork."""
+    if path.name.endswith(".roads.pkl"):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    loader = MapLoader(path)
+    if path.name.endswith(".osm.pbf"):
+        return loader._extract_all_roads()
+    return loader._get_full_network()
+
+
+def tile_path_for(path, output_dir):
+    """<region>.roads.tile for a source map file."""
+    name = path.name
+    for suffix in SOURCE_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return (output_dir or path.parent) / f"{name}{TILE_SUFFIX}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert CoPilot map caches to memory-mapped road tiles"
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="Map files or directories")
+    parser.add_argument("--output-dir", "-o", type=Path, help="Directory for tiles (default: beside source)")
+    parser.add_argument("--force", "-f", action="store_true", help="Overwrite existing tiles")
+    args = parser.parse_args()
+
+    files = source_files(args.paths)
+    if not files:
+        print("No .roads.pkl, .osm.pbf or .roads.db files found", file=sys.stderr)
+        sys.exit(1)
+
+    failed = 0
+    converted = set()
+    for path in files:
+        tile_path = tile_path_for(path, args.output_dir)
+        if tile_path in converted:
+            continue  # Same region from another source format
+        if tile_path.exists() and not args.force:
+            print(f"{tile_path.name}: exists, skipping (use --force to overwrite)")
+            continue
+
+        start = time.perf_counter()
+        try:
+            network = load_network(path)
+            write_tile(tile_path, network)
+        except Exception as e:
+            print(f"{path.name}: failed: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        converted.add(tile_path)
+        size_mb = tile_path.stat().st_size / 1024 / 1024
+        print(f"{path.name} -> {tile_path.name}: {len(network.ways):,} roads, "
+              f"{size_mb:.1f} MB in {time.perf_counter() - start:.1f}s")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark the corner detectors on real track centrelines.
+
+Runs each corner detector (lap timing threshold, ASC, hybrid, CurveFinder
+and the CoPilot ASC detector) over every KMZ/GPX track in the track library
+(or the directories given), once with the vectorised geometry kernels and
+once with the original per-point scalar loops. Reports the time per
+detection for both and checks the corner output is identical.
+
+Usage:
+    python tools/corner_benchmark.py
+    python tools/corner_benchmark.py /path/to/tracks --repeat 20
+"""
+
+import argparse
+import dataclasses
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (  # noqa: E402
+    LAP_TIMING_CUSTOM_TRACKS_DIR,
+    LAP_TIMING_RACELOGIC_TRACKS_DIR,
+    LAP_TIMING_ROUTES_DIR,
+)
+from copilot.corners import CornerDetector as CoPilotCornerDetector  # noqa: E402
+from copilot.geometry import calculate_curvature  # noqa: E402
+from lap_timing.analysis.asc_corner_detector import ASCCornerDetector  # noqa: E402
+from lap_timing.analysis.corner_detector import CornerDetector  # noqa: E402
+from lap_timing.analysis.curvefinder_detector import CurveFinderDetector  # noqa: E402
+from lap_timing.analysis.hybrid_corner_detector import HybridCornerDetector  # noqa: E402
+from lap_timing.data.track_loader import load_track  # noqa: E402
+
+TRACK_EXTENSIONS = (".kmz", ".gpx")
+
+
+def _find_tracks(directories):
+    """Yield track files under the given directories."""
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(TRACK_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+# Scalar reference implementations (the per-point loops the kernels replaced)
+
+def _scalar_curvatures_closed(centerline):
+    n = len(centerline)
+    return [
+        calculate_curvature(centerline[(i - 1) % n], centerline[i], centerline[(i + 1) % n])
+        for i in range(n)
+    ]
+
+
+def _scalar_curvatures_open(points):
+    curvatures = [0.0]
+    for i in range(1, len(points) - 1):
+        curvatures.append(calculate_curvature(points[i - 1], points[i], points[i + 1]))
+    curvatures.append(0.0)
+    return curvatures
+
+
+def _scalar_local_coords(centerline):
+    if not centerline:
+        return np.array([])
+    ref_lat = centerline[0].lat
+    ref_lon = centerline[0].lon
+    coords = np.zeros((len(centerline), 2))
+    for i, pt in enumerate(centerline):
+        coords[i, 0] = (pt.lon - ref_lon) * 111320 * math.cos(math.radians(ref_lat))
+        coords[i, 1] = (pt.lat - ref_lat) * 110540
+    return coords
+
+
+def _use_scalar(detector):
+    """Patch a detector instance to use the scalar reference loops."""
+    if isinstance(detector, CoPilotCornerDetector):
+        detector._calculate_curvatures = _scalar_curvatures_open
+    elif isinstance(detector, (ASCCornerDetector, CornerDetector)):
+        detector._calculate_curvatures = _scalar_curvatures_closed
+    else:
+        detector._to_local_coords = _scalar_local_coords
+        if isinstance(detector, HybridCornerDetector):
+            detector.asc._calculate_curvatures = _scalar_curvatures_closed
+    return detector
+
+
+def _detectors():
+    return {
+        "threshold": CornerDetector,
+        "asc": ASCCornerDetector,
+        "hybrid": HybridCornerDetector,
+        "curvefinder": CurveFinderDetector,
+        "copilot": CoPilotCornerDetector,
+    }
+
+
+def _signature(corners):
+    """Comparable corner output, rounded past floating point noise."""
+    result = []
+    for corner in corners:
+        fields = dataclasses.asdict(corner)
+        result.append({
+            k: round(v, 6) if isinstance(v, float) else v
+            for k, v in fields.items()
+        })
+    return result
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark openTPT corner detection on real track centrelines"
+    )
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=[
+            LAP_TIMING_RACELOGIC_TRACKS_DIR,
+            LAP_TIMING_CUSTOM_TRACKS_DIR,
+            LAP_TIMING_ROUTES_DIR,
+        ],
+        help="Directories to search for .kmz/.gpx tracks (default: track library)",
+    )
+    parser.add_argument(
+        "--repeat", "-n",
+        type=int,
+        default=10,
+        help="Detections per measurement (default: 10)",
+    )
+    args = parser.parse_args()
+
+    totals = {name: [0.0, 0.0] for name in _detectors()}
+    tracks = mismatches = 0
+    for path in _find_tracks(args.directories):
+        try:
+            track = load_track(path)
+        except Exception as e:
+            print(f"FAILED {path}: {e}", file=sys.stderr)
+            continue
+        tracks += 1
+        points = [(p.lat, p.lon) for p in track.centerline]
+        print(f"{track.name} ({len(track.centerline)} points)")
+
+        for name, cls in _detectors().items():
+            if cls is CoPilotCornerDetector:
+                run_kernel = lambda d=cls(): d.detect_corners(points)  # noqa: E731
+                run_scalar = lambda d=_use_scalar(cls()): d.detect_corners(points)  # noqa: E731
+            else:
+                run_kernel = lambda d=cls(): d.detect_corners(track)  # noqa: E731
+                run_scalar = lambda d=_use_scalar(cls()): d.detect_corners(track)  # noqa: E731
+
+            scalar_s, scalar_corners = _time(run_scalar, args.repeat)
+            kernel_s, kernel_corners = _time(run_kernel, args.repeat)
+            totals[name][0] += scalar_s
+            totals[name][1] += kernel_s
+
+            same = _signature(scalar_corners) == _signature(kernel_corners)
+            mismatches += not same
+            print(f"  {name:<12} {len(kernel_corners):>3} corners  "
+                  f"scalar {scalar_s * 1000:8.2f}ms  kernel {kernel_s * 1000:8.2f}ms  "
+                  f"x{scalar_s / kernel_s:5.1f}  {'identical' if same else 'DIFFERENT'}")
+
+    if not tracks:
+        print("No tracks found", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"\nTotal over {tracks} tracks:")
+    for name, (scalar_s, kernel_s) in totals.items():
+        print(f"  {name:<12} scalar {scalar_s * 1000:8.2f}ms  kernel {kernel_s * 1000:8.2f}ms  "
+              f"x{scalar_s / kernel_s:5.1f}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
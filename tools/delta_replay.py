@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Delta prediction replay benchmark for openTPT.
+
+Replays two laps from a RaceLogic .vbo log through DeltaCalculator: one as
+the reference lap and one as the current lap. Prints how the predicted lap
+time converges on the actual lap time through the lap, and how much it
+jumps between consecutive GPS fixes.
+
+Distance along track is the cumulative GPS path length of each lap, so no
+track map is needed. Laps are selected by the [lap] markers in the file.
+
+Usage:
+    python tools/delta_replay.py session.vbo --reference-lap 2 --lap 3
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lap_timing.core.delta_calculator import DeltaCalculator  # noqa: E402
+from lap_timing.data.models import Lap, TrackPosition  # noqa: E402
+from lap_timing.utils.geometry import haversine_distance  # noqa: E402
+from lap_timing.utils.vbo_parser import VBOParser  # noqa: E402
+
+
+def _positions(points, track_length):
+    """Convert a lap's GPS points to track positions by path length."""
+    positions = []
+    distance = 0.0
+    for prev, point in zip([None] + points[:-1], points):
+        if prev is not None:
+            distance += haversine_distance(prev.lat, prev.lon, point.lat, point.lon)
+        positions.append(TrackPosition(
+            distance_along_track=min(distance, track_length),
+            lateral_offset=0.0,
+            segment_index=0,
+            progress_fraction=min(distance / track_length, 1.0),
+            timestamp=point.timestamp,
+        ))
+    return positions
+
+
+def _path_length(points):
+    """Total GPS path length of a lap in metres."""
+    return sum(
+        haversine_distance(a.lat, a.lon, b.lat, b.lon)
+        for a, b in zip(points, points[1:])
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a VBO lap against a reference lap through DeltaCalculator"
+    )
+    parser.add_argument("vbo", help="RaceLogic .vbo file")
+    parser.add_argument("--reference-lap", type=int, required=True,
+                        help="Lap number used as the reference (1-indexed)")
+    parser.add_argument("--lap", type=int, required=True,
+                        help="Lap number replayed against the reference (1-indexed)")
+    args = parser.parse_args()
+
+    vbo = VBOParser(args.vbo)
+    ref_points = vbo.parse_gps_points(args.reference_lap, args.reference_lap)
+    lap_points = vbo.parse_gps_points(args.lap, args.lap)
+    if len(ref_points) < 2 or len(lap_points) < 2:
+        parser.error("both laps need at least two GPS points")
+
+    track_length = _path_length(ref_points)
+    ref_duration = ref_points[-1].timestamp - ref_points[0].timestamp
+    reference = Lap(
+        lap_number=args.reference_lap,
+        start_time=ref_points[0].timestamp,
+        end_time=ref_points[-1].timestamp,
+        duration=ref_duration,
+        gps_points=ref_points,
+        positions=_positions(ref_points, track_length),
+    )
+
+    calc = DeltaCalculator(track_length)
+    start = time.perf_counter()
+    calc.set_reference_lap(reference)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    actual = lap_points[-1].timestamp - lap_points[0].timestamp
+    calc.start_lap(lap_points[0].timestamp, args.lap)
+
+    deltas = []
+    start = time.perf_counter()
+    for position in _positions(lap_points, track_length):
+        delta = calc.calculate_delta(position)
+        if delta:
+            deltas.append(delta)
+    per_fix_us = (time.perf_counter() - start) / len(lap_points) * 1e6
+
+    print(f"Track length {track_length:.0f} m, reference {ref_duration:.2f} s, "
+          f"lap {actual:.2f} s")
+    print(f"Reference table build {build_ms:.1f} ms, {per_fix_us:.0f} us per fix")
+    print()
+    print("progress  delta(s)  rate(s/s)  predicted(s)  error(s)")
+    next_report = 0.0
+    for delta in deltas:
+        progress = delta.position.progress_fraction
+        if progress >= next_report:
+            print(f"{progress * 100:7.0f}%  {delta.time_delta:+8.3f}  "
+                  f"{delta.delta_rate:+9.3f}  {delta.predicted_lap_time:12.3f}  "
+                  f"{delta.predicted_lap_time - actual:+8.3f}")
+            next_report += 0.1
+
+    predictions = [d.predicted_lap_time for d in deltas]
+    errors = [p - actual for p in predictions]
+    jumps = [abs(b - a) for a, b in zip(predictions, predictions[1:])]
+    if errors:
+        rms = math.sqrt(sum(e * e for e in errors) / len(errors))
+        print()
+        print(f"Prediction RMS error {rms:.3f} s, "
+              f"max fix-to-fix jump {max(jumps, default=0.0):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
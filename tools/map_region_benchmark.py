@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark CoPilot road region loads from the SQLite map cache.
+
+Times SQLiteMapCache.load_region at the centre of a map database. Without
+--db, a synthetic dense urban grid (short block-length ways, a junction at
+every corner) is generated in a temporary directory.
+
+Usage:
+    python tools/map_region_benchmark.py
+    python tools/map_region_benchmark.py --db /path/to/region.roads.db --lat 51.45 --lon -2.59
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import COPILOT_ROAD_FETCH_RADIUS_M  # noqa: E402
+from copilot.sqlite_cache import (  # noqa: E402
+    Barrier,
+    Node,
+    RailwayCrossing,
+    SQLiteMapCache,
+    Way,
+)
+
+LAT0, LON0 = 51.45, -2.59
+M_LAT = 1 / 111000
+M_LON = 1 / (111000 * 0.6225)  # cos(51.45)
+
+
+def build_urban_grid(cache, size_m=6000, block_m=60, node_step_m=15, seed=1):
+    """Fill a cache with a grid of streets, one way per block edge."""
+    rng = random.Random(seed)
+    nodes = {}
+    ways = {}
+    node_ids = {}
+
+    def node_at(east, north):
+        key = (east, north)
+        if key not in node_ids:
+            nid = len(node_ids) + 1
+            node_ids[key] = nid
+            nodes[nid] = Node(nid, LAT0 + north * M_LAT, LON0 + east * M_LON)
+        return node_ids[key]
+
+    way_id = 1
+    for line in range(0, size_m + 1, block_m):
+        for start in range(0, size_m, block_m):
+            steps = range(start, start + block_m + 1, node_step_m)
+            for points in ([(line, a) for a in steps], [(a, line) for a in steps]):
+                ways[way_id] = Way(
+                    id=way_id,
+                    nodes=[node_at(e, n) for e, n in points],
+                    name=f"Street {line}",
+                    highway_type=rng.choice(["residential", "tertiary", "secondary"]),
+                )
+                way_id += 1
+
+    crossings = {}
+    barriers = {}
+    for nid in rng.sample(sorted(nodes), 200):
+        node = nodes[nid]
+        crossings[nid] = RailwayCrossing(nid, node.lat, node.lon)
+    for nid in rng.sample(sorted(nodes), 200):
+        node = nodes[nid]
+        barriers[nid] = Barrier(nid, node.lat, node.lon, "gate")
+
+    cache.import_network(nodes, ways, crossings, barriers)
+    return LAT0 + size_m / 2 * M_LAT, LON0 + size_m / 2 * M_LON
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark SQLite map cache region loads"
+    )
+    parser.add_argument("--db", help="Existing .roads.db (default: synthetic urban grid)")
+    parser.add_argument("--lat", type=float, help="Query latitude (default: map centre)")
+    parser.add_argument("--lon", type=float, help="Query longitude (default: map centre)")
+    parser.add_argument(
+        "--radius", type=float, default=COPILOT_ROAD_FETCH_RADIUS_M,
+        help=f"Query radius in metres (default: {COPILOT_ROAD_FETCH_RADIUS_M})",
+    )
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="Loads to time (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            cache = SQLiteMapCache(args.db)
+            bounds = cache.get_bounds()
+            if not bounds:
+                print(f"No data in {args.db}", file=sys.stderr)
+                sys.exit(1)
+            lat = (bounds[0] + bounds[2]) / 2
+            lon = (bounds[1] + bounds[3]) / 2
+        else:
+            cache = SQLiteMapCache(os.path.join(tmp, "urban.roads.db"))
+            start = time.perf_counter()
+            lat, lon = build_urban_grid(cache)
+            print(f"Built synthetic urban grid in {time.perf_counter() - start:.1f}s")
+
+        lat = args.lat if args.lat is not None else lat
+        lon = args.lon if args.lon is not None else lon
+
+        cache.load_region(lat, lon, args.radius)  # Warm the page cache
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            network = cache.load_region(lat, lon, args.radius)
+            times.append(time.perf_counter() - start)
+        cache.close()
+
+    print(f"load_region({lat:.4f}, {lon:.4f}, {args.radius:.0f}m): "
+          f"{len(network.ways):,} ways, {len(network.nodes):,} nodes, "
+          f"{len(network.junctions):,} junctions, "
+          f"{len(network.railway_crossings)} crossings, {len(network.barriers)} barriers")
+    print(f"  best {min(times) * 1000:.1f}ms, mean {sum(times) / len(times) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark reduced-scale MJPEG decoding for camera capture.
+
+Replays recorded JPEG frames through the camera capture path: decode the
+raw MJPEG bytes at full, 1/2, 1/4 and 1/8 scale, then convert into a
+frame pool buffer at the size the frames are shown on the display.
+Reports per-stage time per frame (decode, convert) and the frames per
+second one CPU core could deliver, against decoding at full size and
+scaling down. Needs OpenCV; runs without a camera or screen.
+
+Record frames from a camera without re-encoding, e.g.:
+    ffmpeg -f v4l2 -input_format mjpeg -video_size 1920x1080 -i /dev/video-rear \\
+        -c:v copy -frames:v 300 frames/%04d.jpg
+
+Usage:
+    python tools/mjpeg_decode_benchmark.py --frames-dir frames
+    python tools/mjpeg_decode_benchmark.py --width 1920 --height 1080 --mirror
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from config import CAMERA_HEIGHT, CAMERA_WIDTH, DISPLAY_HEIGHT, DISPLAY_WIDTH  # noqa: E402
+from gui.camera_frames import (  # noqa: E402
+    CV2_AVAILABLE,
+    MJPEG_DECODE_SCALES,
+    FrameConverter,
+    FramePool,
+    MjpegDecoder,
+    RecordedMjpegCamera,
+    SyntheticCamera,
+    mjpeg_decode_scale,
+)
+
+
+def synthetic_recording(width, height, count):
+    """JPEG-encoded SyntheticCamera frames, standing in for a recording."""
+    import cv2
+
+    camera = SyntheticCamera(width, height)
+    frames = []
+    for _ in range(count):
+        camera.grab()
+        frames.append(cv2.imencode(".jpg", camera.retrieve()[1], [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes())
+    return RecordedMjpegCamera(frames)
+
+
+def time_scale(camera, scale, pool, mirror, frames):
+    """Median decode and convert milliseconds per frame at one decode scale."""
+    decoder = MjpegDecoder(scale)
+    converter = FrameConverter(mirror=mirror, pixel_format=pool.pixel_format)
+    decode, convert = [], []
+    for _ in range(frames):
+        camera.grab()
+        _, data = camera.retrieve()
+        start = time.perf_counter()
+        frame = decoder.decode(data)
+        middle = time.perf_counter()
+        converter.convert(frame, pool.write_buffer())
+        pool.publish()
+        decode.append(middle - start)
+        convert.append(time.perf_counter() - middle)
+    return statistics.median(decode) * 1000, statistics.median(convert) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-scale MJPEG decoding")
+    parser.add_argument("--frames-dir", help="Directory of recorded .jpg frames (default: synthetic frames)")
+    parser.add_argument("--width", type=int, default=CAMERA_WIDTH * 2, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=CAMERA_HEIGHT * 2, help="Synthetic frame height")
+    parser.add_argument("--frames", type=int, default=200, help="Frames timed per scale")
+    parser.add_argument("--mirror", action="store_true", help="Mirror frames, as for the rear camera")
+    args = parser.parse_args()
+
+    if not CV2_AVAILABLE:
+        print("OpenCV (cv2) is required for this benchmark")
+        return 1
+
+    import cv2
+
+    if args.frames_dir:
+        camera = RecordedMjpegCamera.from_directory(args.frames_dir)
+        source = args.frames_dir
+    else:
+        camera = synthetic_recording(args.width, args.height, 30)
+        source = "synthetic frames"
+    camera.grab()
+    height, width = cv2.imdecode(camera.retrieve()[1], cv2.IMREAD_COLOR).shape[:2]
+
+    scale = min(DISPLAY_WIDTH / width, DISPLAY_HEIGHT / height)
+    pool = FramePool(int(width * scale), int(height * scale))
+    auto = mjpeg_decode_scale((width, height), pool.size)
+    print(f"{width}x{height} JPEGs ({source}) shown at {pool.width}x{pool.height}, "
+          f"{args.frames} frames per scale; auto scale 1/{auto}")
+
+    for factor in MJPEG_DECODE_SCALES:
+        if width // factor < 8 or height // factor < 8:
+            break
+        decode, convert = time_scale(camera, factor, pool, args.mirror, args.frames)
+        total = decode + convert
+        marker = " (auto)" if factor == auto else ""
+        print(f"  1/{factor}: decode {decode:6.2f} ms, convert {convert:6.2f} ms, "
+              f"total {total:6.2f} ms = {1000 / total:6.0f} FPS per core{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Telemetry stream exporter for openTPT.
+
+Converts columnar telemetry stream files (.tlm) recorded by the Pi into CSV
+files with the same column layout as the in-car export, and raw channel logs
+(.raw.tlm) into one CSV per source. Also recovers sessions left as .partial
+files after a crash or power loss, up to the last complete block.
+
+Usage:
+    python tools/telemetry_export.py session.tlm [session.tlm.partial ...]
+    python tools/telemetry_export.py session.tlm --output session.csv
+"""
+
+import argparse
+import os
+import sys
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.telemetry_stream import export_csv  # noqa: E402
+from utils.raw_channel_log import export_csv as export_raw_csv  # noqa: E402
+
+RAW_SUFFIX = ".raw.tlm"
+
+
+def _strip_partial(path: str) -> str:
+    """Remove the .partial suffix left on files from an interrupted session."""
+    if path.endswith(".partial"):
+        return path[:-len(".partial")]
+    return path
+
+
+def _default_output(path: str) -> str:
+    """Derive the CSV path for a stream file."""
+    base, _ = os.path.splitext(_strip_partial(path))
+    return base + ".csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export openTPT telemetry stream files to CSV"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Stream files (.tlm, .raw.tlm, optionally .partial)",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default=None,
+        help="CSV output path (only valid with a single .tlm input)",
+    )
+
+    args = parser.parse_args()
+
+    if args.output and len(args.inputs) > 1:
+        parser.error("--output can only be used with a single input file")
+
+    failed = False
+    for path in args.inputs:
+        if _strip_partial(path).endswith(RAW_SUFFIX):
+            prefix = _strip_partial(path)[:-len(RAW_SUFFIX)]
+            try:
+                outputs = export_raw_csv(path, prefix)
+            except (IOError, OSError, ValueError) as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                failed = True
+                continue
+            for output in outputs.values():
+                print(f"{path} -> {output}")
+            continue
+
+        output = args.output or _default_output(path)
+        try:
+            rows = export_csv(path, output)
+        except (IOError, OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"{path} -> {output} ({rows} rows)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark text rendering through the shared text cache.
+
+Draws the strings a typical frame draws (FPS counter, tyre pressures,
+brake temperatures, G-meter and lap timing readouts, labels) for a
+simulated drive at 60 FPS, with values changing like live data. Compares
+blitting font.render() with draw_text() through gui.text_cache, and
+prints the cache statistics. Runs without a screen (SDL dummy video driver).
+
+Usage:
+    python tools/text_cache_benchmark.py
+    python tools/text_cache_benchmark.py --seconds 30
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from config import (  # noqa: E402
+    DISPLAY_HEIGHT,
+    DISPLAY_WIDTH,
+    FONT_PATH,
+    FONT_SIZE_LARGE,
+    FONT_SIZE_MEDARGE,
+    FONT_SIZE_MEDIUM,
+    FONT_SIZE_SMALL,
+    GREEN,
+    GREY,
+    WHITE,
+    YELLOW,
+)
+from gui.text_cache import TextCache, get_font  # noqa: E402
+
+FPS = 60
+
+
+def frame_strings(frame):
+    """(size, text, colour) drawn in one frame, values moving like live data."""
+    t = frame / FPS
+    strings = [(FONT_SIZE_SMALL, f"{59.0 + math.sin(t * 7):.1f} FPS", YELLOW)]
+    for i in range(4):
+        strings.append((FONT_SIZE_MEDARGE, f"{32.0 + math.sin(t / 10 + i):.1f}", WHITE))
+        strings.append((FONT_SIZE_SMALL, f"{300 + 200 * math.sin(t + i):.0f}", WHITE))
+    strings += [
+        (FONT_SIZE_MEDIUM, "PSI", WHITE),
+        (int(FONT_SIZE_LARGE * 1.5), f"{math.hypot(math.sin(t), math.cos(t / 2)):.1f}g", GREEN),
+        (FONT_SIZE_MEDIUM, f"Lat: {math.sin(t):+.1f}g", GREEN),
+        (FONT_SIZE_SMALL, "Peak G: 1.4g", YELLOW),
+        (int(FONT_SIZE_LARGE * 1.5), f"{int(120 + 40 * math.sin(t / 5))}", WHITE),
+        (FONT_SIZE_SMALL, "km/h", GREY),
+        (int(FONT_SIZE_LARGE * 3), f"{int(t // 60)}:{t % 60:06.3f}", WHITE),
+        (FONT_SIZE_SMALL, "LAST", GREY),
+        (FONT_SIZE_LARGE, "1:32.418", WHITE),
+    ]
+    return strings
+
+
+def time_frames(frames, draw):
+    """Seconds spent drawing each frame's strings."""
+    latencies = []
+    for strings in frames:
+        start = time.perf_counter()
+        for font, text, colour in strings:
+            draw(font, text, colour)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared text cache")
+    parser.add_argument("--seconds", type=int, default=10, help="Simulated seconds at 60 FPS")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    centre = (DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
+    frames = [
+        [(get_font(FONT_PATH, size), text, colour) for size, text, colour in frame_strings(frame)]
+        for frame in range(args.seconds * FPS)
+    ]
+    cache = TextCache()
+
+    print(f"{len(frames)} frames, {len(frames[0])} strings per frame")
+    def blit_render(font, text, colour):
+        text_surface = font.render(text, True, colour)
+        screen.blit(text_surface, text_surface.get_rect(center=centre))
+
+    def draw_cached(font, text, colour):
+        cache.draw(screen, font, text, colour, center=centre)
+
+    for name, draw in (("font.render", blit_render), ("text cache", draw_cached)):
+        latencies = time_frames(frames, draw)
+        print(f"  {name:<12} median {statistics.median(latencies) * 1000:6.3f} ms/frame, "
+              f"max {max(latencies) * 1000:6.3f} ms")
+
+    stats = cache.stats()
+    print(f"  hit rate {stats['hit_rate'] * 100:.1f}%: {stats['hits']} hits, "
+          f"{stats['atlas_draws']} from atlas, {stats['misses']} rendered; "
+          f"{stats['entries']} strings, {stats['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark tyre thermal tile rendering for all four corners at 60 FPS.
+
+Draws the four thermal images through Display every frame for a simulated
+drive, with sensor data arriving at 10 Hz: slowly drifting temperatures
+plus sensor noise. Reports per-frame time for the current-temperature and
+history views, with and without the tile cache, against the 16.7 ms frame
+budget. Runs without a screen (SDL dummy video driver).
+
+Usage:
+    python tools/thermal_tile_benchmark.py
+    python tools/thermal_tile_benchmark.py --seconds 20 --noise 0.3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Allow running from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from config import DISPLAY_HEIGHT, DISPLAY_WIDTH  # noqa: E402
+from utils.tyre_history import TyreHistorySnapshot  # noqa: E402
+
+POSITIONS = ["FL", "FR", "RL", "RR"]
+FPS = 60
+DATA_HZ = 10
+
+
+def sensor_frames(seconds, noise, rng):
+    """Per display frame, the latest 24x32 image for each corner (new at DATA_HZ)."""
+    frames = []
+    latest = None
+    for frame in range(seconds * FPS):
+        if frame % (FPS // DATA_HZ) == 0:
+            t = frame / FPS
+            latest = {
+                position: 75 + 10 * np.sin(t / 20 + i) + rng.normal(0, noise, (24, 32))
+                for i, position in enumerate(POSITIONS)
+            }
+        frames.append(latest)
+    return frames
+
+
+def history_snapshot(image):
+    """History snapshot with bands cooling away from the current zone means."""
+    zones = [image[:, :10].mean(), image[:, 10:20].mean(), image[:, 20:].mean()]
+    bands = [tuple(zone - 2 * i for i in range(7)) for zone in zones]
+    return TyreHistorySnapshot(bands[0], bands[1], bands[2], time.time())
+
+
+def time_frames(display, frames, history, show_text):
+    """Seconds to draw the four corners, per frame."""
+    snapshots = {}
+    latencies = []
+    for images in frames:
+        if history and id(images) not in snapshots:
+            snapshots = {id(images): {p: history_snapshot(images[p]) for p in POSITIONS}}
+        start = time.perf_counter()
+        for position in POSITIONS:
+            if history:
+                display.draw_thermal_image_with_history(
+                    position, snapshots[id(images)][position], show_text)
+            else:
+                display.draw_thermal_image(position, images[position], show_text)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thermal tile rendering")
+    parser.add_argument("--seconds", type=int, default=10, help="Simulated seconds at 60 FPS")
+    parser.add_argument("--noise", type=float, default=0.05,
+                        help="Sensor noise (degrees, standard deviation)")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    from gui.display import Display
+
+    display = Display(screen)
+    frames = sensor_frames(args.seconds, args.noise, np.random.default_rng(0))
+    budget_ms = 1000 / FPS
+
+    print(f"{len(frames)} frames, data at {DATA_HZ} Hz, noise {args.noise} degrees")
+    print(f"  {'View':<26} {'cache':>6} {'median':>9} {'p95':>9} {'budget':>8}")
+    for history in (False, True):
+        for show_text in (False, True):
+            for cached in (True, False):
+                display.thermal_tiles.clear()
+                display.thermal_tiles.max_tiles = 32 if cached else 0
+                latencies = time_frames(display, frames, history, show_text)
+                median_ms = statistics.median(latencies) * 1000
+                p95_ms = float(np.percentile(latencies, 95)) * 1000
+                view = ("history" if history else "current") + (" + text" if show_text else "")
+                print(f"  {view:<26} {'on' if cached else 'off':>6} {median_ms:>7.3f}ms "
+                      f"{p95_ms:>7.3f}ms {median_ms / budget_ms * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
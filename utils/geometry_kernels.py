@@ -0,0 +1,138 @@
+"""
+Vectorised geometry kernels for GPS paths.
+
+Batched numpy versions of the per-point helpers in copilot/geometry.py and
+lap_timing/utils/geometry.py, used by the CoPilot and lap timing corner
+detectors. Each kernel uses the same formula as its scalar counterpart, so
+results agree to floating point rounding.
+
+All functions take array-likes of decimal degrees and return numpy arrays.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Mean Earth radius in metres (matches the scalar haversine_distance)
+EARTH_RADIUS_M = 6371000.0
+
+# Metres per degree used by the small-area equirectangular projection
+METRES_PER_DEG_LON = 111320.0  # At the equator, scaled by cos(latitude)
+METRES_PER_DEG_LAT = 110540.0
+
+# Three-point curvature guards (match the scalar implementations)
+_MIN_TRIANGLE_AREA = 1e-6  # m^2, below this points are collinear
+_MIN_RADIUS_M = 0.1
+
+
+def haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great circle distance in metres between point pairs."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    delta_phi = np.radians(np.subtract(lat2, lat1))
+    delta_lambda = np.radians(np.subtract(lon2, lon1))
+
+    a = np.sin(delta_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+    return EARTH_RADIUS_M * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+
+
+def bearing(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Initial bearing in degrees (0-360) from the first to the second point."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    delta_lambda = np.radians(np.subtract(lon2, lon1))
+
+    x = np.sin(delta_lambda) * np.cos(phi2)
+    y = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(delta_lambda)
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
+
+
+def segment_lengths(lats, lons) -> np.ndarray:
+    """Haversine length in metres of each segment of a path (n - 1 values)."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return haversine(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+
+def cumulative_distances(lats, lons) -> np.ndarray:
+    """Distance in metres along a path at each point, starting at 0."""
+    distances = np.zeros(len(lats))
+    if len(lats) > 1:
+        np.cumsum(segment_lengths(lats, lons), out=distances[1:])
+    return distances
+
+
+def to_local(lats, lons, ref_lat: float, ref_lon: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project points to a local east/north frame in metres.
+
+    Small-area equirectangular projection about (ref_lat, ref_lon), with the
+    east scale taken at ref_lat.
+
+    Returns:
+        (east, north) arrays in metres
+    """
+    east = (np.subtract(lons, ref_lon) * METRES_PER_DEG_LON) * np.cos(np.radians(ref_lat))
+    north = np.subtract(lats, ref_lat) * METRES_PER_DEG_LAT
+    return east, north
+
+
+def curvature(lats, lons, closed: bool = False) -> np.ndarray:
+    """
+    Signed three-point (circumcircle) curvature at each point of a path.
+
+    Each point is the middle of a triangle with its neighbours, projected to
+    metres about the middle point. Positive = left turn, negative = right,
+    0 for collinear points or radii below 0.1m.
+
+    Args:
+        lats, lons: Path points (decimal degrees)
+        closed: Treat the path as a loop (first and last points use the
+                other end as a neighbour). Otherwise the end points are 0.
+
+    Returns:
+        Curvature in 1/metres at each point
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    n = len(lats)
+    if n == 0 or (n < 3 and not closed):
+        return np.zeros(n)
+
+    if closed:
+        prev = np.roll(np.arange(n), 1)
+        nxt = np.roll(np.arange(n), -1)
+        mid = np.arange(n)
+    else:
+        prev = np.arange(0, n - 2)
+        mid = prev + 1
+        nxt = prev + 2
+
+    lat2 = lats[mid]
+    lon2 = lons[mid]
+    scale = np.cos(np.radians(lat2))
+    x1 = (lons[prev] - lon2) * METRES_PER_DEG_LON * scale
+    y1 = (lats[prev] - lat2) * METRES_PER_DEG_LAT
+    x3 = (lons[nxt] - lon2) * METRES_PER_DEG_LON * scale
+    y3 = (lats[nxt] - lat2) * METRES_PER_DEG_LAT
+
+    # Triangle with the middle point at the origin
+    area = np.abs((x3 * y1 - x1 * y3) / 2.0)
+    a = np.sqrt(x3 * x3 + y3 * y3)
+    b = np.sqrt((x1 - x3) ** 2 + (y1 - y3) ** 2)
+    c = np.sqrt(x1 * x1 + y1 * y1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius = (a * b * c) / (4.0 * area)
+    cross = (x3 - x1) * -y1 - (y3 - y1) * -x1
+    sign = np.where(cross > 0, 1.0, -1.0)
+
+    valid = (area >= _MIN_TRIANGLE_AREA) & (radius >= _MIN_RADIUS_M)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(valid, sign / radius, 0.0)
+
+    if closed:
+        return values
+    result = np.zeros(n)
+    result[1:-1] = values
+    return result
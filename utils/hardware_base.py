@@ -7,7 +7,8 @@ import logging
 import threading
 import queue
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 import time
 
 from config import HANDLER_QUEUE_DEPTH, HANDLER_STOP_TIMEOUT_S
@@ -20,10 +21,15 @@ class HardwareSnapshot:
     """
     Immutable snapshot of hardware data for lock-free access.
     Uses dataclass frozen=True for immutability.
+
+    seq is the handler's publish sequence number (1 for the first snapshot),
+    so readers can tell whether they have already seen a snapshot. In
+    zero-copy mode data and metadata are read-only mappings.
     """
     timestamp: float
-    data: Dict[str, Any] = field(default_factory=dict)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    data: Mapping[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    seq: int = 0
 
 
 class ExponentialBackoff:
@@ -102,6 +108,12 @@ class BoundedQueueHardwareHandler:
     - Lock-free snapshots for render path
     - Worker thread handles all I/O and processing
     - Never blocks render loop
+    - Sequence-numbered update notification for downstream worker threads
+      (wait_for_update) so they react to new data instead of sleep-polling
+    - Optional zero-copy mode: the worker swaps a read-only snapshot into a
+      single reference slot and readers get that object without any copy.
+      The published dict is owned by the snapshot, so the publisher must
+      build a fresh dict for every publish and never modify it afterwards.
 
     Performance targets from system plan:
     - Queue depth: 2 (1 current + 1 buffer)
@@ -109,19 +121,30 @@ class BoundedQueueHardwareHandler:
     - No locks in consumer (render) path
     """
 
-    def __init__(self, queue_depth: int = HANDLER_QUEUE_DEPTH):
+    def __init__(self, queue_depth: int = HANDLER_QUEUE_DEPTH, zero_copy: bool = False):
         """
         Initialise the hardware handler.
 
         Args:
             queue_depth: Maximum queue depth (default from config for double-buffering)
+            zero_copy: Publish through a single atomic reference slot instead
+                       of the queue, without copying data (see class docstring)
         """
         self.queue_depth = queue_depth
+        self.zero_copy = zero_copy
         self.data_queue = queue.Queue(maxsize=queue_depth)
         self.current_snapshot: Optional[HardwareSnapshot] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
 
+        # Update notification: sequence number bumped on every publish
+        self._update_seq = 0
+        self._update_cond = threading.Condition()
+
+        # Optional raw channel tap (utils/raw_channel_log.ChannelTap), fed
+        # with every published snapshot while a recording is running
+        self.log_tap = None
+
         # Performance monitoring
         self.frame_count = 0
         self.last_perf_time = time.time()
@@ -158,32 +181,44 @@ class BoundedQueueHardwareHandler:
 
     def _publish_snapshot(self, data: Dict[str, Any], metadata: Dict[str, Any] = None):
         """
-        Publish a new data snapshot to the queue.
+        Publish a new data snapshot to the queue (or the slot in zero-copy mode).
 
         Args:
-            data: Hardware data dictionary
+            data: Hardware data dictionary (owned by the snapshot in zero-copy mode)
             metadata: Optional metadata (status, errors, etc.)
         """
-        snapshot = HardwareSnapshot(
-            timestamp=time.time(),
-            data=data.copy() if data else {},
-            metadata=metadata.copy() if metadata else {}
-        )
+        seq = self._update_seq + 1
+        if self.zero_copy:
+            # Take ownership of the caller's dicts behind read-only views
+            snapshot = HardwareSnapshot(
+                timestamp=time.time(),
+                data=MappingProxyType(data if data else {}),
+                metadata=MappingProxyType(metadata if metadata else {}),
+                seq=seq,
+            )
+        else:
+            snapshot = HardwareSnapshot(
+                timestamp=time.time(),
+                data=data.copy() if data else {},
+                metadata=metadata.copy() if metadata else {},
+                seq=seq,
+            )
+
+        # Feed the raw channel log at the handler's native rate
+        log_tap = self.log_tap
+        if log_tap is not None:
+            log_tap.push(snapshot.timestamp, snapshot.data)
+
+        if self.zero_copy:
+            # Single writer: a plain attribute store is an atomic swap
+            self.current_snapshot = snapshot
+        else:
+            self._enqueue_snapshot(snapshot)
 
-        # Non-blocking put - drop oldest frame if queue full
-        try:
-            self.data_queue.put_nowait(snapshot)
-        except queue.Full:
-            # Queue full - drop oldest and retry
-            try:
-                self.data_queue.get_nowait()
-                self.data_queue.put_nowait(snapshot)
-                self._frames_dropped += 1
-                self._frames_dropped_total += 1
-            except (queue.Empty, queue.Full):
-                # Race condition - frame truly dropped
-                self._frames_dropped += 1
-                self._frames_dropped_total += 1
+        # Wake any threads waiting in wait_for_update()
+        with self._update_cond:
+            self._update_seq = seq
+            self._update_cond.notify_all()
 
         # Update performance metrics
         self.frame_count += 1
@@ -207,6 +242,55 @@ class BoundedQueueHardwareHandler:
             self._frames_dropped = 0
             self._last_drop_log_time = current_time
 
+    def _enqueue_snapshot(self, snapshot: HardwareSnapshot):
+        """Non-blocking put - drop oldest frame if queue full."""
+        try:
+            self.data_queue.put_nowait(snapshot)
+        except queue.Full:
+            # Queue full - drop oldest and retry
+            try:
+                self.data_queue.get_nowait()
+                self.data_queue.put_nowait(snapshot)
+                self._frames_dropped += 1
+                self._frames_dropped_total += 1
+            except (queue.Empty, queue.Full):
+                # Race condition - frame truly dropped
+                self._frames_dropped += 1
+                self._frames_dropped_total += 1
+
+    @property
+    def update_seq(self) -> int:
+        """Sequence number of the latest published snapshot (0 = none yet)."""
+        return self._update_seq
+
+    def wait_for_update(self, since_seq: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until a snapshot newer than since_seq is published.
+
+        For downstream worker threads only - never call from the render path.
+
+        Args:
+            since_seq: Last sequence number the caller has processed
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Current sequence number (equal to since_seq if the wait timed out)
+        """
+        with self._update_cond:
+            self._update_cond.wait_for(
+                lambda: self._update_seq != since_seq, timeout=timeout
+            )
+            return self._update_seq
+
+    def set_log_tap(self, tap):
+        """
+        Attach or detach a raw channel tap.
+
+        Args:
+            tap: ChannelTap to receive every published snapshot, or None
+        """
+        self.log_tap = tap
+
     def get_snapshot(self) -> Optional[HardwareSnapshot]:
         """
         Get the latest data snapshot (lock-free for render path).
@@ -214,6 +298,9 @@ class BoundedQueueHardwareHandler:
         Returns:
             HardwareSnapshot or None if no data available
         """
+        if self.zero_copy:
+            return self.current_snapshot
+
         # Drain queue keeping only latest snapshot (non-blocking)
         try:
             while True:
@@ -223,12 +310,13 @@ class BoundedQueueHardwareHandler:
 
         return self.current_snapshot
 
-    def get_data(self) -> Dict[str, Any]:
+    def get_data(self) -> Mapping[str, Any]:
         """
         Get the latest hardware data.
 
         Returns:
-            Dictionary with hardware data or empty dict if no data
+            Mapping with hardware data (read-only in zero-copy mode) or
+            empty dict if no data
         """
         snapshot = self.get_snapshot()
         return snapshot.data if snapshot else {}
@@ -0,0 +1,388 @@
+"""
+High-rate raw channel logging for openTPT.
+
+Hardware handlers push every published sample into a per-handler ring buffer
+(a ChannelTap attached to BoundedQueueHardwareHandler), and a logger thread
+drains all the rings into a raw session file. This captures IMU, OBD2, GPS
+and radar data at their native rates, independent of the 10 Hz telemetry
+recording clock driven by the render loop.
+
+Each ring has a single producer (the handler's worker thread) and a single
+consumer (the logger thread). The producer writes a slot and then advances
+its write counter; the consumer only reads slots behind that counter, so no
+locks are needed under the GIL.
+
+File layout (little-endian):
+    header:  MAGIC (8 bytes) | uint32 schema length | schema JSON
+    block:   BLOCK_MAGIC (4 bytes) | uint16 source | uint32 rows |
+             uint32 payload length | uint32 CRC32 of payload | payload
+
+The payload holds the float64 timestamp column followed by one column per
+channel of the source (NaN for missing values): float32, except float64 for
+GPS position. Each source's column dtypes are listed in the schema header.
+"""
+
+import csv
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import RAW_LOG_FLUSH_INTERVAL_S, RAW_LOG_RING_CAPACITY
+
+logger = logging.getLogger('openTPT.telemetry')
+
+FORMAT_VERSION = 2
+MAGIC = b"OTPTRAW\x01"
+BLOCK_MAGIC = b"RAW\x00"
+_HEADER_STRUCT = struct.Struct("<I")
+_BLOCK_STRUCT = struct.Struct("<4sHIII")
+
+# Channel keys captured from each handler's published data
+IMU_RAW_KEYS = ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z")
+OBD2_RAW_KEYS = (
+    "engine_rpm", "obd_speed_kmh", "throttle_percent", "boost_kpa",
+    "brake_pressure_input_bar", "brake_pressure_output_bar",
+)
+GPS_RAW_KEYS = ("latitude", "longitude", "speed_kmh", "heading")
+RADAR_RAW_KEYS = ("track_id", "long_dist", "lat_dist", "rel_speed")
+
+# Keys stored as float64: float32 cannot hold latitude/longitude to better
+# than ~1 m
+_F8_KEYS = frozenset(("latitude", "longitude"))
+
+
+def key_dtype(key: str) -> str:
+    """On-disk column dtype for a captured channel key."""
+    return "<f8" if key in _F8_KEYS else "<f4"
+
+
+def radar_track_rows(data: Dict[Any, Dict]) -> Iterable[Dict]:
+    """Split a radar snapshot (tracks keyed by ID) into one row per track."""
+    return data.values()
+
+
+class ChannelTap:
+    """
+    Single-producer, single-consumer ring buffer of timestamped samples.
+
+    Attach to a handler with BoundedQueueHardwareHandler.set_log_tap(); the
+    handler's worker thread calls push() for every published snapshot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keys: Sequence[str],
+        capacity: int = RAW_LOG_RING_CAPACITY,
+        rows_of: Optional[Callable[[Dict], Iterable[Dict]]] = None,
+    ):
+        """
+        Initialise the tap.
+
+        Args:
+            name: Source name written to the log (e.g. "imu")
+            keys: Data keys to capture, in column order
+            capacity: Ring size in samples (oldest are overwritten when full)
+            rows_of: Optional function splitting one snapshot into several
+                     rows (e.g. one per radar track); default is one row
+        """
+        self.name = name
+        self.keys = tuple(keys)
+        self.formats = tuple(key_dtype(key) for key in self.keys)
+        self.capacity = capacity
+        self.rows_of = rows_of
+        self._buffer = np.full((capacity, 1 + len(self.keys)), np.nan)
+        self._write = 0
+        self._read = 0
+        self.samples_lost = 0
+
+    def push(self, timestamp: float, data: Dict[str, Any]):
+        """
+        Record a snapshot (producer side, handler worker thread).
+
+        Args:
+            timestamp: Snapshot timestamp (epoch seconds)
+            data: Snapshot data
+        """
+        rows = self.rows_of(data) if self.rows_of else (data,)
+        keys = self.keys
+        for sample in rows:
+            slot = self._buffer[self._write % self.capacity]
+            slot[0] = timestamp
+            try:
+                slot[1:] = [sample.get(key) for key in keys]
+            except (TypeError, ValueError):
+                # Non-numeric value in a captured channel - skip the sample
+                continue
+            # Publish the slot only after it is fully written
+            self._write += 1
+
+    def drain(self) -> np.ndarray:
+        """
+        Take every sample pushed since the last drain (consumer side).
+
+        Returns:
+            Array of shape (n, 1 + len(keys)): timestamp then channel values
+        """
+        write = self._write
+        # The slot at write % capacity may be mid-overwrite, so never read
+        # more than capacity - 1 samples back
+        oldest = write - self.capacity + 1
+        if self._read < oldest:
+            self.samples_lost += oldest - self._read
+            self._read = oldest
+        count = write - self._read
+        if count <= 0:
+            return self._buffer[:0].copy()
+
+        start = self._read % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            rows = self._buffer[start:end].copy()
+        else:
+            rows = np.concatenate(
+                (self._buffer[start:], self._buffer[:end - self.capacity])
+            )
+        self._read = write
+        return rows
+
+
+def encode_block(source: int, rows: np.ndarray, formats: Sequence[str]) -> bytes:
+    """
+    Encode drained samples as a framed, checksummed columnar block.
+
+    Args:
+        source: Index of the tap in the file's schema
+        rows: Array from ChannelTap.drain()
+        formats: On-disk dtype of each channel column (ChannelTap.formats)
+
+    Returns:
+        Bytes ready to append to a raw log file
+    """
+    parts = [rows[:, 0].astype("<f8").tobytes()]
+    parts.extend(rows[:, j].astype(fmt).tobytes() for j, fmt in enumerate(formats, 1))
+    payload = b"".join(parts)
+    header = _BLOCK_STRUCT.pack(
+        BLOCK_MAGIC, source, len(rows), len(payload), zlib.crc32(payload)
+    )
+    return header + payload
+
+
+class RawChannelLogger:
+    """
+    Drains a set of ChannelTaps into a raw log file on a background thread.
+
+    Usage:
+        logger = RawChannelLogger(path, [imu_tap, radar_tap])
+        logger.start(start_time)
+        # ... handlers push into taps ...
+        logger.stop()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        taps: Sequence[ChannelTap],
+        flush_interval_s: float = RAW_LOG_FLUSH_INTERVAL_S,
+    ):
+        """
+        Initialise the logger.
+
+        Args:
+            path: Destination file path
+            taps: Taps to drain, in schema order
+            flush_interval_s: Seconds between drains
+        """
+        self.path = path
+        self.taps = list(taps)
+        self.flush_interval_s = flush_interval_s
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+
+        self.rows_written = 0
+        self.write_errors = 0
+
+    def start(self, start_time: float):
+        """
+        Create the file, write the schema header and start the logger thread.
+
+        Args:
+            start_time: Session start time (epoch seconds), stored in the header
+
+        Raises:
+            OSError: If the file cannot be created
+        """
+        schema = json.dumps({
+            "version": FORMAT_VERSION,
+            "start_time": start_time,
+            "sources": [
+                {"name": t.name, "keys": t.keys, "formats": t.formats}
+                for t in self.taps
+            ],
+        }).encode("utf-8")
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC + _HEADER_STRUCT.pack(len(schema)) + schema)
+        self._file.flush()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._logger_loop, name="raw-channel-logger", daemon=True
+        )
+        self._thread.start()
+
+    def _logger_loop(self):
+        """Logger thread: periodically drain every tap into the file."""
+        while not self._stop_event.wait(self.flush_interval_s):
+            self._drain_all()
+        # Final drain so nothing pushed before stop() is lost
+        self._drain_all()
+
+    def _drain_all(self):
+        """Drain each tap and append a block for any new samples."""
+        wrote = False
+        for index, tap in enumerate(self.taps):
+            rows = tap.drain()
+            if not len(rows):
+                continue
+            try:
+                self._file.write(encode_block(index, rows, tap.formats))
+                self.rows_written += len(rows)
+                wrote = True
+            except (IOError, OSError) as e:
+                self.write_errors += 1
+                logger.error("Error writing raw channel block: %s", e)
+        if wrote:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except (IOError, OSError) as e:
+                self.write_errors += 1
+                logger.error("Error flushing raw channel log: %s", e)
+
+    def stop(self):
+        """Drain remaining samples, stop the logger thread and close the file."""
+        if self._file is None:
+            return
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        try:
+            self._file.close()
+        except (IOError, OSError) as e:
+            logger.error("Error closing raw channel log: %s", e)
+        self._file = None
+        lost = sum(t.samples_lost for t in self.taps)
+        if lost:
+            logger.warning("Raw channel log overran %d samples", lost)
+
+
+def read_header(f) -> Dict[str, Any]:
+    """
+    Read and validate a raw log header.
+
+    Args:
+        f: Binary file object positioned at the start of the file
+
+    Returns:
+        Schema dictionary
+
+    Raises:
+        ValueError: If the file is not a raw channel log
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an openTPT raw channel log")
+    raw = f.read(_HEADER_STRUCT.size)
+    if len(raw) < _HEADER_STRUCT.size:
+        raise ValueError("Truncated raw channel log header")
+    (schema_len,) = _HEADER_STRUCT.unpack(raw)
+    return json.loads(f.read(schema_len).decode("utf-8"))
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[str, Tuple[str, ...], np.ndarray]]:
+    """
+    Iterate over the blocks of a raw log file.
+
+    Stops quietly at the first truncated or corrupt block.
+
+    Args:
+        path: Raw log file path
+
+    Yields:
+        (source name, channel keys, structured array with "timestamp" and
+        one field per key) per block
+    """
+    with open(path, "rb") as f:
+        sources = read_header(f)["sources"]
+        dtypes = [
+            np.dtype([("timestamp", "<f8")] + list(zip(
+                s["keys"], s.get("formats", ["<f4"] * len(s["keys"]))
+            )))
+            for s in sources
+        ]
+        while True:
+            raw = f.read(_BLOCK_STRUCT.size)
+            if not raw:
+                return
+            if len(raw) < _BLOCK_STRUCT.size:
+                logger.warning("Truncated block header in %s", path)
+                return
+            magic, source, rows, length, crc = _BLOCK_STRUCT.unpack(raw)
+            if magic != BLOCK_MAGIC or source >= len(sources):
+                logger.warning("Bad block marker in %s", path)
+                return
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                logger.warning("Truncated or corrupt block in %s", path)
+                return
+
+            block = np.empty(rows, dtype=dtypes[source])
+            offset = 0
+            for name in block.dtype.names:
+                fmt = block.dtype[name]
+                block[name] = np.frombuffer(payload, dtype=fmt, count=rows, offset=offset)
+                offset += rows * fmt.itemsize
+            yield sources[source]["name"], tuple(sources[source]["keys"]), block
+
+
+def export_csv(src_path: str, dst_prefix: str) -> Dict[str, str]:
+    """
+    Export a raw log to one CSV per source.
+
+    Args:
+        src_path: Raw log file path (complete or partial)
+        dst_prefix: Output path prefix; files are named <prefix>_<source>.csv
+
+    Returns:
+        Mapping of source name to CSV path written
+    """
+    blocks: Dict[str, List[np.ndarray]] = {}
+    keys_of: Dict[str, Tuple[str, ...]] = {}
+    for name, keys, block in iter_blocks(src_path):
+        blocks.setdefault(name, []).append(block)
+        keys_of[name] = keys
+
+    outputs = {}
+    for name, parts in blocks.items():
+        rows = np.concatenate(parts)
+        dst_path = f"{dst_prefix}_{name}.csv"
+        columns = [[repr(v) for v in rows["timestamp"].tolist()]]
+        for key in keys_of[name]:
+            cells = rows[key].astype(str).tolist()
+            for i in np.flatnonzero(np.isnan(rows[key])).tolist():
+                cells[i] = ""
+            columns.append(cells)
+        with open(dst_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("timestamp",) + keys_of[name])
+            writer.writerows(zip(*columns))
+        outputs[name] = dst_path
+    return outputs
@@ -0,0 +1,189 @@
+"""
+Telemetry row assembly for openTPT.
+
+Maps hardware handler snapshot keys to slots in a preallocated telemetry row
+(see utils/telemetry_stream), so recording a frame on the render thread is a
+handful of vectorised slot writes rather than building a TelemetryFrame.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.telemetry_stream import CHANNEL_INDEX, CHANNEL_NAMES
+
+POSITIONS = ("FL", "FR", "RL", "RR")
+
+# Source key -> telemetry channel, per handler
+TPMS_CHANNELS = tuple(
+    ((pos, key), f"tpms_{pos.lower()}_{channel}")
+    for pos in POSITIONS
+    for key, channel in (("pressure", "pressure"), ("temp", "temp"))
+)
+TYRE_CHANNELS = tuple(
+    ((pos, key), f"tyre_{pos.lower()}_{channel}")
+    for pos in POSITIONS
+    for key, channel in (
+        ("left_median", "inner"),
+        ("centre_median", "centre"),
+        ("right_median", "outer"),
+    )
+)
+BRAKE_CHANNELS = tuple((pos, f"brake_{pos.lower()}") for pos in POSITIONS)
+IMU_CHANNELS = tuple(
+    (key, key) for key in ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z")
+)
+OBD_CHANNELS = tuple(
+    (key, key) for key in (
+        "obd_speed_kmh", "engine_rpm", "throttle_percent", "coolant_temp_c",
+        "oil_temp_c", "intake_temp_c", "map_kpa", "boost_kpa", "maf_gs",
+        "battery_soc", "brake_pressure_input_bar", "brake_pressure_output_bar",
+    )
+)
+GPS_CHANNELS = (
+    ("latitude", "gps_latitude"),
+    ("longitude", "gps_longitude"),
+    ("speed_kmh", "gps_speed_kmh"),
+    ("heading", "gps_heading"),
+)
+LAP_CHANNELS = (
+    ("lap_number", "lap_number"),
+    ("current_lap_time", "lap_time"),
+    ("delta_seconds", "lap_delta"),
+    ("current_sector", "sector"),
+    ("track_position", "track_position"),
+)
+FUEL_CHANNELS = (
+    ("fuel_level_percent", "fuel_level_percent"),
+    ("fuel_rate_lph", "fuel_rate_lph"),
+    ("current_lap_consumption_litres", "fuel_consumption_lap_litres"),
+)
+
+_EMPTY: Dict = {}
+
+
+def _compile(channels: Sequence[Tuple]) -> Tuple[tuple, np.ndarray]:
+    """Split a channel map into source keys and an index array of row slots."""
+    keys = tuple(key for key, _ in channels)
+    slots = np.array([CHANNEL_INDEX[channel] for _, channel in channels], dtype=np.intp)
+    return keys, slots
+
+
+class TelemetryRowAssembler:
+    """
+    Assembles one telemetry row per call from the live hardware handlers.
+
+    The row and string table are preallocated and reused; the caller must
+    hand them to TelemetryRecorder.record_row() (which copies the row) before
+    the next call.
+    """
+
+    def __init__(self):
+        """Compile the channel maps and allocate the row buffer."""
+        self.row = np.full(len(CHANNEL_NAMES), np.nan)
+        self.strings: Dict[str, Optional[str]] = {"track_name": None}
+
+        self._timestamp_slot = CHANNEL_INDEX["timestamp"]
+        self._sector_time_slot = CHANNEL_INDEX["sector_time"]
+        self._heart_rate_slot = CHANNEL_INDEX["heart_rate_bpm"]
+        self._tpms_keys, self._tpms_slots = _compile(TPMS_CHANNELS)
+        self._tyre_keys, self._tyre_slots = _compile(TYRE_CHANNELS)
+        self._brake_keys, self._brake_slots = _compile(BRAKE_CHANNELS)
+        self._imu_keys, self._imu_slots = _compile(IMU_CHANNELS)
+        self._obd_keys, self._obd_slots = _compile(OBD_CHANNELS)
+        self._gps_keys, self._gps_slots = _compile(GPS_CHANNELS)
+        self._lap_keys, self._lap_slots = _compile(LAP_CHANNELS)
+        self._fuel_keys, self._fuel_slots = _compile(FUEL_CHANNELS)
+
+    def assemble(self, sources, timestamp: float) -> Tuple[np.ndarray, Dict[str, Optional[str]]]:
+        """
+        Fill the row from the handlers attached to sources.
+
+        Args:
+            sources: Object with tpms, thermal, brakes, imu, obd2, gps,
+                     lap_timing, fuel_tracker and ant_hr attributes, any
+                     of which may be None
+            timestamp: Frame timestamp (epoch seconds)
+
+        Returns:
+            (row, strings) ready for TelemetryRecorder.record_row()
+        """
+        row = self.row
+        row.fill(np.nan)
+        row[self._timestamp_slot] = timestamp
+        self.strings["track_name"] = None
+
+        # TPMS data
+        tpms = sources.tpms
+        if tpms:
+            tpms_data = tpms.get_data()
+            row[self._tpms_slots] = [
+                (tpms_data.get(pos) or _EMPTY).get(key) for pos, key in self._tpms_keys
+            ]
+
+        # Tyre thermal data (3-zone temps from CAN corner sensors)
+        thermal = sources.thermal
+        if thermal:
+            zones = {pos: thermal.get_zone_data(pos) or _EMPTY for pos in POSITIONS}
+            row[self._tyre_slots] = [zones[pos].get(key) for pos, key in self._tyre_keys]
+
+        # Brake temps
+        brakes = sources.brakes
+        if brakes:
+            brake_temps = brakes.get_temps()
+            values = []
+            for pos in self._brake_keys:
+                data = brake_temps.get(pos)
+                values.append(data.get("temp") if isinstance(data, dict) else data)
+            row[self._brake_slots] = values
+
+        # IMU data
+        imu = sources.imu
+        if imu:
+            imu_data = imu.get_data()
+            if imu_data:
+                row[self._imu_slots] = [imu_data.get(key) for key in self._imu_keys]
+
+        # OBD2 data
+        obd2 = sources.obd2
+        if obd2:
+            obd_data = obd2.get_data()
+            if obd_data:
+                row[self._obd_slots] = [obd_data.get(key) for key in self._obd_keys]
+
+        # GPS data
+        gps = sources.gps
+        if gps:
+            snapshot = gps.get_snapshot()
+            if snapshot and snapshot.data and snapshot.data.get("has_fix"):
+                gps_data = snapshot.data
+                row[self._gps_slots] = [gps_data.get(key) for key in self._gps_keys]
+
+        # Lap timing data
+        lap_timing = sources.lap_timing
+        if lap_timing:
+            snapshot = lap_timing.get_snapshot()
+            if snapshot and snapshot.data:
+                lap_data = snapshot.data
+                row[self._lap_slots] = [lap_data.get(key) for key in self._lap_keys]
+                sector_times = lap_data.get("sector_times")
+                current_sector = lap_data.get("current_sector") or 0
+                if sector_times and 0 < current_sector <= len(sector_times):
+                    row[self._sector_time_slot] = sector_times[current_sector - 1]
+                self.strings["track_name"] = lap_data.get("track_name")
+
+        # Fuel tracking data
+        fuel_tracker = sources.fuel_tracker
+        if fuel_tracker:
+            fuel_state = fuel_tracker.get_state()
+            if fuel_state.get("data_available"):
+                row[self._fuel_slots] = [fuel_state.get(key) for key in self._fuel_keys]
+
+        # ANT+ Heart Rate data
+        ant_hr = sources.ant_hr
+        if ant_hr:
+            hr = ant_hr.get_heart_rate()
+            if hr is not None:
+                row[self._heart_rate_slot] = hr
+
+        return row, self.strings
@@ -1,16 +1,18 @@
 """
 Telemetry Recorder for openTPT.
-Records sensor data to CSV files for later analysis.
+Records sensor data to disk during a session and exports it to CSV.
 """
 
-import csv
 import logging
 import os
 import time
 import threading
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Iterable, List, Sequence, Tuple
+from dataclasses import dataclass
+
+from config import RAW_LOG_ENABLED
+from utils.raw_channel_log import ChannelTap, RawChannelLogger, export_csv as export_raw_csv
 
 logger = logging.getLogger('openTPT.telemetry')
 
@@ -161,7 +163,16 @@ class TelemetryFrame:
 
 class TelemetryRecorder:
     """
-    Records telemetry data to CSV files.
+    Records telemetry data to disk while the session runs.
+
+    Frames are streamed into a columnar binary file (see utils/telemetry_stream)
+    by a background writer thread, so memory stays bounded however long the
+    session is and a crash loses at most one block. Saving finalises the
+    stream file and exports it to CSV, either before returning (save()) or on
+    a background thread (save_in_background()).
+
+    Handlers registered with register_raw_source() are also logged at their
+    native rate to a companion raw channel file (see utils/raw_channel_log).
 
     Usage:
         recorder = TelemetryRecorder()
@@ -180,6 +191,9 @@ class TelemetryRecorder:
     USB_PATH = "/mnt/usb/telemetry"
     FALLBACK_PATH = "/home/pi/telemetry"
 
+    # Suffix of a stream file still being written (or left by a crash)
+    PARTIAL_SUFFIX = ".partial"
+
     def __init__(self, output_dir: Optional[str] = None):
         """
         Initialise the recorder.
@@ -189,10 +203,18 @@ class TelemetryRecorder:
                         USB (/mnt/usb/telemetry) if mounted, else SD card fallback.
         """
         self.recording = False
-        self.frames: List[TelemetryFrame] = []
+        self.frame_count = 0
         self.start_time: Optional[float] = None
         self.temp_filename: Optional[str] = None
+        self.stream_path: Optional[str] = None
+        self.writer = None
         self.lock = threading.Lock()
+        self.export_thread: Optional[threading.Thread] = None
+
+        # High-rate raw channel sources: (name, handler, keys, rows_of)
+        self.raw_sources: List[Tuple[str, Any, Sequence[str], Optional[Callable]]] = []
+        self.raw_path: Optional[str] = None
+        self.raw_logger: Optional[RawChannelLogger] = None
 
         # Select output directory
         if output_dir:
@@ -228,23 +250,85 @@ class TelemetryRecorder:
         logger.info("Using SD card fallback for telemetry")
         return self.FALLBACK_PATH
 
+    def register_raw_source(
+        self,
+        name: str,
+        handler,
+        keys: Sequence[str],
+        rows_of: Optional[Callable[[Dict], Iterable[Dict]]] = None,
+    ):
+        """
+        Log a handler's published snapshots at native rate while recording.
+
+        Args:
+            name: Source name in the raw log (e.g. "imu")
+            handler: BoundedQueueHardwareHandler to tap
+            keys: Data keys to capture
+            rows_of: Optional function splitting a snapshot into several rows
+        """
+        self.raw_sources.append((name, handler, tuple(keys), rows_of))
+
+    def _start_raw_log(self, base: str):
+        """Create taps on registered handlers and start the raw logger."""
+        if not RAW_LOG_ENABLED or not self.raw_sources:
+            return
+        taps = [
+            ChannelTap(name, keys, rows_of=rows_of)
+            for name, _, keys, rows_of in self.raw_sources
+        ]
+        self.raw_path = os.path.join(
+            self.output_dir, base + ".raw.tlm" + self.PARTIAL_SUFFIX
+        )
+        raw_logger = RawChannelLogger(self.raw_path, taps)
+        try:
+            raw_logger.start(self.start_time)
+        except (IOError, OSError) as e:
+            logger.error("Error creating raw channel log: %s", e)
+            self.raw_path = None
+            return
+        self.raw_logger = raw_logger
+        for (_, handler, _, _), tap in zip(self.raw_sources, taps):
+            handler.set_log_tap(tap)
+
     def start_recording(self):
         """Start a new recording session."""
+        # Imported here to avoid a circular import (the stream schema is
+        # built from TelemetryFrame)
+        from utils.telemetry_stream import TelemetryStreamWriter
+
+        # Restarting without save/discard keeps the previous stream
         with self.lock:
-            self.recording = True
-            self.frames = []
+            previous = self._detach_writers()
+        self._close_writers(*previous)
+
+        with self.lock:
+            self.frame_count = 0
             self.start_time = time.time()
             # Generate temp filename based on start time
             dt = datetime.fromtimestamp(self.start_time)
             self.temp_filename = dt.strftime("telemetry_%Y%m%d_%H%M%S.csv")
-            logger.info("Recording started: %s", self.temp_filename)
+            base = os.path.splitext(self.temp_filename)[0]
+            self.stream_path = os.path.join(
+                self.output_dir, base + ".tlm" + self.PARTIAL_SUFFIX
+            )
+            writer = TelemetryStreamWriter(self.stream_path)
+            try:
+                writer.open(self.start_time)
+            except (IOError, OSError) as e:
+                logger.error("Error creating telemetry stream: %s", e)
+                self._clear()
+                return
+            self.writer = writer
+            self._start_raw_log(base)
+            self.recording = True
+            logger.info("Recording started: %s", self.stream_path)
 
     def stop_recording(self):
         """Stop the current recording session."""
         with self.lock:
             self.recording = False
             duration = time.time() - self.start_time if self.start_time else 0
-            logger.info("Recording stopped: %d frames, %.1fs", len(self.frames), duration)
+            logger.info("Recording stopped: %d frames, %.1fs", self.frame_count, duration)
 
     def is_recording(self) -> bool:
         """Check if currently recording."""
@@ -258,7 +342,7 @@ class TelemetryRecorder:
 
     def get_frame_count(self) -> int:
         """Get number of recorded frames."""
-        return len(self.frames)
+        return self.frame_count
 
     def record_frame(self, frame: TelemetryFrame):
         """
@@ -271,50 +355,204 @@ class TelemetryRecorder:
             return
 
         with self.lock:
-            self.frames.append(frame)
+            if self.writer:
+                self.writer.append_frame(frame)
+                self.frame_count += 1
+
+    def record_row(self, row, strings: Optional[Dict[str, str]] = None):
+        """
+        Record a preassembled row of telemetry data.
+
+        Args:
+            row: float64 array in utils.telemetry_stream.CHANNEL_NAMES order,
+                 NaN for missing values
+            strings: Values for string channels (e.g. track_name), keyed by
+                     channel name
+        """
+        if not self.recording:
+            return
+
+        with self.lock:
+            if self.writer:
+                self.writer.append_row(row, strings)
+                self.frame_count += 1
 
     def save(self) -> Optional[str]:
         """
-        Save the recorded data to a CSV file.
+        Finalise the recording and export it to CSV.
+
+        Blocks until the CSV has been written; use save_in_background() to
+        keep the caller responsive on long sessions.
 
         Returns:
-            Path to saved file, or None if no data
+            Path to saved CSV file, or None if no data
         """
-        with self.lock:
-            if not self.frames:
-                logger.warning("No frames to save")
-                return None
+        export = self._finalise()
+        if export is None:
+            return None
+        self._export_csv(*export)
+        return export[1]
 
-            filepath = os.path.join(self.output_dir, self.temp_filename)
+    def save_in_background(self) -> Optional[str]:
+        """
+        Finalise the recording and export it to CSV on a background thread.
 
-            try:
-                with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                    # Get fieldnames from first frame
-                    fieldnames = list(self.frames[0].to_dict().keys())
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
+        The stream file is closed and renamed before returning, but the CSV
+        does not exist until the export finishes; call wait_for_export()
+        before opening it.
 
-                    for frame in self.frames:
-                        writer.writerow(frame.to_dict())
+        Returns:
+            Path the CSV is being written to, or None if no data
+        """
+        export = self._finalise()
+        if export is None:
+            return None
+        self.export_thread = threading.Thread(
+            target=self._export_csv,
+            args=export,
+            name="telemetry-export",
+            daemon=True,
+        )
+        self.export_thread.start()
+        return export[1]
+
+    def wait_for_export(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a background CSV export started by save_in_background().
 
-                logger.info("Saved %d frames to %s", len(self.frames), filepath)
-                self._clear()
-                return filepath
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
 
-            except (IOError, OSError, KeyError, TypeError) as e:
-                logger.error("Error saving telemetry: %s", e)
-                self._clear()  # Clear frames even on error to prevent stale data
-                return None
+        Returns:
+            True if no export is still running
+        """
+        thread = self.export_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _finalise(self) -> Optional[Tuple[str, str, int, Optional[str]]]:
+        """
+        Close the stream writers and rename their files to their final names.
+
+        Returns:
+            (stream_path, csv_path, frame_count, raw_path) to export, or None
+            if there is nothing to save
+        """
+        with self.lock:
+            writers = self._detach_writers()
+            partials = (self.stream_path, self.raw_path)
+            has_frames = writers[0] is not None and self.frame_count > 0
+            csv_path = (
+                os.path.join(self.output_dir, self.temp_filename) if has_frames else None
+            )
+            frame_count = self.frame_count
+            self._clear()
+
+        # Writer threads are joined outside the lock so producers never stall
+        self._close_writers(*writers)
+
+        if not has_frames:
+            logger.warning("No frames to save")
+            self._remove_files(partials)
+            return None
+
+        stream_partial, raw_partial = partials
+        stream_path = stream_partial[:-len(self.PARTIAL_SUFFIX)]
+        try:
+            os.replace(stream_partial, stream_path)
+        except (IOError, OSError) as e:
+            logger.error("Error saving telemetry: %s", e)
+            return None
+
+        raw_path = None
+        if raw_partial:
+            raw_path = raw_partial[:-len(self.PARTIAL_SUFFIX)]
+            try:
+                os.replace(raw_partial, raw_path)
+            except (IOError, OSError) as e:
+                logger.error("Error saving raw channel log: %s", e)
+                raw_path = None
+
+        return stream_path, csv_path, frame_count, raw_path
+
+    def _export_csv(
+        self,
+        stream_path: str,
+        csv_path: str,
+        frame_count: int,
+        raw_path: Optional[str] = None,
+    ):
+        """Export finalised stream files to CSV."""
+        from utils.telemetry_stream import export_csv
+
+        try:
+            rows = export_csv(stream_path, csv_path)
+            logger.info("Saved %d frames to %s", rows, csv_path)
+            if rows < frame_count:
+                logger.warning(
+                    "%d frames were lost before reaching disk", frame_count - rows
+                )
+        except (IOError, OSError, ValueError) as e:
+            logger.error("Error exporting telemetry to CSV: %s", e)
+
+        if raw_path:
+            try:
+                outputs = export_raw_csv(raw_path, os.path.splitext(csv_path)[0])
+                logger.info("Saved raw channels: %s", ", ".join(sorted(outputs)))
+            except (IOError, OSError, ValueError) as e:
+                logger.error("Error exporting raw channels to CSV: %s", e)
 
     def discard(self):
         """Discard the current recording without saving."""
         with self.lock:
-            frame_count = len(self.frames)
+            frame_count = self.frame_count
+            writers = self._detach_writers()
+            partials = (self.stream_path, self.raw_path)
             self._clear()
-            logger.info("Discarded %d frames", frame_count)
+        self._close_writers(*writers)
+        self._remove_files(partials)
+        logger.info("Discarded %d frames", frame_count)
+
+    def _detach_writers(self) -> Tuple[Any, Optional[RawChannelLogger]]:
+        """
+        Detach raw taps and take the stream writers so nothing appends to them.
+
+        Must be called with the lock held; the writers are then closed with
+        _close_writers() after releasing it.
+        """
+        if self.raw_logger:
+            for _, handler, _, _ in self.raw_sources:
+                handler.set_log_tap(None)
+        writers = (self.writer, self.raw_logger)
+        self.writer = None
+        self.raw_logger = None
+        return writers
+
+    @staticmethod
+    def _close_writers(writer, raw_logger: Optional[RawChannelLogger]):
+        """Flush and close detached stream writers, joining their threads."""
+        if raw_logger:
+            raw_logger.stop()
+        if writer:
+            writer.close()
+
+    @staticmethod
+    def _remove_files(paths: Iterable[Optional[str]]):
+        """Delete partial stream files, ignoring ones already gone."""
+        for path in paths:
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
 
     def _clear(self):
         """Clear recording data."""
-        self.frames = []
+        self.recording = False
+        self.frame_count = 0
         self.start_time = None
         self.temp_filename = None
+        self.stream_path = None
+        self.raw_path = None
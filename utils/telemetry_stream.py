@@ -0,0 +1,412 @@
+"""
+Streaming columnar telemetry storage for openTPT.
+
+Telemetry rows are buffered into fixed-size, array-backed blocks and appended
+to a chunked binary file by a background writer thread, so memory use stays
+bounded for the length of a session and nothing large is written on save.
+
+File layout (little-endian):
+    header:  MAGIC (8 bytes) | uint32 schema length | schema JSON
+    block:   BLOCK_MAGIC (4 bytes) | uint32 rows | uint32 payload length |
+             uint32 CRC32 of payload | payload
+
+The payload holds each channel as a contiguous column (float32 with NaN for
+missing values, int16 with INT_MISSING for missing values, float64 for the
+timestamp and GPS position), followed by a JSON list of the strings
+referenced by the block's string channels. Every block is self-contained, so a file cut short by a
+crash or power loss reads back cleanly up to its last complete block.
+"""
+
+import csv
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import zlib
+from dataclasses import fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple, get_args
+
+import numpy as np
+
+from config import TELEMETRY_BLOCK_ROWS, TELEMETRY_MAX_PENDING_BLOCKS
+from utils.telemetry_recorder import TelemetryFrame
+
+logger = logging.getLogger('openTPT.telemetry')
+
+FORMAT_VERSION = 2
+MAGIC = b"OTPTTLM\x01"
+BLOCK_MAGIC = b"BLK\x00"
+_HEADER_STRUCT = struct.Struct("<I")
+_BLOCK_STRUCT = struct.Struct("<4sIII")
+
+# Sentinel stored in int16 columns when a value is missing (no NaN for ints)
+INT_MISSING = -32768
+_INT_MAX = 32767
+
+# Channels that need float64: float32 cannot hold epoch seconds to better
+# than ~2 minutes, or latitude/longitude to better than ~1 m
+_F8_CHANNELS = frozenset(("timestamp", "gps_latitude", "gps_longitude"))
+
+
+def _field_types(annotation: Any) -> Tuple[Any, ...]:
+    """Unwrap Optional[...] into its member types."""
+    return get_args(annotation) or (annotation,)
+
+
+def _channel_dtype(name: str, annotation: Any) -> str:
+    """Map a TelemetryFrame field to its on-disk column dtype."""
+    if name in _F8_CHANNELS:
+        return "<f8"
+    types = _field_types(annotation)
+    if int in types:
+        return "<i2"
+    if str in types:
+        # Index into the block's string table
+        return "<i2"
+    return "<f4"
+
+
+def _build_schema() -> Tuple[List[Tuple[str, str]], Tuple[str, ...]]:
+    """Build the channel list and string channel names from TelemetryFrame."""
+    channels = []
+    string_channels = []
+    for f in fields(TelemetryFrame):
+        channels.append((f.name, _channel_dtype(f.name, f.type)))
+        if str in _field_types(f.type):
+            string_channels.append(f.name)
+    return channels, tuple(string_channels)
+
+
+# Fixed schema shared by the writer, reader and CSV exporter. Channel order
+# matches TelemetryFrame.to_dict() so exported CSVs keep the existing layout.
+CHANNELS, STRING_CHANNELS = _build_schema()
+CHANNEL_NAMES = tuple(name for name, _ in CHANNELS)
+CHANNEL_INDEX = {name: j for j, name in enumerate(CHANNEL_NAMES)}
+STREAM_DTYPE = np.dtype(CHANNELS)
+
+
+def new_block(rows: int) -> np.ndarray:
+    """
+    Allocate a staging block with every channel set to missing (NaN).
+
+    Rows are staged as float64 so a whole row can be written with one
+    vectorised assignment; columns are narrowed to their on-disk dtype by
+    encode_block() on the writer thread.
+    """
+    return np.full((rows, len(CHANNELS)), np.nan)
+
+
+def _column_bytes(col: np.ndarray, fmt: str) -> bytes:
+    """Narrow a float64 staging column to its on-disk dtype."""
+    if fmt != "<i2":
+        return col.astype(fmt).tobytes()
+    values = np.nan_to_num(col, nan=INT_MISSING)
+    values[(values < INT_MISSING) | (values > _INT_MAX)] = INT_MISSING
+    return values.astype(fmt).tobytes()
+
+
+def encode_block(block: np.ndarray, strings: List[str]) -> bytes:
+    """
+    Encode rows as a framed, checksummed columnar block.
+
+    Args:
+        block: Staging rows, shape (rows, len(CHANNELS)), NaN for missing
+        strings: String table referenced by the block's string channels
+
+    Returns:
+        Bytes ready to append to a stream file
+    """
+    parts = [_column_bytes(block[:, j], fmt) for j, (_, fmt) in enumerate(CHANNELS)]
+    parts.append(json.dumps(strings).encode("utf-8"))
+    payload = b"".join(parts)
+    header = _BLOCK_STRUCT.pack(
+        BLOCK_MAGIC, len(block), len(payload), zlib.crc32(payload)
+    )
+    return header + payload
+
+
+def _decode_payload(payload: bytes, rows: int) -> Tuple[np.ndarray, List[str]]:
+    """Decode a block payload back into a structured array and string table."""
+    block = np.empty(rows, dtype=STREAM_DTYPE)
+    offset = 0
+    for name, fmt in CHANNELS:
+        size = rows * np.dtype(fmt).itemsize
+        block[name] = np.frombuffer(payload, dtype=fmt, count=rows, offset=offset)
+        offset += size
+    strings = json.loads(payload[offset:].decode("utf-8"))
+    return block, strings
+
+
+class TelemetryStreamWriter:
+    """
+    Appends telemetry rows to a columnar stream file from a background thread.
+
+    The producer (render thread) only copies rows into a preallocated block; full
+    blocks are handed to the writer thread through a bounded queue. If the
+    writer falls behind (e.g. a stalled USB stick) whole blocks are dropped
+    rather than blocking the producer or growing memory.
+
+    Usage:
+        writer = TelemetryStreamWriter("/mnt/usb/telemetry/session.tlm")
+        writer.open(start_time)
+        writer.append_frame(frame)
+        writer.close()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        block_rows: int = TELEMETRY_BLOCK_ROWS,
+        max_pending_blocks: int = TELEMETRY_MAX_PENDING_BLOCKS,
+    ):
+        """
+        Initialise the writer.
+
+        Args:
+            path: Destination file path
+            block_rows: Rows per block (bounds data lost on a crash)
+            max_pending_blocks: Blocks allowed to queue before dropping
+        """
+        self.path = path
+        self.block_rows = block_rows
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_blocks)
+        self._block = new_block(block_rows)
+        self._row = 0
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+
+        self.rows_written = 0
+        self.blocks_written = 0
+        self.blocks_dropped = 0
+        self.write_errors = 0
+
+    def open(self, start_time: float):
+        """
+        Create the file, write the schema header and start the writer thread.
+
+        Args:
+            start_time: Session start time (epoch seconds), stored in the header
+
+        Raises:
+            OSError: If the file cannot be created
+        """
+        schema = json.dumps({
+            "version": FORMAT_VERSION,
+            "start_time": start_time,
+            "channels": CHANNELS,
+            "string_channels": STRING_CHANNELS,
+        }).encode("utf-8")
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC + _HEADER_STRUCT.pack(len(schema)) + schema)
+        self._file.flush()
+
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="telemetry-writer", daemon=True
+        )
+        self._thread.start()
+
+    def append_frame(self, frame: TelemetryFrame):
+        """
+        Append a TelemetryFrame as one row.
+
+        Args:
+            frame: Frame to append
+        """
+        row = self._block[self._row]
+        for j, name in enumerate(CHANNEL_NAMES):
+            value = getattr(frame, name)
+            if value is None:
+                continue
+            if name in STRING_CHANNELS:
+                value = self.intern(value)
+            row[j] = value
+        self._advance()
+
+    def append_row(self, row: np.ndarray, strings: Optional[Dict[str, str]] = None):
+        """
+        Append a preassembled row.
+
+        Args:
+            row: float64 array of len(CHANNELS) values in CHANNEL_NAMES order,
+                 NaN for missing
+            strings: Values for string channels, keyed by channel name
+        """
+        block_row = self._block[self._row]
+        block_row[:] = row
+        if strings:
+            for name, value in strings.items():
+                if value is not None:
+                    block_row[CHANNEL_INDEX[name]] = self.intern(value)
+        self._advance()
+
+    def intern(self, value: str) -> int:
+        """Return the string table index for a value in the current block."""
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = index
+        return index
+
+    def _advance(self):
+        """Move to the next row, handing the block off when it is full."""
+        self._row += 1
+        if self._row >= self.block_rows:
+            self._submit()
+
+    def _submit(self):
+        """Queue the current block for writing and start a fresh one."""
+        if self._row == 0:
+            return
+        item = (self._block[:self._row], self._strings)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.blocks_dropped += 1
+            logger.warning(
+                "Telemetry writer behind, dropped block of %d rows", self._row
+            )
+        self._block = new_block(self.block_rows)
+        self._row = 0
+        self._strings = []
+        self._string_index = {}
+
+    def _writer_loop(self):
+        """Writer thread: encode queued blocks and append them to the file."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            block, strings = item
+            try:
+                self._file.write(encode_block(block, strings))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.rows_written += len(block)
+                self.blocks_written += 1
+            except (IOError, OSError) as e:
+                self.write_errors += 1
+                logger.error("Error writing telemetry block: %s", e)
+
+    def close(self):
+        """Flush the partial block, stop the writer thread and close the file."""
+        if self._file is None:
+            return
+        self._submit()
+        # Sentinel must not be dropped, so block until the writer has room
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        try:
+            self._file.close()
+        except (IOError, OSError) as e:
+            logger.error("Error closing telemetry file: %s", e)
+        self._file = None
+
+
+def read_header(f) -> Dict[str, Any]:
+    """
+    Read and validate a stream file header.
+
+    Args:
+        f: Binary file object positioned at the start of the file
+
+    Returns:
+        Schema dictionary
+
+    Raises:
+        ValueError: If the file is not a telemetry stream or uses another schema
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an openTPT telemetry stream")
+    raw = f.read(_HEADER_STRUCT.size)
+    if len(raw) < _HEADER_STRUCT.size:
+        raise ValueError("Truncated telemetry stream header")
+    (schema_len,) = _HEADER_STRUCT.unpack(raw)
+    schema = json.loads(f.read(schema_len).decode("utf-8"))
+    if [tuple(c) for c in schema.get("channels", [])] != CHANNELS:
+        raise ValueError("Telemetry stream schema does not match this version")
+    return schema
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[np.ndarray, List[str]]]:
+    """
+    Iterate over the blocks of a stream file.
+
+    Stops quietly at the first truncated or corrupt block, which is how a file
+    interrupted by a crash ends.
+
+    Args:
+        path: Stream file path
+
+    Yields:
+        (structured array of rows, string table) per block
+    """
+    with open(path, "rb") as f:
+        read_header(f)
+        while True:
+            raw = f.read(_BLOCK_STRUCT.size)
+            if not raw:
+                return
+            if len(raw) < _BLOCK_STRUCT.size:
+                logger.warning("Truncated block header in %s", path)
+                return
+            magic, rows, length, crc = _BLOCK_STRUCT.unpack(raw)
+            if magic != BLOCK_MAGIC:
+                logger.warning("Bad block marker in %s", path)
+                return
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                logger.warning("Truncated or corrupt block in %s", path)
+                return
+            yield _decode_payload(payload, rows)
+
+
+def _column_strings(block: np.ndarray, strings: List[str]) -> List[List[str]]:
+    """Format every column of a block as CSV cell strings."""
+    columns = []
+    for name, fmt in CHANNELS:
+        col = block[name]
+        if name in STRING_CHANNELS:
+            cells = [strings[i] if 0 <= i < len(strings) else "" for i in col.tolist()]
+        elif fmt == "<i2":
+            cells = col.astype(str).tolist()
+            missing = col == INT_MISSING
+            for i in np.flatnonzero(missing).tolist():
+                cells[i] = ""
+        elif fmt == "<f8":
+            cells = ["" if v != v else repr(v) for v in col.tolist()]
+        else:
+            # float32 -> shortest round-trip text, NaN -> empty cell
+            cells = col.astype(str).tolist()
+            for i in np.flatnonzero(np.isnan(col)).tolist():
+                cells[i] = ""
+        columns.append(cells)
+    return columns
+
+
+def export_csv(src_path: str, dst_path: str) -> int:
+    """
+    Export a stream file to CSV in the TelemetryFrame column layout.
+
+    Args:
+        src_path: Stream file path (complete or partial)
+        dst_path: CSV file to write
+
+    Returns:
+        Number of rows exported
+    """
+    rows = 0
+    with open(dst_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CHANNEL_NAMES)
+        for block, strings in iter_blocks(src_path):
+            writer.writerows(zip(*_column_strings(block, strings)))
+            rows += len(block)
+    return rows